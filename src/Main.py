@@ -1,19 +1,204 @@
 """
 Main Application File
 """
+import os
 import sys
+from types import SimpleNamespace
+from typing import List
 
 from PyQt6.QtWidgets import QApplication
 
 from models.GameModel import GameModel
 from widgets.GameWidget import GameWidget
+from utils import Constants, RandomUtils
 from utils.ExceptionUtils import except_hook
 
+DEFAULT_OPTIONS = {
+    'backend': 'widget',
+    'tiled': False,
+    'seed': None,
+    'record': None,
+    'autosave': None,
+    'connect': None,
+    'world': None,
+    'quit_after_first_frame': False,
+    'minimap': False,
+    'automation': None,
+}
+
+
+def parse_arguments(argv: List[str]) -> SimpleNamespace:
+    """
+    Parses the application command line arguments. Unknown arguments are left for Qt.
+    argparse is imported only if there are arguments, so plain launches do not pay for it
+
+    Args:
+        argv (List[str]): command line arguments including the program name
+
+    Returns:
+        SimpleNamespace: parsed options, see DEFAULT_OPTIONS
+    """
+    options = SimpleNamespace(**DEFAULT_OPTIONS)
+
+    if len(argv) <= 1:
+        return options
+
+    import argparse  # pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(description='World of Rectangles')
+    parser.add_argument('--backend', choices=['widget', 'scene'],
+                        help='render with the GameWidget (default) or with the QGraphicsScene based GameGraphicsView')
+    parser.add_argument('--tiled', action='store_true',
+                        help='paint the GameWidget from cached tiles rendered on a thread pool')
+    parser.add_argument('--seed', type=int, help='seed of the rectangle color and id random source')
+    parser.add_argument('--record', metavar='PATH', help='record input events to the trace file')
+    parser.add_argument('--autosave', metavar='DIR',
+                        help='journal every change to the directory and restore the last session from it on start')
+    parser.add_argument('--connect', metavar='ADDRESS',
+                        help='share the scene through the sync server at HOST:PORT or unix:PATH')
+    parser.add_argument('--world', metavar='DIR',
+                        help='show a view of the world stored in region files in the directory, move it with arrows')
+    parser.add_argument('--minimap', action='store_true',
+                        help='show the whole scene downscaled next to the game field, click it to jump with --world')
+    parser.add_argument('--automation', metavar='ADDRESS',
+                        help='serve the JSON-RPC automation API of the scene at HOST:PORT or unix:PATH')
+    parser.add_argument('--quit-after-first-frame', action='store_true',
+                        help='print a marker and quit once the first frame is painted, used by the startup benchmark')
+    parser.parse_known_args(argv[1:], namespace=options)
+
+    if options.connect and (options.backend == 'scene' or options.autosave):
+        parser.error('--connect is only supported by the widget backend and without --autosave')
+    if options.minimap and options.backend == 'scene':
+        parser.error('--minimap is only supported by the widget backend')
+    if options.automation and options.backend == 'scene':
+        parser.error('--automation is only supported by the widget backend')
+    if options.world and (options.backend == 'scene' or options.tiled or options.autosave or options.connect):
+        parser.error('--world is only supported by the plain widget backend and without --autosave or --connect')
+
+    return options
+
+def main() -> int:
+    """
+    Starts the application. Optional features are imported only when they are enabled
+
+    Returns:
+        int: application exit code
+    """
+    options = parse_arguments(sys.argv)
+    RandomUtils.seed(options.seed)
 
-if __name__ == '__main__':
     app = QApplication(sys.argv)
     game_model = GameModel()
-    game_widget = GameWidget(game_model)
-    game_widget.show()
+    recorder = None
+    journal = None
+    sync = None
+    world = None
+    watchdog = None
+    automation = None
+
+    if options.connect:
+        # pylint: disable=import-outside-toplevel
+        from network.SyncBridge import SyncBridge
+        from network.SyncProtocol import parse_address
+
+        sync = SyncBridge(game_model, *parse_address(options.connect))
+
+    if options.world:
+        # pylint: disable=import-outside-toplevel
+        from models.ShardedWorld import ShardedWorld
+        from persistence.RegionStore import RegionStore
+
+        world = ShardedWorld(game_model, RegionStore(options.world))
+
+    if options.autosave:
+        # pylint: disable=import-outside-toplevel
+        from persistence.ModelJournal import ModelJournal
+        from persistence.ModelRecovery import load_model
+
+        game_model, generation = load_model(options.autosave)
+        journal = ModelJournal(options.autosave, game_model, generation)
+        game_model.journal = journal
+
+    if options.record:
+        # pylint: disable=import-outside-toplevel
+        import random
+        from recording.InputRecorder import InputRecorder
+
+        seed = options.seed if options.seed is not None else random.getrandbits(63)
+        RandomUtils.seed(seed)
+        recorder = InputRecorder(options.record, seed, game_model.field_width, game_model.field_height)
+
+    if options.backend == 'scene':
+        from widgets.GameGraphicsView import GameGraphicsView  # pylint: disable=import-outside-toplevel
+        game_widget = GameGraphicsView(game_model, recorder)
+    else:
+        game_widget = GameWidget(game_model, recorder, options.tiled, sync, world)
+
+    window = game_widget
+
+    if options.automation:
+        from network.AutomationBridge import AutomationBridge  # pylint: disable=import-outside-toplevel
+        automation = AutomationBridge(game_model, options.automation)
+
+    if options.minimap:
+        # pylint: disable=import-outside-toplevel
+        from PyQt6.QtWidgets import QHBoxLayout, QWidget
+        from widgets.MinimapWidget import MinimapWidget
+
+        window = QWidget()
+        window.setWindowTitle(game_widget.windowTitle())
+        layout = QHBoxLayout(window)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(game_widget)
+        layout.addWidget(MinimapWidget(game_model, game_widget.jump_to, world))
+
+    if options.quit_after_first_frame:
+        from benchmarks.FirstFrameProbe import FirstFrameProbe  # pylint: disable=import-outside-toplevel
+        FirstFrameProbe(app, game_widget)
+
+    if os.environ.get(Constants.PROFILE_ENV_VAR) and options.backend == 'widget':
+        game_widget.toggle_profiling()
+
+    stall_threshold_ms = int(os.environ.get(Constants.STALL_ENV_VAR) or Constants.STALL_THRESHOLD_MS)
+
+    if stall_threshold_ms > 0:
+        # pylint: disable=import-outside-toplevel
+        from PyQt6.QtCore import QTimer
+        from diagnostics.StallWatchdog import StallWatchdog
+
+        watchdog = StallWatchdog(stall_threshold_ms / 1000)
+        heartbeat = QTimer(app)
+        heartbeat.timeout.connect(watchdog.beat)
+        heartbeat.start(max(stall_threshold_ms // 4, 1))
+        watchdog.start()
+
+    window.show()
     sys.excepthook = except_hook
-    sys.exit(app.exec())
+    exit_code = app.exec()
+
+    if watchdog:
+        watchdog.stop()
+
+    if options.backend == 'widget' and game_widget.profiler and game_widget.profiler.is_capturing:
+        sys.stderr.write(f'profile written to {game_widget.toggle_profiling()}\n')
+
+    if recorder:
+        recorder.close()
+
+    if journal:
+        journal.close()
+
+    if automation:
+        automation.close()
+
+    if sync:
+        sync.close()
+
+    if world:
+        world.close()
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Implementation of the first frame probe used by the startup benchmark
+"""
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QAbstractScrollArea, QApplication, QWidget
+
+FIRST_FRAME_MARKER: str = 'first-frame'
+
+
+class FirstFrameProbe(QObject):
+    """
+    The FirstFrameProbe, child of QObject class, that prints a marker to stdout once the watched widget
+    has painted its first frame and then quits the application
+
+    Args:
+        app (QApplication): running application
+        widget (QWidget): widget to watch. The viewport is watched for scroll areas such as QGraphicsView
+
+    Attributes:
+        app (QApplication): running application
+    """
+    def __init__(self, app: QApplication, widget: QWidget):
+        super().__init__(widget)
+
+        self.app = app
+        (widget.viewport() if isinstance(widget, QAbstractScrollArea) else widget).installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # pylint: disable=invalid-name
+        """
+        Waits for the first paint event of the watched widget
+
+        Args:
+            watched (QObject): watched widget
+            event (QEvent): event data
+
+        Returns:
+            (bool): False, so the event is always delivered to the widget
+        """
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            QTimer.singleShot(0, self.report_first_frame)
+
+        return False
+
+    def report_first_frame(self) -> None:
+        """
+        Prints the first frame marker once the first paint event was handled and quits the application
+
+        Returns:
+            None
+        """
+        print(FIRST_FRAME_MARKER, flush=True)
+        self.app.quit()
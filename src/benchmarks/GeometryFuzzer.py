@@ -0,0 +1,646 @@
+"""
+Differential fuzz harness that checks the accelerated geometry queries of the game model against brute force
+references. Every run applies a seeded random sequence of operations to a fresh game model and compares
+both paths on random queries after every operation. The first diverging case is minimized by dropping
+operations while it still diverges, then the resulting scene is rebuilt from explicit placements that are
+minimized again, so the report is a short list of rectangles and links that can be replayed by hand.
+The harness also times both paths on random scenes of growing size to report the speedup.
+
+Usage (from the src folder):
+    python -m benchmarks.GeometryFuzzer [--seed 0] [--runs 20] [--steps 200] [--sizes 64 256 1024]
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from components.Port import Port
+from models.GameModel import GameModel
+from utils import Constants, RandomUtils
+from utils.MathUtils import (has_border_collision, has_rectangle_overlap, is_point_in_circle, is_point_in_polygon,
+                             is_rectangle_inside)
+
+Operation = Tuple[Any, ...]
+Query = Tuple[Any, ...]
+QueryPath = Callable[..., Any]
+
+FIELD_SIZE_PX: Tuple[int, int] = (1024, 768)
+OPERATION_WEIGHTS: Dict[str, int] = {'add': 5, 'move': 4, 'resize': 2, 'remove': 1, 'link': 2, 'unlink': 1}
+QUERY_KINDS: List[str] = ['rectangle', 'port', 'link', 'collision', 'placement']
+
+
+class Divergence(NamedTuple):
+    """
+    Query whose accelerated and brute force results differ
+
+    Attributes:
+        seed (int): seed of the run
+        operations (List[Operation]): operations that lead to the divergence, minimized
+        query (Query): diverging query
+        expected (str): result of the brute force reference
+        actual (str): result of the accelerated path
+    """
+    seed: int
+    operations: List[Operation]
+    query: Query
+    expected: str
+    actual: str
+
+
+class SpeedRecord(NamedTuple):
+    """
+    Mean time of a query kind on both paths
+
+    Attributes:
+        size (int): number of rectangles in the scene
+        kind (str): query kind
+        fast_us (float): mean time of the accelerated path in microseconds
+        reference_us (float): mean time of the brute force reference in microseconds
+    """
+    size: int
+    kind: str
+    fast_us: float
+    reference_us: float
+
+
+def get_rectangle(model: GameModel, index: int) -> Optional[MoveableRectangle]:
+    """
+    Gets the rectangle at the index wrapped around the rectangles of the model, so operations and queries
+    stay valid when earlier operations are dropped by the minimization
+
+    Args:
+        model (GameModel): game model
+        index (int): any non-negative index
+
+    Returns:
+        Optional[MoveableRectangle]: rectangle, None if the model has no rectangles
+    """
+    return model.rectangles[index % len(model.rectangles)] if model.rectangles else None
+
+def reference_find_rectangle(model: GameModel, x_coord: int, y_coord: int) -> Optional[MoveableRectangle]:
+    """
+    Finds the innermost rectangle at the point by checking every rectangle. The rectangles at a point are
+    nested in each other, so the innermost one is the smallest
+
+    Args:
+        model (GameModel): game model
+        x_coord (int): x coordinate of the point
+        y_coord (int): y coordinate of the point
+
+    Returns:
+        Optional[MoveableRectangle]: innermost rectangle, None if there is no rectangle at the point
+    """
+    found = [rect for rect in model.rectangles if rect.contains(x_coord, y_coord)]
+    return min(found, key=lambda rect: rect.width() * rect.height(), default=None)
+
+def reference_find_port(model: GameModel, index: int, x_coord: int, y_coord: int, search_all: bool) -> Optional[Port]:
+    """
+    Finds the port at the point by checking the ports of the selected rectangle, or every port
+
+    Args:
+        model (GameModel): game model
+        index (int): index of the rectangle to select
+        x_coord (int): x coordinate of the point
+        y_coord (int): y coordinate of the point
+        search_all (bool): flag to check the ports of every rectangle
+
+    Returns:
+        Optional[Port]: first port at the point, None if there is none
+    """
+    model.selected_rectangle = get_rectangle(model, index)
+
+    if model.selected_rectangle is None:
+        return None
+
+    rectangles = model.rectangles if search_all else [model.selected_rectangle]
+
+    return next((port for rect in rectangles for port in rect.ports
+                 if is_point_in_circle(port.x(), port.y(), x_coord, y_coord)), None)
+
+def reference_find_link(model: GameModel, x_coord: int, y_coord: int) -> Optional[Link]:
+    """
+    Finds the straight link at the point by checking the outline of every link
+
+    Args:
+        model (GameModel): game model
+        x_coord (int): x coordinate of the point
+        y_coord (int): y coordinate of the point
+
+    Returns:
+        Optional[Link]: first link at the point, None if there is none
+    """
+    width = Constants.LINK_WIDTH_PX
+
+    for link in model.links:
+        outline = ((int(link.x1() + width), int(link.y1() - width)), (int(link.x2() + width), int(link.y2() - width)),
+                   (int(link.x2() - width), int(link.y2() + width)), (int(link.x1() - width), int(link.y1() + width)))
+
+        if is_point_in_polygon(outline, x_coord, y_coord):
+            return link
+
+    return None
+
+def reference_has_collision(model: GameModel, rectangle: Optional[MoveableRectangle],
+                            x_offset: int, y_offset: int) -> bool:
+    """
+    Checks the moved rectangle against the game field and every rectangle except the ones it is moved into
+    and, if it is in the game model, the ones nested in it that it carries
+
+    Args:
+        model (GameModel): game model
+        rectangle (Optional[MoveableRectangle]): rectangle to check, it does not have to be in the game model
+        x_offset (int): x coordinate offset
+        y_offset (int): y coordinate offset
+
+    Returns:
+        bool: True if the moved rectangle collides. False otherwise
+    """
+    if rectangle is None:
+        return False
+
+    is_carrying = any(rect is rectangle for rect in model.rectangles)
+    bounds = rectangle.get_bound_coordinates()
+    left, right, top, bottom = bounds
+    moved = (left + x_offset, right + x_offset, top + y_offset, bottom + y_offset)
+
+    if has_border_collision(*bounds, model.field_width, model.field_height, x_offset, y_offset):
+        return True
+
+    for rect in model.rectangles:
+        other = rect.get_bound_coordinates()
+
+        if (rect is not rectangle and not (is_carrying and is_rectangle_inside(*other, *bounds))
+                and not is_rectangle_inside(*moved, *other) and has_rectangle_overlap(*moved, *other)):
+            return True
+
+    return False
+
+def place_rectangle(x_coord: int, y_coord: int) -> MoveableRectangle:
+    """
+    Creates a new rectangle of the default size with the center at the point, as a double click does
+
+    Args:
+        x_coord (int): x coordinate of the center
+        y_coord (int): y coordinate of the center
+
+    Returns:
+        MoveableRectangle: new rectangle that is not added to any model
+    """
+    return MoveableRectangle(x_coord, y_coord, Constants.RECTANGLE_WIDTH_PX, Constants.RECTANGLE_HEIGHT_PX)
+
+def select_and_find_port(model: GameModel, index: int, x_coord: int, y_coord: int, search_all: bool) -> Optional[Port]:
+    """
+    Selects the rectangle at the index and finds the port at the point through the game model
+
+    Args:
+        model (GameModel): game model
+        index (int): index of the rectangle to select
+        x_coord (int): x coordinate of the point
+        y_coord (int): y coordinate of the point
+        search_all (bool): flag to check the ports of every rectangle
+
+    Returns:
+        Optional[Port]: port found by the game model
+    """
+    model.selected_rectangle = get_rectangle(model, index)
+    return model.find_selected_port(x_coord, y_coord, search_all)
+
+
+QUERY_PATHS: Dict[str, Tuple[QueryPath, QueryPath]] = {
+    'rectangle': (lambda model, x_coord, y_coord: model.find_selected_rectangle(x_coord, y_coord),
+                  reference_find_rectangle),
+    'port': (select_and_find_port, reference_find_port),
+    'link': (lambda model, x_coord, y_coord: model.find_selected_link(x_coord, y_coord), reference_find_link),
+    'collision': (lambda model, index, x_offset, y_offset:
+                  model.has_collision(get_rectangle(model, index), x_offset, y_offset),
+                  lambda model, index, x_offset, y_offset:
+                  reference_has_collision(model, get_rectangle(model, index), x_offset, y_offset)),
+    'placement': (lambda model, x_coord, y_coord: model.has_collision(place_rectangle(x_coord, y_coord)),
+                  lambda model, x_coord, y_coord: reference_has_collision(model, place_rectangle(x_coord, y_coord),
+                                                                          0, 0)),
+}
+
+
+def new_model(seed: int, field_width: int = FIELD_SIZE_PX[0], field_height: int = FIELD_SIZE_PX[1]) -> GameModel:
+    """
+    Creates an empty game model with the colors and ids drawn from the seeded random source
+
+    Args:
+        seed (int): seed of the color and id random source
+        field_width (int): width of the game field. Default: FIELD_SIZE_PX[0]
+        field_height (int): height of the game field. Default: FIELD_SIZE_PX[1]
+
+    Returns:
+        GameModel: empty game model
+    """
+    RandomUtils.seed(seed)
+    model = GameModel()
+    model.field_width, model.field_height = field_width, field_height
+
+    return model
+
+def generate_operation(rng: random.Random, model: GameModel) -> Operation:
+    """
+    Generates a random operation. Rectangles and links are referred to by indexes that wrap around
+
+    Args:
+        rng (random.Random): random source of the run
+        model (GameModel): game model the operation is generated for
+
+    Returns:
+        Operation: name of the operation followed by its arguments
+    """
+    name = rng.choices(list(OPERATION_WEIGHTS), list(OPERATION_WEIGHTS.values()))[0]
+    index = rng.randrange(1 << 16)
+
+    if name == 'add':
+        return name, rng.randrange(model.field_width), rng.randrange(model.field_height)
+    if name == 'move':
+        return name, index, rng.randint(-150, 150), rng.randint(-150, 150)
+    if name == 'resize':
+        # containers have to be large to nest the default rectangles
+        return (name, index, rng.randint(Constants.RECTANGLE_MIN_WIDTH_PX, 4 * Constants.RECTANGLE_WIDTH_PX),
+                rng.randint(Constants.RECTANGLE_MIN_HEIGHT_PX, 4 * Constants.RECTANGLE_HEIGHT_PX))
+    if name == 'link':
+        return name, index, rng.randrange(4), rng.randrange(1 << 16), rng.randrange(4)
+
+    return name, index
+
+def apply_operation(model: GameModel, operation: Operation) -> None:
+    """
+    Applies the operation the way the controller does, moves and resizes that collide are skipped.
+    The place and connect operations of minimized scenes refer to rectangles by their top left corners
+
+    Args:
+        model (GameModel): game model to change
+        operation (Operation): operation to apply
+
+    Returns:
+        None
+    """
+    name, *args = operation
+    rectangle = get_rectangle(model, args[0]) if name in ('move', 'resize', 'remove', 'link') else None
+
+    if name == 'place':
+        left, top, width, height = args
+        model.add_rectangle(MoveableRectangle(left + width / 2, top + height / 2, width, height))
+    elif name == 'connect':
+        corners = {(rect.x(), rect.y()): rect for rect in model.rectangles}
+        src, dst = corners.get(tuple(args[:2])), corners.get(tuple(args[3:5]))
+
+        if src is not None and dst is not None and src is not dst:
+            model.add_link(src.ports[args[2]], dst.ports[args[5]])
+    elif name == 'add':
+        model.try_add_new_rectangle(*args)
+    elif name == 'move' and rectangle is not None and not model.has_collision(rectangle, *args[1:]):
+        model.move_rectangle(rectangle, *args[1:])
+    elif name == 'resize' and rectangle is not None and model.can_resize(rectangle, *args[1:]):
+        model.resize_rectangle(rectangle, *args[1:])
+    elif name == 'remove' and rectangle is not None:
+        model.remove_rectangle(rectangle)
+    elif name == 'link' and rectangle is not None and get_rectangle(model, args[2]) is not rectangle:
+        model.add_link(rectangle.ports[args[1]], get_rectangle(model, args[2]).ports[args[3]])
+    elif name == 'unlink' and model.links:
+        model.remove_link(model.links[args[0] % len(model.links)])
+
+def generate_point(rng: random.Random, model: GameModel) -> Tuple[int, int]:
+    """
+    Generates a random point, mostly close to the edges of rectangles, ports and link ends where
+    off-by-one errors hide
+
+    Args:
+        rng (random.Random): random source of the run
+        model (GameModel): game model the point is generated for
+
+    Returns:
+        Tuple[int, int]: x and y coordinates of the point
+    """
+    features = rng.choice(['field', 'rectangle', 'port', 'link'])
+
+    if features == 'rectangle' and model.rectangles:
+        left, right, top, bottom = rng.choice(model.rectangles).get_bound_coordinates()
+        return rng.choice([left, right]) + rng.randint(-2, 2), rng.choice([top, bottom]) + rng.randint(-2, 2)
+    if features == 'port' and model.rectangles:
+        port = rng.choice(rng.choice(model.rectangles).ports)
+        reach = Constants.CIRCLE_RADIUS_PX + 1
+        return port.x() + rng.randint(-reach, reach), port.y() + rng.randint(-reach, reach)
+    if features == 'link' and model.links:
+        link = rng.choice(model.links)
+        share, reach = rng.random(), Constants.LINK_WIDTH_PX + 1
+        return (int(link.x1() + (link.x2() - link.x1()) * share) + rng.randint(-reach, reach),
+                int(link.y1() + (link.y2() - link.y1()) * share) + rng.randint(-reach, reach))
+
+    return rng.randrange(-10, model.field_width + 10), rng.randrange(-10, model.field_height + 10)
+
+def generate_query(rng: random.Random, model: GameModel) -> Query:
+    """
+    Generates a random query of a random kind
+
+    Args:
+        rng (random.Random): random source of the run
+        model (GameModel): game model the query is generated for
+
+    Returns:
+        Query: kind of the query followed by its arguments
+    """
+    kind = rng.choice(QUERY_KINDS)
+
+    if kind == 'port':
+        return (kind, rng.randrange(1 << 16), *generate_point(rng, model), rng.random() < 0.5)
+    if kind == 'collision':
+        return kind, rng.randrange(1 << 16), rng.randint(-150, 150), rng.randint(-150, 150)
+
+    return (kind, *generate_point(rng, model))
+
+def describe(value: Any) -> str:
+    """
+    Describes a query result by its geometry, as ids differ between runs
+
+    Args:
+        value (Any): query result
+
+    Returns:
+        str: description of the result
+    """
+    if isinstance(value, MoveableRectangle):
+        return f'rectangle at ({value.x()}, {value.y()}) of {value.width()}x{value.height()}'
+    if isinstance(value, Port):
+        return f'port at ({value.x()}, {value.y()})'
+    if isinstance(value, Link):
+        return f'link from ({value.x1()}, {value.y1()}) to ({value.x2()}, {value.y2()})'
+
+    return repr(value)
+
+def check_query(model: GameModel, query: Query,
+                paths: Dict[str, Tuple[QueryPath, QueryPath]] = None) -> Optional[Tuple[str, str]]:
+    """
+    Runs the query through both paths. Objects are compared by identity, as rectangles compare by value
+
+    Args:
+        model (GameModel): game model to query
+        query (Query): query to run
+        paths (Dict[str, Tuple[QueryPath, QueryPath]]): accelerated and brute force paths of every query kind.
+            Default: QUERY_PATHS
+
+    Returns:
+        Optional[Tuple[str, str]]: descriptions of the brute force and the accelerated results if they differ,
+        None otherwise
+    """
+    fast, reference = (paths or QUERY_PATHS)[query[0]]
+    expected, actual = reference(model, *query[1:]), fast(model, *query[1:])
+
+    if actual is expected or (isinstance(expected, bool) and actual == expected):
+        return None
+
+    return describe(expected), describe(actual)
+
+def replay(seed: int, operations: Sequence[Operation]) -> GameModel:
+    """
+    Applies the operations to a fresh game model
+
+    Args:
+        seed (int): seed of the run
+        operations (Sequence[Operation]): operations to apply
+
+    Returns:
+        GameModel: changed game model
+    """
+    model = new_model(seed)
+
+    for operation in operations:
+        apply_operation(model, operation)
+
+    return model
+
+def reduce_operations(seed: int, operations: List[Operation], query: Query,
+                      paths: Dict[str, Tuple[QueryPath, QueryPath]] = None, kept: int = 0) -> List[Operation]:
+    """
+    Drops chunks of operations, halving the chunk size, while the query still diverges after the rest
+
+    Args:
+        seed (int): seed of the run
+        operations (List[Operation]): operations that lead to the divergence
+        query (Query): diverging query
+        paths (Dict[str, Tuple[QueryPath, QueryPath]]): paths of every query kind. Default: QUERY_PATHS
+        kept (int): number of leading operations that are never dropped. Default: 0
+
+    Returns:
+        List[Operation]: operations that still lead to the divergence
+    """
+    chunk = max(1, (len(operations) - kept) // 2)
+
+    while True:
+        start, is_reduced = kept, False
+
+        while start < len(operations):
+            candidate = operations[:start] + operations[start + chunk:]
+
+            if check_query(replay(seed, candidate), query, paths) is not None:
+                operations, is_reduced = candidate, True
+            else:
+                start += chunk
+
+        if chunk == 1 and not is_reduced:
+            return operations
+
+        chunk = max(1, chunk // 2)
+
+def snapshot(model: GameModel, query: Query) -> Tuple[List[Operation], Query]:
+    """
+    Describes the scene as place and connect operations that do not depend on the order of the rectangles.
+    The rectangle a query refers to by index is placed first and the query refers to it by index 0
+
+    Args:
+        model (GameModel): game model with the scene
+        query (Query): diverging query
+
+    Returns:
+        Tuple[List[Operation], Query]: operations that rebuild the scene and the rewritten query
+    """
+    rectangles = list(model.rectangles)
+
+    if query[0] in ('port', 'collision') and rectangles:
+        target = get_rectangle(model, query[1])
+        rectangles.sort(key=lambda rect: rect is not target)
+        query = (query[0], 0, *query[2:])
+
+    corners = {port.id: (rect.x(), rect.y(), index) for rect in rectangles for index, port in enumerate(rect.ports)}
+    operations: List[Operation] = [('place', rect.x(), rect.y(), rect.width(), rect.height()) for rect in rectangles]
+    operations += [('connect', *corners[link.src_id], *corners[link.dst_id]) for link in model.links]
+
+    return operations, query
+
+def minimize(seed: int, operations: List[Operation], query: Query,
+             paths: Dict[str, Tuple[QueryPath, QueryPath]] = None) -> Divergence:
+    """
+    Minimizes the operations that lead to the divergence, then minimizes the placements of the resulting
+    scene if they still diverge, as dropping an operation also changes the rectangles later operations refer to
+
+    Args:
+        seed (int): seed of the run
+        operations (List[Operation]): operations that lead to the divergence
+        query (Query): diverging query
+        paths (Dict[str, Tuple[QueryPath, QueryPath]]): paths of every query kind. Default: QUERY_PATHS
+
+    Returns:
+        Divergence: minimized diverging case
+    """
+    operations = reduce_operations(seed, operations, query, paths)
+    scene, scene_query = snapshot(replay(seed, operations), query)
+
+    if check_query(replay(seed, scene), scene_query, paths) is not None:
+        scene = reduce_operations(seed, scene, scene_query, paths, int(scene_query[1:2] == (0,)))
+
+        if len(scene) < len(operations):
+            operations, query = scene, scene_query
+
+    expected, actual = check_query(replay(seed, operations), query, paths)
+
+    return Divergence(seed, operations, query, expected, actual)
+
+def fuzz(seed: int, steps: int, queries_per_step: int = 20,
+         paths: Dict[str, Tuple[QueryPath, QueryPath]] = None) -> Optional[Divergence]:
+    """
+    Applies random operations to a fresh game model and runs random queries through both paths after each one
+
+    Args:
+        seed (int): seed of the run
+        steps (int): number of operations
+        queries_per_step (int): number of queries after every operation. Default: 20
+        paths (Dict[str, Tuple[QueryPath, QueryPath]]): paths of every query kind. Default: QUERY_PATHS
+
+    Returns:
+        Optional[Divergence]: first diverging case, minimized, None if both paths agree
+    """
+    rng = random.Random(seed)
+    model = new_model(seed)
+    operations: List[Operation] = []
+
+    for _ in range(steps):
+        operations.append(generate_operation(rng, model))
+        apply_operation(model, operations[-1])
+
+        for _ in range(queries_per_step):
+            query = generate_query(rng, model)
+
+            if check_query(model, query, paths) is not None:
+                return minimize(seed, operations, query, paths)
+
+    return None
+
+def format_divergence(divergence: Divergence) -> str:
+    """
+    Formats the diverging case as a replayable list of operations
+
+    Args:
+        divergence (Divergence): diverging case
+
+    Returns:
+        str: report of the case
+    """
+    lines = [f'seed {divergence.seed}: {divergence.query} diverges after {len(divergence.operations)} operations',
+             *(f'    {operation}' for operation in divergence.operations),
+             f'  brute force: {divergence.expected}',
+             f'  accelerated: {divergence.actual}']
+
+    return '\n'.join(lines)
+
+def build_random_scene(size: int, seed: int) -> GameModel:
+    """
+    Builds a game model with the given number of rectangles at random positions, on a field that grows
+    with the number of rectangles, and every rectangle linked to the previous one
+
+    Args:
+        size (int): number of rectangles
+        seed (int): seed of the scene
+
+    Returns:
+        GameModel: game model with the scene, it may hold fewer rectangles if the random positions collide
+    """
+    side = int(math.sqrt(size) * 3 * Constants.RECTANGLE_WIDTH_PX)
+    model = new_model(seed, side, side)
+    rng = random.Random(seed)
+
+    for _ in range(20 * size):
+        if len(model.rectangles) == size:
+            break
+
+        if model.try_add_new_rectangle(rng.randrange(side), rng.randrange(side)) and len(model.rectangles) > 1:
+            model.add_link(model.rectangles[-2].ports[1], model.rectangles[-1].ports[3])
+
+    return model
+
+def measure_speedup(sizes: Sequence[int], queries_count: int, seed: int = 0) -> List[SpeedRecord]:
+    """
+    Times both paths of every query kind on the same random queries
+
+    Args:
+        sizes (Sequence[int]): numbers of rectangles of the scenes
+        queries_count (int): number of queries per scene
+        seed (int): seed of the scenes and queries. Default: 0
+
+    Returns:
+        List[SpeedRecord]: mean times of every scene size and query kind
+    """
+    records = []
+
+    for size in sizes:
+        model = build_random_scene(size, seed)
+        rng = random.Random(seed)
+        queries = [generate_query(rng, model) for _ in range(queries_count)]
+
+        for kind in QUERY_KINDS:
+            arguments = [query[1:] for query in queries if query[0] == kind]
+            timings = []
+
+            for path in QUERY_PATHS[kind]:
+                start = time.perf_counter()
+
+                for args in arguments:
+                    path(model, *args)
+
+                timings.append((time.perf_counter() - start) / max(1, len(arguments)) * 1e6)
+
+            records.append(SpeedRecord(size, kind, *timings))
+
+    return records
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Runs the fuzz harness and the speed comparison, exits with 1 on the first divergence
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv[1:]
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Compare accelerated geometry queries to brute force references')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first run')
+    parser.add_argument('--runs', type=int, default=20, help='number of runs with consecutive seeds')
+    parser.add_argument('--steps', type=int, default=200, help='number of operations per run')
+    parser.add_argument('--queries', type=int, default=20, help='number of queries after every operation')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 256, 1024], help='numbers of rectangles')
+    args = parser.parse_args(argv)
+
+    for seed in range(args.seed, args.seed + args.runs):
+        divergence = fuzz(seed, args.steps, args.queries)
+
+        if divergence is not None:
+            print(format_divergence(divergence))
+            sys.exit(1)
+
+    print(f'no divergence in {args.runs} runs of {args.steps} operations')
+    print(f'{"size":>6} {"query":<10} {"fast us":>10} {"brute us":>10} {"speedup":>8}')
+
+    for record in measure_speedup(args.sizes, 2000, args.seed):
+        print(f'{record.size:>6} {record.kind:<10} {record.fast_us:>10.2f} {record.reference_us:>10.2f} '
+              f'{record.reference_us / max(record.fast_us, 1e-9):>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
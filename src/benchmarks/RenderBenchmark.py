@@ -0,0 +1,188 @@
+"""
+Render benchmark that compares frame time and memory of the GameWidget, the tiled GameWidget and
+the GameGraphicsView backends
+on the same generated scenes. Every backend and scene size runs in its own offscreen process,
+so memory numbers are not polluted by other runs.
+
+Usage (from the src folder):
+    python -m benchmarks.RenderBenchmark [--sizes 16 64 144] [--frames 50]
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from models.GameModel import GameModel
+from utils import Constants, RandomUtils
+
+SOURCE_DIR: Path = Path(__file__).resolve().parents[1]
+BACKENDS: List[str] = ['widget', 'tiled', 'scene']
+
+
+def build_scene(rectangles_count: int, field_width: int = Constants.SCREEN_SIZE_MAX_PX[0],
+                field_height: int = Constants.SCREEN_SIZE_MAX_PX[1], seed: int = 0) -> GameModel:
+    """
+    Builds a game model with rectangles placed on a regular grid and every rectangle linked to its right neighbour
+
+    Args:
+        rectangles_count (int): number of rectangles
+        field_width (int): width of the game field. Default: Constants.SCREEN_SIZE_MAX_PX[0]
+        field_height (int): height of the game field. Default: Constants.SCREEN_SIZE_MAX_PX[1]
+        seed (int): seed of the color and id random source. Default: 0
+
+    Returns:
+        GameModel: game model with the generated scene
+
+    Raises:
+        ValueError: if the rectangles do not fit into the game field
+    """
+    RandomUtils.seed(seed)
+
+    model = GameModel()
+    model.field_width, model.field_height = field_width, field_height
+
+    columns = max(1, min(field_width // Constants.RECTANGLE_WIDTH_PX,
+                         math.ceil(math.sqrt(rectangles_count * field_width / field_height))))
+    rows = max(1, math.ceil(rectangles_count / columns))
+    cell_width, cell_height = field_width // columns, field_height // rows
+
+    if cell_width < Constants.RECTANGLE_WIDTH_PX or cell_height < Constants.RECTANGLE_HEIGHT_PX:
+        raise ValueError(f'{rectangles_count} rectangles do not fit into {field_width}x{field_height} field')
+
+    for i in range(rectangles_count):
+        row, column = divmod(i, columns)
+        rectangle = model.try_add_new_rectangle(column * cell_width + cell_width // 2,
+                                                row * cell_height + cell_height // 2)
+
+        if column > 0 and rectangle:
+            model.add_link(model.rectangles[-2].ports[1], rectangle.ports[3])
+
+    model.recalculate_min_field_size()
+
+    return model
+
+def get_resident_memory() -> int:
+    """
+    Gets the resident memory of the current process
+
+    Returns:
+        int: resident memory in bytes, or peak resident memory where /proc is not available
+    """
+    try:
+        with open('/proc/self/statm', encoding='utf-8') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource  # pylint: disable=import-outside-toplevel
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def run_worker(backend: str, rectangles_count: int, frames: int) -> Dict[str, float]:
+    """
+    Measures one backend on one scene in the current process
+
+    Args:
+        backend (str): 'widget', 'tiled' or 'scene'
+        rectangles_count (int): number of rectangles in the scene
+        frames (int): number of measured frames per scenario
+
+    Returns:
+        Dict[str, float]: full frame time and drag frame time in milliseconds and memory in megabytes
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtCore import QEvent, QPointF, Qt
+    from PyQt6.QtGui import QMouseEvent
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    model = build_scene(rectangles_count)
+    memory_before = get_resident_memory()
+
+    if backend == 'scene':
+        from widgets.GameGraphicsView import GameGraphicsView
+        view = GameGraphicsView(model)
+        canvas = view.viewport()
+    else:
+        from widgets.GameWidget import GameWidget
+        view = GameWidget(model, tiled=backend == 'tiled')
+        canvas = view
+
+    view.show()
+    app.processEvents()
+    canvas.repaint()
+    memory_after = get_resident_memory()
+
+    full_frames = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        canvas.repaint()
+        full_frames.append(time.perf_counter() - start)
+
+    def send(event_type: QEvent.Type, handler, x_coord: int, y_coord: int) -> None:
+        position = QPointF(x_coord, y_coord)
+        handler(QMouseEvent(event_type, position, position, Qt.MouseButton.LeftButton,
+                            Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier))
+
+    dragged = model.rectangles[len(model.rectangles) // 2]
+    center_x, center_y = dragged.center().x(), dragged.center().y()
+    send(QEvent.Type.MouseButtonPress, view.mousePressEvent, center_x, center_y)
+    app.processEvents()
+
+    drag_frames = []
+    for i in range(frames):
+        offset = 4 if i % 2 else -4
+        start = time.perf_counter()
+        send(QEvent.Type.MouseMove, view.mouseMoveEvent, center_x + offset, center_y + offset)
+        app.processEvents()
+        drag_frames.append(time.perf_counter() - start)
+
+    send(QEvent.Type.MouseButtonRelease, view.mouseReleaseEvent, center_x, center_y)
+    view.close()
+
+    return {
+        'full_frame_ms': statistics.median(full_frames) * 1000,
+        'drag_frame_ms': statistics.median(drag_frames) * 1000,
+        'memory_mb': (memory_after - memory_before) / 2 ** 20,
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the render benchmark
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Compare GameWidget, tiled GameWidget and GameGraphicsView rendering')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 64, 144], help='numbers of rectangles')
+    parser.add_argument('--frames', type=int, default=50, help='number of measured frames per scenario')
+    parser.add_argument('--worker', nargs=2, metavar=('BACKEND', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker[0], int(args.worker[1]), args.frames)))
+        return
+
+    print(f'{"rectangles":>10}{"backend":>9}{"full frame ms":>15}{"drag frame ms":>15}{"memory MB":>11}')
+
+    for size in args.sizes:
+        for backend in BACKENDS:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.RenderBenchmark', '--frames', str(args.frames),
+                 '--worker', backend, str(size)],
+                cwd=SOURCE_DIR, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f'{size:>10}{backend:>9}{result["full_frame_ms"]:>15.3f}{result["drag_frame_ms"]:>15.3f}'
+                  f'{result["memory_mb"]:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Startup benchmark that launches the application with -X importtime, measures the time to the first painted
+frame and reports the slowest imports.
+
+Usage (from the src folder):
+    python -m benchmarks.StartupBenchmark [--runs 10] [--top 15] [-- extra Main.py arguments]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.FirstFrameProbe import FIRST_FRAME_MARKER
+
+SOURCE_DIR: Path = Path(__file__).resolve().parents[1]
+
+
+class ImportRecord(NamedTuple):
+    """
+    Single line of the -X importtime output
+
+    Attributes:
+        name (str): module name
+        depth (int): nesting level of the import, 0 for imports made directly by the script
+        self_us (int): time spent in the module itself in microseconds
+        cumulative_us (int): time spent in the module and its imports in microseconds
+    """
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Parses the -X importtime output written to stderr
+
+    Args:
+        output (str): stderr of the process
+
+    Returns:
+        List[ImportRecord]: import records in output order
+    """
+    records = []
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(ImportRecord(name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    return records
+
+def run_once(main_args: List[str]) -> Tuple[float, List[ImportRecord]]:
+    """
+    Launches Main.py once and waits for its first painted frame
+
+    Args:
+        main_args (List[str]): extra Main.py arguments
+
+    Returns:
+        Tuple[float, List[ImportRecord]]: seconds from launch to the first frame and import records
+
+    Raises:
+        RuntimeError: if the application exited without painting a frame
+    """
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    start = time.perf_counter()
+    with subprocess.Popen([sys.executable, '-X', 'importtime', 'Main.py', '--quit-after-first-frame', *main_args],
+                          cwd=SOURCE_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True) as process:
+        first_frame = None
+
+        for line in process.stdout:
+            if line.strip() == FIRST_FRAME_MARKER:
+                first_frame = time.perf_counter() - start
+                break
+
+        _, stderr = process.communicate()
+
+    if first_frame is None:
+        raise RuntimeError(f'Application exited without painting a frame:\n{stderr}')
+
+    return first_frame, parse_importtime(stderr)
+
+def format_report(first_frames: List[float], runs: List[List[ImportRecord]], top: int) -> str:
+    """
+    Formats the median time to the first frame and the median import times
+
+    Args:
+        first_frames (List[float]): seconds to the first frame of every run
+        runs (List[List[ImportRecord]]): import records of every run
+        top (int): number of modules to list in each table
+
+    Returns:
+        str: report
+    """
+    self_times: Dict[str, List[int]] = {}
+    top_level_times: Dict[str, List[int]] = {}
+
+    for records in runs:
+        for record in records:
+            self_times.setdefault(record.name, []).append(record.self_us)
+            if record.depth == 0:
+                top_level_times.setdefault(record.name, []).append(record.cumulative_us)
+
+    def table(title: str, times: Dict[str, List[int]]) -> List[str]:
+        medians = sorted(((statistics.median(values), name) for name, values in times.items()), reverse=True)
+        return [title] + [f'{median / 1000:>10.2f} ms  {name}' for median, name in medians[:top]]
+
+    lines = [f'time to first frame: median {statistics.median(first_frames) * 1000:.1f} ms, '
+             f'min {min(first_frames) * 1000:.1f} ms over {len(first_frames)} runs',
+             f'imports: median {statistics.median(sum(r.self_us for r in records) for records in runs) / 1000:.1f} ms']
+    lines += table('slowest top-level imports (cumulative):', top_level_times)
+    lines += table('slowest modules (self):', self_times)
+
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the startup benchmark
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Measure application startup and import times')
+    parser.add_argument('--runs', type=int, default=10, help='number of launches')
+    parser.add_argument('--top', type=int, default=15, help='number of modules to list')
+    parser.add_argument('main_args', nargs='*', help='extra Main.py arguments, given after --')
+    args = parser.parse_args(argv)
+
+    first_frames = []
+    runs = []
+
+    for _ in range(args.runs):
+        first_frame, records = run_once(args.main_args)
+        first_frames.append(first_frame)
+        runs.append(records)
+
+    print(format_report(first_frames, runs, args.top))
+
+
+if __name__ == '__main__':
+    main()
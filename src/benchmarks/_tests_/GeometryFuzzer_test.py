@@ -0,0 +1,43 @@
+from src.benchmarks import GeometryFuzzer
+
+
+def find_outermost_rectangle(model, x_coord, y_coord):
+    tree = model.rectangle_trees.get(None)
+    return None if tree is None else next(tree.query(x_coord, y_coord, x_coord + 1, y_coord + 1), None)
+
+
+class TestGeometryFuzzer:
+    def test_accelerated_queries_match_brute_force(self):
+        for seed in range(3):
+            assert GeometryFuzzer.fuzz(seed, 80) is None
+
+    def test_minimizes_first_divergence(self):
+        paths = dict(GeometryFuzzer.QUERY_PATHS)
+        paths['rectangle'] = (find_outermost_rectangle, GeometryFuzzer.reference_find_rectangle)
+
+        divergence = next(filter(None, (GeometryFuzzer.fuzz(seed, 200, paths=paths) for seed in range(10))))
+
+        # a container and a rectangle nested in it are enough to tell the innermost rectangle from the outermost
+        assert [operation[0] for operation in divergence.operations] == ['place', 'place']
+        assert divergence.expected != divergence.actual
+        assert GeometryFuzzer.check_query(GeometryFuzzer.replay(divergence.seed, divergence.operations),
+                                          divergence.query, paths) is not None
+        assert GeometryFuzzer.format_divergence(divergence).count('\n') == 4
+
+    def test_keeps_queried_rectangle_while_minimizing(self):
+        paths = dict(GeometryFuzzer.QUERY_PATHS)
+        paths['port'] = (lambda model, index, x_coord, y_coord, search_all:
+                         GeometryFuzzer.select_and_find_port(model, index, x_coord, y_coord, False),
+                         GeometryFuzzer.reference_find_port)
+
+        divergence = GeometryFuzzer.fuzz(0, 200, paths=paths)
+
+        assert divergence.query[:2] == ('port', 0) and divergence.query[4]
+        assert len(divergence.operations) == 2
+
+    def test_measures_speedup(self):
+        records = GeometryFuzzer.measure_speedup([16, 64], 200)
+
+        assert [(record.size, record.kind) for record in records] == \
+            [(size, kind) for size in (16, 64) for kind in GeometryFuzzer.QUERY_KINDS]
+        assert all(record.fast_us > 0 and record.reference_us > 0 for record in records)
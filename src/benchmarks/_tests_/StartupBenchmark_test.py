@@ -0,0 +1,27 @@
+from src.benchmarks import StartupBenchmark
+
+
+class TestStartupBenchmark:
+    def test_parse_importtime(self):
+        output = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       466 |        466 |   posix',
+            'import time:      1120 |       3876 | site',
+            'import time:       607 |        607 |       utils.Constants',
+            'some unrelated stderr line',
+        ])
+
+        records = StartupBenchmark.parse_importtime(output)
+
+        assert records == [
+            StartupBenchmark.ImportRecord('posix', 1, 466, 466),
+            StartupBenchmark.ImportRecord('site', 0, 1120, 3876),
+            StartupBenchmark.ImportRecord('utils.Constants', 3, 607, 607),
+        ]
+
+    def test_run_once_reaches_first_frame(self):
+        first_frame, records = StartupBenchmark.run_once([])
+
+        assert first_frame > 0
+        assert any(record.name == 'PyQt6.QtWidgets' for record in records)
+        assert not any(record.name.startswith('recording') for record in records)
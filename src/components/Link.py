@@ -1,18 +1,21 @@
 """
 Implementation of the Link component
 """
-import uuid
+from typing import Optional, Tuple
 
-from PyQt6.QtCore import QLine
-from PyQt6.QtGui import QColor
-
-from utils import Constants
+from utils import RandomUtils
 from components.Port import Port
+from geometry.Line import Line
+
+Ends = Tuple[int, int, int, int]
 
 
-class Link(QLine):
+class Link(Line):
     """
-    The Link, child of QLine class, that stores all additional data required for the game
+    The Link, child of Line class, that stores all additional data required for the game.
+    The ends of a link bound to its ports are derived from the ports, lazily, and kept until one of the rectangles
+    of the ports changes its geometry version. An end without a port, e.g. at a rectangle that is not loaded,
+    keeps its own coordinates
 
     Args:
         x1_coord (int): x coordinate of the source port
@@ -22,24 +25,33 @@ class Link(QLine):
         src_id (str): id of the source port object
         dst_id (str): id of the destination port object
         width (int): width of the link
-        color (QColor): color of the link
+        color (str): color name of the link
 
     Attributes:
         id (str): id of this Link object
         src_id (str): id of the source Port object
         dst_id (str): id of the destination Port object
         width (int): width of the link
-        color (QColor): color of the link
+        color (str): color name of the link
+        src (Optional[Port]): source Port object the source end is derived from
+        dst (Optional[Port]): destination Port object the destination end is derived from
+        ends (Ends): last derived ends
+        ends_key (Optional[Tuple[Optional[int], Optional[int]]]): versions of the ports the ends were derived at,
+            None if they have to be derived again
     """
     def __init__(self, x1_coord: int, y1_coord: int, x2_coord: int, y2_coord: int, src_id: str,
-                 dst_id: str, width: int, color: QColor):
+                 dst_id: str, width: int, color: str):
         super().__init__(x1_coord, y1_coord, x2_coord, y2_coord)
 
-        self.id = src_id + ';;' + dst_id + ';;' + str(uuid.uuid4())
+        self.id = src_id + ';;' + dst_id + ';;' + RandomUtils.new_id()
         self.src_id = src_id
         self.dst_id = dst_id
         self.width = width
         self.color = color
+        self.src: Optional[Port] = None
+        self.dst: Optional[Port] = None
+        self.ends: Ends = (x1_coord, y1_coord, x2_coord, y2_coord)
+        self.ends_key: Optional[Tuple[Optional[int], Optional[int]]] = None
 
     @classmethod
     def from_clone(cls, clone, src_id, dst_id):
@@ -60,21 +72,99 @@ class Link(QLine):
                    src_id, dst_id, clone.width, clone.color)
 
     @classmethod
-    def from_ports(cls, src: Port, dst: Port, width: int, color: QColor):
+    def from_ports(cls, src: Port, dst: Port, width: int, color: str):
         """
-        Creates a new instance of the Link using source and destination ports with specified parameters
+        Creates a new instance of the Link bound to the source and destination ports with specified parameters
 
         Args:
             src (Port): source port object
             dst (Port): destination port object
             width (int): width of the link
-            color (QColor): color of the link
+            color (str): color name of the link
 
         Returns: new Link object
         """
-        x1 = int(src.x() + Constants.CIRCLE_RADIUS_PX / 2)
-        y1 = int(src.y() + Constants.CIRCLE_RADIUS_PX / 2)
-        x2 = int(dst.x() + Constants.CIRCLE_RADIUS_PX / 2)
-        y2 = int(dst.y() + Constants.CIRCLE_RADIUS_PX / 2)
+        link = cls(*src.get_link_end(), *dst.get_link_end(), src.id, dst.id, width, color)
+        link.bind(src, dst)
+
+        return link
+
+    def bind(self, src: Optional[Port], dst: Optional[Port]) -> None:
+        """
+        Derives the ends of the link from the given ports from now on, an end whose port is None
+        stays where it is now
+
+        Args:
+            src (Optional[Port]): source port object
+            dst (Optional[Port]): destination port object
+
+        Returns:
+            None
+        """
+        Line.setLine(self, *self.get_ends())
+        self.src = src
+        self.dst = dst
+        self.ends_key = None
+
+    def get_ends(self) -> Ends:
+        """
+        Gets the ends of the link, derived again only if a port has moved since
+
+        Returns:
+            Ends: x and y coordinates of the source and of the destination end
+        """
+        src, dst = self.src, self.dst
+        key = (None if src is None else src.get_version(), None if dst is None else dst.get_version())
+
+        if key != self.ends_key:
+            x1, y1 = (self._x1, self._y1) if src is None else src.get_link_end()
+            x2, y2 = (self._x2, self._y2) if dst is None else dst.get_link_end()
+            self.ends = (x1, y1, x2, y2)
+            self.ends_key = key
+
+        return self.ends
+
+    def x1(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the source end
+        """
+        return self.get_ends()[0]
+
+    def y1(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the source end
+        """
+        return self.get_ends()[1]
+
+    def x2(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the destination end
+        """
+        return self.get_ends()[2]
 
-        return cls(x1, y1, x2, y2, src.id, dst.id, width, color)
+    def y2(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the destination end
+        """
+        return self.get_ends()[3]
+
+    def setLine(self, x1_coord: int, y1_coord: int,  # pylint: disable=invalid-name
+                x2_coord: int, y2_coord: int) -> None:
+        """
+        Sets the ends of the link that are not bound to a port, the bound ends follow their ports
+
+        Args:
+            x1_coord (int): x coordinate of the source end
+            y1_coord (int): y coordinate of the source end
+            x2_coord (int): x coordinate of the destination end
+            y2_coord (int): y coordinate of the destination end
+
+        Returns:
+            None
+        """
+        super().setLine(x1_coord, y1_coord, x2_coord, y2_coord)
+        self.ends_key = None
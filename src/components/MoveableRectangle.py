@@ -1,20 +1,19 @@
 """
 Implementation of the MoveableRectangle component
 """
-import random
-import uuid
-from typing import List
-
-from PyQt6.QtCore import QRect
-from PyQt6.QtGui import QColor
+from typing import List, Tuple
 
 from components.Port import Port
-from utils import Constants
+from geometry.Rect import Rect
+from utils import Constants, RandomUtils
+
+PORT_NORMALS: Tuple[Tuple[int, int], ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
 
 
-class MoveableRectangle(QRect):
+class MoveableRectangle(Rect):
     """
-    The MoveableRectangle, child of QRect class, that stores all additional data required for the game
+    The MoveableRectangle, child of Rect class, that stores all additional data required for the game.
+    Its ports keep only their slot offsets from the top left corner, so a move is a change of the origin alone
 
     Args:
         x_center_coord (int): x coordinate of the center of current object
@@ -24,39 +23,24 @@ class MoveableRectangle(QRect):
 
     Attributes:
         id (str): id of this MoveableRectangle object
-        color (QColor): color of the rectangle
-        ports (List[Port]): list of ports
+        color (str): color name of the rectangle
+        label (str): text shown in the rectangle, empty for none
+        ports (List[Port]): list of ports in the order of the top, right, bottom and left sides,
+            the outward normals of the sides are in PORT_NORMALS
+        geometry_version (int): number of the changes of the position, the size or the port slots,
+            the links derive their ends from the ports again when it changes
     """
     def __init__(self, x_center_coord: int, y_center_coord: int, width: int, height: int):
         super().__init__(int(x_center_coord - width / 2), int(y_center_coord - height / 2), width, height)
 
-        self.id = str(uuid.uuid4())
-        self.color: QColor = QColor(random.choice(Constants.RECTANGLE_COLORS))
+        self.id = RandomUtils.new_id()
+        self.color: str = RandomUtils.choice(Constants.RECTANGLE_COLORS)
+        self.label: str = ''
         self.ports: List[Port] = []
+        self.geometry_version = 0
 
-        self.add_new_port(
-            self.id,
-            int(self.x() + self.width() / 2 - Constants.CIRCLE_RADIUS_PX / 2),
-            int(self.y() - Constants.CIRCLE_RADIUS_PX / 2)
-        )
-
-        self.add_new_port(
-            self.id,
-            int(self.x() + self.width() - Constants.CIRCLE_RADIUS_PX / 2),
-            int(self.y() + self.height() / 2 - Constants.CIRCLE_RADIUS_PX / 2)
-        )
-
-        self.add_new_port(
-            self.id,
-            int(self.x() + self.width() / 2 - Constants.CIRCLE_RADIUS_PX / 2),
-            int(self.y() + self.height() - Constants.CIRCLE_RADIUS_PX / 2)
-        )
-
-        self.add_new_port(
-            self.id,
-            int(self.x() - Constants.CIRCLE_RADIUS_PX / 2),
-            int(self.y() + self.height() / 2 - Constants.CIRCLE_RADIUS_PX / 2)
-        )
+        for port_x, port_y in self.get_port_positions():
+            self.add_new_port(self.id, port_x, port_y)
 
     @classmethod
     def from_clone(cls, clone):
@@ -73,20 +57,86 @@ class MoveableRectangle(QRect):
 
         return cls(clone.center().x(), clone.center().y(), clone.width(), clone.height())
 
-    def update_ports_offset(self, x_offset: int, y_offset: int) -> None:
+    @classmethod
+    def restore(cls, rectangle_id: str, color: str, x_coord: int, y_coord: int, width: int, height: int,
+                port_ids: List[str], label: str = ''):
+        """
+        Creates a new instance of the MoveableRectangle with the given ids, e.g. to restore a saved
+        or a remote rectangle
+
+        Args:
+            rectangle_id (str): id of the rectangle
+            color (str): color name of the rectangle
+            x_coord (int): x coordinate of the top left corner
+            y_coord (int): y coordinate of the top left corner
+            width (int): width of the rectangle
+            height (int): height of the rectangle
+            port_ids (List[str]): ids of the ports in the order they are created
+            label (str): text shown in the rectangle. Default: ''
+
+        Returns: new MoveableRectangle object with the given fields
+        """
+        rectangle = cls(x_coord + width / 2, y_coord + height / 2, width, height)
+        rectangle.id = rectangle_id
+        rectangle.color = color
+        rectangle.label = label
+
+        for port, port_id in zip(rectangle.ports, port_ids):
+            port.id = port_id
+            port.parent_id = rectangle_id
+
+        return rectangle
+
+    def get_port_positions(self) -> List[Tuple[int, int]]:
+        """
+        Gets the positions of the ports in the middle of the top, right, bottom and left sides
+
+        Returns:
+            List[Tuple[int, int]]: x and y coordinates of the ports
+        """
+        return [
+            (int(self.x() + self.width() / 2 - Constants.CIRCLE_RADIUS_PX / 2),
+             int(self.y() - Constants.CIRCLE_RADIUS_PX / 2)),
+            (int(self.x() + self.width() - Constants.CIRCLE_RADIUS_PX / 2),
+             int(self.y() + self.height() / 2 - Constants.CIRCLE_RADIUS_PX / 2)),
+            (int(self.x() + self.width() / 2 - Constants.CIRCLE_RADIUS_PX / 2),
+             int(self.y() + self.height() - Constants.CIRCLE_RADIUS_PX / 2)),
+            (int(self.x() - Constants.CIRCLE_RADIUS_PX / 2),
+             int(self.y() + self.height() / 2 - Constants.CIRCLE_RADIUS_PX / 2)),
+        ]
+
+    def setRect(self, x_coord: int, y_coord: int, width: int, height: int) -> None:  # pylint: disable=invalid-name
+        """
+        Sets the position and size of the rectangle, the ports move with it
+
+        Args:
+            x_coord (int): x coordinate of the top left corner
+            y_coord (int): y coordinate of the top left corner
+            width (int): width of the rectangle
+            height (int): height of the rectangle
+
+        Returns:
+            None
+        """
+        super().setRect(x_coord, y_coord, width, height)
+        self.geometry_version += 1
+
+    def resize(self, width: int, height: int) -> None:
         """
-        Updates the coordinates of ports using new offset values
+        Sets the new size of the rectangle, keeping its top left corner, and lays the ports out on the new sides
 
         Args:
-            x_offset (int): new x coordinate offset
-            y_offset (int): new y coordinate offset
+            width (int): new width of the rectangle
+            height (int): new height of the rectangle
 
         Returns:
             None
         """
-        for port in self.ports:
-            port.setX(port.x() + x_offset)
-            port.setY(port.y() + y_offset)
+        self.setRect(self.x(), self.y(), width, height)
+
+        for port, (port_x, port_y) in zip(self.ports, self.get_port_positions()):
+            port.setX(port_x)
+            port.setY(port_y)
 
     def get_bound_coordinates(self) -> List[int]:
         """
@@ -102,19 +152,38 @@ class MoveableRectangle(QRect):
             self.y() + self.height()
         ]
 
+    def get_alignment_coordinates(self, x_offset: int = 0, y_offset: int = 0) -> Tuple[List[int], List[int]]:
+        """
+        Gets the coordinates of the rectangle edges and center lines that other rectangles can be aligned to
+
+        Args:
+            x_offset (int): x coordinate offset. Default: 0
+            y_offset (int): y coordinate offset. Default: 0
+
+        Returns:
+            Tuple[List[int], List[int]]: x coordinates as follows: [left, center, right]
+            and y coordinates as follows: [top, center, bottom]
+        """
+        left, right, top, bottom = self.get_bound_coordinates()
+
+        return (
+            [left + x_offset, (left + right) // 2 + x_offset, right + x_offset],
+            [top + y_offset, (top + bottom) // 2 + y_offset, bottom + y_offset]
+        )
+
     def add_new_port(self, parent_id:str, port_x: int, port_y: int, port_radius:int=Constants.CIRCLE_RADIUS_PX,
-                     port_color:QColor=Constants.PORT_COLOR) -> None:
+                     port_color:str=Constants.PORT_COLOR) -> None:
         """
-        Updates the coordinates of links that were moved using new offset values
+        Adds a new port at the given position, it keeps its offset from the top left corner when the rectangle moves
 
         Args:
             parent_id (str): parent rectangle id
             port_x (int): x coordinate of the port center
             port_y (int): y coordinate of the port center
             port_radius (int): radius of the port. Default: Constants.CIRCLE_RADIUS_PX
-            port_color (QColor): color of the port. Default: Constants.PORT_COLOR
+            port_color (str): color name of the port. Default: Constants.PORT_COLOR
 
         Returns:
             None
         """
-        self.ports.append(Port(parent_id, port_x, port_y, port_radius, port_color))
+        self.ports.append(Port(parent_id, port_x, port_y, port_radius, port_color, self))
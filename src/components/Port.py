@@ -1,36 +1,51 @@
 """
 Implementation of the Port component
 """
-import uuid
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from PyQt6.QtCore import QPoint
-from PyQt6.QtGui import QColor
+from geometry.Point import Point
+from utils import Constants, RandomUtils
 
+if TYPE_CHECKING:
+    from components.MoveableRectangle import MoveableRectangle
 
-class Port(QPoint):
+
+class Port(Point):
     """
-    The Port, child of QPoint class, that stores all additional data required for the game
+    The Port, child of Point class, that stores all additional data required for the game.
+    A port of a rectangle keeps only its fixed slot offset from the top left corner of the rectangle,
+    so its position is derived from the rectangle and moving the rectangle moves the port for free.
+    A port without a rectangle, e.g. a clone, keeps its own coordinates
 
     Args:
         parent_id (str): id of the parent MoveableRectangle object
         x_coord (int): x coordinate of the center of current object
         y_coord (int): y coordinate of the center of current object
         radius (int): radius of the port
-        color (QColor): color of the port
+        color (str): color name of the port
+        rectangle (Optional[MoveableRectangle]): rectangle the port is on. Default = None
 
     Attributes:
         id (str): id of this Port object
         parent_id (str): id of the parent MoveableRectangle object
         radius (int): radius of the port
-        color (QColor): color of the port
+        color (str): color name of the port
+        rectangle (Optional[MoveableRectangle]): rectangle the port is on
+        version (int): number of the changes of the coordinates of a port without a rectangle
     """
-    def __init__(self, parent_id: str, x_coord: int, y_coord: int, radius: int, color: QColor):
+    def __init__(self, parent_id: str, x_coord: int, y_coord: int, radius: int, color: str,
+                 rectangle: Optional['MoveableRectangle'] = None):
+        if rectangle is not None:
+            x_coord, y_coord = x_coord - rectangle.x(), y_coord - rectangle.y()
+
         super().__init__(x_coord, y_coord)
 
-        self.id = parent_id + '_' + str(uuid.uuid4())
+        self.id = parent_id + '_' + RandomUtils.new_id()
         self.parent_id = parent_id
         self.radius = radius
         self.color = color
+        self.rectangle = rectangle
+        self.version = 0
 
     @classmethod
     def from_clone(cls, clone):
@@ -46,3 +61,79 @@ class Port(QPoint):
             return None
 
         return cls(clone.parent_id, clone.x(), clone.y(), clone.radius, clone.color)
+
+    def x(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the port
+        """
+        if self.rectangle is None:
+            return self._x
+
+        return self.rectangle.x() + self._x
+
+    def y(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the port
+        """
+        if self.rectangle is None:
+            return self._y
+
+        return self.rectangle.y() + self._y
+
+    def setX(self, x_coord: int) -> None:  # pylint: disable=invalid-name
+        """
+        Moves the port to the x coordinate, a port of a rectangle gets a new slot offset
+
+        Args:
+            x_coord (int): new x coordinate
+
+        Returns:
+            None
+        """
+        self._x = x_coord if self.rectangle is None else x_coord - self.rectangle.x()
+        self.touch()
+
+    def setY(self, y_coord: int) -> None:  # pylint: disable=invalid-name
+        """
+        Moves the port to the y coordinate, a port of a rectangle gets a new slot offset
+
+        Args:
+            y_coord (int): new y coordinate
+
+        Returns:
+            None
+        """
+        self._y = y_coord if self.rectangle is None else y_coord - self.rectangle.y()
+        self.touch()
+
+    def touch(self) -> None:
+        """
+        Marks the position of the port as changed, so the ends of its link are derived again
+
+        Returns:
+            None
+        """
+        if self.rectangle is None:
+            self.version += 1
+        else:
+            self.rectangle.geometry_version += 1
+
+    def get_version(self) -> int:
+        """
+        Gets the version of the position of the port, it changes whenever the port moves
+
+        Returns:
+            int: geometry version of the rectangle, or the own version of a port without a rectangle
+        """
+        return self.version if self.rectangle is None else self.rectangle.geometry_version
+
+    def get_link_end(self) -> Tuple[int, int]:
+        """
+        Gets the point in the middle of the port that a link is attached to
+
+        Returns:
+            Tuple[int, int]: x and y coordinates of the link end
+        """
+        return self.x() + Constants.CIRCLE_RADIUS_PX // 2, self.y() + Constants.CIRCLE_RADIUS_PX // 2
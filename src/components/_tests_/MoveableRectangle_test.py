@@ -4,17 +4,21 @@ from src.components.MoveableRectangle import MoveableRectangle
 
 
 class TestMoveableRectangle:
-    def test_update_ports_offset(self):
+    def test_ports_follow_rectangle(self):
         x_offset = 12
         y_offset = 30
         expected_rectangle = MoveableRectangle(100, 100, 100, 50)
+        version = expected_rectangle.geometry_version
 
         expected_coordinates = []
 
         for port in expected_rectangle.ports:
             expected_coordinates.append((port.x() + x_offset, port.y() + y_offset))
 
-        expected_rectangle.update_ports_offset(x_offset, y_offset)
+        expected_rectangle.setRect(expected_rectangle.x() + x_offset, expected_rectangle.y() + y_offset,
+                                   expected_rectangle.width(), expected_rectangle.height())
+
+        assert expected_rectangle.geometry_version > version
 
         for i in range(len(expected_coordinates)):
             port = expected_rectangle.ports[i]
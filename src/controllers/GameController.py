@@ -0,0 +1,470 @@
+"""
+Implementation of the Qt-free game controller
+"""
+from typing import Optional, Tuple
+
+from models.ChangeBus import SELECTION_CHANGED
+from models.GameModel import GameModel
+from models.Subgraph import Subgraph, copy_subgraph, decode_subgraph, encode_subgraph, paste_subgraph
+from utils import Constants
+from utils.MathUtils import is_point_in_circle
+
+
+class GameController:
+    """
+    The GameController that implements the press/move/release/double-click interaction logic on plain
+    coordinates. It does not depend on Qt, so it can drive the GameModel without a QApplication.
+    Every handler returns True if the game field has to be re-painted
+
+    Args:
+        model (GameModel): GameModel object with game data
+
+    Attributes:
+        model (GameModel): GameModel object to hold game data
+        clipboard (Optional[Tuple[str, Subgraph]]): last copied or pasted text with its decoded subgraph,
+            so repeated pastes of the same text are decoded once
+    """
+
+    def __init__(self, model: GameModel):
+        self.model = model
+        self.clipboard: Optional[Tuple[str, Subgraph]] = None
+
+    def move(self, x_coord: int, y_coord: int) -> bool:
+        """
+        Handles the mouse movement logic
+
+        Args:
+            x_coord (int): x coordinate of the mouse position
+            y_coord (int): y coordinate of the mouse position
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        if self.model.x1 <= 0:
+            return False
+
+        new_x2 = x_coord - self.model.x1
+        new_y2 = y_coord - self.model.y1
+
+        if self.model.selection_box is not None:
+            self.model.select_in_box(self.model.x1, self.model.y1, x_coord, y_coord)
+        elif self.model.is_dragging_link:
+            self.model.hovered_port = self.model.find_selected_port(x_coord, y_coord, True)
+
+            self.model.x2 = new_x2
+            self.model.y2 = new_y2
+        elif self.model.resized_size is not None:
+            width = max(self.model.resized_size[0] + new_x2, Constants.RECTANGLE_MIN_WIDTH_PX)
+            height = max(self.model.resized_size[1] + new_y2, Constants.RECTANGLE_MIN_HEIGHT_PX)
+            rectangle = self.model.selected_rectangle
+
+            if (width, height) != (rectangle.width(), rectangle.height()) and \
+                    self.model.can_resize(rectangle, width, height):
+                self.model.resize_rectangle(rectangle, width, height)
+        else:
+            new_x2, new_y2 = self.snap(new_x2, new_y2)
+
+            if not self.model.has_collision(self.model.selected_rectangle, new_x2, new_y2):
+                self.model.x2 = new_x2
+                self.model.y2 = new_y2
+            elif self.model.is_push_enabled:
+                self.push(new_x2, new_y2)
+
+        return True
+
+    def push(self, x_offset: int, y_offset: int) -> None:
+        """
+        Drags the selected rectangle towards the offset along the x axis and then along the y axis,
+        pushing the rectangles in its way as far as the border lets them move
+
+        Args:
+            x_offset (int): x coordinate offset the selected rectangle is dragged to
+            y_offset (int): y coordinate offset the selected rectangle is dragged to
+
+        Returns:
+            None
+        """
+        rectangle = self.model.selected_rectangle
+
+        for distance, is_vertical in ((x_offset - self.model.x2, False), (y_offset - self.model.y2, True)):
+            if not distance:
+                continue
+
+            distance, offsets = self.model.find_pushed_rectangles(rectangle, self.model.x2, self.model.y2,
+                                                                  distance, is_vertical)
+            new_x2 = self.model.x2 + (0 if is_vertical else distance)
+            new_y2 = self.model.y2 + (distance if is_vertical else 0)
+
+            if offsets:
+                self.model.shift_rectangles(offsets)
+
+            if not self.model.has_collision(rectangle, new_x2, new_y2):
+                self.model.x2, self.model.y2 = new_x2, new_y2
+
+    def snap(self, x_offset: int, y_offset: int) -> Tuple[int, int]:
+        """
+        Snaps the drag offset of the selected rectangle if snapping is enabled.
+        The snapped offset is dropped together with the guides if the rectangle collides there
+
+        Args:
+            x_offset (int): x coordinate offset of the selected rectangle
+            y_offset (int): y coordinate offset of the selected rectangle
+
+        Returns:
+            Tuple[int, int]: snapped x and y coordinate offsets, or the given ones
+        """
+        if not self.model.is_grid_snap_enabled and not self.model.is_guide_snap_enabled:
+            return x_offset, y_offset
+
+        snapped_x_offset, snapped_y_offset = self.model.snap_offset(x_offset, y_offset)
+
+        if self.model.has_collision(self.model.selected_rectangle, snapped_x_offset, snapped_y_offset):
+            self.model.vertical_guides, self.model.horizontal_guides = [], []
+            return x_offset, y_offset
+
+        return snapped_x_offset, snapped_y_offset
+
+    def set_snapping(self, is_grid_snap_enabled: bool, is_guide_snap_enabled: bool) -> bool:
+        """
+        Enables or disables snapping of the dragged rectangle
+
+        Args:
+            is_grid_snap_enabled (bool): flag to snap the dragged rectangle to the grid
+            is_guide_snap_enabled (bool): flag to snap the dragged rectangle to the edges of other rectangles
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        self.model.is_grid_snap_enabled = is_grid_snap_enabled
+        self.model.is_guide_snap_enabled = is_guide_snap_enabled
+        self.model.vertical_guides, self.model.horizontal_guides = [], []
+
+        return True
+
+    def set_push(self, is_enabled: bool) -> bool:
+        """
+        Enables or disables pushing the rectangles in the way of the dragged rectangle
+
+        Args:
+            is_enabled (bool): flag to push the rectangles instead of stopping the dragged rectangle
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        self.model.is_push_enabled = is_enabled
+
+        return True
+
+    def set_curved_links(self, is_enabled: bool) -> bool:
+        """
+        Switches the links between straight lines and curves, which also changes how links are hit-tested
+
+        Args:
+            is_enabled (bool): flag to draw and hit-test the links as curves
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        self.model.is_curved_links_enabled = is_enabled
+
+        return True
+
+    def set_compaction(self, is_enabled: bool) -> bool:
+        """
+        Enables or disables the compaction of the rectangles when the game field shrinks
+
+        Args:
+            is_enabled (bool): flag to push the rectangles left and up instead of blocking the shrinking
+
+        Returns:
+            (bool): True if the min size of the game field has to be updated. False otherwise
+        """
+        self.model.is_compaction_enabled = is_enabled
+        self.model.recalculate_min_field_size()
+
+        return True
+
+    def set_label(self, label: str) -> bool:
+        """
+        Sets the text shown in the selected rectangle
+
+        Args:
+            label (str): new text, empty to remove the label
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        if self.model.selected_rectangle is None:
+            return False
+
+        self.model.set_label(self.model.selected_rectangle, label)
+
+        return True
+
+    def get_selection(self) -> Tuple[object, object, object]:
+        """
+        Gets the objects selected by clicking, to notify the subscribers of the game model when they change
+
+        Returns:
+            Tuple[object, object, object]: selected rectangle, port and link
+        """
+        return self.model.selected_rectangle, self.model.selected_port, self.model.selected_link
+
+    def notify_selection(self, previous: Tuple[object, object, object]) -> None:
+        """
+        Emits the selection change if the objects selected by clicking differ from the previous ones
+
+        Args:
+            previous (Tuple[object, object, object]): selection returned by get_selection before the change
+
+        Returns:
+            None
+        """
+        if any(old is not new for old, new in zip(previous, self.get_selection())):
+            self.model.changes.emit(SELECTION_CHANGED)
+
+    def handle_delete_link_button_pressed(self) -> bool:
+        """
+        Handles the case when user pressed delete link button
+
+        Returns:
+            (bool): True if delete button was pressed and press event is handled. False otherwise
+        """
+        if (self.model.selected_link and is_point_in_circle(
+                *self.model.get_link_center(self.model.selected_link),
+                self.model.x1,
+                self.model.y1)
+        ):
+            self.model.remove_link(self.model.selected_link)
+            self.model.selected_link = None
+            return True
+
+        return False
+
+    def handle_link_pressed(self) -> bool:
+        """
+        Handles the case when user pressed link object
+
+        Returns:
+            (bool): True if link was pressed and press event is handled. False otherwise
+        """
+        self.model.selected_link = self.model.find_selected_link(self.model.x1, self.model.y1)
+
+        if self.model.selected_link is not None:
+            self.model.selected_port = None
+            self.model.selected_rectangle = None
+            self.model.is_dragging_link = False
+            return True
+
+        return False
+
+    def handle_port_pressed(self) -> bool:
+        """
+        Handles the case when user pressed port object
+
+        Returns:
+            (bool): True if port was pressed and press event is handled. False otherwise
+        """
+        self.model.selected_port = self.model.find_selected_port(self.model.x1, self.model.y1)
+
+        if (self.model.selected_port is not None
+                and self.model.selected_port.id not in self.model.linked_port_ids):
+            self.model.is_dragging_link = True
+            return True
+
+        self.model.selected_port = None
+        return False
+
+    def handle_resize_handle_pressed(self) -> bool:
+        """
+        Handles the case when user pressed the resize handle in the bottom right corner of the selected rectangle
+
+        Returns:
+            (bool): True if resize handle was pressed and press event is handled. False otherwise
+        """
+        rectangle = self.model.selected_rectangle
+
+        if (rectangle is None or not rectangle.contains(self.model.x1, self.model.y1)
+                or rectangle.x() + rectangle.width() - self.model.x1 > Constants.RESIZE_HANDLE_PX
+                or rectangle.y() + rectangle.height() - self.model.y1 > Constants.RESIZE_HANDLE_PX):
+            return False
+
+        self.model.resized_size = (rectangle.width(), rectangle.height())
+        return True
+
+    def handle_moveable_rectangle_pressed(self) -> bool:
+        """
+        Handles the case when user pressed moveable rectangle object
+
+        Returns:
+            (bool): True if moveable rectangle was pressed and press event is handled. False otherwise
+        """
+        self.model.selected_rectangle = self.model.find_selected_rectangle(self.model.x1, self.model.y1)
+
+        return self.model.selected_rectangle is not None
+
+    def handle_empty_space_pressed(self) -> bool:
+        """
+        Handles the case when user pressed the empty game field: starts the rubber-band selection box
+
+        Returns:
+            (bool): True as the press event is always handled
+        """
+        self.model.select_in_box(self.model.x1, self.model.y1, self.model.x1, self.model.y1)
+        return True
+
+    def press(self, x_coord: int, y_coord: int) -> bool:
+        """
+        Handles the mouse press logic
+
+        Args:
+            x_coord (int): x coordinate of the press position
+            y_coord (int): y coordinate of the press position
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        self.model.x1 = x_coord
+        self.model.y1 = y_coord
+        self.model.clear_box_selection()
+        previous = self.get_selection()
+
+        is_handled = (self.handle_delete_link_button_pressed()
+                      or self.handle_link_pressed()
+                      or self.handle_port_pressed()
+                      or self.handle_resize_handle_pressed()
+                      or self.handle_moveable_rectangle_pressed()
+                      or self.handle_empty_space_pressed())
+        self.notify_selection(previous)
+
+        return is_handled
+
+    def double_click(self, x_coord: int, y_coord: int) -> bool:
+        """
+        Handles the mouse double click logic: adds a new rectangle, as a child if it fits inside the rectangle
+        under the cursor
+
+        Args:
+            x_coord (int): x coordinate of the double click position
+            y_coord (int): y coordinate of the double click position
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        self.model.x1 = x_coord
+        self.model.y1 = y_coord
+
+        selected_link = self.model.find_selected_link(self.model.x1, self.model.y1)
+        selected_port = self.model.find_selected_port(self.model.x1, self.model.y1)
+
+        if selected_link is not None or selected_port is not None:
+            return False
+
+        new_rectangle = self.model.try_add_new_rectangle(self.model.x1, self.model.y1)
+        self.model.x1 = self.model.y1 = 0
+
+        if new_rectangle:
+            previous = self.get_selection()
+            self.model.selected_rectangle = new_rectangle
+            self.notify_selection(previous)
+            return True
+
+        return False
+
+    def release(self) -> bool:
+        """
+        Handles the mouse release logic: applies the dragged offset, creates the dragged link
+        and recalculates the min field size
+
+        Returns:
+            (bool): True if the game field has to be re-painted. False otherwise
+        """
+        if self.model.selected_rectangle and not self.model.is_dragging_link and self.model.resized_size is None:
+            self.model.move_selected_rectangle(self.model.x2, self.model.y2)
+
+        if (self.model.selected_port is not None
+                and self.model.hovered_port is not None
+                and self.model.hovered_port not in self.model.selected_rectangle.ports
+        ):
+            self.model.add_link(self.model.selected_port, self.model.hovered_port)
+
+        self.model.x1 = self.model.x2 = self.model.y1 = self.model.y2 = 0
+        self.model.is_dragging_link = False
+        self.model.resized_size = None
+        self.model.selection_box = None
+        self.model.hovered_port = None
+        self.model.vertical_guides, self.model.horizontal_guides = [], []
+        self.model.recalculate_min_field_size()
+
+        return True
+
+    def resize(self, width: int, height: int) -> bool:
+        """
+        Handles the game field resize logic, the rectangles are compacted into the shrunk game field
+        if the compaction is enabled
+
+        Args:
+            width (int): new width of the game field
+            height (int): new height of the game field
+
+        Returns:
+            (bool): True if the rectangles were compacted and the min size of the game field has to be updated.
+            False otherwise
+        """
+        is_compacted = self.model.is_compaction_enabled and self.model.compact_field(width, height)
+        self.model.resize_field(width, height)
+
+        if is_compacted:
+            self.model.recalculate_min_field_size()
+
+        return is_compacted
+
+    def copy(self) -> Optional[str]:
+        """
+        Copies the box selection, or the selected rectangle if there is no box selection,
+        together with the nested rectangles and the links between them
+
+        Returns:
+            (Optional[str]): encoded subgraph, None if nothing is selected
+        """
+        if self.model.selected_rectangle_ids:
+            rectangles = [rect for rect in self.model.rectangles if rect.id in self.model.selected_rectangle_ids]
+        elif self.model.selected_rectangle is not None:
+            rectangles = [self.model.selected_rectangle]
+        else:
+            return None
+
+        subgraph = copy_subgraph(self.model, rectangles)
+        text = encode_subgraph(subgraph)
+        self.clipboard = (text, subgraph)
+
+        return text
+
+    def paste(self, text: str, x_coord: int, y_coord: int) -> bool:
+        """
+        Pastes the encoded subgraph centered at the given position, if the whole subgraph fits there.
+        The pasted objects become the box selection
+
+        Args:
+            text (str): encoded subgraph
+            x_coord (int): x coordinate of the center of the pasted subgraph
+            y_coord (int): y coordinate of the center of the pasted subgraph
+
+        Returns:
+            (bool): True if the subgraph was pasted and the game field has to be re-painted. False otherwise
+        """
+        if self.clipboard is None or self.clipboard[0] != text:
+            try:
+                self.clipboard = (text, decode_subgraph(text))
+            except ValueError:
+                return False
+
+        subgraph = self.clipboard[1]
+        pasted = paste_subgraph(self.model, subgraph, x_coord - subgraph.width // 2, y_coord - subgraph.height // 2)
+
+        if pasted:
+            previous = self.get_selection()
+            self.model.selected_rectangle = None
+            self.notify_selection(previous)
+
+        return bool(pasted)
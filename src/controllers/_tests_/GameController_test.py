@@ -0,0 +1,259 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src.components.MoveableRectangle import MoveableRectangle
+from src.controllers.GameController import GameController
+from src.models.GameModel import GameModel
+
+
+class TestGameController:
+    def test_core_is_qt_free(self):
+        code = ('import sys; import controllers.GameController, models.GameModel; '
+                'sys.exit(any(name.startswith("PyQt6") for name in sys.modules))')
+        result = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parents[2], check=False)
+
+        assert result.returncode == 0
+
+    def test_double_click(self):
+        controller = GameController(GameModel())
+
+        assert controller.double_click(300, 300)
+        assert len(controller.model.rectangles) == 1
+        assert controller.model.selected_rectangle is controller.model.rectangles[0]
+
+        assert not controller.double_click(300, 300)
+        assert len(controller.model.rectangles) == 1
+
+    def test_drag_rectangle(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        rectangle = controller.model.rectangles[0]
+        expected_x, expected_y = rectangle.x() + 40, rectangle.y() + 20
+        expected_port = (rectangle.ports[0].x() + 40, rectangle.ports[0].y() + 20)
+
+        assert controller.press(300, 300)
+        assert controller.move(340, 320)
+        assert controller.release()
+
+        assert (rectangle.x(), rectangle.y()) == (expected_x, expected_y)
+        assert (rectangle.ports[0].x(), rectangle.ports[0].y()) == expected_port
+        assert controller.model.x1 == controller.model.x2 == 0
+
+    def test_drag_blocked_by_collision(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        controller.double_click(500, 300)
+        rectangle = controller.model.rectangles[0]
+        expected_x = rectangle.x()
+
+        controller.press(300, 300)
+        controller.move(450, 300)
+        controller.release()
+
+        assert rectangle.x() == expected_x
+
+    def test_link_ports_and_delete_link(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        controller.double_click(600, 300)
+        src_port = controller.model.rectangles[0].ports[1]
+        dst_port = controller.model.rectangles[1].ports[3]
+
+        controller.press(300, 300)
+        controller.release()
+        assert controller.press(src_port.x(), src_port.y())
+        assert controller.model.is_dragging_link
+        controller.move(dst_port.x(), dst_port.y())
+        assert controller.model.hovered_port is dst_port
+        controller.release()
+
+        assert len(controller.model.links) == 1
+        assert controller.model.linked_port_ids == [src_port.id, dst_port.id]
+
+        link = controller.model.links[0]
+        link_center = link.center()
+        assert controller.press(link_center.x() - 20, link_center.y())
+        assert controller.model.selected_link is link
+        controller.release()
+
+        assert controller.press(link_center.x(), link_center.y())
+        assert not controller.model.links
+        assert not controller.model.linked_port_ids
+
+    def test_resize(self):
+        controller = GameController(GameModel())
+
+        controller.resize(640, 480)
+
+        assert (controller.model.field_width, controller.model.field_height) == (640, 480)
+
+    def test_resize_compacts_rectangles(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        controller.double_click(900, 600)
+        controller.release()
+
+        assert controller.model.min_field_width > 900
+
+        assert controller.set_compaction(True)
+        assert controller.model.min_field_width < 300
+        assert controller.resize(600, 400)
+
+        rectangle = controller.model.rectangles[1]
+
+        assert (rectangle.x() + rectangle.width(), rectangle.y() + rectangle.height()) == (600, 400)
+        assert not controller.resize(800, 600)
+        assert (rectangle.x() + rectangle.width(), rectangle.y() + rectangle.height()) == (600, 400)
+
+    def test_drag_pushes_rectangles(self):
+        model = GameModel()
+        dragged, first, second, below = (MoveableRectangle(150, 300, 100, 50), MoveableRectangle(260, 300, 100, 50),
+                                         MoveableRectangle(370, 300, 100, 50), MoveableRectangle(550, 400, 100, 50))
+
+        for rectangle in (dragged, first, second, below):
+            model.add_rectangle(rectangle)
+
+        link = model.add_link(first.ports[2], below.ports[0])
+        link_x = link.x1()
+        controller = GameController(model)
+
+        controller.press(150, 300)
+        controller.move(450, 300)
+
+        assert (model.x2, model.y2) == (0, 0)
+
+        assert controller.set_push(True)
+        controller.move(450, 300)
+
+        assert (model.x2, first.x(), second.x(), below.x()) == (300, 500, 600, 500)
+
+        # the chain stops at the border of the game field
+        controller.move(1000, 310)
+        controller.release()
+
+        assert [rect.x() for rect in (dragged, first, second)] == [724, 824, 924]
+        assert [rect.y() for rect in (dragged, first, second)] == [285, 275, 275]
+        assert link.x1() == link_x + 614
+
+    def test_drag_snaps_to_guides(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        controller.double_click(600, 500)
+        anchor, rectangle = controller.model.rectangles
+
+        assert controller.set_snapping(False, True)
+        controller.press(600, 500)
+        controller.move(303, 700)
+        assert controller.model.vertical_guides == anchor.get_alignment_coordinates()[0]
+        controller.release()
+
+        assert rectangle.x() == anchor.x()
+        assert not controller.model.vertical_guides
+
+    def test_resize_and_nest_rectangles(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        container = controller.model.rectangles[0]
+
+        assert controller.press(300, 300)
+        controller.release()
+        assert controller.press(349, 324)
+        assert controller.move(549, 224)
+        controller.release()
+
+        assert (container.width(), container.height()) == (300, 20)
+        assert controller.press(549, 294)
+        assert controller.move(549, 474)
+        controller.release()
+
+        assert (container.x(), container.y(), container.width(), container.height()) == (250, 275, 300, 200)
+        assert controller.double_click(320, 320)
+
+        child = controller.model.selected_rectangle
+
+        assert controller.model.containers[id(child)] is container
+        assert controller.press(320, 320)
+        assert controller.move(320, 520)
+        controller.release()
+
+        assert (child.x(), child.y()) == (270, 495)
+        assert controller.model.containers[id(child)] is None
+        assert controller.press(320, 520)
+        assert controller.move(320, 370)
+        controller.release()
+
+        assert controller.model.containers[id(child)] is container
+        assert controller.press(500, 450)
+        assert controller.move(550, 450)
+        controller.release()
+
+        assert (container.x(), child.x(), child.y()) == (300, 320, 345)
+
+    def test_box_selection(self):
+        controller = GameController(GameModel())
+        controller.double_click(300, 300)
+        controller.double_click(600, 300)
+        controller.double_click(300, 500)
+        first, second, third = controller.model.rectangles
+        link = controller.model.add_link(first.ports[1], second.ports[3])
+
+        assert controller.press(450, 200)
+        assert controller.move(320, 400)
+        assert controller.model.selection_box == (320, 200, 450, 400)
+        assert controller.model.selected_rectangle_ids == {first.id}
+        assert controller.model.selected_link_ids == {link.id}
+
+        assert controller.move(320, 480)
+        controller.release()
+
+        assert controller.model.selection_box is None
+        assert controller.model.selected_rectangle_ids == {first.id, third.id}
+        assert (third.x(), third.y()) == (250, 475)
+
+        controller.press(600, 300)
+
+        assert not controller.model.selected_rectangle_ids and not controller.model.selected_link_ids
+
+    def test_copy_and_paste(self):
+        controller = GameController(GameModel())
+
+        assert controller.copy() is None
+
+        controller.double_click(300, 300)
+        controller.double_click(600, 300)
+        first, second = controller.model.rectangles
+        controller.model.add_link(first.ports[1], second.ports[3])
+        controller.model.select_objects({first.id, second.id}, set())
+        text = controller.copy()
+
+        assert not controller.paste(text, 450, 300)
+        assert not controller.paste('garbage', 450, 600)
+        assert controller.paste(text, 450, 600)
+
+        pasted = controller.model.rectangles[2:]
+
+        assert [(rect.x(), rect.y()) for rect in pasted] == [(250, 575), (550, 575)]
+        assert controller.model.selected_rectangle_ids == {rect.id for rect in pasted}
+        assert len(controller.model.links) == 2
+
+        controller.press(900, 100)
+        assert controller.paste(text, 450, 450)
+        assert len(controller.model.rectangles) == 6
+
+    def test_set_label(self):
+        controller = GameController(GameModel())
+        events = []
+        controller.model.changes.subscribe(events.extend, {'rectangle_relabeled'})
+
+        assert not controller.set_label('ignored')
+
+        controller.double_click(300, 300)
+        rectangle = controller.model.selected_rectangle
+        version = controller.model.version
+
+        assert controller.set_label('x' * 1000)
+        assert rectangle.label == 'x' * 256 and controller.model.version == version + 1
+
+        controller.model.changes.flush()
+        assert [event.item for event in events] == [rectangle]
@@ -0,0 +1,154 @@
+"""
+Implementation of the sampling profiler of the event handlers that writes collapsed stacks for flame graph tools
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+from typing import Iterator, List, Optional, Tuple
+
+from utils import Constants
+
+
+class SamplingProfiler:
+    """
+    The SamplingProfiler that samples the stack of the profiled thread from a background thread, but only
+    while the thread is inside a measured section, e.g. an event handler, so the idle event loop is not recorded.
+    The samples are counted per stack and written in the collapsed format read by flamegraph.pl and speedscope
+
+    Args:
+        interval (float): seconds between the samples. Default = Constants.PROFILER_INTERVAL_MS / 1000
+        thread_id (Optional[int]): identifier of the profiled thread. Default = None - the creating thread
+
+    Attributes:
+        interval (float): seconds between the samples
+        thread_id (int): identifier of the profiled thread
+        stacks (Counter[Tuple[str, ...]]): sample counts by the stack, outermost frame first
+        depth (int): number of the measured sections the profiled thread is inside of
+        stop_event (threading.Event): event that stops the sampling thread
+        thread (Optional[threading.Thread]): sampling thread, None if the capture is not running
+    """
+    def __init__(self, interval: float = Constants.PROFILER_INTERVAL_MS / 1000, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.stacks: Counter[Tuple[str, ...]] = Counter()
+        self.depth = 0
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def is_capturing(self) -> bool:
+        """
+        Checks if the capture is running
+
+        Returns:
+            bool: True if the sampling thread is running. False otherwise
+        """
+        return self.thread is not None
+
+    def start(self) -> None:
+        """
+        Starts the sampling thread, the samples of the previous capture are dropped
+
+        Returns:
+            None
+        """
+        if self.thread is not None:
+            return
+
+        self.stacks.clear()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='SamplingProfiler', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the sampling thread, the samples are kept until the next capture starts
+
+        Returns:
+            None
+        """
+        if self.thread is None:
+            return
+
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """
+        Marks the section of the profiled thread to sample
+
+        Returns:
+            Iterator[None]: context of the section
+        """
+        self.depth += 1
+
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+    def run(self) -> None:
+        """
+        Samples the profiled thread until the capture is stopped
+
+        Returns:
+            None
+        """
+        while not self.stop_event.wait(self.interval):
+            if self.depth > 0:
+                self.sample()
+
+    def sample(self) -> None:
+        """
+        Counts the current stack of the profiled thread
+
+        Returns:
+            None
+        """
+        frame: Optional[FrameType] = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+        stack = []
+
+        while frame is not None:
+            stack.append(f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}')
+            frame = frame.f_back
+
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def get_collapsed(self) -> List[str]:
+        """
+        Gets the samples in the collapsed stack format: the frames joined by semicolons and the sample count
+
+        Returns:
+            List[str]: lines sorted by the stack
+        """
+        return [f'{";".join(stack)} {count}' for stack, count in sorted(self.stacks.items())]
+
+    def write(self, path: str) -> None:
+        """
+        Writes the samples in the collapsed stack format
+
+        Args:
+            path (str): path of the output file
+
+        Returns:
+            None
+        """
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.writelines(f'{line}\n' for line in self.get_collapsed())
+
+def get_profile_path() -> str:
+    """
+    Gets the path to write the profile to: the value of the Constants.PROFILE_ENV_VAR environment variable,
+    or a file named by the current time in the working directory
+
+    Returns:
+        str: path of the collapsed stack file
+    """
+    return os.environ.get(Constants.PROFILE_ENV_VAR) or time.strftime('profile-%Y%m%d-%H%M%S.folded')
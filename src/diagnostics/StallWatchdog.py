@@ -0,0 +1,116 @@
+"""
+Implementation of the watchdog that reports the stalls of the event loop with the stack of the blocked thread
+"""
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Callable, Optional, TextIO
+
+
+class StallWatchdog:
+    """
+    The StallWatchdog that checks from a background thread that the watched thread beats regularly.
+    The event loop beats from a timer, so a missing beat means it is blocked. Once a stall exceeds the threshold,
+    the stack of the watched thread is written with a timestamp, every stall is reported once
+
+    Args:
+        threshold (float): seconds without a beat that count as a stall
+        stream (Optional[TextIO]): stream to report the stalls to. Default = None - sys.stderr
+        thread_id (Optional[int]): identifier of the watched thread. Default = None - the creating thread
+        clock (Callable[[], float]): monotonic clock in seconds. Default = time.monotonic
+
+    Attributes:
+        threshold (float): seconds without a beat that count as a stall
+        stream (TextIO): stream to report the stalls to
+        thread_id (int): identifier of the watched thread
+        clock (Callable[[], float]): monotonic clock in seconds
+        last_beat (float): time of the last beat
+        is_reported (bool): flag if the current stall was reported
+        stall_count (int): number of the reported stalls
+        stop_event (threading.Event): event that stops the watchdog thread
+        thread (Optional[threading.Thread]): watchdog thread, None if it is not running
+    """
+    def __init__(self, threshold: float, stream: Optional[TextIO] = None, thread_id: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.stream = sys.stderr if stream is None else stream
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.clock = clock
+        self.last_beat = clock()
+        self.is_reported = False
+        self.stall_count = 0
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def beat(self) -> None:
+        """
+        Marks the watched thread alive, called by a timer of its event loop
+
+        Returns:
+            None
+        """
+        self.last_beat = self.clock()
+        self.is_reported = False
+
+    def start(self) -> None:
+        """
+        Starts the watchdog thread, it checks four times per threshold
+
+        Returns:
+            None
+        """
+        if self.thread is not None:
+            return
+
+        self.beat()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='StallWatchdog', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the watchdog thread
+
+        Returns:
+            None
+        """
+        if self.thread is None:
+            return
+
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+    def run(self) -> None:
+        """
+        Checks the watched thread until the watchdog is stopped
+
+        Returns:
+            None
+        """
+        while not self.stop_event.wait(self.threshold / 4):
+            self.check()
+
+    def check(self) -> bool:
+        """
+        Reports the stall if the watched thread did not beat for longer than the threshold
+
+        Returns:
+            bool: True if a new stall was reported. False otherwise
+        """
+        stalled = self.clock() - self.last_beat
+
+        if self.is_reported or stalled <= self.threshold:
+            return False
+
+        self.is_reported = True
+        self.stall_count += 1
+        frame = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+        stack = '' if frame is None else ''.join(traceback.format_stack(frame))
+        self.stream.write(f'{datetime.now().isoformat(timespec="milliseconds")} event loop blocked '
+                          f'for {stalled * 1000:.0f} ms\n{stack}')
+        self.stream.flush()
+
+        return True
@@ -0,0 +1,32 @@
+import time
+
+from src.diagnostics.SamplingProfiler import SamplingProfiler
+
+
+def busy_handler(seconds):
+    finish = time.perf_counter() + seconds
+
+    while time.perf_counter() < finish:
+        pass
+
+
+class TestSamplingProfiler:
+    def test_samples_only_measured_sections(self, tmp_path):
+        profiler = SamplingProfiler(0.001)
+        profiler.start()
+        busy_handler(0.05)
+
+        assert not profiler.stacks
+
+        with profiler.measure():
+            busy_handler(0.1)
+
+        profiler.stop()
+        path = tmp_path / 'profile.folded'
+        profiler.write(str(path))
+        lines = path.read_text(encoding='utf-8').splitlines()
+
+        assert lines and not profiler.is_capturing
+        assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+        assert any(line.rsplit(' ', 1)[0].endswith('SamplingProfiler_test.py:busy_handler') for line in lines)
+        assert all('SamplingProfiler_test.py:test_samples_only_measured_sections;' in line for line in lines)
@@ -0,0 +1,39 @@
+import io
+import time
+
+from src.diagnostics.StallWatchdog import StallWatchdog
+
+
+def blocking_handler(seconds):
+    time.sleep(seconds)
+
+
+class TestStallWatchdog:
+    def test_reports_every_stall_once(self):
+        now = [0.0]
+        stream = io.StringIO()
+        watchdog = StallWatchdog(0.5, stream, clock=lambda: now[0])
+
+        now[0] = 0.4
+        assert not watchdog.check()
+
+        now[0] = 0.6
+        assert watchdog.check()
+        now[0] = 2.0
+        assert not watchdog.check()
+
+        watchdog.beat()
+        now[0] = 2.6
+        assert watchdog.check()
+        assert watchdog.stall_count == 2
+        assert stream.getvalue().count('event loop blocked for') == 2
+
+    def test_dumps_blocked_thread_stack(self):
+        stream = io.StringIO()
+        watchdog = StallWatchdog(0.05, stream)
+        watchdog.start()
+        blocking_handler(0.3)
+        watchdog.stop()
+
+        assert watchdog.stall_count == 1
+        assert 'in blocking_handler' in stream.getvalue()
@@ -0,0 +1,298 @@
+"""
+Implementation of the dynamic axis-aligned bounding box tree
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Bounds = Tuple[int, int, int, int]
+
+
+class AabbNode:
+    """
+    Node of the AabbTree. Leaves hold an item, inner nodes hold the union of the bounds of their two children
+
+    Attributes:
+        left (int): left side of the bounds
+        top (int): top side of the bounds
+        right (int): right side of the bounds, exclusive
+        bottom (int): bottom side of the bounds, exclusive
+        item (Any): item of the leaf, None for inner nodes
+        parent (Optional[AabbNode]): parent node
+        child1 (Optional[AabbNode]): first child, None for leaves
+        child2 (Optional[AabbNode]): second child, None for leaves
+        height (int): height of the subtree, 0 for leaves
+    """
+    __slots__ = ('left', 'top', 'right', 'bottom', 'item', 'parent', 'child1', 'child2', 'height')
+
+    def __init__(self, left: int, top: int, right: int, bottom: int, item: Any = None):
+        self.left, self.top, self.right, self.bottom = left, top, right, bottom
+        self.item = item
+        self.parent: Optional[AabbNode] = None
+        self.child1: Optional[AabbNode] = None
+        self.child2: Optional[AabbNode] = None
+        self.height = 0
+
+    def is_leaf(self) -> bool:
+        """
+        Checks if the node is a leaf
+
+        Returns:
+            bool: True if the node holds an item. False otherwise
+        """
+        return self.child1 is None
+
+    def fit(self) -> None:
+        """
+        Sets the bounds and the height of the inner node from its children
+
+        Returns:
+            None
+        """
+        first, second = self.child1, self.child2
+        self.left, self.top = min(first.left, second.left), min(first.top, second.top)
+        self.right, self.bottom = max(first.right, second.right), max(first.bottom, second.bottom)
+        self.height = 1 + max(first.height, second.height)
+
+
+class AabbTree:
+    """
+    The AabbTree that indexes the bounds of items in a balanced binary tree of bounding boxes,
+    so the items overlapping a region are found in logarithmic time. Items are compared by identity,
+    and the bounds are half-open like in has_rectangle_overlap: touching items do not overlap
+
+    Attributes:
+        root (Optional[AabbNode]): root node, None if the tree is empty
+        leaves (Dict[int, AabbNode]): leaves by the identity of their items
+    """
+    def __init__(self):
+        self.root: Optional[AabbNode] = None
+        self.leaves: Dict[int, AabbNode] = {}
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    def __contains__(self, item: Any) -> bool:
+        return id(item) in self.leaves
+
+    def get_bounds(self) -> Optional[Bounds]:
+        """
+        Gets the union of the bounds of all items
+
+        Returns:
+            Optional[Bounds]: left, top, right and bottom sides, None if the tree is empty
+        """
+        if self.root is None:
+            return None
+
+        return self.root.left, self.root.top, self.root.right, self.root.bottom
+
+    def insert(self, item: Any, left: int, top: int, right: int, bottom: int) -> None:
+        """
+        Inserts the item next to the sibling that grows the least by it and re-balances the path to the root
+
+        Args:
+            item (Any): item to insert
+            left (int): left side of the item
+            top (int): top side of the item
+            right (int): right side of the item, exclusive
+            bottom (int): bottom side of the item, exclusive
+
+        Returns:
+            None
+        """
+        leaf = AabbNode(left, top, right, bottom, item)
+        self.leaves[id(item)] = leaf
+
+        if self.root is None:
+            self.root = leaf
+            return
+
+        sibling = self.root
+
+        while not sibling.is_leaf():
+            sibling = min((sibling.child1, sibling.child2), key=lambda node: (
+                max(node.right, right) - min(node.left, left) + max(node.bottom, bottom) - min(node.top, top)
+                - (node.right - node.left + node.bottom - node.top)
+            ))
+
+        parent = AabbNode(0, 0, 0, 0)
+        parent.parent = sibling.parent
+        parent.child1, parent.child2 = sibling, leaf
+        sibling.parent = leaf.parent = parent
+
+        if parent.parent is None:
+            self.root = parent
+        elif parent.parent.child1 is sibling:
+            parent.parent.child1 = parent
+        else:
+            parent.parent.child2 = parent
+
+        self.refit(parent)
+
+    def remove(self, item: Any) -> None:
+        """
+        Removes the item, its sibling takes the place of their parent
+
+        Args:
+            item (Any): item to remove
+
+        Returns:
+            None
+        """
+        leaf = self.leaves.pop(id(item))
+        parent = leaf.parent
+
+        if parent is None:
+            self.root = None
+            return
+
+        sibling = parent.child2 if parent.child1 is leaf else parent.child1
+        sibling.parent = parent.parent
+
+        if parent.parent is None:
+            self.root = sibling
+            return
+
+        if parent.parent.child1 is parent:
+            parent.parent.child1 = sibling
+        else:
+            parent.parent.child2 = sibling
+
+        self.refit(sibling.parent)
+
+    def update(self, item: Any, left: int, top: int, right: int, bottom: int) -> None:
+        """
+        Moves the item to the new bounds
+
+        Args:
+            item (Any): item to move
+            left (int): new left side of the item
+            top (int): new top side of the item
+            right (int): new right side of the item, exclusive
+            bottom (int): new bottom side of the item, exclusive
+
+        Returns:
+            None
+        """
+        self.remove(item)
+        self.insert(item, left, top, right, bottom)
+
+    def translate(self, x_offset: int, y_offset: int) -> None:
+        """
+        Moves all items by the given offset, the shape of the tree does not change
+
+        Args:
+            x_offset (int): x coordinate offset
+            y_offset (int): y coordinate offset
+
+        Returns:
+            None
+        """
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+            node.left, node.right = node.left + x_offset, node.right + x_offset
+            node.top, node.bottom = node.top + y_offset, node.bottom + y_offset
+
+            if not node.is_leaf():
+                stack += (node.child1, node.child2)
+
+    def query(self, left: int, top: int, right: int, bottom: int) -> Iterator[Any]:
+        """
+        Finds the items overlapping the region, only the subtrees whose bounds overlap it are visited,
+        and the leaves of a subtree inside the region are collected without further checks
+
+        Args:
+            left (int): left side of the region
+            top (int): top side of the region
+            right (int): right side of the region, exclusive
+            bottom (int): bottom side of the region, exclusive
+
+        Returns:
+            Iterator[Any]: overlapping items
+        """
+        stack: List[AabbNode] = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if not (node.left < right and left < node.right and node.top < bottom and top < node.bottom):
+                continue
+
+            if node.child1 is None:
+                yield node.item
+            elif left <= node.left and node.right <= right and top <= node.top and node.bottom <= bottom:
+                yield from self.iterate(node)
+            else:
+                stack += (node.child2, node.child1)
+
+    @staticmethod
+    def iterate(node: AabbNode) -> Iterator[Any]:
+        """
+        Iterates over the items of the subtree
+
+        Args:
+            node (AabbNode): root of the subtree
+
+        Returns:
+            Iterator[Any]: items of the leaves
+        """
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+
+            if node.child1 is None:
+                yield node.item
+            else:
+                stack += (node.child2, node.child1)
+
+    def refit(self, node: Optional[AabbNode]) -> None:
+        """
+        Fits the bounds and heights of the node and its ancestors, rotating the unbalanced ones
+
+        Args:
+            node (Optional[AabbNode]): first inner node to fit
+
+        Returns:
+            None
+        """
+        while node is not None:
+            node = self.balance(node)
+            node.fit()
+            node = node.parent
+
+    def balance(self, node: AabbNode) -> AabbNode:
+        """
+        Rotates the higher grandchild of the node up if the heights of the children differ by more than one
+
+        Args:
+            node (AabbNode): inner node to balance, its children must be fitted
+
+        Returns:
+            AabbNode: node that took the place of the given one
+        """
+        first, second = node.child1, node.child2
+
+        if abs(first.height - second.height) <= 1:
+            return node
+
+        higher, lower = (second, first) if second.height > first.height else (first, second)
+        taller, shorter = ((higher.child1, higher.child2) if higher.child1.height >= higher.child2.height
+                           else (higher.child2, higher.child1))
+
+        higher.parent = node.parent
+
+        if node.parent is None:
+            self.root = higher
+        elif node.parent.child1 is node:
+            node.parent.child1 = higher
+        else:
+            node.parent.child2 = higher
+
+        node.child1, node.child2 = lower, shorter
+        shorter.parent, node.parent = node, higher
+        higher.child1, higher.child2 = node, taller
+        node.fit()
+
+        return higher
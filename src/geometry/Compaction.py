@@ -0,0 +1,98 @@
+"""
+Implementation of the one-dimensional constraint-graph compaction of non-overlapping rectangles.
+The functions work on the x axis, swap the axes of the bounds to compact along the y axis
+"""
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+Bounds = Tuple[int, int, int, int]
+
+
+def build_constraint_graph(bounds: Sequence[Bounds]) -> Tuple[List[int], List[List[int]]]:
+    """
+    Builds the visibility graph of the rectangles along the x axis with a sweep line. The sweep visits
+    the rectangles by their left sides and keeps the profile of the bands of the y axis, each owned by
+    the rightmost rectangle visited so far that covers it. A rectangle has to stay right of the owners
+    of the bands it covers; constraints to the rectangles hidden behind them follow transitively
+
+    Args:
+        bounds (Sequence[Bounds]): left, top, right and bottom sides of the rectangles, right and bottom exclusive
+
+    Returns:
+        Tuple[List[int], List[List[int]]]: indexes of the rectangles by their left sides and the indexes of
+        the rectangles every rectangle has to stay right of
+    """
+    order = sorted(range(len(bounds)), key=lambda index: bounds[index][0])
+    band_starts: List[int] = []
+    band_owners: List[Optional[int]] = []
+    predecessors: List[List[int]] = [[] for _ in bounds]
+
+    def split(coord: int) -> None:
+        position = bisect_right(band_starts, coord)
+
+        if position == 0 or band_starts[position - 1] != coord:
+            band_starts.insert(position, coord)
+            band_owners.insert(position, band_owners[position - 1] if position else None)
+
+    for index in order:
+        _, top, _, bottom = bounds[index]
+        split(top)
+        split(bottom)
+        first, last = bisect_left(band_starts, top), bisect_left(band_starts, bottom)
+
+        predecessors[index] = list(dict.fromkeys(owner for owner in band_owners[first:last] if owner is not None))
+        band_starts[first:last] = [top]
+        band_owners[first:last] = [index]
+
+    return order, predecessors
+
+def get_min_extent(bounds: Sequence[Bounds]) -> int:
+    """
+    Gets the smallest right border the rectangles can be compacted to without changing their order,
+    the width of the widest chain of rectangles that have to stay next to each other
+
+    Args:
+        bounds (Sequence[Bounds]): left, top, right and bottom sides of the rectangles
+
+    Returns:
+        int: smallest right border, 0 if there are no rectangles
+    """
+    order, predecessors = build_constraint_graph(bounds)
+    ends = [0] * len(bounds)
+
+    for index in order:
+        left, _, right, _ = bounds[index]
+        ends[index] = max((ends[predecessor] for predecessor in predecessors[index]), default=0) + right - left
+
+    return max(ends, default=0)
+
+def compact(bounds: Sequence[Bounds], extent: int) -> List[int]:
+    """
+    Moves the rectangles left, each only as far as needed so all of them end before the right border,
+    and none passes the rectangles it has to stay right of. Rectangles never move right
+
+    Args:
+        bounds (Sequence[Bounds]): left, top, right and bottom sides of the rectangles
+        extent (int): right border
+
+    Returns:
+        List[int]: new left sides of the rectangles
+
+    Raises:
+        ValueError: if the rectangles can not be compacted before the right border, see get_min_extent
+    """
+    order, predecessors = build_constraint_graph(bounds)
+    caps = [extent] * len(bounds)
+    lefts = [0] * len(bounds)
+
+    for index in reversed(order):
+        left, _, right, _ = bounds[index]
+        lefts[index] = min(left, caps[index] - (right - left))
+
+        if lefts[index] < min(left, 0):
+            raise ValueError(f'rectangles do not fit before {extent}')
+
+        for predecessor in predecessors[index]:
+            caps[predecessor] = min(caps[predecessor], lefts[index])
+
+    return lefts
@@ -0,0 +1,89 @@
+"""
+Implementation of the Qt-free Line primitive
+"""
+from geometry.Point import Point
+
+
+class Line:
+    """
+    The Line, plain Python replacement of QLine that keeps the subset of its API used by the game
+
+    Args:
+        x1_coord (int): x coordinate of the start point. Default: 0
+        y1_coord (int): y coordinate of the start point. Default: 0
+        x2_coord (int): x coordinate of the end point. Default: 0
+        y2_coord (int): y coordinate of the end point. Default: 0
+    """
+    __slots__ = ('_x1', '_y1', '_x2', '_y2')
+
+    def __init__(self, x1_coord: int = 0, y1_coord: int = 0, x2_coord: int = 0, y2_coord: int = 0):
+        self._x1 = x1_coord
+        self._y1 = y1_coord
+        self._x2 = x2_coord
+        self._y2 = y2_coord
+
+    def x1(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the start point
+        """
+        return self._x1
+
+    def y1(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the start point
+        """
+        return self._y1
+
+    def x2(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the end point
+        """
+        return self._x2
+
+    def y2(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the end point
+        """
+        return self._y2
+
+    def center(self) -> Point:
+        """
+        Returns:
+            Point: center point of the line, truncated towards zero as in QLine
+        """
+        return Point(int((self.x1() + self.x2()) / 2), int((self.y1() + self.y2()) / 2))
+
+    def setLine(self, x1_coord: int, y1_coord: int,  # pylint: disable=invalid-name
+                x2_coord: int, y2_coord: int) -> None:
+        """
+        Sets the start and end points of the line
+
+        Args:
+            x1_coord (int): x coordinate of the start point
+            y1_coord (int): y coordinate of the start point
+            x2_coord (int): x coordinate of the end point
+            y2_coord (int): y coordinate of the end point
+
+        Returns:
+            None
+        """
+        self._x1 = x1_coord
+        self._y1 = y1_coord
+        self._x2 = x2_coord
+        self._y2 = y2_coord
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Line):
+            return NotImplemented
+
+        return (self.x1() == other.x1() and self.y1() == other.y1()
+                and self.x2() == other.x2() and self.y2() == other.y2())
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.x1()}, {self.y1()}, {self.x2()}, {self.y2()})'
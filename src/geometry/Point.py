@@ -0,0 +1,67 @@
+"""
+Implementation of the Qt-free Point primitive
+"""
+
+
+class Point:
+    """
+    The Point, plain Python replacement of QPoint that keeps the subset of its API used by the game
+
+    Args:
+        x_coord (int): x coordinate of the point. Default: 0
+        y_coord (int): y coordinate of the point. Default: 0
+    """
+    __slots__ = ('_x', '_y')
+
+    def __init__(self, x_coord: int = 0, y_coord: int = 0):
+        self._x = x_coord
+        self._y = y_coord
+
+    def x(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the point
+        """
+        return self._x
+
+    def y(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the point
+        """
+        return self._y
+
+    def setX(self, x_coord: int) -> None:  # pylint: disable=invalid-name
+        """
+        Sets the x coordinate of the point
+
+        Args:
+            x_coord (int): new x coordinate
+
+        Returns:
+            None
+        """
+        self._x = x_coord
+
+    def setY(self, y_coord: int) -> None:  # pylint: disable=invalid-name
+        """
+        Sets the y coordinate of the point
+
+        Args:
+            y_coord (int): new y coordinate
+
+        Returns:
+            None
+        """
+        self._y = y_coord
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Point):
+            return NotImplemented
+
+        return self.x() == other.x() and self.y() == other.y()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.x()}, {self.y()})'
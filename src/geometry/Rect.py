@@ -0,0 +1,138 @@
+"""
+Implementation of the Qt-free Rect primitive
+"""
+from geometry.Point import Point
+
+
+class Rect:
+    """
+    The Rect, plain Python replacement of QRect that keeps the subset of its API used by the game.
+    Integer semantics follow QRect: right() and bottom() are inclusive, center() truncates towards zero
+
+    Args:
+        x_coord (int): x coordinate of the top left corner. Default: 0
+        y_coord (int): y coordinate of the top left corner. Default: 0
+        width (int): width of the rectangle. Default: 0
+        height (int): height of the rectangle. Default: 0
+    """
+    __slots__ = ('_x', '_y', '_width', '_height')
+
+    def __init__(self, x_coord: int = 0, y_coord: int = 0, width: int = 0, height: int = 0):
+        self._x = x_coord
+        self._y = y_coord
+        self._width = width
+        self._height = height
+
+    def x(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the top left corner
+        """
+        return self._x
+
+    def y(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the top left corner
+        """
+        return self._y
+
+    def width(self) -> int:
+        """
+        Returns:
+            int: width of the rectangle
+        """
+        return self._width
+
+    def height(self) -> int:
+        """
+        Returns:
+            int: height of the rectangle
+        """
+        return self._height
+
+    def left(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the left side
+        """
+        return self._x
+
+    def top(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the top side
+        """
+        return self._y
+
+    def right(self) -> int:
+        """
+        Returns:
+            int: x coordinate of the right side, inclusive as in QRect
+        """
+        return self._x + self._width - 1
+
+    def bottom(self) -> int:
+        """
+        Returns:
+            int: y coordinate of the bottom side, inclusive as in QRect
+        """
+        return self._y + self._height - 1
+
+    def center(self) -> Point:
+        """
+        Returns:
+            Point: center point of the rectangle, truncated towards zero as in QRect
+        """
+        return Point(int((self.left() + self.right()) / 2), int((self.top() + self.bottom()) / 2))
+
+    def contains(self, x_coord: int, y_coord: int) -> bool:
+        """
+        Checks if the point with given coordinates is inside the rectangle or on its edge
+
+        Args:
+            x_coord (int): x coordinate of the point
+            y_coord (int): y coordinate of the point
+
+        Returns:
+            bool: True if the point is inside the rectangle. False otherwise
+        """
+        left, right = self.left(), self.right()
+        if right < left - 1:
+            left, right = right + 1, left - 1
+
+        top, bottom = self.top(), self.bottom()
+        if bottom < top - 1:
+            top, bottom = bottom + 1, top - 1
+
+        return left <= x_coord <= right and top <= y_coord <= bottom
+
+    def setRect(self, x_coord: int, y_coord: int, width: int, height: int) -> None:  # pylint: disable=invalid-name
+        """
+        Sets the position and size of the rectangle
+
+        Args:
+            x_coord (int): x coordinate of the top left corner
+            y_coord (int): y coordinate of the top left corner
+            width (int): width of the rectangle
+            height (int): height of the rectangle
+
+        Returns:
+            None
+        """
+        self._x = x_coord
+        self._y = y_coord
+        self._width = width
+        self._height = height
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Rect):
+            return NotImplemented
+
+        return (self.x() == other.x() and self.y() == other.y()
+                and self.width() == other.width() and self.height() == other.height())
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.x()}, {self.y()}, {self.width()}, {self.height()})'
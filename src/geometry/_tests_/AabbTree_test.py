@@ -0,0 +1,83 @@
+import random
+
+from src.geometry.AabbTree import AabbTree
+
+
+def build_boxes(count, seed=5):
+    generator = random.Random(seed)
+    boxes = {}
+
+    for index in range(count):
+        left, top = generator.randrange(0, 2000), generator.randrange(0, 2000)
+        boxes[index] = (left, top, left + generator.randrange(1, 80), top + generator.randrange(1, 80))
+
+    return boxes
+
+
+def brute_force(boxes, left, top, right, bottom):
+    return sorted(key for key, (box_left, box_top, box_right, box_bottom) in boxes.items()
+                  if box_left < right and left < box_right and box_top < bottom and top < box_bottom)
+
+
+def check_heights(node):
+    if node.is_leaf():
+        return 0
+
+    first, second = check_heights(node.child1), check_heights(node.child2)
+
+    assert abs(first - second) <= 1
+    assert node.child1.parent is node and node.child2.parent is node
+    assert node.height == 1 + max(first, second)
+
+    return node.height
+
+
+class TestAabbTree:
+    def test_query_matches_brute_force(self):
+        boxes = build_boxes(500)
+        keys = {key: [key] for key in boxes}
+        tree = AabbTree()
+
+        for key, box in boxes.items():
+            tree.insert(keys[key], *box)
+
+        generator = random.Random(11)
+
+        for key in generator.sample(sorted(boxes), 200):
+            tree.remove(keys[key])
+            del boxes[key]
+
+        for key in generator.sample(sorted(boxes), 100):
+            left, top = generator.randrange(0, 2000), generator.randrange(0, 2000)
+            boxes[key] = (left, top, left + 50, top + 30)
+            tree.update(keys[key], *boxes[key])
+
+        tree.translate(-100, 40)
+        boxes = {key: (left - 100, top + 40, right - 100, bottom + 40)
+                 for key, (left, top, right, bottom) in boxes.items()}
+
+        for _ in range(100):
+            left, top = generator.randrange(-200, 2000), generator.randrange(0, 2100)
+            region = (left, top, left + generator.randrange(1, 300), top + generator.randrange(1, 300))
+
+            assert sorted(item[0] for item in tree.query(*region)) == brute_force(boxes, *region)
+
+        assert len(tree) == 300
+        assert keys[next(iter(boxes))] in tree
+        assert tree.get_bounds() == (min(box[0] for box in boxes.values()), min(box[1] for box in boxes.values()),
+                                     max(box[2] for box in boxes.values()), max(box[3] for box in boxes.values()))
+
+    def test_stays_balanced(self):
+        tree = AabbTree()
+        items = [[index] for index in range(1024)]
+
+        for index, item in enumerate(items):
+            tree.insert(item, index * 10, 0, index * 10 + 10, 10)
+
+        assert check_heights(tree.root) <= 20
+        assert list(tree.query(10, 0, 20, 10)) == [items[1]]
+
+        for item in items:
+            tree.remove(item)
+
+        assert tree.root is None and tree.get_bounds() is None
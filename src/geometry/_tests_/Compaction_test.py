@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from src.geometry.Compaction import build_constraint_graph, compact, get_min_extent
+
+
+def build_scene(count, seed=3, size=3000):
+    generator = random.Random(seed)
+    bounds = []
+
+    while len(bounds) < count:
+        left, top = generator.randrange(0, size), generator.randrange(0, size)
+        box = (left, top, left + generator.randrange(10, 80), top + generator.randrange(10, 80))
+
+        if not any(has_overlap(box, other) for other in bounds):
+            bounds.append(box)
+
+    return bounds
+
+
+def has_overlap(first, second):
+    return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+
+def has_y_overlap(first, second):
+    return first[1] < second[3] and second[1] < first[3]
+
+
+def move(bounds, lefts):
+    return [(new_left, top, new_left + right - left, bottom) for new_left, (left, top, right, bottom)
+            in zip(lefts, bounds)]
+
+
+class TestCompaction:
+    def test_builds_visibility_graph(self):
+        bounds = [(0, 0, 10, 10), (20, 0, 30, 5), (20, 5, 30, 20), (40, 0, 50, 20), (40, 30, 50, 40)]
+        order, predecessors = build_constraint_graph(bounds)
+
+        assert order == [0, 1, 2, 3, 4]
+        # the third rectangle hides the first one from the fourth, the last one faces nothing
+        assert predecessors == [[], [0], [0], [1, 2], []]
+
+    def test_gets_min_extent(self):
+        bounds = [(100, 0, 110, 10), (200, 0, 230, 5), (300, 5, 340, 20), (400, 0, 410, 20)]
+
+        assert get_min_extent(bounds) == 10 + 40 + 10
+        assert get_min_extent([]) == 0
+
+    def test_moves_rectangles_only_as_far_as_needed(self):
+        bounds = [(0, 0, 10, 10), (50, 0, 60, 10), (100, 0, 110, 10), (100, 20, 110, 30)]
+
+        assert compact(bounds, 200) == [0, 50, 100, 100]
+        assert compact(bounds, 80) == [0, 50, 70, 70]
+        assert compact(bounds, 30) == [0, 10, 20, 20]
+
+        with pytest.raises(ValueError):
+            compact(bounds, 29)
+
+    def test_preserves_order_and_non_overlap(self):
+        for seed in range(5):
+            bounds = build_scene(300, seed, 1000)
+            extent = get_min_extent(bounds)
+            lefts = compact(bounds, extent)
+            moved = move(bounds, lefts)
+
+            assert all(0 <= left and right <= extent for left, _, right, _ in moved)
+            assert all(left <= old_left for left, old_left in zip(lefts, (box[0] for box in bounds)))
+
+            for first in range(len(bounds)):
+                for second in range(first + 1, len(bounds)):
+                    assert not has_overlap(moved[first], moved[second])
+
+                    if has_y_overlap(bounds[first], bounds[second]):
+                        assert (bounds[first][0] < bounds[second][0]) == (moved[first][0] < moved[second][0])
+
+    def test_tracks_live_resize_of_large_scene(self):
+        bounds = build_scene(3000, size=6000)
+        extent = get_min_extent(bounds)
+
+        for width in range(6080, extent, -(6080 - extent) // 10):
+            bounds = move(bounds, compact(bounds, width))
+
+        assert max(right for _, _, right, _ in bounds) <= max(extent, width)
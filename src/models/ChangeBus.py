@@ -0,0 +1,143 @@
+"""
+Implementation of the bus that notifies subscribers about the changes of the game model
+"""
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+RECTANGLE_ADDED: str = 'rectangle_added'
+RECTANGLE_MOVED: str = 'rectangle_moved'
+RECTANGLE_RESIZED: str = 'rectangle_resized'
+RECTANGLE_REMOVED: str = 'rectangle_removed'
+RECTANGLE_RELABELED: str = 'rectangle_relabeled'
+PORT_MOVED: str = 'port_moved'
+LINK_ADDED: str = 'link_added'
+LINK_MOVED: str = 'link_moved'
+LINK_REMOVED: str = 'link_removed'
+SELECTION_CHANGED: str = 'selection_changed'
+FIELD_RESIZED: str = 'field_resized'
+SCENE_TRANSLATED: str = 'scene_translated'
+
+CHANGE_KINDS: FrozenSet[str] = frozenset({
+    RECTANGLE_ADDED, RECTANGLE_MOVED, RECTANGLE_RESIZED, RECTANGLE_REMOVED, RECTANGLE_RELABELED, PORT_MOVED,
+    LINK_ADDED, LINK_MOVED, LINK_REMOVED, SELECTION_CHANGED, FIELD_RESIZED, SCENE_TRANSLATED,
+})
+
+
+class ChangeEvent(NamedTuple):
+    """
+    Change of the game model
+
+    Attributes:
+        kind (str): kind of the change, one of CHANGE_KINDS
+        item (Any): changed rectangle, port or link, None for the changes of the selection, the field and the scene
+    """
+    kind: str
+    item: Any = None
+
+
+ChangeCallback = Callable[[List[ChangeEvent]], None]
+
+
+class ChangeBus:
+    """
+    The ChangeBus that delivers typed change events of the game model to subscribers. Events are queued and
+    coalesced until the end of the event loop tick: every item is reported once per kind, at the position of
+    its last change, so a rectangle dragged over many mouse moves of one tick is reported moved once.
+    Events of kinds nobody subscribed to are dropped right away, so an unobserved game model pays one set lookup
+
+    Args:
+        schedule (Optional[Callable[[Callable[[], None]], None]]): function that calls the given function
+            on the next tick of the event loop. Default = None - the owner calls flush
+
+    Attributes:
+        schedule (Optional[Callable[[Callable[[], None]], None]]): function that schedules the next flush
+        subscribers (List[Tuple[ChangeCallback, Optional[FrozenSet[str]]]]): callbacks with the kinds
+            they receive, None for every kind
+        kinds (Set[str]): kinds at least one subscriber receives
+        pending (Dict[Tuple[str, int], ChangeEvent]): queued events by their kind and item identity,
+            in the order of their last change
+        is_scheduled (bool): flag if the flush is scheduled
+    """
+    def __init__(self, schedule: Optional[Callable[[Callable[[], None]], None]] = None):
+        self.schedule = schedule
+        self.subscribers: List[Tuple[ChangeCallback, Optional[FrozenSet[str]]]] = []
+        self.kinds: Set[str] = set()
+        self.pending: Dict[Tuple[str, int], ChangeEvent] = {}
+        self.is_scheduled = False
+
+    def subscribe(self, callback: ChangeCallback, kinds: Optional[Iterable[str]] = None) -> None:
+        """
+        Subscribes the callback to the events of the given kinds, it receives the coalesced events of every tick
+
+        Args:
+            callback (ChangeCallback): function that receives the list of events
+            kinds (Optional[Iterable[str]]): kinds of the events to receive. Default = None - every kind
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if a kind is unknown
+        """
+        kinds = None if kinds is None else frozenset(kinds)
+
+        if kinds is not None and not kinds <= CHANGE_KINDS:
+            raise ValueError(f'unknown change kinds: {", ".join(sorted(kinds - CHANGE_KINDS))}')
+
+        self.subscribers.append((callback, kinds))
+        self.kinds.update(CHANGE_KINDS if kinds is None else kinds)
+
+    def unsubscribe(self, callback: ChangeCallback) -> None:
+        """
+        Removes every subscription of the callback
+
+        Args:
+            callback (ChangeCallback): subscribed function
+
+        Returns:
+            None
+        """
+        self.subscribers = [(subscriber, kinds) for subscriber, kinds in self.subscribers if subscriber != callback]
+        self.kinds = {kind for _, kinds in self.subscribers for kind in (CHANGE_KINDS if kinds is None else kinds)}
+
+    def emit(self, kind: str, item: Any = None) -> None:
+        """
+        Queues the event and schedules the flush if it is the first event of the tick
+
+        Args:
+            kind (str): kind of the change
+            item (Any): changed item. Default = None
+
+        Returns:
+            None
+        """
+        if kind not in self.kinds:
+            return
+
+        key = (kind, id(item))
+        self.pending.pop(key, None)
+        self.pending[key] = ChangeEvent(kind, item)
+
+        if not self.is_scheduled and self.schedule is not None:
+            self.is_scheduled = True
+            self.schedule(self.flush)
+
+    def flush(self) -> None:
+        """
+        Delivers the queued events to the subscribers of their kinds. Events emitted by the subscribers
+        are delivered by the next flush
+
+        Returns:
+            None
+        """
+        self.is_scheduled = False
+
+        if not self.pending:
+            return
+
+        events, self.pending = list(self.pending.values()), {}
+
+        for callback, kinds in list(self.subscribers):
+            received = events if kinds is None else [event for event in events if event.kind in kinds]
+
+            if received:
+                callback(received)
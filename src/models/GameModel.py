@@ -1,17 +1,29 @@
 """
 Implementation of the main game model
 """
-from typing import Optional, List, Dict
-
-from PyQt6.QtCore import Qt, QPoint
-from PyQt6.QtGui import QPolygon
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+from itertools import islice
+from typing import Optional, List, Dict, Iterator, Set, Tuple, TYPE_CHECKING
 
 from components.Link import Link
 from components.MoveableRectangle import MoveableRectangle
 from components.Port import Port
+from geometry.AabbTree import AabbTree
+from geometry.Compaction import compact, get_min_extent
+from models.ChangeBus import (FIELD_RESIZED, LINK_ADDED, LINK_MOVED, LINK_REMOVED, PORT_MOVED, RECTANGLE_ADDED,
+                              RECTANGLE_MOVED, RECTANGLE_RELABELED, RECTANGLE_REMOVED, RECTANGLE_RESIZED,
+                              SCENE_TRANSLATED, SELECTION_CHANGED, ChangeBus)
 from utils import Constants
-from utils.MathUtils import has_collision, is_point_in_circle
+from utils.MathUtils import (has_border_collision, has_segment_overlap, is_point_in_circle, is_point_in_polygon,
+                             is_rectangle_inside)
+
+if TYPE_CHECKING:
+    from persistence.ModelJournal import ModelJournal
+    from rendering.LinkPathCache import LinkPathCache
 
+VERTICAL_EDGE_NAMES: Tuple[str, str, str] = ('left', 'center_x', 'right')
+HORIZONTAL_EDGE_NAMES: Tuple[str, str, str] = ('top', 'center_y', 'bottom')
 
 class GameModel:
     """
@@ -31,6 +43,8 @@ class GameModel:
         rectangles (List[MoveableRectangle]): list of moveable rectangle objects
         links (List[Link]): list of link objects
         linked_port_ids (List[str]): list of port ids that were linked
+        ports_by_id (Dict[str, Port]): ports of the rectangles in the game model by id, the links are bound to them
+        port_links (Dict[str, Link]): link of every linked port by port id
         selected_rectangle (Optional[MoveableRectangle]): selected moveable rectangle object
         selected_port (Optional[Port]): selected port object
         hovered_port (Optional[Port]): hovered port object
@@ -39,6 +53,33 @@ class GameModel:
         y1 (int): y coordinate of the initial click position
         x2 (int): x coordinate of the moving mouse position
         y2 (int): y coordinate of the moving mouse position
+        version (int): counter that is incremented by every mutation method of the game model
+        edge_indexes (Dict[str, List[Tuple[int, str]]]): sorted (coordinate, rectangle id) pairs for every
+            edge and center line name from VERTICAL_EDGE_NAMES and HORIZONTAL_EDGE_NAMES
+        is_grid_snap_enabled (bool): flag to snap the dragged rectangle to the grid
+        is_guide_snap_enabled (bool): flag to snap the dragged rectangle to the edges of other rectangles
+        vertical_guides (List[int]): x coordinates of the alignment guides of the dragged rectangle
+        horizontal_guides (List[int]): y coordinates of the alignment guides of the dragged rectangle
+        journal (Optional[ModelJournal]): journal to log rectangle and link mutations to
+        is_curved_links_enabled (bool): flag to draw the links as curves leaving their ports along the side normals
+        link_paths (Optional[LinkPathCache]): cache of the drawn link paths to hit-test the curved links with
+        resized_size (Optional[Tuple[int, int]]): size of the selected rectangle when its resize started,
+            None if it is not resized
+        containers (Dict[int, Optional[MoveableRectangle]]): container of every rectangle by its identity,
+            None for the rectangles on the game field
+        rectangle_trees (Dict[Optional[int], AabbTree]): bounding volume hierarchies of the children of every
+            container by its identity, None for the rectangles on the game field
+        link_tree (AabbTree): bounding volume hierarchy of the links, see get_link_bounds
+        selection_box (Optional[Tuple[int, int, int, int]]): left, top, right and bottom sides of the rubber-band
+            selection box while it is dragged, None otherwise
+        selected_rectangle_ids (Set[str]): ids of the rectangles selected with the selection box
+        selected_link_ids (Set[str]): ids of the links selected with the selection box
+        selection_version (int): counter that is incremented whenever the box selection changes
+        changes (ChangeBus): bus that notifies subscribers about the changes of the scene, the selection and the field
+        is_compaction_enabled (bool): flag to push the rectangles left and up when the game field shrinks
+            instead of blocking the shrinking
+        is_push_enabled (bool): flag to push the rectangles in the way of the dragged rectangle
+            instead of stopping it
     """
     def __init__(self, clone=None):
         self.window_x = Constants.START_COORDINATES[0] if clone is None else clone.window_x
@@ -67,14 +108,20 @@ class GameModel:
 
         if clone and len(clone.links):
             for clone_link in clone.links:
-                new_link = Link.from_clone(clone_link, ports_map[clone_link.src_id], ports_map[clone_link.src_id])
+                new_link = Link.from_clone(clone_link, ports_map[clone_link.src_id], ports_map[clone_link.dst_id])
                 self.links.append(new_link)
 
         self.linked_port_ids: List[str] = []
+        self.ports_by_id: Dict[str, Port] = {port.id: port for rectangle in self.rectangles
+                                             for port in rectangle.ports}
+        self.port_links: Dict[str, Link] = {}
 
         for link in self.links:
             self.linked_port_ids.append(link.src_id)
             self.linked_port_ids.append(link.dst_id)
+            self.port_links.setdefault(link.src_id, link)
+            self.port_links.setdefault(link.dst_id, link)
+            self.bind_link(link)
 
         self.selected_rectangle: Optional[MoveableRectangle] = \
             None if clone is None else MoveableRectangle.from_clone(clone.selected_rectangle)
@@ -97,6 +144,43 @@ class GameModel:
         self.y1 = 0 if clone is None else clone.y1
         self.y2 = 0 if clone is None else clone.y2
 
+        self.version = 0
+
+        self.edge_indexes: Dict[str, List[Tuple[int, str]]] = {
+            name: [] for name in VERTICAL_EDGE_NAMES + HORIZONTAL_EDGE_NAMES
+        }
+        self.containers: Dict[int, Optional[MoveableRectangle]] = {}
+        self.rectangle_trees: Dict[Optional[int], AabbTree] = {}
+
+        for rectangle in self.rectangles:
+            self.index_rectangle_edges(rectangle)
+            self.index_rectangle(rectangle)
+
+        self.link_tree = AabbTree()
+
+        for link in self.links:
+            self.index_link(link)
+
+        self.is_grid_snap_enabled: bool = False if clone is None else clone.is_grid_snap_enabled
+        self.is_guide_snap_enabled: bool = False if clone is None else clone.is_guide_snap_enabled
+        self.vertical_guides: List[int] = []
+        self.horizontal_guides: List[int] = []
+
+        self.journal: Optional['ModelJournal'] = None
+
+        self.is_curved_links_enabled: bool = False if clone is None else clone.is_curved_links_enabled
+        self.link_paths: Optional['LinkPathCache'] = None
+        self.resized_size: Optional[Tuple[int, int]] = None
+
+        self.selection_box: Optional[Tuple[int, int, int, int]] = None
+        self.selected_rectangle_ids: Set[str] = set()
+        self.selected_link_ids: Set[str] = set()
+        self.selection_version = 0
+
+        self.changes = ChangeBus()
+        self.is_compaction_enabled: bool = False if clone is None else clone.is_compaction_enabled
+        self.is_push_enabled: bool = False if clone is None else clone.is_push_enabled
+
     def try_add_new_rectangle(self, x_coord: int, y_coord: int) -> Optional[MoveableRectangle]:
         """
         Tries to add new MoveableRectangle object to the game model with center at (x_coord, y_coord)
@@ -112,15 +196,42 @@ class GameModel:
         temp_rectangle = MoveableRectangle(x_coord, y_coord, Constants.RECTANGLE_WIDTH_PX,
                                            Constants.RECTANGLE_HEIGHT_PX)
 
-        if not has_collision(temp_rectangle, self.rectangles, self.field_width, self.field_height):
-            self.rectangles.append(temp_rectangle)
+        if not self.has_collision(temp_rectangle):
+            self.add_rectangle(temp_rectangle)
             return temp_rectangle
 
         return None
 
+    def add_rectangle(self, rectangle: MoveableRectangle) -> None:
+        """
+        Adds the MoveableRectangle object to the game model without collision checks
+
+        Args:
+            rectangle (MoveableRectangle): rectangle object to add
+
+        Returns:
+            None
+        """
+        self.rectangles.append(rectangle)
+        self.index_rectangle_edges(rectangle)
+        self.index_rectangle(rectangle)
+
+        for port in rectangle.ports:
+            self.ports_by_id[port.id] = port
+
+            if port.id in self.port_links:
+                self.bind_link(self.port_links[port.id])
+
+        self.version += 1
+        self.changes.emit(RECTANGLE_ADDED, rectangle)
+
+        if self.journal:
+            self.journal.record_rectangle_added(rectangle)
+
     def find_selected_rectangle(self, x_coord: int, y_coord: int) -> Optional[MoveableRectangle]:
         """
-        Tries to find the MoveableRectangle object from the game model at coordinates (x_coord, y_coord)
+        Tries to find the MoveableRectangle object from the game model at coordinates (x_coord, y_coord).
+        The hierarchy is descended through the containers at the point, so the innermost rectangle is found
 
         Args:
             x_coord (int): x coordinate of the click position
@@ -129,11 +240,19 @@ class GameModel:
         Returns:
             Optional[MoveableRectangle]: MoveableRectangle object if rectangle was found. None otherwise
         """
-        for rectangle in self.rectangles:
-            if rectangle.contains(x_coord, y_coord):
-                return rectangle
+        found = None
+        tree = self.rectangle_trees.get(None)
 
-        return None
+        while tree is not None:
+            rectangle = next(tree.query(x_coord, y_coord, x_coord + 1, y_coord + 1), None)
+
+            if rectangle is None:
+                break
+
+            found = rectangle
+            tree = self.rectangle_trees.get(id(rectangle))
+
+        return found
 
     def find_selected_port(self, x_coord: int, y_coord: int,
                            search_all: bool=False) -> Optional[Port]:
@@ -176,28 +295,121 @@ class GameModel:
         Returns:
             Optional[Link]: Link object if link was found. None otherwise
         """
+        if self.is_curved_links_enabled and self.link_paths is not None:
+            return next((link for link in self.links if self.link_paths.contains(link, x_coord, y_coord)), None)
+
         for link in self.links:
-            src_x, src_y = link.x1(), link.y1()
-            dst_x, dst_y = link.x2(), link.y2()
-            link_polygon = QPolygon([
-                QPoint(int(src_x + Constants.LINK_WIDTH_PX), int(src_y - Constants.LINK_WIDTH_PX)),
-                QPoint(int(dst_x + Constants.LINK_WIDTH_PX), int(dst_y - Constants.LINK_WIDTH_PX)),
-                QPoint(int(dst_x - Constants.LINK_WIDTH_PX), int(dst_y + Constants.LINK_WIDTH_PX)),
-                QPoint(int(src_x - Constants.LINK_WIDTH_PX), int(src_y + Constants.LINK_WIDTH_PX))
-            ])
-
-            if link_polygon.containsPoint(QPoint(x_coord, y_coord), Qt.FillRule.WindingFill):
+            src_x, src_y, dst_x, dst_y = link.get_ends()
+            link_polygon = (
+                (int(src_x + Constants.LINK_WIDTH_PX), int(src_y - Constants.LINK_WIDTH_PX)),
+                (int(dst_x + Constants.LINK_WIDTH_PX), int(dst_y - Constants.LINK_WIDTH_PX)),
+                (int(dst_x - Constants.LINK_WIDTH_PX), int(dst_y + Constants.LINK_WIDTH_PX)),
+                (int(src_x - Constants.LINK_WIDTH_PX), int(src_y + Constants.LINK_WIDTH_PX))
+            )
+
+            if is_point_in_polygon(link_polygon, x_coord, y_coord):
                 return link
 
         return None
 
-    def update_links_offset(self, x_offset: int, y_offset: int) -> None:
+    def get_link_center(self, link: Link) -> Tuple[float, float]:
+        """
+        Gets the middle point of the link as it is drawn, where its delete button is
+
+        Args:
+            link (Link): link to get the middle point of
+
+        Returns:
+            Tuple[float, float]: x and y coordinates of the middle point
+        """
+        if self.is_curved_links_enabled and self.link_paths is not None:
+            return self.link_paths.get_center(link)
+
+        return link.center().x(), link.center().y()
+
+    def add_link(self, src: Port, dst: Port, link_id: Optional[str] = None) -> Link:
+        """
+        Creates a new Link object between the given ports and adds it to the game model
+
+        Args:
+            src (Port): source port object
+            dst (Port): destination port object
+            link_id (Optional[str]): id of the link, e.g. to restore a saved or a remote link. Default = None
+
+        Returns:
+            Link: created Link object
+        """
+        link = Link.from_ports(src, dst, Constants.LINK_WIDTH_PX, Constants.LINK_COLOR)
+
+        if link_id is not None:
+            link.id = link_id
+
+        self.attach_link(link)
+
+        return link
+
+    def attach_link(self, link: Link) -> None:
+        """
+        Adds the created Link object to the game model, its ports do not have to be in the game model,
+        e.g. for a link to a rectangle that is not loaded
+
+        Args:
+            link (Link): link object to add
+
+        Returns:
+            None
+        """
+        self.links.append(link)
+        self.linked_port_ids.append(link.src_id)
+        self.linked_port_ids.append(link.dst_id)
+        self.port_links.setdefault(link.src_id, link)
+        self.port_links.setdefault(link.dst_id, link)
+        self.bind_link(link)
+        self.index_link(link)
+        self.version += 1
+        self.changes.emit(LINK_ADDED, link)
+
+        if self.journal:
+            self.journal.record_link_added(link)
+
+    def remove_link(self, link: Link) -> None:
         """
-        Updates the coordinates of links that were moved using new offset values
+        Removes the given Link object from the game model and releases its ports
 
         Args:
-            x_offset (int): new x coordinate offset
-            y_offset (int): new y coordinate offset
+            link (Link): link object to remove
+
+        Returns:
+            None
+        """
+        self.links.remove(link)
+        self.linked_port_ids.remove(link.src_id)
+        self.linked_port_ids.remove(link.dst_id)
+
+        for port_id in (link.src_id, link.dst_id):
+            if self.port_links.get(port_id) is link:
+                del self.port_links[port_id]
+
+        if link in self.link_tree:
+            self.link_tree.remove(link)
+        if link.id in self.selected_link_ids:
+            self.selected_link_ids.discard(link.id)
+            self.selection_version += 1
+            self.changes.emit(SELECTION_CHANGED)
+
+        self.version += 1
+        self.changes.emit(LINK_REMOVED, link)
+
+        if self.journal:
+            self.journal.record_link_removed(link)
+
+    def move_selected_rectangle(self, x_offset: int, y_offset: int) -> None:
+        """
+        Moves the selected rectangle together with its ports and links by the given offset
+
+        Args:
+            x_offset (int): x coordinate offset
+            y_offset (int): y coordinate offset
 
         Returns:
             None
@@ -205,32 +417,1047 @@ class GameModel:
         if self.selected_rectangle is None:
             return
 
+        self.move_rectangle(self.selected_rectangle, x_offset, y_offset)
+
+    def move_rectangle(self, rectangle: MoveableRectangle, x_offset: int, y_offset: int) -> None:
+        """
+        Moves the given rectangle together with its children, their ports and links by the given offset.
+        The rectangle joins the container it is moved into
+
+        Args:
+            rectangle (MoveableRectangle): rectangle object to move
+            x_offset (int): x coordinate offset
+            y_offset (int): y coordinate offset
+
+        Returns:
+            None
+        """
+        container = self.containers.get(id(rectangle))
+        tree = self.rectangle_trees.get(self.get_tree_key(container))
+
+        if tree is not None and rectangle in tree:
+            tree.remove(rectangle)
+
+        moved = self.offset_subtree(rectangle, x_offset, y_offset)
+
+        self.index_port_links([port.id for moved_rectangle in moved for port in moved_rectangle.ports])
+        self.index_rectangle(rectangle)
+
+        if self.containers.get(id(rectangle)) is not container and self.containers.get(id(rectangle)) is not None:
+            self.raise_rectangles([rectangle])
+
+        self.version += 1
+
+        if self.journal:
+            for moved_rectangle in moved:
+                self.journal.record_rectangle_moved(moved_rectangle)
+
+    def shift_rectangles(self, offsets: List[Tuple[MoveableRectangle, int, int]]) -> None:
+        """
+        Moves many rectangles together with their children, ports and links at once, updating every link once.
+        The rectangles must keep their containers, e.g. when the game field is compacted
+
+        Args:
+            offsets (List[Tuple[MoveableRectangle, int, int]]): rectangles with their x and y coordinate offsets
+
+        Returns:
+            None
+        """
+        moved = []
+
+        for rectangle, x_offset, y_offset in offsets:
+            moved += self.offset_subtree(rectangle, x_offset, y_offset)
+            self.rectangle_trees[self.get_tree_key(self.containers.get(id(rectangle)))].update(
+                rectangle, *self.get_tree_bounds(rectangle))
+
+        self.index_port_links([port.id for moved_rectangle in moved for port in moved_rectangle.ports])
+        self.version += 1
+
+        if self.journal:
+            for moved_rectangle in moved:
+                self.journal.record_rectangle_moved(moved_rectangle)
+
+    def offset_subtree(self, rectangle: MoveableRectangle, x_offset: int, y_offset: int) -> List[MoveableRectangle]:
+        """
+        Moves the rectangle and its descendants with their edge indexes and the hierarchies of their children
+        by the given offset, the ports follow their rectangles, the hierarchy the rectangle itself is in
+        and the index of the links are left to the caller
+
+        Args:
+            rectangle (MoveableRectangle): root of the moved subtree
+            x_offset (int): x coordinate offset
+            y_offset (int): y coordinate offset
+
+        Returns:
+            List[MoveableRectangle]: moved rectangles
+        """
+        moved = self.get_subtree(rectangle)
+
+        for moved_rectangle in moved:
+            self.unindex_rectangle_edges(moved_rectangle)
+            moved_rectangle.setRect(moved_rectangle.x() + x_offset, moved_rectangle.y() + y_offset,
+                                    moved_rectangle.width(), moved_rectangle.height())
+            self.index_rectangle_edges(moved_rectangle)
+            self.emit_rectangle_change(RECTANGLE_MOVED, moved_rectangle)
+
+            if id(moved_rectangle) in self.rectangle_trees:
+                self.rectangle_trees[id(moved_rectangle)].translate(x_offset, y_offset)
+
+        return moved
+
+    def resize_rectangle(self, rectangle: MoveableRectangle, width: int, height: int) -> None:
+        """
+        Sets the new size of the given rectangle, keeping its top left corner, and moves its ports and links
+
+        Args:
+            rectangle (MoveableRectangle): rectangle object to resize
+            width (int): new width of the rectangle
+            height (int): new height of the rectangle
+
+        Returns:
+            None
+        """
+        tree = self.rectangle_trees.get(self.get_tree_key(self.containers.get(id(rectangle))))
+
+        if tree is not None and rectangle in tree:
+            tree.remove(rectangle)
+
+        self.unindex_rectangle_edges(rectangle)
+        rectangle.resize(width, height)
+        self.index_rectangle_edges(rectangle)
+        self.index_rectangle(rectangle)
+
+        self.index_port_links([port.id for port in rectangle.ports])
+
+        self.version += 1
+        self.emit_rectangle_change(RECTANGLE_RESIZED, rectangle)
+
+        if self.journal:
+            self.journal.record_rectangle_resized(rectangle)
+
+    def set_label(self, rectangle: MoveableRectangle, label: str) -> None:
+        """
+        Sets the text shown in the rectangle, cut to Constants.LABEL_MAX_LENGTH characters
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to label
+            label (str): new text, empty to remove the label
+
+        Returns:
+            None
+        """
+        rectangle.label = label[:Constants.LABEL_MAX_LENGTH]
+        self.version += 1
+        self.changes.emit(RECTANGLE_RELABELED, rectangle)
+
+        if self.journal:
+            self.journal.record_rectangle_relabeled(rectangle)
+
+    def remove_rectangle(self, rectangle: MoveableRectangle) -> None:
+        """
+        Removes the given rectangle together with its links from the game model
+
+        Args:
+            rectangle (MoveableRectangle): rectangle object to remove
+
+        Returns:
+            None
+        """
+        port_ids = {port.id for port in rectangle.ports}
+
+        for link in [link for link in self.links if link.src_id in port_ids or link.dst_id in port_ids]:
+            self.remove_link(link)
+
+        if self.selected_rectangle is rectangle:
+            self.selected_rectangle = None
+            self.selected_port = None
+        if rectangle.id in self.selected_rectangle_ids:
+            self.selected_rectangle_ids.discard(rectangle.id)
+            self.selection_version += 1
+            self.changes.emit(SELECTION_CHANGED)
+
+        self.unindex_rectangle_edges(rectangle)
+        self.unindex_rectangle(rectangle)
+        self.rectangles.remove(rectangle)
+
+        for port_id in port_ids:
+            self.ports_by_id.pop(port_id, None)
+
+        self.version += 1
+        self.changes.emit(RECTANGLE_REMOVED, rectangle)
+
+        if self.journal:
+            self.journal.record_rectangle_removed(rectangle)
+
+    def remove_duplicate_rectangle(self, rectangle: MoveableRectangle, original: MoveableRectangle) -> None:
+        """
+        Removes the rectangle object that shares its id with the original, found by identity, as rectangles
+        compare by geometry. The links and ports shared with the original stay and are bound to the original.
+        The journal is not notified, as the id still exists and the recovery skips duplicate ids anyway
+
+        Args:
+            rectangle (MoveableRectangle): duplicate rectangle object to remove
+            original (MoveableRectangle): rectangle object with the same id that stays
+
+        Returns:
+            None
+        """
+        if self.selected_rectangle is rectangle:
+            self.selected_rectangle = None
+            self.selected_port = None
+
+        self.unindex_rectangle_edges(rectangle)
+        self.unindex_rectangle(rectangle)
+        self.rectangles = [rect for rect in self.rectangles if rect is not rectangle]
+
+        for port in rectangle.ports:
+            if self.ports_by_id.get(port.id) is port:
+                del self.ports_by_id[port.id]
+
+        for port in original.ports:
+            self.ports_by_id[port.id] = port
+
+            if port.id in self.port_links:
+                self.bind_link(self.port_links[port.id])
+
+        self.index_port_links([port.id for port in original.ports])
+        self.version += 1
+        self.changes.emit(RECTANGLE_REMOVED, rectangle)
+
+    def detach_objects(self, rectangle_ids: Set[str], link_ids: Set[str]) -> None:
+        """
+        Removes the rectangles and links with the given ids from the game model in one pass, without removing
+        the other links of the rectangles, e.g. to unload a part of a larger world. The journal is not notified,
+        as the objects still exist
+
+        Args:
+            rectangle_ids (Set[str]): ids of the rectangles to remove
+            link_ids (Set[str]): ids of the links to remove
+
+        Returns:
+            None
+        """
+        for rectangle in self.rectangles:
+            if rectangle.id in rectangle_ids:
+                self.unindex_rectangle_edges(rectangle)
+                self.unindex_rectangle(rectangle)
+                self.changes.emit(RECTANGLE_REMOVED, rectangle)
+
         for link in self.links:
-            src_x_offset = 0
-            src_y_offset = 0
-            dst_x_offset = 0
-            dst_y_offset = 0
-
-            src_port = next((x for x in self.selected_rectangle.ports if x.id == link.src_id), None)
-            dst_port = next((x for x in self.selected_rectangle.ports if x.id == link.dst_id), None)
-
-            if src_port:
-                src_x_offset = x_offset
-                src_y_offset = y_offset
-            if dst_port:
-                dst_x_offset = x_offset
-                dst_y_offset = y_offset
-
-            link.setLine(
-                link.x1() + src_x_offset,
-                link.y1() + src_y_offset,
-                link.x2() + dst_x_offset,
-                link.y2() + dst_y_offset
-            )
+            if link.id in link_ids:
+                if link in self.link_tree:
+                    self.link_tree.remove(link)
+
+                self.changes.emit(LINK_REMOVED, link)
+
+        self.rectangles = [rectangle for rectangle in self.rectangles if rectangle.id not in rectangle_ids]
+        self.links = [link for link in self.links if link.id not in link_ids]
+        if self.selected_rectangle_ids & rectangle_ids or self.selected_link_ids & link_ids:
+            self.selected_rectangle_ids -= rectangle_ids
+            self.selected_link_ids -= link_ids
+            self.selection_version += 1
+            self.changes.emit(SELECTION_CHANGED)
+
+        self.linked_port_ids = [port_id for link in self.links for port_id in (link.src_id, link.dst_id)]
+        self.ports_by_id = {port.id: port for rectangle in self.rectangles for port in rectangle.ports}
+        self.port_links = {}
+
+        for link in self.links:
+            self.port_links.setdefault(link.src_id, link)
+            self.port_links.setdefault(link.dst_id, link)
+
+            # the ends at the detached rectangles stay where they are
+            if link.src_id not in self.ports_by_id or link.dst_id not in self.ports_by_id:
+                link.bind(self.ports_by_id.get(link.src_id), self.ports_by_id.get(link.dst_id))
+
+        if self.selected_rectangle is not None and self.selected_rectangle.id in rectangle_ids:
+            self.selected_rectangle = None
+            self.selected_port = None
+        if self.selected_link is not None and self.selected_link.id in link_ids:
+            self.selected_link = None
+
+        self.version += 1
+
+    def translate(self, x_offset: int, y_offset: int) -> None:
+        """
+        Moves all rectangles, ports and links by the given offset without collision checks, e.g. to scroll
+        the game field over a larger world. The ports and the link ends bound to them follow the rectangles,
+        only the link ends without a port are moved here. The journal is not notified, as the scene itself
+        does not change
+
+        Args:
+            x_offset (int): x coordinate offset
+            y_offset (int): y coordinate offset
+
+        Returns:
+            None
+        """
+        for rectangle in self.rectangles:
+            rectangle.setRect(rectangle.x() + x_offset, rectangle.y() + y_offset,
+                              rectangle.width(), rectangle.height())
+
+        for link in self.links:
+            if link.src is None or link.dst is None:
+                link.setLine(link.x1() + x_offset, link.y1() + y_offset, link.x2() + x_offset, link.y2() + y_offset)
+
+        for name, edges in self.edge_indexes.items():
+            offset = x_offset if name in VERTICAL_EDGE_NAMES else y_offset
+            self.edge_indexes[name] = [(coord + offset, rectangle_id) for coord, rectangle_id in edges]
+
+        for tree in self.rectangle_trees.values():
+            tree.translate(x_offset, y_offset)
+
+        self.link_tree.translate(x_offset, y_offset)
+
+        self.version += 1
+        self.changes.emit(SCENE_TRANSLATED)
+
+    @staticmethod
+    def get_tree_key(container: Optional[MoveableRectangle]) -> Optional[int]:
+        """
+        Gets the key of the bounding volume hierarchy of the children of the container
+
+        Args:
+            container (Optional[MoveableRectangle]): container, None for the game field
+
+        Returns:
+            Optional[int]: key of rectangle_trees
+        """
+        return None if container is None else id(container)
+
+    def find_container(self, left: int, right: int, top: int, bottom: int,
+                       exclude: Optional[MoveableRectangle] = None) -> Tuple[bool, Optional[MoveableRectangle]]:
+        """
+        Descends the hierarchy through the containers the bounds lie inside. The children of a container
+        are only checked if its bounds contain the given ones, so a check costs a few tree queries per level
+
+        Args:
+            left (int): left side of the bounds
+            right (int): right side of the bounds
+            top (int): top side of the bounds
+            bottom (int): bottom side of the bounds
+            exclude (Optional[MoveableRectangle]): rectangle to skip together with its children, e.g. the moved one.
+                Default = None
+
+        Returns:
+            Tuple[bool, Optional[MoveableRectangle]]: True if the bounds overlap no rectangle except their containers,
+            and the innermost container, None for the game field
+        """
+        container = None
+
+        while True:
+            tree = self.rectangle_trees.get(self.get_tree_key(container))
+            hits = [] if tree is None else list(islice(
+                (rect for rect in tree.query(left, top, right, bottom) if rect is not exclude), 2))
+
+            if not hits:
+                return True, container
+            if len(hits) > 1 or not is_rectangle_inside(left, right, top, bottom, *hits[0].get_bound_coordinates()):
+                return False, container
+
+            container = hits[0]
+
+    def has_collision(self, rectangle: Optional[MoveableRectangle], x_offset: int = 0, y_offset: int = 0) -> bool:
+        """
+        Checks if the rectangle moved by the offset leaves the game field or overlaps rectangles other than
+        its containers
+
+        Args:
+            rectangle (Optional[MoveableRectangle]): rectangle to check, it does not have to be in the game model
+            x_offset (int): x coordinate offset. Default: 0
+            y_offset (int): y coordinate offset. Default: 0
+
+        Returns:
+            bool: True if the rectangle collides. False otherwise
+        """
+        if rectangle is None:
+            return False
+
+        left, right, top, bottom = rectangle.get_bound_coordinates()
+
+        if has_border_collision(left, right, top, bottom, self.field_width, self.field_height, x_offset, y_offset):
+            return True
+
+        return not self.find_container(left + x_offset, right + x_offset, top + y_offset, bottom + y_offset,
+                                       rectangle)[0]
+
+    def find_pushed_rectangles(self, rectangle: MoveableRectangle, x_offset: int, y_offset: int, distance: int,
+                               is_vertical: bool) -> Tuple[int, List[Tuple[MoveableRectangle, int, int]]]:
+        """
+        Finds how far the rectangle dragged by the offset can move further along one axis, pushing the rectangles
+        in its way, which push the rectangles in their way in turn, until the chain reaches the border
+        of the container or the game field. The rectangles are visited once, in the order of their front sides,
+        and the rectangles each of them pushes are found with a query of the region it sweeps
+
+        Args:
+            rectangle (MoveableRectangle): dragged rectangle
+            x_offset (int): x coordinate offset the rectangle is dragged by
+            y_offset (int): y coordinate offset the rectangle is dragged by
+            distance (int): signed distance to move the dragged rectangle further by along the axis
+            is_vertical (bool): flag to move the rectangle along the y axis instead of the x axis
+
+        Returns:
+            Tuple[int, List[Tuple[MoveableRectangle, int, int]]]: signed distance the dragged rectangle can move by,
+            and the pushed rectangles with their x and y coordinate offsets, see shift_rectangles
+        """
+        sign = 1 if distance > 0 else -1
+
+        def to_frame(left: int, top: int, right: int, bottom: int) -> Tuple[int, int, int, int]:
+            # bounds in the frame where the rectangle moves right
+            if is_vertical:
+                left, top, right, bottom = top, left, bottom, right
+
+            return (left, top, right, bottom) if sign > 0 else (-right, top, -left, bottom)
+
+        def from_frame(left: int, top: int, right: int, bottom: int) -> Tuple[int, int, int, int]:
+            if sign < 0:
+                left, right = -right, -left
+
+            return (top, left, bottom, right) if is_vertical else (left, top, right, bottom)
+
+        left, right, top, bottom = rectangle.get_bound_coordinates()
+        bounds = (left + x_offset, top + y_offset, right + x_offset, bottom + y_offset)
+        container = self.find_container(bounds[0], bounds[2], bounds[1], bounds[3], rectangle)[1]
+        tree = self.rectangle_trees.get(self.get_tree_key(container))
+        border = (0, 0, self.field_width, self.field_height) if container is None \
+            else self.get_tree_bounds(container)
+        limit = to_frame(*border)[2]
+
+        gaps = {id(rectangle): 0}
+        visited: Set[int] = set()
+        chain: List[Tuple[MoveableRectangle, int]] = []
+        heap = [(to_frame(*bounds)[0], 0, rectangle, bounds)]
+        count = 1
+        allowed = abs(distance)
+
+        while heap:
+            _, _, item, item_bounds = heappop(heap)
+            gap = gaps[id(item)]
+
+            if id(item) in visited or (chain and gap >= allowed):
+                continue
+
+            visited.add(id(item))
+            chain.append((item, gap))
+            _, frame_top, frame_right, frame_bottom = to_frame(*item_bounds)
+            allowed = min(allowed, limit - frame_right + gap)
+
+            if tree is None or gap >= allowed:
+                continue
+
+            for hit in tree.query(*from_frame(frame_right, frame_top, frame_right + allowed - gap, frame_bottom)):
+                if hit is rectangle:
+                    continue
+
+                hit_bounds = self.get_tree_bounds(hit)
+                hit_left = to_frame(*hit_bounds)[0]
+                hit_gap = gap + hit_left - frame_right
+
+                if hit_gap < gaps.get(id(hit), allowed):
+                    gaps[id(hit)] = hit_gap
+                    heappush(heap, (hit_left, count, hit, hit_bounds))
+                    count += 1
+
+        allowed = max(allowed, 0)
+        offsets = [(item, 0, (allowed - gap) * sign) if is_vertical else (item, (allowed - gap) * sign, 0)
+                   for item, gap in chain[1:] if gap < allowed]
+
+        return allowed * sign, offsets
+
+    def can_resize(self, rectangle: MoveableRectangle, width: int, height: int) -> bool:
+        """
+        Checks if the rectangle can take the new size without going below the min size, leaving the game field,
+        overlapping other rectangles or leaving out its children
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to check
+            width (int): new width of the rectangle
+            height (int): new height of the rectangle
+
+        Returns:
+            bool: True if the rectangle can be resized. False otherwise
+        """
+        left, top = rectangle.x(), rectangle.y()
+        right, bottom = left + width, top + height
+
+        if (width < Constants.RECTANGLE_MIN_WIDTH_PX or height < Constants.RECTANGLE_MIN_HEIGHT_PX
+                or has_border_collision(left, right, top, bottom, self.field_width, self.field_height)):
+            return False
+
+        children = self.rectangle_trees.get(id(rectangle))
+        children_bounds = children.get_bounds() if children is not None else None
+
+        if children_bounds is not None:
+            children_left, children_top, children_right, children_bottom = children_bounds
+
+            if not is_rectangle_inside(children_left, children_right, children_top, children_bottom,
+                                       left, right, top, bottom):
+                return False
+
+        return self.find_container(left, right, top, bottom, rectangle)[0]
+
+    def index_rectangle(self, rectangle: MoveableRectangle) -> None:
+        """
+        Inserts the rectangle into the bounding volume hierarchy of its innermost container.
+        The rectangles of that container that lie inside the inserted one become its children
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to index
+
+        Returns:
+            None
+        """
+        left, right, top, bottom = rectangle.get_bound_coordinates()
+        container = self.find_container(left, right, top, bottom, rectangle)[1]
+        tree = self.rectangle_trees.setdefault(self.get_tree_key(container), AabbTree())
+        children = [rect for rect in tree.query(left, top, right, bottom)
+                    if is_rectangle_inside(*rect.get_bound_coordinates(), left, right, top, bottom)]
+
+        if children:
+            child_tree = self.rectangle_trees.setdefault(id(rectangle), AabbTree())
+
+            for child in children:
+                tree.remove(child)
+                child_tree.insert(child, *self.get_tree_bounds(child))
+                self.containers[id(child)] = rectangle
+
+        tree.insert(rectangle, left, top, right, bottom)
+        self.containers[id(rectangle)] = container
+
+        if children:
+            self.raise_rectangles(children)
+
+    def unindex_rectangle(self, rectangle: MoveableRectangle) -> None:
+        """
+        Removes the rectangle from the bounding volume hierarchy, its children move to its container
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to remove
+
+        Returns:
+            None
+        """
+        container = self.containers.pop(id(rectangle), None)
+        tree = self.rectangle_trees.get(self.get_tree_key(container))
+
+        if tree is None or rectangle not in tree:
+            return
+
+        tree.remove(rectangle)
+
+        for child in self.get_children(rectangle):
+            tree.insert(child, *self.get_tree_bounds(child))
+            self.containers[id(child)] = container
+
+        self.rectangle_trees.pop(id(rectangle), None)
+
+    @staticmethod
+    def get_tree_bounds(rectangle: MoveableRectangle) -> Tuple[int, int, int, int]:
+        """
+        Gets the bounds of the rectangle in the order of the AabbTree
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to get the bounds of
+
+        Returns:
+            Tuple[int, int, int, int]: left, top, right and bottom sides
+        """
+        left, right, top, bottom = rectangle.get_bound_coordinates()
+        return left, top, right, bottom
+
+    def get_children(self, rectangle: MoveableRectangle) -> List[MoveableRectangle]:
+        """
+        Gets the children of the container in the order they were indexed
+
+        Args:
+            rectangle (MoveableRectangle): container
+
+        Returns:
+            List[MoveableRectangle]: children, empty if the rectangle is not a container
+        """
+        tree = self.rectangle_trees.get(id(rectangle))
+        return [] if tree is None else [leaf.item for leaf in tree.leaves.values()]
+
+    def get_subtree(self, rectangle: MoveableRectangle) -> List[MoveableRectangle]:
+        """
+        Gets the rectangle followed by all of its descendants, every container before its children
+
+        Args:
+            rectangle (MoveableRectangle): root of the subtree
+
+        Returns:
+            List[MoveableRectangle]: rectangles of the subtree
+        """
+        subtree = [rectangle]
+
+        for container in subtree:
+            subtree += self.get_children(container)
+
+        return subtree
+
+    def find_rectangles(self, left: int, top: int, right: int, bottom: int) -> List[MoveableRectangle]:
+        """
+        Finds the rectangles overlapping the region level by level, so every container precedes its children
+
+        Args:
+            left (int): left side of the region
+            top (int): top side of the region
+            right (int): right side of the region
+            bottom (int): bottom side of the region
+
+        Returns:
+            List[MoveableRectangle]: overlapping rectangles in paint order
+        """
+        rectangles: List[MoveableRectangle] = []
+        trees = [self.rectangle_trees.get(None)]
+
+        while trees:
+            level = []
+
+            for tree in trees:
+                for rectangle in [] if tree is None else tree.query(left, top, right, bottom):
+                    rectangles.append(rectangle)
+                    level.append(self.rectangle_trees.get(id(rectangle)))
+
+            trees = [tree for tree in level if tree is not None]
+
+        return rectangles
+
+    def get_scene_extent(self, margin: int = 0) -> Tuple[int, int, int, int]:
+        """
+        Gets the bounds of the game field together with the rectangles outside of it
+
+        Args:
+            margin (int): distance the rectangle bounds are grown by, to cover the outlines and links. Default: 0
+
+        Returns:
+            Tuple[int, int, int, int]: left, top, right and bottom sides of the scene
+        """
+        tree = self.rectangle_trees.get(None)
+        bounds = None if tree is None else tree.get_bounds()
+
+        if bounds is None:
+            return 0, 0, self.field_width, self.field_height
+
+        return (min(bounds[0] - margin, 0), min(bounds[1] - margin, 0),
+                max(bounds[2] + margin, self.field_width), max(bounds[3] + margin, self.field_height))
+
+    def is_descendant(self, rectangle: MoveableRectangle, ancestor: MoveableRectangle) -> bool:
+        """
+        Checks if the rectangle lies in the ancestor, directly or through other containers
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to check
+            ancestor (MoveableRectangle): possible ancestor
+
+        Returns:
+            bool: True if the ancestor contains the rectangle. False otherwise
+        """
+        container = self.containers.get(id(rectangle))
+
+        while container is not None:
+            if container is ancestor:
+                return True
+            container = self.containers.get(id(container))
+
+        return False
+
+    def get_depth(self, rectangle: MoveableRectangle) -> int:
+        """
+        Gets the number of the containers of the rectangle
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to get the depth of
+
+        Returns:
+            int: 0 for the rectangles on the game field
+        """
+        depth = 0
+        container = self.containers.get(id(rectangle))
+
+        while container is not None:
+            depth += 1
+            container = self.containers.get(id(container))
+
+        return depth
+
+    def get_dragged_rectangles(self) -> List[MoveableRectangle]:
+        """
+        Gets the rectangles drawn with the drag offset: the selected rectangle with its descendants
+
+        Returns:
+            List[MoveableRectangle]: dragged rectangles, empty if a link is dragged or nothing is selected
+        """
+        if self.selected_rectangle is None or self.is_dragging_link:
+            return []
+
+        return self.get_subtree(self.selected_rectangle)
+
+    def raise_rectangles(self, rectangles: List[MoveableRectangle]) -> None:
+        """
+        Moves the rectangles with their descendants to the end of the drawing order, so containers
+        are always drawn before their children
+
+        Args:
+            rectangles (List[MoveableRectangle]): rectangles to raise
+
+        Returns:
+            None
+        """
+        raised = [rect for rectangle in rectangles for rect in self.get_subtree(rectangle)]
+        raised_ids = {id(rect) for rect in raised}
+        self.rectangles = [rect for rect in self.rectangles if id(rect) not in raised_ids] + raised
+
+    @staticmethod
+    def get_link_bounds(link: Link) -> Tuple[int, int, int, int]:
+        """
+        Gets the bounds of the link in the link tree. The chord is grown on every side by the reach of the curve
+        control points, so the bounds hold the link whether it is drawn straight or curved
+
+        Args:
+            link (Link): link to get the bounds of
+
+        Returns:
+            Tuple[int, int, int, int]: left, top, right and bottom sides, right and bottom are exclusive
+        """
+        x1, y1, x2, y2 = link.get_ends()
+        reach = max(Constants.LINK_CURVE_REACH_PX, (abs(x2 - x1) + abs(y2 - y1)) // 3 + 1) + Constants.LINK_WIDTH_PX
+
+        return min(x1, x2) - reach, min(y1, y2) - reach, max(x1, x2) + reach + 1, max(y1, y2) + reach + 1
+
+    def index_link(self, link: Link) -> None:
+        """
+        Adds the link to the link tree or moves it there to its current bounds
+
+        Args:
+            link (Link): added or moved link
+
+        Returns:
+            None
+        """
+        if link in self.link_tree:
+            self.link_tree.update(link, *self.get_link_bounds(link))
+        else:
+            self.link_tree.insert(link, *self.get_link_bounds(link))
+
+    def select_in_box(self, x1_coord: int, y1_coord: int, x2_coord: int, y2_coord: int) -> None:
+        """
+        Sets the selection box between the given corners and selects the rectangles and links that touch it.
+        Both sets come from range queries: the rectangle trees are only descended into the containers the box
+        touches, and the links found in the link tree are clipped against the box, so a drag costs
+        logarithmic time plus the number of selected objects
+
+        Args:
+            x1_coord (int): x coordinate of the first corner
+            y1_coord (int): y coordinate of the first corner
+            x2_coord (int): x coordinate of the opposite corner
+            y2_coord (int): y coordinate of the opposite corner
+
+        Returns:
+            None
+        """
+        left, right = min(x1_coord, x2_coord), max(x1_coord, x2_coord)
+        top, bottom = min(y1_coord, y2_coord), max(y1_coord, y2_coord)
+        self.selection_box = (left, top, right, bottom)
+
+        rectangle_ids = set()
+        trees = [self.rectangle_trees.get(None)]
+
+        while trees:
+            tree = trees.pop()
+
+            if tree is None:
+                continue
+
+            for rectangle in tree.query(left, top, right + 1, bottom + 1):
+                rectangle_ids.add(rectangle.id)
+
+                if id(rectangle) in self.rectangle_trees:
+                    trees.append(self.rectangle_trees[id(rectangle)])
+
+        link_ids = set()
+        is_curved = self.is_curved_links_enabled and self.link_paths is not None
+
+        for link in self.link_tree.query(left, top, right + 1, bottom + 1):
+            if left <= link.x1() <= right and top <= link.y1() <= bottom:
+                is_touched = True
+            elif is_curved:
+                is_touched = self.link_paths.intersects(link, left, top, right, bottom)
+            else:
+                is_touched = has_segment_overlap(link.x1(), link.y1(), link.x2(), link.y2(), left, right, top, bottom)
+
+            if is_touched:
+                link_ids.add(link.id)
+
+        if rectangle_ids != self.selected_rectangle_ids or link_ids != self.selected_link_ids:
+            self.selected_rectangle_ids, self.selected_link_ids = rectangle_ids, link_ids
+            self.selection_version += 1
+            self.changes.emit(SELECTION_CHANGED)
+
+    def select_objects(self, rectangle_ids: Set[str], link_ids: Set[str]) -> None:
+        """
+        Replaces the box selection with the given objects, e.g. the pasted ones
+
+        Args:
+            rectangle_ids (Set[str]): ids of the rectangles to select
+            link_ids (Set[str]): ids of the links to select
+
+        Returns:
+            None
+        """
+        self.selected_rectangle_ids, self.selected_link_ids = set(rectangle_ids), set(link_ids)
+        self.selection_version += 1
+        self.changes.emit(SELECTION_CHANGED)
+
+    def clear_box_selection(self) -> None:
+        """
+        Drops the selection box and deselects the objects selected with it
+
+        Returns:
+            None
+        """
+        if self.selected_rectangle_ids or self.selected_link_ids:
+            self.selected_rectangle_ids, self.selected_link_ids = set(), set()
+            self.selection_version += 1
+            self.changes.emit(SELECTION_CHANGED)
+
+        self.selection_box = None
+
+    def emit_rectangle_change(self, kind: str, rectangle: MoveableRectangle) -> None:
+        """
+        Notifies the subscribers about the changed rectangle and its moved ports
+
+        Args:
+            kind (str): kind of the rectangle change
+            rectangle (MoveableRectangle): changed rectangle
+
+        Returns:
+            None
+        """
+        self.changes.emit(kind, rectangle)
+
+        if PORT_MOVED in self.changes.kinds:
+            for port in rectangle.ports:
+                self.changes.emit(PORT_MOVED, port)
+
+    def index_rectangle_edges(self, rectangle: MoveableRectangle) -> None:
+        """
+        Inserts the edges and center lines of the rectangle into the sorted edge indexes
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to index
+
+        Returns:
+            None
+        """
+        x_coords, y_coords = rectangle.get_alignment_coordinates()
+
+        for name, coord in zip(VERTICAL_EDGE_NAMES + HORIZONTAL_EDGE_NAMES, x_coords + y_coords):
+            insort(self.edge_indexes[name], (coord, rectangle.id))
+
+    def unindex_rectangle_edges(self, rectangle: MoveableRectangle) -> None:
+        """
+        Removes the edges and center lines of the rectangle from the sorted edge indexes
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to remove, with the coordinates it was indexed with
+
+        Returns:
+            None
+        """
+        x_coords, y_coords = rectangle.get_alignment_coordinates()
+
+        for name, coord in zip(VERTICAL_EDGE_NAMES + HORIZONTAL_EDGE_NAMES, x_coords + y_coords):
+            index = self.edge_indexes[name]
+            del index[bisect_left(index, (coord, rectangle.id))]
+
+    def find_indexed_edges(self, name: str, low: int, high: int, exclude_id: str) -> Iterator[int]:
+        """
+        Finds the indexed edge coordinates in range [low, high] by bisection
+
+        Args:
+            name (str): edge or center line name
+            low (int): low bound of the range
+            high (int): high bound of the range
+            exclude_id (str): id of the rectangle to skip
+
+        Returns:
+            Iterator[int]: matching coordinates in ascending order
+        """
+        index = self.edge_indexes[name]
+        start = bisect_left(index, (low,))
+        end = bisect_left(index, (high + 1,))
+
+        for position in range(start, end):
+            if index[position][1] != exclude_id:
+                yield index[position][0]
+
+    def find_alignment(self, coords: List[int], names: Tuple[str, ...],
+                       exclude_id: str) -> Tuple[Optional[int], List[int]]:
+        """
+        Finds the smallest shift within Constants.SNAP_TOLERANCE_PX that aligns any of the coordinates
+        with an indexed edge or center line of the same axis
+
+        Args:
+            coords (List[int]): edge and center line coordinates of the dragged rectangle
+            names (Tuple[str, ...]): edge and center line names of the same axis
+            exclude_id (str): id of the dragged rectangle
+
+        Returns:
+            Tuple[Optional[int], List[int]]: shift, or None if nothing is in range,
+            and coordinates of the guides aligned after the shift
+        """
+        best_shift: Optional[int] = None
+
+        for coord in coords:
+            for name in names:
+                for edge in self.find_indexed_edges(name, coord - Constants.SNAP_TOLERANCE_PX,
+                                                    coord + Constants.SNAP_TOLERANCE_PX, exclude_id):
+                    if best_shift is None or abs(edge - coord) < abs(best_shift):
+                        best_shift = edge - coord
+
+        if best_shift is None:
+            return None, []
+
+        guides = [coord + best_shift for coord in coords
+                  if any(next(self.find_indexed_edges(name, coord + best_shift, coord + best_shift, exclude_id),
+                              None) is not None for name in names)]
+
+        return best_shift, guides
+
+    def snap_offset(self, x_offset: int, y_offset: int) -> Tuple[int, int]:
+        """
+        Snaps the drag offset of the selected rectangle to the edges and center lines of other rectangles
+        and, on the axes without alignment, to the grid. Updates the alignment guides
+
+        Args:
+            x_offset (int): x coordinate offset of the selected rectangle
+            y_offset (int): y coordinate offset of the selected rectangle
+
+        Returns:
+            Tuple[int, int]: snapped x and y coordinate offsets
+        """
+        self.vertical_guides, self.horizontal_guides = [], []
+
+        if self.selected_rectangle is None:
+            return x_offset, y_offset
+
+        x_coords, y_coords = self.selected_rectangle.get_alignment_coordinates(x_offset, y_offset)
+        x_shift: Optional[int] = None
+        y_shift: Optional[int] = None
+
+        if self.is_guide_snap_enabled:
+            x_shift, self.vertical_guides = self.find_alignment(x_coords, VERTICAL_EDGE_NAMES,
+                                                                self.selected_rectangle.id)
+            y_shift, self.horizontal_guides = self.find_alignment(y_coords, HORIZONTAL_EDGE_NAMES,
+                                                                  self.selected_rectangle.id)
+
+        if self.is_grid_snap_enabled:
+            grid = Constants.GRID_SIZE_PX
+            if x_shift is None:
+                x_shift = (x_coords[0] + grid // 2) // grid * grid - x_coords[0]
+            if y_shift is None:
+                y_shift = (y_coords[0] + grid // 2) // grid * grid - y_coords[0]
+
+        return x_offset + (x_shift or 0), y_offset + (y_shift or 0)
+
+    def resize_field(self, width: int, height: int) -> None:
+        """
+        Sets the new size of the game field
+
+        Args:
+            width (int): new width of the game field
+            height (int): new height of the game field
+
+        Returns:
+            None
+        """
+        self.field_width = width
+        self.field_height = height
+        self.version += 1
+        self.changes.emit(FIELD_RESIZED)
+
+    def get_compacted_rectangles(self) -> List[MoveableRectangle]:
+        """
+        Gets the rectangles moved by the compaction: the rectangles on the game field that start inside of it.
+        Nested rectangles are carried by their containers
+
+        Returns:
+            List[MoveableRectangle]: compacted rectangles
+        """
+        return [rectangle for rectangle in self.rectangles if self.containers.get(id(rectangle)) is None
+                and rectangle.x() < self.field_width and rectangle.y() < self.field_height]
+
+    def compact_field(self, width: int, height: int) -> bool:
+        """
+        Pushes the rectangles left and then up, each only as far as needed to fit the game field of the given size.
+        Every rectangle keeps its order to the rectangles it faces along the axis, so no rectangles overlap
+        or change their containers. Rectangles that can not fit are moved as far as their order allows
+
+        Args:
+            width (int): new width of the game field
+            height (int): new height of the game field
+
+        Returns:
+            bool: True if any rectangle was moved. False otherwise
+        """
+        rectangles = self.get_compacted_rectangles()
+        bounds = [self.get_tree_bounds(rectangle) for rectangle in rectangles]
+
+        if all(right <= width and bottom <= height for _, _, right, bottom in bounds):
+            return False
+
+        lefts = compact(bounds, max(width, get_min_extent(bounds)))
+        y_bounds = [(top, new_left, bottom, new_left + right - left)
+                    for new_left, (left, top, right, bottom) in zip(lefts, bounds)]
+        tops = compact(y_bounds, max(height, get_min_extent(y_bounds)))
+
+        offsets = [(rectangle, new_left - left, new_top - top)
+                   for rectangle, new_left, new_top, (left, top, _, _) in zip(rectangles, lefts, tops, bounds)
+                   if new_left != left or new_top != top]
+
+        if not offsets:
+            return False
+
+        self.shift_rectangles(offsets)
+
+        return True
+
+    def bind_link(self, link: Link) -> None:
+        """
+        Binds the ends of the link to their ports in the game model, so they follow the ports from now on,
+        the ends whose ports are not in the game model keep the ports they are bound to, if any
+
+        Args:
+            link (Link): link to bind
+
+        Returns:
+            None
+        """
+        link.bind(self.ports_by_id.get(link.src_id, link.src), self.ports_by_id.get(link.dst_id, link.dst))
+
+    def index_port_links(self, port_ids: List[str]) -> None:
+        """
+        Moves the links at the given ports to their current bounds in the link tree after their ports have moved.
+        The ends of the links are derived from the ports, so only the index is updated
+
+        Args:
+            port_ids (List[str]): ids of the moved ports
+
+        Returns:
+            None
+        """
+        moved_links = {id(link): link for link in map(self.port_links.get, port_ids) if link is not None}
+
+        for link in moved_links.values():
+            self.index_link(link)
+            self.changes.emit(LINK_MOVED, link)
 
     def recalculate_min_field_size(self) -> (int, int):
         """
-        Recalculates the min field size of the game model considering current rectangle positions
+        Recalculates the min field size of the game model considering current positions of the rectangles
+        that start inside of the game field, limited by the max screen size. With the compaction enabled
+        the rectangles only block the shrinking once they are compacted, see compact_field
 
         Returns:
             (int, int): min_width and min_height values
@@ -238,10 +1465,19 @@ class GameModel:
         max_width = Constants.SCREEN_SIZE_MIN_PX[0]
         max_height = Constants.SCREEN_SIZE_MIN_PX[1]
 
-        for rectangle in self.rectangles:
-            max_width = max(max_width, rectangle.x() + rectangle.width())
-            max_height = max(max_height, rectangle.y() + rectangle.height())
+        if self.is_compaction_enabled:
+            bounds = [self.get_tree_bounds(rectangle) for rectangle in self.get_compacted_rectangles()]
+            max_width = max(max_width, get_min_extent(bounds))
+            max_height = max(max_height, get_min_extent([(top, left, bottom, right)
+                                                         for left, top, right, bottom in bounds]))
+        else:
+            for rectangle in self.rectangles:
+                if rectangle.x() < self.field_width and rectangle.y() < self.field_height:
+                    max_width = max(max_width, rectangle.x() + rectangle.width())
+                    max_height = max(max_height, rectangle.y() + rectangle.height())
 
+        max_width = min(max_width, Constants.SCREEN_SIZE_MAX_PX[0])
+        max_height = min(max_height, Constants.SCREEN_SIZE_MAX_PX[1])
         self.min_field_width, self.min_field_height = max_width, max_height
 
         return max_width, max_height
@@ -0,0 +1,409 @@
+"""
+Implementation of the sharded world that pages regions of a large world in and out of the game model
+"""
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from models.GameModel import GameModel
+from persistence.RegionStore import (Bounds, LinkRecord, RectangleRecord, RegionData, RegionKey, RegionStore,
+                                     RegionSummary)
+from utils import Constants
+
+MEMORY_BUDGET_RECORDS: int = 65536
+PREFETCH_MARGIN_REGIONS: int = 1
+
+
+class ShardedWorld:
+    """
+    The ShardedWorld that shows a part of a world stored in region files through the game model.
+    The game field is a view at the view origin of the world: only the rectangles of the regions under it
+    are materialized in the game model, in the view coordinates. The regions around the view are read
+    and decoded by a background thread ahead of time, and decoded regions that are not in the view are
+    evicted, least recently used first, once their records exceed the memory budget.
+    A link between two regions is stored in both and stays in the game model while any of its
+    rectangles is, so it keeps working when its other end is not loaded
+
+    Args:
+        model (GameModel): game model to materialize the view in, must be empty
+        store (RegionStore): storage of the region files
+        memory_budget (int): max number of decoded records of the regions outside of the view.
+            Default: MEMORY_BUDGET_RECORDS
+        prefetch_margin (int): number of regions to prefetch around the view. Default: PREFETCH_MARGIN_REGIONS
+
+    Attributes:
+        model (GameModel): game model the view is materialized in
+        store (RegionStore): storage of the region files
+        memory_budget (int): max number of decoded records of the regions outside of the view
+        prefetch_margin (int): number of regions to prefetch around the view
+        origin_x (int): x coordinate of the view origin in the world
+        origin_y (int): y coordinate of the view origin in the world
+        regions (OrderedDict[RegionKey, RegionData]): decoded regions, least recently used first
+        materialized (Set[RegionKey]): regions whose rectangles are in the game model
+        link_regions (Dict[str, Tuple[RegionKey, RegionKey]]): regions of both ends of the links in the game model
+        synced_version (int): version of the game model the records were last updated from
+        lock (threading.Lock): lock of the decoded regions
+        requests (queue.Queue): regions to prefetch, None stops the background thread
+        thread (threading.Thread): background thread that prefetches regions
+    """
+    def __init__(self, model: GameModel, store: RegionStore, memory_budget: int = MEMORY_BUDGET_RECORDS,
+                 prefetch_margin: int = PREFETCH_MARGIN_REGIONS):
+        self.model = model
+        self.store = store
+        self.memory_budget = memory_budget
+        self.prefetch_margin = prefetch_margin
+        self.origin_x = 0
+        self.origin_y = 0
+
+        self.regions: 'OrderedDict[RegionKey, RegionData]' = OrderedDict()
+        self.materialized: Set[RegionKey] = set()
+        self.link_regions: Dict[str, Tuple[RegionKey, RegionKey]] = {}
+        self.synced_version = model.version
+
+        self.lock = threading.Lock()
+        self.requests: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name='ShardedWorld', daemon=True)
+        self.thread.start()
+
+        self.update_view()
+
+    def get_view_regions(self, margin: int = 0) -> Set[RegionKey]:
+        """
+        Gets the regions under the view together with the regions outside of it whose rectangles reach into it,
+        found by the summaries of the changed regions and of the saved ones, so the rectangles
+        that start outside of the view are shown whatever their size
+
+        Args:
+            margin (int): number of regions to add around the view. Default: 0
+
+        Returns:
+            Set[RegionKey]: keys of the regions
+        """
+        left = self.origin_x - margin * self.store.region_size
+        top = self.origin_y - margin * self.store.region_size
+        right = self.origin_x + self.model.field_width + margin * self.store.region_size
+        bottom = self.origin_y + self.model.field_height + margin * self.store.region_size
+
+        first_column, first_row = self.store.get_region_key(left, top)
+        last_column, last_row = self.store.get_region_key(right - 1, bottom - 1)
+        keys = {(column, row) for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)}
+
+        with self.lock:
+            reaches = dict(self.store.reaches)
+
+            for key, data in self.regions.items():
+                if data.is_dirty:
+                    summary = data.get_summary()
+                    reaches.pop(key, None)
+
+                    if self.store.is_reaching_out(key, summary):
+                        reaches[key] = summary.right, summary.bottom
+
+        for key, reach in reaches.items():
+            if key[0] <= last_column and key[1] <= last_row and reach[0] > left and reach[1] > top:
+                keys.add(key)
+
+        return keys
+
+    def get_region_summaries(self) -> Dict[RegionKey, RegionSummary]:
+        """
+        Gets the summaries of the regions that are not in the game model, from the changed regions
+        and the region index, so the whole world can be shown without reading the regions
+
+        Returns:
+            Dict[RegionKey, RegionSummary]: summaries in the view coordinates by region key
+        """
+        with self.lock:
+            summaries = dict(self.store.summaries)
+
+            for key, data in self.regions.items():
+                if data.is_dirty:
+                    summaries[key] = data.get_summary()
+
+        return {key: summary._replace(left=summary.left - self.origin_x, top=summary.top - self.origin_y,
+                                      right=summary.right - self.origin_x, bottom=summary.bottom - self.origin_y)
+                for key, summary in summaries.items() if summary is not None and key not in self.materialized}
+
+    def get_world_bounds(self) -> Optional[Bounds]:
+        """
+        Gets the bounds of the rectangles of the saved and changed regions of the world
+
+        Returns:
+            Optional[Bounds]: left, top, right and bottom sides in the view coordinates, None if there are
+            no rectangles
+        """
+        with self.lock:
+            bounds = [self.store.get_bounds()]
+            bounds.extend(data.get_summary()[:4] for data in self.regions.values() if data.is_dirty and data.rectangles)
+
+        bounds = [item for item in bounds if item is not None]
+
+        if not bounds:
+            return None
+
+        return (min(item[0] for item in bounds) - self.origin_x, min(item[1] for item in bounds) - self.origin_y,
+                max(item[2] for item in bounds) - self.origin_x, max(item[3] for item in bounds) - self.origin_y)
+
+    def get_region(self, key: RegionKey) -> RegionData:
+        """
+        Gets the decoded region, reads it from the disk if it was not prefetched
+
+        Args:
+            key (RegionKey): key of the region
+
+        Returns:
+            RegionData: decoded region
+        """
+        with self.lock:
+            if key in self.regions:
+                self.regions.move_to_end(key)
+                return self.regions[key]
+
+        data = self.store.load(key)
+
+        with self.lock:
+            return self.regions.setdefault(key, data)
+
+    def write_back(self) -> None:
+        """
+        Updates the records of the materialized regions from the game model. Rectangles are stored in the region
+        of their top left corner, and links with ends in other regions are updated in those regions too
+
+        Returns:
+            None
+        """
+        if self.model.version == self.synced_version:
+            return
+
+        homes: Dict[str, RegionKey] = {}
+        records: Dict[RegionKey, Dict[str, RectangleRecord]] = {key: {} for key in self.materialized}
+
+        for rect in self.model.rectangles:
+            x_coord, y_coord = rect.x() + self.origin_x, rect.y() + self.origin_y
+            homes[rect.id] = self.store.get_region_key(x_coord, y_coord)
+            records.setdefault(homes[rect.id], {})[rect.id] = RectangleRecord(
+                rect.id, rect.color, x_coord, y_coord, rect.width(), rect.height(),
+                tuple(port.id for port in rect.ports), rect.label
+            )
+
+        links: Dict[RegionKey, Dict[str, LinkRecord]] = {key: {} for key in self.materialized}
+        link_regions = {}
+
+        for link in self.model.links:
+            src_region, dst_region = self.link_regions.get(link.id, (None, None))
+            src_region = homes.get(link.src_id.split('_')[0], src_region)
+            dst_region = homes.get(link.dst_id.split('_')[0], dst_region)
+            record = LinkRecord(link.id, link.src_id, link.dst_id, link.x1() + self.origin_x,
+                                link.y1() + self.origin_y, link.x2() + self.origin_x, link.y2() + self.origin_y,
+                                src_region, dst_region)
+
+            for key in {src_region, dst_region}:
+                links.setdefault(key, {})[link.id] = record
+
+            link_regions[link.id] = (src_region, dst_region)
+
+        removed_links = {link_id: regions for link_id, regions in self.link_regions.items()
+                         if link_id not in link_regions}
+
+        for key in {key for regions in removed_links.values() for key in regions} - set(links):
+            links[key] = {}
+
+        for key in set(records) | set(links):
+            data = self.get_region(key)
+
+            with self.lock:
+                # the region may have been saved and evicted by the background thread in the meantime
+                data = self.regions.setdefault(key, data)
+
+                if key in self.materialized:
+                    data.rectangles = records.get(key, {})
+                    data.links = links.get(key, {})
+                else:
+                    data.rectangles.update(records.get(key, {}))
+                    data.links.update(links.get(key, {}))
+                    for link_id, regions in removed_links.items():
+                        if key in regions:
+                            data.links.pop(link_id, None)
+
+                data.is_dirty = True
+
+        self.link_regions = link_regions
+        self.synced_version = self.model.version
+
+    def materialize(self, key: RegionKey) -> None:
+        """
+        Adds the rectangles of the region and the links of them that are not loaded yet to the game model
+
+        Args:
+            key (RegionKey): key of the region
+
+        Returns:
+            None
+        """
+        self.materialized.add(key)
+        data = self.get_region(key)
+
+        with self.lock:
+            data = self.regions.setdefault(key, data)
+            rectangles, links = list(data.rectangles.values()), list(data.links.values())
+
+        for record in rectangles:
+            self.model.add_rectangle(MoveableRectangle.restore(
+                record.id, record.color, record.x - self.origin_x, record.y - self.origin_y,
+                record.width, record.height, list(record.port_ids), record.label
+            ))
+
+        for record in links:
+            if record.id not in self.link_regions:
+                link = Link(record.x1 - self.origin_x, record.y1 - self.origin_y, record.x2 - self.origin_x,
+                            record.y2 - self.origin_y, record.src_id, record.dst_id,
+                            Constants.LINK_WIDTH_PX, Constants.LINK_COLOR)
+                link.id = record.id
+                self.model.attach_link(link)
+                self.link_regions[record.id] = (record.src_region, record.dst_region)
+
+    def dematerialize(self, keys: Set[RegionKey]) -> None:
+        """
+        Removes the rectangles of the regions from the game model together with the links that have
+        no end in the regions that stay. The records must be written back before
+
+        Args:
+            keys (Set[RegionKey]): keys of the regions
+
+        Returns:
+            None
+        """
+        with self.lock:
+            rectangle_ids = {rectangle_id for key in keys for rectangle_id in self.regions[key].rectangles}
+
+        self.materialized -= keys
+
+        link_ids = {link_id for link_id, regions in self.link_regions.items()
+                    if regions[0] not in self.materialized and regions[1] not in self.materialized}
+
+        self.model.detach_objects(rectangle_ids, link_ids)
+
+        for link_id in link_ids:
+            del self.link_regions[link_id]
+
+    def update_view(self) -> None:
+        """
+        Materializes the regions that came under the view, dematerializes the ones that left it,
+        requests the regions around the view to be prefetched and evicts the idle ones
+
+        Returns:
+            None
+        """
+        self.write_back()
+        view_regions = self.get_view_regions()
+        leaving_regions = self.materialized - view_regions
+
+        if leaving_regions:
+            self.dematerialize(leaving_regions)
+
+        for key in sorted(view_regions - self.materialized):
+            self.materialize(key)
+
+        self.synced_version = self.model.version
+        self.model.recalculate_min_field_size()
+
+        for key in sorted(self.get_view_regions(self.prefetch_margin) - view_regions):
+            self.requests.put(key)
+
+        self.evict()
+
+    def move_view(self, x_offset: int, y_offset: int) -> None:
+        """
+        Moves the view over the world by the given offset
+
+        Args:
+            x_offset (int): x coordinate offset
+            y_offset (int): y coordinate offset
+
+        Returns:
+            None
+        """
+        self.write_back()
+        self.model.translate(-x_offset, -y_offset)
+        self.origin_x += x_offset
+        self.origin_y += y_offset
+        self.synced_version = self.model.version
+        self.update_view()
+
+    def evict(self) -> None:
+        """
+        Saves the changed regions outside of the view, so only the regions in the view hold unsaved changes,
+        and drops the least recently used of them while their records exceed the memory budget
+
+        Returns:
+            None
+        """
+        with self.lock:
+            idle_keys = [key for key in self.regions if key not in self.materialized]
+            idle_size = sum(self.regions[key].size() for key in idle_keys)
+
+            for key in idle_keys:
+                if self.regions[key].is_dirty:
+                    self.store.save(key, self.regions[key])
+
+            self.store.save_index()
+
+            for key in idle_keys:
+                if idle_size <= self.memory_budget:
+                    break
+
+                idle_size -= self.regions.pop(key).size()
+
+    def run(self) -> None:
+        """
+        Reads and decodes the requested regions. Runs on the background thread until None is received
+
+        Returns:
+            None
+        """
+        while (key := self.requests.get()) is not None:
+            with self.lock:
+                is_loaded = key in self.regions
+
+            if not is_loaded:
+                data = self.store.load(key)
+
+                with self.lock:
+                    self.regions.setdefault(key, data)
+
+            self.evict()
+            self.requests.task_done()
+
+    def flush(self) -> None:
+        """
+        Writes the changed regions to the disk
+
+        Returns:
+            None
+        """
+        self.write_back()
+
+        with self.lock:
+            for key, data in self.regions.items():
+                if data.is_dirty:
+                    self.store.save(key, data)
+
+            self.store.save_index()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background thread and writes the changed regions to the disk
+
+        Args:
+            timeout (Optional[float]): max time in seconds to wait for the background thread. Default = None
+
+        Returns:
+            None
+        """
+        self.requests.put(None)
+        self.thread.join(timeout)
+        self.flush()
@@ -0,0 +1,163 @@
+"""
+Implementation of the clipboard format of linked subgraphs, the rectangles of a selection with the links between them
+"""
+import json
+from typing import Iterable, List, NamedTuple, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import PORT_NORMALS, MoveableRectangle
+from models.GameModel import GameModel
+from utils import Constants
+from utils.MathUtils import has_border_collision
+
+SUBGRAPH_FORMAT: str = 'world-of-rectangles/subgraph'
+SUBGRAPH_MIME_TYPE: str = 'application/x-world-of-rectangles-subgraph'
+
+RectangleRecord = Tuple[str, int, int, int, int, str]
+LinkRecord = Tuple[int, int, int, int]
+
+
+class Subgraph(NamedTuple):
+    """
+    Copied rectangles with the links between them, without ids, so every paste creates new objects
+
+    Attributes:
+        rectangles (List[RectangleRecord]): color, x and y coordinates relative to the top left corner
+            of the subgraph, width, height and label of every rectangle, in paint order
+        links (List[LinkRecord]): rectangle and port indexes of the source and of the destination of every link
+        width (int): width of the bounds of the subgraph
+        height (int): height of the bounds of the subgraph
+    """
+    rectangles: List[RectangleRecord]
+    links: List[LinkRecord]
+    width: int
+    height: int
+
+
+def copy_subgraph(model: GameModel, rectangles: Iterable[MoveableRectangle]) -> Subgraph:
+    """
+    Copies the rectangles together with the rectangles nested in them and the links between the copied rectangles.
+    Links to rectangles outside of the copy are left out
+
+    Args:
+        model (GameModel): game model the rectangles belong to
+        rectangles (Iterable[MoveableRectangle]): rectangles to copy
+
+    Returns:
+        Subgraph: copied subgraph, empty if there are no rectangles
+    """
+    copied_ids = {id(rect) for rectangle in rectangles for rect in model.get_subtree(rectangle)}
+    copied = [rectangle for rectangle in model.rectangles if id(rectangle) in copied_ids]
+
+    if not copied:
+        return Subgraph([], [], 0, 0)
+
+    left = min(rectangle.x() for rectangle in copied)
+    top = min(rectangle.y() for rectangle in copied)
+    right = max(rectangle.x() + rectangle.width() for rectangle in copied)
+    bottom = max(rectangle.y() + rectangle.height() for rectangle in copied)
+
+    ports = {port.id: (index, port_index) for index, rectangle in enumerate(copied)
+             for port_index, port in enumerate(rectangle.ports)}
+
+    return Subgraph(
+        [(rectangle.color, rectangle.x() - left, rectangle.y() - top, rectangle.width(), rectangle.height(),
+          rectangle.label) for rectangle in copied],
+        [(*ports[link.src_id], *ports[link.dst_id]) for link in model.links
+         if link.src_id in ports and link.dst_id in ports],
+        right - left,
+        bottom - top,
+    )
+
+def encode_subgraph(subgraph: Subgraph) -> str:
+    """
+    Encodes the subgraph as compact JSON
+
+    Args:
+        subgraph (Subgraph): subgraph to encode
+
+    Returns:
+        str: encoded subgraph
+    """
+    return json.dumps({'format': SUBGRAPH_FORMAT, 'width': subgraph.width, 'height': subgraph.height,
+                       'rectangles': subgraph.rectangles, 'links': subgraph.links}, separators=(',', ':'))
+
+def decode_subgraph(text: str) -> Subgraph:
+    """
+    Decodes the subgraph encoded by encode_subgraph
+
+    Args:
+        text (str): encoded subgraph
+
+    Returns:
+        Subgraph: decoded subgraph
+
+    Raises:
+        ValueError: if the text is not an encoded subgraph
+    """
+    try:
+        data = json.loads(text)
+
+        if not isinstance(data, dict) or data.get('format') != SUBGRAPH_FORMAT:
+            raise ValueError('not a world of rectangles subgraph')
+
+        # the label was added later, copies without labels are still accepted
+        rectangles = [(str(color), int(x_coord), int(y_coord), int(width), int(height), str(label[0]) if label else '')
+                      for color, x_coord, y_coord, width, height, *label in data['rectangles']]
+        links = [(int(src), int(src_port), int(dst), int(dst_port)) for src, src_port, dst, dst_port in data['links']]
+        subgraph = Subgraph(rectangles, links, int(data['width']), int(data['height']))
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError('malformed world of rectangles subgraph') from error
+
+    if any(not 0 <= index < len(rectangles) or not 0 <= port_index < len(PORT_NORMALS)
+           for link in links for index, port_index in (link[:2], link[2:])):
+        raise ValueError('subgraph link refers to a missing port')
+
+    for color, x_coord, y_coord, width, height, _ in rectangles:
+        if color not in Constants.RECTANGLE_COLORS:
+            raise ValueError(f'subgraph rectangle has unknown color {color}')
+        if width < Constants.RECTANGLE_MIN_WIDTH_PX or height < Constants.RECTANGLE_MIN_HEIGHT_PX:
+            raise ValueError('subgraph rectangle is smaller than the minimum size')
+        if x_coord < 0 or y_coord < 0 or x_coord + width > subgraph.width or y_coord + height > subgraph.height:
+            raise ValueError('subgraph rectangle lies outside of the subgraph bounds')
+
+    return subgraph
+
+def paste_subgraph(model: GameModel, subgraph: Subgraph, x_coord: int, y_coord: int) -> List[MoveableRectangle]:
+    """
+    Adds new rectangles and links copied from the subgraph with its top left corner at the given position.
+    The whole subgraph is checked for collisions at once: its bounds must fit into the game field and
+    may overlap only the rectangles they lie inside. The pasted objects become the box selection
+
+    Args:
+        model (GameModel): game model to paste into
+        subgraph (Subgraph): subgraph to paste
+        x_coord (int): x coordinate of the top left corner of the pasted subgraph
+        y_coord (int): y coordinate of the top left corner of the pasted subgraph
+
+    Returns:
+        List[MoveableRectangle]: pasted rectangles, empty if the subgraph does not fit at the position
+    """
+    right, bottom = x_coord + subgraph.width, y_coord + subgraph.height
+
+    if not subgraph.rectangles or \
+            has_border_collision(x_coord, right, y_coord, bottom, model.field_width, model.field_height) or \
+            not model.find_container(x_coord, right, y_coord, bottom)[0]:
+        return []
+
+    pasted = []
+
+    for color, x_offset, y_offset, width, height, label in subgraph.rectangles:
+        rectangle = MoveableRectangle(x_coord + x_offset + width / 2, y_coord + y_offset + height / 2, width, height)
+        rectangle.color = color
+        rectangle.label = label
+        model.add_rectangle(rectangle)
+        pasted.append(rectangle)
+
+    links: List[Link] = [model.add_link(pasted[src].ports[src_port], pasted[dst].ports[dst_port])
+                         for src, src_port, dst, dst_port in subgraph.links]
+
+    model.select_objects({rectangle.id for rectangle in pasted}, {link.id for link in links})
+    model.recalculate_min_field_size()
+
+    return pasted
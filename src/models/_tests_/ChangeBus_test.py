@@ -0,0 +1,111 @@
+import pytest
+
+from src.controllers.GameController import GameController
+from src.models.ChangeBus import (LINK_ADDED, LINK_MOVED, LINK_REMOVED, PORT_MOVED, RECTANGLE_ADDED, RECTANGLE_MOVED,
+                                  RECTANGLE_REMOVED, SELECTION_CHANGED, ChangeBus)
+from src.models.GameModel import GameModel
+
+
+def subscribe(bus, kinds=None):
+    received = []
+    bus.subscribe(received.append, kinds)
+    return received
+
+
+class TestChangeBus:
+    def test_coalesces_events_of_tick(self):
+        scheduled = []
+        bus = ChangeBus(scheduled.append)
+        received = subscribe(bus)
+        first, second = object(), object()
+
+        for _ in range(10):
+            bus.emit(RECTANGLE_MOVED, first)
+
+        bus.emit(RECTANGLE_MOVED, second)
+        bus.emit(RECTANGLE_REMOVED, first)
+        bus.emit(RECTANGLE_ADDED, first)
+        bus.emit(RECTANGLE_MOVED, first)
+
+        assert scheduled == [bus.flush]
+
+        scheduled.pop()()
+
+        assert [[(event.kind, event.item) for event in events] for events in received] == [[
+            (RECTANGLE_MOVED, second), (RECTANGLE_REMOVED, first), (RECTANGLE_ADDED, first), (RECTANGLE_MOVED, first)
+        ]]
+
+        bus.emit(RECTANGLE_MOVED, first)
+
+        assert scheduled == [bus.flush]
+
+    def test_filters_kinds(self):
+        bus = ChangeBus()
+        links = subscribe(bus, {LINK_ADDED, LINK_REMOVED})
+        bus.emit(RECTANGLE_ADDED, object())
+
+        assert not bus.pending
+
+        everything = subscribe(bus)
+        bus.emit(RECTANGLE_ADDED, 1)
+        bus.emit(LINK_ADDED, 2)
+        bus.flush()
+
+        assert [event.item for events in links for event in events] == [2]
+        assert [event.item for events in everything for event in events] == [1, 2]
+
+        bus.unsubscribe(everything.append)
+        bus.emit(RECTANGLE_ADDED, 3)
+
+        assert not bus.pending
+
+        with pytest.raises(ValueError):
+            bus.subscribe(links.append, {'rectangle_renamed'})
+
+    def test_delivers_events_emitted_while_flushing_next_tick(self):
+        bus = ChangeBus()
+        received = []
+
+        def handle(events):
+            received.append([event.kind for event in events])
+            if events[0].kind == RECTANGLE_ADDED:
+                bus.emit(LINK_ADDED, 1)
+
+        bus.subscribe(handle)
+        bus.emit(RECTANGLE_ADDED, 0)
+        bus.flush()
+        bus.flush()
+
+        assert received == [[RECTANGLE_ADDED], [LINK_ADDED]]
+
+    def test_game_model_emits_changes(self):
+        controller = GameController(GameModel())
+        model = controller.model
+        received = subscribe(model.changes)
+
+        controller.double_click(300, 300)
+        controller.double_click(600, 300)
+        first, second = model.rectangles
+        link = model.add_link(first.ports[1], second.ports[3])
+        model.changes.flush()
+
+        assert [(event.kind, event.item) for event in received.pop()] == [
+            # the selection changed twice, it is reported once at its last change
+            (RECTANGLE_ADDED, first), (RECTANGLE_ADDED, second), (SELECTION_CHANGED, None), (LINK_ADDED, link)
+        ]
+
+        for _ in range(3):
+            model.move_rectangle(first, 0, 10)
+
+        model.changes.flush()
+
+        assert [(event.kind, event.item) for event in received.pop()] == [
+            (RECTANGLE_MOVED, first), *((PORT_MOVED, port) for port in first.ports), (LINK_MOVED, link)
+        ]
+
+        model.remove_rectangle(second)
+        model.changes.flush()
+
+        assert [(event.kind, event.item) for event in received.pop()] == [
+            (LINK_REMOVED, link), (RECTANGLE_REMOVED, second)
+        ]
@@ -1,7 +1,10 @@
 from PyQt6.QtGui import QColor
 
+from src.benchmarks.RenderBenchmark import build_scene
 from src.components.Link import Link
+from src.components.MoveableRectangle import MoveableRectangle
 from src.models.GameModel import GameModel
+from src.utils.MathUtils import has_segment_overlap
 
 
 class TestGameModel:
@@ -20,6 +23,8 @@ class TestGameModel:
             "rectangles": [],
             "links": [],
             "linked_port_ids": [],
+            "ports_by_id": {},
+            "port_links": {},
             "selected_rectangle": None,
             "selected_port": None,
             "hovered_port": None,
@@ -27,10 +32,31 @@ class TestGameModel:
             "x1": 0,
             "x2": 0,
             "y1": 0,
-            "y2": 0
+            "y2": 0,
+            "version": 0,
+            "edge_indexes": {"left": [], "center_x": [], "right": [], "top": [], "center_y": [], "bottom": []},
+            "containers": {},
+            "rectangle_trees": {},
+            "is_grid_snap_enabled": False,
+            "is_guide_snap_enabled": False,
+            "vertical_guides": [],
+            "horizontal_guides": [],
+            "journal": None,
+            "is_curved_links_enabled": False,
+            "link_paths": None,
+            "resized_size": None,
+            "selection_box": None,
+            "selected_rectangle_ids": set(),
+            "selected_link_ids": set(),
+            "selection_version": 0,
+            "is_compaction_enabled": False,
+            "is_push_enabled": False
         }
 
-        actual_attributes = vars(model)
+        actual_attributes = dict(vars(model))
+
+        assert len(actual_attributes.pop("link_tree")) == 0
+        assert not actual_attributes.pop("changes").subscribers
 
         for attribute in actual_attributes:
             assert attribute in expected_attributes
@@ -106,48 +132,60 @@ class TestGameModel:
         assert model.find_selected_link(expected_x, expected_y) is expected_link
         assert model.find_selected_link(1000, 1000) is None
 
-    def test_update_links_offset(self):
+    def test_links_follow_moved_rectangle(self):
         model = GameModel()
 
-        x1 = 10
-        y1 = 10
-
-        x2 = 500
-        y2 = 500
-
-        is_added1 = model.try_add_new_rectangle(x1, y1)
-        is_added2 = model.try_add_new_rectangle(x2, y2)
-        assert is_added1 and is_added2
+        first = model.try_add_new_rectangle(100, 100)
+        second = model.try_add_new_rectangle(500, 500)
+        assert first and second
 
         x_offset = 15
         y_offset = 10
 
-        port1 = model.rectangles[0].ports[0]
-        port2 = model.rectangles[1].ports[0]
-        expected_link = Link.from_ports(port1, port2, 4, QColor('white'))
-        model.links.append(expected_link)
-
-        model.selected_rectangle = model.rectangles[0]
+        link = model.add_link(first.ports[1], second.ports[3])
         expected_x1, expected_y1, expected_x2, expected_y2 = (
-            expected_link.x1() + x_offset,
-            expected_link.y1() + y_offset,
-            expected_link.x2(),
-            expected_link.y2()
+            link.x1() + x_offset,
+            link.y1() + y_offset,
+            link.x2(),
+            link.y2()
         )
 
-        model.update_links_offset(x_offset, y_offset)
+        model.move_rectangle(first, x_offset, y_offset)
 
-        actual_x1, actual_y1, actual_x2, actual_y2 = (
-            expected_link.x1(),
-            expected_link.y1(),
-            expected_link.x2(),
-            expected_link.y2()
-        )
+        assert (link.x1(), link.y1(), link.x2(), link.y2()) == (expected_x1, expected_y1, expected_x2, expected_y2)
+        assert (link.x1(), link.y1()) == (first.ports[1].x() + 5, first.ports[1].y() + 5)
+        assert list(model.link_tree.query(expected_x1, expected_y1, expected_x1 + 1, expected_y1 + 1)) == [link]
+
+        model.resize_rectangle(second, 120, 80)
 
-        assert expected_x1 == actual_x1
-        assert expected_y1 == actual_y1
-        assert expected_x2 == actual_x2
-        assert expected_y2 == actual_y2
+        assert (link.x2(), link.y2()) == second.ports[3].get_link_end() == (second.x(), second.y() + 40)
+
+    def test_link_end_without_port_stays_until_port_is_added(self):
+        model = GameModel()
+        first = model.try_add_new_rectangle(100, 100)
+        second = MoveableRectangle(500, 500, 100, 50)
+        dst_x, dst_y = second.ports[3].get_link_end()
+        link = Link(0, 0, dst_x, dst_y, first.ports[1].id, second.ports[3].id, 4, 'white')
+        model.attach_link(link)
+
+        assert (link.x1(), link.y1()) == first.ports[1].get_link_end()
+
+        model.translate(10, 20)
+
+        assert (link.x1(), link.y1()) == first.ports[1].get_link_end()
+        assert (link.x2(), link.y2()) == (dst_x + 10, dst_y + 20)
+
+        second.setRect(second.x() + 10, second.y() + 20, second.width(), second.height())
+        model.add_rectangle(second)
+        model.move_rectangle(second, 0, 30)
+
+        assert (link.x2(), link.y2()) == (dst_x + 10, dst_y + 50)
+
+        model.detach_objects({second.id}, set())
+        model.move_rectangle(first, 0, 30)
+
+        assert (link.x2(), link.y2()) == (dst_x + 10, dst_y + 50)
+        assert (link.x1(), link.y1()) == first.ports[1].get_link_end()
 
     def test_recalculate_min_field_size(self):
         model = GameModel()
@@ -164,3 +202,189 @@ class TestGameModel:
 
         assert actual_min_width == expected_min_width
         assert actual_min_height == expected_min_height
+
+    def test_edge_indexes(self):
+        model = GameModel()
+        model.try_add_new_rectangle(500, 500)
+        model.try_add_new_rectangle(200, 100)
+        model.try_add_new_rectangle(800, 300)
+
+        model.selected_rectangle = model.rectangles[0]
+        model.move_selected_rectangle(-120, 40)
+
+        for name, coord_index in (('left', 0), ('center_x', 1), ('right', 2)):
+            expected_index = sorted((rect.get_alignment_coordinates()[0][coord_index], rect.id)
+                                    for rect in model.rectangles)
+            assert model.edge_indexes[name] == expected_index
+
+        for name, coord_index in (('top', 0), ('center_y', 1), ('bottom', 2)):
+            expected_index = sorted((rect.get_alignment_coordinates()[1][coord_index], rect.id)
+                                    for rect in model.rectangles)
+            assert model.edge_indexes[name] == expected_index
+
+    def test_snap_offset(self):
+        model = GameModel()
+        anchor = model.try_add_new_rectangle(200, 200)
+        model.selected_rectangle = model.try_add_new_rectangle(500, 403)
+
+        assert model.snap_offset(4, 0) == (4, 0)
+        assert not model.vertical_guides and not model.horizontal_guides
+
+        model.is_guide_snap_enabled = True
+        x_offset, y_offset = model.snap_offset(-296, -190)
+
+        assert (model.selected_rectangle.x() + x_offset, y_offset) == (anchor.x(), -190)
+        assert model.vertical_guides == anchor.get_alignment_coordinates()[0]
+        assert not model.horizontal_guides
+
+        model.is_grid_snap_enabled = True
+        x_offset, y_offset = model.snap_offset(-296, -190)
+
+        assert model.selected_rectangle.x() + x_offset == anchor.x()
+        assert (model.selected_rectangle.y() + y_offset) % 25 == 0
+
+    def test_clone_keeps_link_ends(self):
+        model = GameModel()
+        src_rectangle = model.try_add_new_rectangle(200, 200)
+        dst_rectangle = model.try_add_new_rectangle(500, 200)
+        model.add_link(src_rectangle.ports[1], dst_rectangle.ports[3])
+
+        clone = GameModel(model)
+        clone_link = clone.links[0]
+
+        assert clone_link.src_id == clone.rectangles[0].ports[1].id
+        assert clone_link.dst_id == clone.rectangles[1].ports[3].id
+        assert sorted(clone.linked_port_ids) == sorted([clone_link.src_id, clone_link.dst_id])
+
+    def test_nested_rectangles(self):
+        model = GameModel()
+        container = MoveableRectangle(300, 300, 300, 200)
+        model.add_rectangle(container)
+        child = model.try_add_new_rectangle(250, 250)
+        sibling = model.try_add_new_rectangle(380, 350)
+
+        assert model.containers[id(child)] is container and model.containers[id(sibling)] is container
+        assert model.get_children(container) == [child, sibling]
+        assert model.find_selected_rectangle(250, 250) is child
+        assert model.find_selected_rectangle(420, 250) is container
+        assert model.try_add_new_rectangle(300, 260) is None
+        assert model.has_collision(child, 200, 0)
+        assert not model.has_collision(child, 20, 0)
+
+        link = model.add_link(child.ports[1], sibling.ports[3])
+        model.move_rectangle(container, 100, 50)
+
+        assert (child.x(), child.y(), sibling.x(), sibling.y()) == (300, 275, 430, 375)
+        assert (link.x1(), link.y1()) == (child.ports[1].x() + 5, child.ports[1].y() + 5)
+        assert model.find_selected_rectangle(350, 300) is child
+
+        model.remove_rectangle(container)
+
+        assert model.containers[id(child)] is None
+        assert model.find_selected_rectangle(350, 300) is child
+
+    def test_resize_rectangle(self):
+        model = GameModel()
+        rectangle = model.try_add_new_rectangle(300, 300)
+        neighbour = model.try_add_new_rectangle(500, 300)
+        link = model.add_link(rectangle.ports[1], neighbour.ports[3])
+
+        assert not model.can_resize(rectangle, 300, 50)
+        assert model.can_resize(rectangle, 140, 120)
+
+        model.resize_rectangle(rectangle, 140, 120)
+
+        assert (rectangle.x(), rectangle.y(), rectangle.width(), rectangle.height()) == (250, 275, 140, 120)
+        assert [(port.x(), port.y()) for port in rectangle.ports] == \
+            [(port.x(), port.y()) for port in MoveableRectangle(320, 335, 140, 120).ports]
+        assert (link.x1(), link.y1()) == (rectangle.ports[1].x() + 5, rectangle.ports[1].y() + 5)
+        assert model.find_selected_rectangle(380, 390) is rectangle
+
+    def test_select_in_box(self):
+        model = build_scene(64)
+        model.move_rectangle(model.rectangles[10], 37, 11)
+
+        for corners in [(0, 0, 1023, 767), (300, 420, 120, 200), (555, 333, 555, 333), (130, 60, 135, 500)]:
+            model.select_in_box(*corners)
+            left, top, right, bottom = model.selection_box
+
+            assert model.selected_rectangle_ids == {
+                rect.id for rect in model.rectangles
+                if rect.x() <= right and left < rect.x() + rect.width() and rect.y() <= bottom
+                and top < rect.y() + rect.height()}
+            assert model.selected_link_ids == {
+                link.id for link in model.links
+                if has_segment_overlap(link.x1(), link.y1(), link.x2(), link.y2(), left, right, top, bottom)}
+
+        model.select_in_box(0, 0, 1023, 767)
+        model.remove_link(model.links[0])
+
+        assert len(model.selected_link_ids) == len(model.links)
+
+        model.clear_box_selection()
+
+        assert model.selection_box is None and not model.selected_rectangle_ids and not model.selected_link_ids
+
+    def test_select_nested_rectangles_in_box(self):
+        model = GameModel()
+        container = MoveableRectangle(400, 400, 300, 200)
+        model.add_rectangle(container)
+        child = model.try_add_new_rectangle(330, 350)
+
+        model.select_in_box(260, 310, 270, 320)
+
+        assert model.selected_rectangle_ids == {container.id}
+
+        model.select_in_box(270, 320, 290, 340)
+
+        assert model.selected_rectangle_ids == {container.id, child.id}
+
+    def test_compact_field(self):
+        model = GameModel()
+        container = MoveableRectangle(250, 200, 300, 200)
+        model.add_rectangle(container)
+        child = MoveableRectangle(200, 200, 100, 50)
+        model.add_rectangle(child)
+        right = MoveableRectangle(800, 200, 100, 50)
+        model.add_rectangle(right)
+        bottom = MoveableRectangle(250, 650, 100, 50)
+        model.add_rectangle(bottom)
+        link = model.add_link(child.ports[1], right.ports[3])
+        link_ends = (link.x1(), link.y1(), link.x2(), link.y2())
+        port = (right.ports[3].x(), right.ports[3].y())
+
+        assert not model.compact_field(900, 700)
+        assert model.compact_field(600, 500)
+
+        assert [(rect.x(), rect.y()) for rect in model.rectangles] == [(100, 100), (150, 175), (500, 175), (200, 450)]
+        assert (link.x1(), link.y1(), link.x2(), link.y2()) == (link_ends[0], link_ends[1],
+                                                                link_ends[2] - 250, link_ends[3])
+        assert (right.ports[3].x(), right.ports[3].y()) == (port[0] - 250, port[1])
+        assert model.containers[id(child)] is container
+        assert list(model.rectangle_trees[None].query(500, 175, 501, 176)) == [right]
+
+        model.is_compaction_enabled = True
+
+        assert model.recalculate_min_field_size() == (300 + 100, 200 + 50)
+
+    def test_push_long_chain(self):
+        model = GameModel()
+        model.field_width = 20000
+        chain = [MoveableRectangle(5 + index * 15, 300, 10, 50) for index in range(1000)]
+
+        for rectangle in chain:
+            model.add_rectangle(rectangle)
+
+        for frame in range(1, 31):
+            distance, offsets = model.find_pushed_rectangles(chain[0], 100 * (frame - 1), 0, 100, False)
+
+            assert distance == 100
+            model.shift_rectangles(offsets)
+
+        # the gaps close one by one, the rectangles behind the first 600 gaps are not reached
+        assert [chain[index].x() for index in (0, 1, 600, 601, 999)] == [0, 3010, 9000, 9015, 14985]
+        assert all(second.x() - first.x() >= 10 for first, second in zip(chain, chain[1:]))
+
+        distance, offsets = model.find_pushed_rectangles(chain[0], 3000, 100, -200, True)
+
+        assert distance == -200 and not offsets
@@ -0,0 +1,153 @@
+import os
+
+from src.models.GameModel import GameModel
+from src.models.ShardedWorld import ShardedWorld
+from src.persistence.RegionStore import RegionStore
+
+
+def open_world(directory, memory_budget=65536):
+    model = GameModel()
+    model.field_width, model.field_height = 600, 400
+    return ShardedWorld(model, RegionStore(str(directory), 256), memory_budget)
+
+
+def world_rectangles(world):
+    return sorted((rect.id, rect.x() + world.origin_x, rect.y() + world.origin_y, rect.label)
+                  for rect in world.model.rectangles)
+
+
+def build_world(directory):
+    world = open_world(directory)
+    model = world.model
+    near = model.try_add_new_rectangle(100, 100)
+    model.try_add_new_rectangle(400, 300)
+    world.move_view(2000, 1000)
+    far = model.try_add_new_rectangle(300, 200)
+    model.set_label(far, 'far')
+    world.move_view(-2000, -1000)
+
+    return world, near.id, far.id
+
+
+class TestShardedWorld:
+    def test_pages_regions_in_and_out(self, tmp_path):
+        world, near_id, far_id = build_world(tmp_path)
+
+        assert [rect.id for rect in world.model.rectangles if rect.id in (near_id, far_id)] == [near_id]
+        assert all(key[0] < 4 and key[1] < 4 for key in world.materialized)
+
+        world.move_view(2000, 1000)
+
+        assert far_id in [rect.id for rect in world.model.rectangles]
+        assert near_id not in [rect.id for rect in world.model.rectangles]
+        assert world_rectangles(world) == [(far_id, 2250, 1175, 'far')]
+        world.close()
+
+    def test_restores_world_from_regions(self, tmp_path):
+        world, _, _ = build_world(tmp_path)
+        world.move_view(2000, 1000)
+        far_rectangles = world_rectangles(world)
+        world.move_view(-2000, -1000)
+        near_rectangles = world_rectangles(world)
+        world.close()
+
+        world = open_world(tmp_path)
+        assert world_rectangles(world) == near_rectangles
+        world.move_view(2000, 1000)
+        assert world_rectangles(world) == far_rectangles
+        world.close()
+
+    def test_keeps_links_across_regions(self, tmp_path):
+        world = open_world(tmp_path)
+        model = world.model
+        left = model.try_add_new_rectangle(100, 200)
+        right = model.try_add_new_rectangle(500, 200)
+        link = model.add_link(left.ports[1], right.ports[3])
+        src_end, dst_end = (link.x1(), link.y1()), (link.x2(), link.y2())
+
+        world.move_view(-400, 0)
+
+        assert [rect.id for rect in model.rectangles] == [left.id]
+        assert [(item.id, item.x2(), item.y2()) for item in model.links] == [(link.id, dst_end[0] + 400, dst_end[1])]
+
+        model.move_rectangle(model.rectangles[0], 0, 40)
+        world.move_view(2000, 0)
+
+        assert not model.links and not model.linked_port_ids
+
+        world.move_view(-1600, 0)
+        world.close()
+
+        world = open_world(tmp_path)
+        assert [(item.id, item.x1(), item.y1(), item.x2(), item.y2()) for item in world.model.links] == \
+            [(link.id, src_end[0], src_end[1] + 40, *dst_end)]
+
+        world.model.remove_link(world.model.links[0])
+        world.move_view(-400, 0)
+        world.move_view(800, 0)
+
+        assert [rect.id for rect in world.model.rectangles] == [right.id]
+        assert not world.model.links
+        world.close()
+
+    def test_prefetches_and_evicts_regions(self, tmp_path):
+        world = open_world(tmp_path, memory_budget=4)
+
+        for column in range(6):
+            world.model.try_add_new_rectangle(60 + column * 90, 60)
+            world.model.try_add_new_rectangle(60 + column * 90, 300)
+            world.move_view(600, 0)
+
+        world.requests.join()
+
+        idle = [data.size() for key, data in world.regions.items() if key not in world.materialized]
+
+        assert sum(idle) <= 4
+        assert not any(data.is_dirty for key, data in world.regions.items() if key not in world.materialized)
+        world.close()
+
+        world = open_world(tmp_path)
+        rectangle_ids = set()
+
+        for _ in range(6):
+            rectangle_ids.update(rect.id for rect in world.model.rectangles)
+            world.move_view(600, 0)
+
+        assert len(rectangle_ids) == 12
+        world.close()
+
+    def test_shows_large_rectangles_from_other_regions(self, tmp_path):
+        world = open_world(tmp_path)
+        wide = world.model.try_add_new_rectangle(100, 100)
+        world.model.resize_rectangle(wide, 1500, 100)
+        world.move_view(1000, 0)
+
+        assert [rect.id for rect in world.model.rectangles] == [wide.id]
+        world.move_view(1000, 0)
+
+        assert not world.model.rectangles
+        world.close()
+
+        world = open_world(tmp_path)
+        world.move_view(1000, 0)
+
+        assert [(rect.id, rect.width()) for rect in world.model.rectangles] == [(wide.id, 1500)]
+        world.close()
+
+    def test_summarizes_regions_that_are_not_loaded(self, tmp_path):
+        world, _, far_id = build_world(tmp_path)
+        world.move_view(2000, 1000)
+        far = world.model.rectangles[0]
+        far_bounds = (far.x() + 2000, far.y() + 1000, far.right() + 2001, far.bottom() + 1001, far.color)
+        world.move_view(-2000, -1000)
+
+        assert far_bounds in [tuple(summary) for summary in world.get_region_summaries().values()]
+        assert world.get_world_bounds()[2:] == far_bounds[2:4]
+        world.close()
+
+        os.remove(world.store.get_index_path())
+        world = open_world(tmp_path)
+
+        assert far_bounds in [tuple(summary) for summary in world.get_region_summaries().values()]
+        assert os.path.exists(world.store.get_index_path())
+        world.close()
@@ -0,0 +1,109 @@
+import pytest
+
+from src.components.MoveableRectangle import MoveableRectangle
+from src.models.GameModel import GameModel
+from src.models.Subgraph import copy_subgraph, decode_subgraph, encode_subgraph, paste_subgraph
+
+
+def build_linked_model():
+    model = GameModel()
+    model.field_width, model.field_height = 2000, 1000
+    container = MoveableRectangle(250, 250, 300, 200)
+    model.add_rectangle(container)
+    child = MoveableRectangle(200, 250, 100, 50)
+    model.add_rectangle(child)
+    right = MoveableRectangle(600, 250, 100, 50)
+    model.add_rectangle(right)
+    outside = MoveableRectangle(600, 500, 100, 50)
+    model.add_rectangle(outside)
+    model.add_link(child.ports[1], right.ports[3])
+    model.add_link(right.ports[2], outside.ports[0])
+
+    return model, container, child, right
+
+
+class TestSubgraph:
+    def test_round_trips_encoded_subgraph(self):
+        model, container, child, right = build_linked_model()
+        child.label = 'child'
+        subgraph = copy_subgraph(model, [right, container])
+
+        assert decode_subgraph(encode_subgraph(subgraph)) == subgraph
+        assert (subgraph.width, subgraph.height) == (550, 200)
+        assert [record[1:] for record in subgraph.rectangles] == [(0, 0, 300, 200, ''), (50, 75, 100, 50, 'child'),
+                                                                  (450, 75, 100, 50, '')]
+        # the link to the rectangle outside of the copy is left out
+        assert subgraph.links == [(1, 1, 2, 3)]
+
+    def test_rejects_malformed_subgraph(self):
+        for text in ('not json', '[]', '{"format": "other"}',
+                     '{"format": "world-of-rectangles/subgraph", "width": 1, "height": 1, "rectangles": []}',
+                     '{"format": "world-of-rectangles/subgraph", "width": 1, "height": 1, '
+                     '"rectangles": [["#fff", 0, 0, 1, 1]], "links": [[0, 0, 1, 0]]}',
+                     # unknown color, below the minimum size and outside of the subgraph bounds
+                     '{"format": "world-of-rectangles/subgraph", "width": 40, "height": 20, '
+                     '"rectangles": [["#fff", 0, 0, 40, 20]], "links": []}',
+                     '{"format": "world-of-rectangles/subgraph", "width": 40, "height": 20, '
+                     '"rectangles": [["cyan", 0, 0, 10, 5]], "links": []}',
+                     '{"format": "world-of-rectangles/subgraph", "width": 40, "height": 20, '
+                     '"rectangles": [["cyan", 10, 0, 40, 20]], "links": []}',
+                     '{"format": "world-of-rectangles/subgraph", "width": 40, "height": 20, '
+                     '"rectangles": [["cyan", 0, -5, 40, 20]], "links": []}'):
+            with pytest.raises(ValueError):
+                decode_subgraph(text)
+
+    def test_decodes_subgraph_without_labels(self):
+        text = ('{"format": "world-of-rectangles/subgraph", "width": 40, "height": 20, '
+                '"rectangles": [["cyan", 0, 0, 40, 20]], "links": []}')
+
+        assert decode_subgraph(text).rectangles == [('cyan', 0, 0, 40, 20, '')]
+
+    def test_pastes_linked_copy(self):
+        model, container, child, right = build_linked_model()
+        subgraph = copy_subgraph(model, [container, right])
+        pasted = paste_subgraph(model, subgraph, 100, 600)
+
+        assert len(pasted) == 3 and len(model.rectangles) == 7
+        assert [(rect.x(), rect.y(), rect.color) for rect in pasted] == [
+            (100, 600, container.color), (150, 675, child.color), (550, 675, right.color)
+        ]
+        assert [rect.label for rect in pasted] == ['', '', '']
+        assert model.containers[id(pasted[1])] is pasted[0]
+
+        link = model.links[-1]
+
+        assert (link.src_id, link.dst_id) == (pasted[1].ports[1].id, pasted[2].ports[3].id)
+        assert model.selected_rectangle_ids == {rect.id for rect in pasted}
+        assert model.selected_link_ids == {link.id}
+
+    def test_rejects_colliding_paste(self):
+        model, container, _, _ = build_linked_model()
+        subgraph = copy_subgraph(model, [container])
+        version = model.version
+
+        assert not paste_subgraph(model, subgraph, 400, 300)
+        assert not paste_subgraph(model, subgraph, 1900, 100)
+        assert model.version == version and len(model.rectangles) == 4
+
+        # fits inside a larger rectangle as its child
+        host = MoveableRectangle(1300, 500, 500, 400)
+        model.add_rectangle(host)
+        pasted = paste_subgraph(model, subgraph, 1100, 350)
+
+        assert model.containers[id(pasted[0])] is host
+
+    def test_pastes_large_subgraph(self):
+        model = GameModel()
+        model.field_width, model.field_height = 8000, 8000
+
+        for index in range(1000):
+            model.add_rectangle(MoveableRectangle(60 + index % 32 * 120, 30 + index // 32 * 60, 100, 50))
+
+        for index in range(999):
+            model.add_link(model.rectangles[index].ports[1], model.rectangles[index + 1].ports[3])
+
+        subgraph = decode_subgraph(encode_subgraph(copy_subgraph(model, model.rectangles)))
+        pasted = paste_subgraph(model, subgraph, 10, 4000)
+
+        assert len(pasted) == 1000 and len(model.links) == 1998
+        assert all(model.containers[id(rect)] is None for rect in pasted)
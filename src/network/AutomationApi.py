@@ -0,0 +1,510 @@
+"""
+Implementation of the JSON-RPC 2.0 automation API of the game model.
+Requests are JSON-RPC objects, a batch is a JSON array of them, one request or batch per line.
+
+Methods:
+    add_rectangle {"x": int, "y": int, "width": int, "height": int, ["color": str], ["label": str]} -> RectangleInfo
+    add_rectangles {"rectangles": [add_rectangle params]} -> [RectangleInfo]
+    move_rectangle {"id": rectangle id, "x": int, "y": int} -> RectangleInfo
+    link {"src": port id, "dst": port id} -> link id
+    unlink {"id": link id} -> true
+    query_region {"x": int, "y": int, "width": int, "height": int} -> {"rectangles": [RectangleInfo],
+        "links": [[id, source port id, destination port id]]}
+    export {["ids": [rectangle id]]} -> subgraph text of the rectangles, of every top level rectangle by default
+
+A RectangleInfo is {"id", "x", "y", "width", "height", "color", "label", "ports": [port ids]}, x and y are the top
+left corner. A batch is one transaction: its requests are applied in order, and if one of them fails, the changes
+of the ones before it are undone, it is answered with its error and every other request with TRANSACTION_ERROR
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from components.Port import Port
+from models.GameModel import GameModel
+from models.Subgraph import copy_subgraph, encode_subgraph
+from utils import Constants
+
+PARSE_ERROR: int = -32700
+INVALID_REQUEST: int = -32600
+METHOD_NOT_FOUND: int = -32601
+INVALID_PARAMS: int = -32602
+INTERNAL_ERROR: int = -32603
+REJECTED_ERROR: int = -32000
+TRANSACTION_ERROR: int = -32001
+
+Params = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+class RpcError(Exception):
+    """
+    The RpcError, child of Exception class, that fails the request with a JSON-RPC error
+
+    Args:
+        code (int): JSON-RPC error code
+        message (str): description of the error
+
+    Attributes:
+        code (int): JSON-RPC error code
+        message (str): description of the error
+    """
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+
+        self.code = code
+        self.message = message
+
+
+def get_int(params: Params, name: str) -> int:
+    """
+    Gets the integer parameter
+
+    Args:
+        params (Params): request parameters
+        name (str): name of the parameter
+
+    Returns:
+        int: value of the parameter
+
+    Raises:
+        RpcError: if the parameter is missing or is not an integer
+    """
+    value = params.get(name)
+
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise RpcError(INVALID_PARAMS, f'{name} must be an integer')
+
+    return value
+
+def get_str(params: Params, name: str) -> str:
+    """
+    Gets the string parameter
+
+    Args:
+        params (Params): request parameters
+        name (str): name of the parameter
+
+    Returns:
+        str: value of the parameter
+
+    Raises:
+        RpcError: if the parameter is missing or is not a string
+    """
+    value = params.get(name)
+
+    if not isinstance(value, str):
+        raise RpcError(INVALID_PARAMS, f'{name} must be a string')
+
+    return value
+
+def rectangle_to_info(rectangle: MoveableRectangle) -> Dict[str, Any]:
+    """
+    Converts the rectangle to its RectangleInfo
+
+    Args:
+        rectangle (MoveableRectangle): rectangle to convert
+
+    Returns:
+        Dict[str, Any]: rectangle info
+    """
+    return {'id': rectangle.id, 'x': rectangle.x(), 'y': rectangle.y(), 'width': rectangle.width(),
+            'height': rectangle.height(), 'color': rectangle.color, 'label': rectangle.label,
+            'ports': [port.id for port in rectangle.ports]}
+
+def encode_response(response: Any) -> bytes:
+    """
+    Encodes the response or the batch of responses as one line of compact JSON
+
+    Args:
+        response (Any): response or list of responses
+
+    Returns:
+        bytes: encoded response, with the trailing newline
+    """
+    return json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class AutomationApi:
+    """
+    The AutomationApi that applies JSON-RPC requests to the game model. Every batch is applied as one transaction,
+    so a script builds a large diagram with one call: the rectangles are checked for collisions while they
+    are added, and the views re-paint once, as the game model reports the changes of the whole batch at the end
+    of the event loop tick. Failed transactions are undone in the reverse order of their changes
+
+    Args:
+        model (GameModel): game model to change
+
+    Attributes:
+        model (GameModel): game model to change
+        methods (Dict[str, Callable[[Params], Any]]): handlers of the requests by method name
+        rectangles (Dict[str, MoveableRectangle]): rectangles by id
+        ports (Dict[str, Port]): ports by id
+        links (Dict[str, Link]): links by id
+        linked_port_ids (Set[str]): ids of the linked ports, the list of the game model is slow to search
+        index_version (int): version of the game model the indexes by id were built at
+        undo (List[Callable[[], None]]): functions that undo the changes of the running transaction
+    """
+    def __init__(self, model: GameModel):
+        self.model = model
+        self.methods: Dict[str, Callable[[Params], Any]] = {
+            'add_rectangle': self.add_rectangle,
+            'add_rectangles': self.add_rectangles,
+            'move_rectangle': self.move_rectangle,
+            'link': self.link,
+            'unlink': self.unlink,
+            'query_region': self.query_region,
+            'export': self.export,
+        }
+        self.rectangles: Dict[str, MoveableRectangle] = {}
+        self.ports: Dict[str, Port] = {}
+        self.links: Dict[str, Link] = {}
+        self.linked_port_ids: Set[str] = set()
+        self.index_version = -1
+        self.undo: List[Callable[[], None]] = []
+
+    def handle_line(self, line: bytes) -> Optional[bytes]:
+        """
+        Applies the encoded request or batch and encodes the responses
+
+        Args:
+            line (bytes): JSON-RPC request or batch
+
+        Returns:
+            Optional[bytes]: encoded response or batch of responses, None if only notifications were sent
+        """
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            return encode_response(self.get_error_response(None, RpcError(PARSE_ERROR, 'parse error')))
+
+        if isinstance(payload, list):
+            if not payload:
+                return encode_response(self.get_error_response(None, RpcError(INVALID_REQUEST, 'empty batch')))
+
+            responses = [response for response in self.execute(payload) if response is not None]
+            return encode_response(responses) if responses else None
+
+        response = self.execute([payload])[0]
+        return None if response is None else encode_response(response)
+
+    def execute(self, requests: List[Any]) -> List[Optional[Response]]:
+        """
+        Applies the requests as one transaction, undone on any failure, an unexpected exception
+        is answered with INTERNAL_ERROR
+
+        Args:
+            requests (List[Any]): decoded requests
+
+        Returns:
+            List[Optional[Response]]: response to every request, None for the notifications
+        """
+        self.update_indexes()
+        self.undo = []
+        results: List[Any] = []
+
+        for request in requests:
+            try:
+                results.append(self.call(request))
+            except Exception as error:  # pylint: disable=broad-except
+                self.rollback()
+                failure = error if isinstance(error, RpcError) else RpcError(INTERNAL_ERROR, f'internal error: {error}')
+                return [self.get_error_response(self.get_request_id(other), failure if other is request else RpcError(
+                    TRANSACTION_ERROR, 'transaction rolled back')) for other in requests]
+
+        self.undo = []
+        self.index_version = self.model.version
+
+        return [None if 'id' not in request else {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+                for request, result in zip(requests, results)]
+
+    def call(self, request: Any) -> Any:
+        """
+        Validates the request and calls the handler of its method
+
+        Args:
+            request (Any): decoded request
+
+        Returns:
+            Any: result of the method
+
+        Raises:
+            RpcError: if the request is malformed or the method fails
+        """
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' or \
+                not isinstance(request.get('method'), str):
+            raise RpcError(INVALID_REQUEST, 'invalid request')
+
+        handler = self.methods.get(request['method'])
+
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f'unknown method {request["method"]}')
+
+        params = request.get('params', {})
+
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, 'params must be an object')
+
+        return handler(params)
+
+    def rollback(self) -> None:
+        """
+        Undoes the changes of the running transaction
+
+        Returns:
+            None
+        """
+        for undo in reversed(self.undo):
+            undo()
+
+        self.undo = []
+        self.index_version = -1
+
+    @staticmethod
+    def get_request_id(request: Any) -> Any:
+        """
+        Gets the id of the request
+
+        Args:
+            request (Any): decoded request
+
+        Returns:
+            Any: id of the request, None if the request has none or is malformed
+        """
+        return request.get('id') if isinstance(request, dict) else None
+
+    @staticmethod
+    def get_error_response(request_id: Any, error: RpcError) -> Response:
+        """
+        Creates the error response
+
+        Args:
+            request_id (Any): id of the failed request
+            error (RpcError): error of the request
+
+        Returns:
+            Response: error response
+        """
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': error.code, 'message': error.message}}
+
+    def update_indexes(self) -> None:
+        """
+        Rebuilds the indexes by id if the game model was changed by anything else since the last transaction
+
+        Returns:
+            None
+        """
+        if self.index_version == self.model.version:
+            return
+
+        self.rectangles = {rectangle.id: rectangle for rectangle in self.model.rectangles}
+        self.ports = {port.id: port for rectangle in self.model.rectangles for port in rectangle.ports}
+        self.links = {link.id: link for link in self.model.links}
+        self.linked_port_ids = set(self.model.linked_port_ids)
+        self.index_version = self.model.version
+
+    def get_rectangle(self, params: Params) -> MoveableRectangle:
+        """
+        Gets the rectangle by the id parameter
+
+        Args:
+            params (Params): request parameters
+
+        Returns:
+            MoveableRectangle: rectangle
+
+        Raises:
+            RpcError: if there is no such rectangle
+        """
+        rectangle = self.rectangles.get(get_str(params, 'id'))
+
+        if rectangle is None:
+            raise RpcError(INVALID_PARAMS, f'unknown rectangle {params["id"]}')
+
+        return rectangle
+
+    def add_rectangle(self, params: Params) -> Dict[str, Any]:
+        """
+        Adds the rectangle if it does not collide
+
+        Args:
+            params (Params): top left corner, size and optionally color and label of the rectangle
+
+        Returns:
+            Dict[str, Any]: info of the added rectangle
+
+        Raises:
+            RpcError: if the parameters are malformed or the rectangle collides
+        """
+        x_coord, y_coord = get_int(params, 'x'), get_int(params, 'y')
+        width, height = get_int(params, 'width'), get_int(params, 'height')
+
+        if width < Constants.RECTANGLE_MIN_WIDTH_PX or height < Constants.RECTANGLE_MIN_HEIGHT_PX:
+            raise RpcError(INVALID_PARAMS, f'rectangle must be at least {Constants.RECTANGLE_MIN_WIDTH_PX}x'
+                                           f'{Constants.RECTANGLE_MIN_HEIGHT_PX}')
+
+        rectangle = MoveableRectangle(x_coord + width / 2, y_coord + height / 2, width, height)
+
+        if 'color' in params:
+            rectangle.color = get_str(params, 'color')
+
+            if rectangle.color not in Constants.RECTANGLE_COLORS:
+                raise RpcError(INVALID_PARAMS, f'color must be one of {", ".join(Constants.RECTANGLE_COLORS)}')
+        if 'label' in params:
+            rectangle.label = get_str(params, 'label')[:Constants.LABEL_MAX_LENGTH]
+
+        if self.model.has_collision(rectangle):
+            raise RpcError(REJECTED_ERROR, f'rectangle at ({x_coord}, {y_coord}) collides')
+
+        self.model.add_rectangle(rectangle)
+        self.rectangles[rectangle.id] = rectangle
+        self.ports.update((port.id, port) for port in rectangle.ports)
+        self.undo.append(lambda: self.model.remove_rectangle(rectangle))
+
+        return rectangle_to_info(rectangle)
+
+    def add_rectangles(self, params: Params) -> List[Dict[str, Any]]:
+        """
+        Adds the rectangles in order, each has to fit among the ones added before it
+
+        Args:
+            params (Params): list of the add_rectangle parameters
+
+        Returns:
+            List[Dict[str, Any]]: infos of the added rectangles
+
+        Raises:
+            RpcError: if the parameters are malformed or a rectangle collides
+        """
+        rectangles = params.get('rectangles')
+
+        if not isinstance(rectangles, list) or not all(isinstance(rectangle, dict) for rectangle in rectangles):
+            raise RpcError(INVALID_PARAMS, 'rectangles must be a list of objects')
+
+        return [self.add_rectangle(rectangle) for rectangle in rectangles]
+
+    def move_rectangle(self, params: Params) -> Dict[str, Any]:
+        """
+        Moves the rectangle with its children to the new top left corner if it does not collide there
+
+        Args:
+            params (Params): id and new top left corner of the rectangle
+
+        Returns:
+            Dict[str, Any]: info of the moved rectangle
+
+        Raises:
+            RpcError: if the parameters are malformed or the rectangle collides
+        """
+        rectangle = self.get_rectangle(params)
+        x_offset, y_offset = get_int(params, 'x') - rectangle.x(), get_int(params, 'y') - rectangle.y()
+
+        if x_offset or y_offset:
+            if self.model.has_collision(rectangle, x_offset, y_offset):
+                raise RpcError(REJECTED_ERROR, f'rectangle {rectangle.id} collides at ({params["x"]}, {params["y"]})')
+
+            self.model.move_rectangle(rectangle, x_offset, y_offset)
+            self.undo.append(lambda: self.model.move_rectangle(rectangle, -x_offset, -y_offset))
+
+        return rectangle_to_info(rectangle)
+
+    def link(self, params: Params) -> str:
+        """
+        Links the free ports of two different rectangles
+
+        Args:
+            params (Params): ids of the source and of the destination port
+
+        Returns:
+            str: id of the created link
+
+        Raises:
+            RpcError: if a port is unknown, already linked or both belong to the same rectangle
+        """
+        src, dst = self.ports.get(get_str(params, 'src')), self.ports.get(get_str(params, 'dst'))
+
+        if src is None or dst is None:
+            raise RpcError(INVALID_PARAMS, 'unknown port')
+        if src.parent_id == dst.parent_id or src.id in self.linked_port_ids or dst.id in self.linked_port_ids:
+            raise RpcError(REJECTED_ERROR, f'ports {src.id} and {dst.id} can not be linked')
+
+        link = self.model.add_link(src, dst)
+        self.links[link.id] = link
+        self.linked_port_ids.update((src.id, dst.id))
+        self.undo.append(lambda: self.model.remove_link(link))
+
+        return link.id
+
+    def unlink(self, params: Params) -> bool:
+        """
+        Removes the link
+
+        Args:
+            params (Params): id of the link
+
+        Returns:
+            bool: True
+
+        Raises:
+            RpcError: if the link is unknown
+        """
+        link = self.links.pop(get_str(params, 'id'), None)
+
+        if link is None:
+            raise RpcError(INVALID_PARAMS, f'unknown link {params["id"]}')
+
+        self.model.remove_link(link)
+        self.linked_port_ids.difference_update((link.src_id, link.dst_id))
+        self.undo.append(lambda: self.model.attach_link(link))
+
+        return True
+
+    def query_region(self, params: Params) -> Dict[str, Any]:
+        """
+        Finds the rectangles and the links overlapping the region
+
+        Args:
+            params (Params): top left corner and size of the region
+
+        Returns:
+            Dict[str, Any]: infos of the rectangles, every container before its children, and records of the links
+
+        Raises:
+            RpcError: if the parameters are malformed
+        """
+        left, top = get_int(params, 'x'), get_int(params, 'y')
+        right, bottom = left + get_int(params, 'width'), top + get_int(params, 'height')
+
+        return {
+            'rectangles': [rectangle_to_info(rectangle)
+                           for rectangle in self.model.find_rectangles(left, top, right, bottom)],
+            'links': [[link.id, link.src_id, link.dst_id]
+                      for link in self.model.link_tree.query(left, top, right, bottom)],
+        }
+
+    def export(self, params: Params) -> str:
+        """
+        Exports the rectangles with their children and the links between them in the clipboard format,
+        see models.Subgraph
+
+        Args:
+            params (Params): optional ids of the rectangles, every top level rectangle by default
+
+        Returns:
+            str: encoded subgraph
+
+        Raises:
+            RpcError: if a rectangle is unknown
+        """
+        if 'ids' not in params:
+            return encode_subgraph(copy_subgraph(self.model, [rectangle for rectangle in self.model.rectangles
+                                                              if self.model.containers.get(id(rectangle)) is None]))
+
+        ids = params['ids']
+
+        if not isinstance(ids, list):
+            raise RpcError(INVALID_PARAMS, 'ids must be a list')
+
+        return encode_subgraph(copy_subgraph(self.model, [self.get_rectangle({'id': rectangle_id})
+                                                          for rectangle_id in ids]))
@@ -0,0 +1,92 @@
+"""
+Implementation of the bridge between the Qt event loop and the asyncio automation server
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from models.GameModel import GameModel
+from network.AutomationApi import AutomationApi
+from network.AutomationServer import AutomationServer
+from network.SyncProtocol import parse_address
+
+
+class AutomationBridge(QObject):
+    """
+    The AutomationBridge, child of QObject class, that runs the AutomationServer on an asyncio event loop
+    in a background thread. Every received line is delivered to the GUI thread through a queued signal and applied
+    there, so the game model is only ever touched by the GUI thread and a whole batch is applied within one
+    event loop tick, which the views re-paint once
+
+    Args:
+        model (GameModel): game model to automate
+        address (str): HOST:PORT or unix:PATH to listen on
+
+    Attributes:
+        api (AutomationApi): API that applies the requests to the game model
+        loop (asyncio.AbstractEventLoop): event loop of the server
+        server (AutomationServer): server of the API
+        thread (threading.Thread): background thread that runs the event loop
+    """
+    line_received = pyqtSignal(bytes, object)
+
+    def __init__(self, model: GameModel, address: str):
+        super().__init__()
+
+        self.api = AutomationApi(model)
+        self.line_received.connect(self.apply_line)
+
+        self.loop = asyncio.new_event_loop()
+        self.server = AutomationServer(self.execute)
+        self.loop.run_until_complete(self.server.start(*parse_address(address)))
+
+        self.thread = threading.Thread(target=self.loop.run_forever, name='AutomationBridge', daemon=True)
+        self.thread.start()
+
+    async def execute(self, line: bytes) -> Optional[bytes]:
+        """
+        Hands the line over to the GUI thread and waits for the response
+
+        Args:
+            line (bytes): JSON-RPC request or batch
+
+        Returns:
+            Optional[bytes]: encoded response, None if only notifications were sent
+        """
+        future: 'Future[Optional[bytes]]' = Future()
+        self.line_received.emit(line, future)
+
+        return await asyncio.wrap_future(future)
+
+    def apply_line(self, line: bytes, future: 'Future[Optional[bytes]]') -> None:
+        """
+        Applies the line on the GUI thread and passes the response back to the event loop thread
+
+        Args:
+            line (bytes): JSON-RPC request or batch
+            future (Future[Optional[bytes]]): future of the response
+
+        Returns:
+            None
+        """
+        try:
+            future.set_result(self.api.handle_line(line))
+        except Exception as error:  # pylint: disable=broad-except
+            future.set_exception(error)
+
+    def close(self) -> None:
+        """
+        Stops the server and waits for the background thread
+
+        Returns:
+            None
+        """
+        if self.thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+        self.loop.close()
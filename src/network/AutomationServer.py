@@ -0,0 +1,188 @@
+"""
+Implementation of the asyncio server of the JSON-RPC automation API, see network.AutomationApi.
+
+Usage (from the src folder):
+    python -m network.AutomationServer [--listen 127.0.0.1:8790] [--listen unix:/tmp/automation.sock] [--autosave DIR]
+"""
+import argparse
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set
+
+from models.GameModel import GameModel
+from network.AutomationApi import AutomationApi
+from network.SyncProtocol import MAX_MESSAGE_SIZE, parse_address
+
+DEFAULT_AUTOMATION_PORT: int = 8790
+
+Execute = Callable[[bytes], Awaitable[Optional[bytes]]]
+
+
+class AutomationServer:
+    """
+    The AutomationServer that reads JSON-RPC requests and batches, one per line, and answers each line with one line.
+    Lines are handed to the execute function, which applies them where the game model lives, e.g. on the GUI thread,
+    so a client waits for the result of its transaction before it sends the next one
+
+    Args:
+        execute (Execute): function that applies the line and returns the encoded response, None for notifications
+
+    Attributes:
+        execute (Execute): function that applies the lines
+        writers (Set[asyncio.StreamWriter]): streams of the connected clients
+        servers (List[asyncio.AbstractServer]): listening servers
+    """
+    def __init__(self, execute: Execute):
+        self.execute = execute
+        self.writers: Set[asyncio.StreamWriter] = set()
+        self.servers: List[asyncio.AbstractServer] = []
+
+    async def start(self, host: Optional[str] = None, port: int = DEFAULT_AUTOMATION_PORT,
+                    path: Optional[str] = None) -> None:
+        """
+        Starts listening on the TCP address or on the Unix socket
+
+        Args:
+            host (Optional[str]): host to listen on. Default = None - localhost
+            port (int): TCP port to listen on, 0 picks a free one. Default: DEFAULT_AUTOMATION_PORT
+            path (Optional[str]): path of the Unix socket to listen on instead of TCP. Default = None
+
+        Returns:
+            None
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path, limit=MAX_MESSAGE_SIZE)
+        else:
+            server = await asyncio.start_server(self.handle_client, host or '127.0.0.1', port, limit=MAX_MESSAGE_SIZE)
+
+        self.servers.append(server)
+
+    def get_tcp_port(self) -> int:
+        """
+        Gets the TCP port the server listens on, useful if it was started on port 0
+
+        Returns:
+            int: TCP port of the first TCP server
+        """
+        for server in self.servers:
+            for sock in server.sockets:
+                if isinstance(sock.getsockname(), tuple):
+                    return sock.getsockname()[1]
+
+        raise RuntimeError('automation server does not listen on TCP')
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answers the lines of the client until it disconnects
+
+        Args:
+            reader (asyncio.StreamReader): stream to read requests from
+            writer (asyncio.StreamWriter): stream to send responses to
+
+        Returns:
+            None
+        """
+        self.writers.add(writer)
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+
+                response = await self.execute(line)
+
+                if response is not None:
+                    writer.write(response)
+                    await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def close(self) -> None:
+        """
+        Stops listening and disconnects the clients
+
+        Returns:
+            None
+        """
+        for server in self.servers:
+            server.close()
+
+        for writer in list(self.writers):
+            writer.close()
+
+        for server in self.servers:
+            await server.wait_closed()
+
+        self.servers = []
+
+
+async def serve(addresses: List[str], autosave: Optional[str] = None) -> None:
+    """
+    Runs the automation server of a headless game model until it is cancelled
+
+    Args:
+        addresses (List[str]): addresses to listen on, see parse_address
+        autosave (Optional[str]): directory to restore the game model from and to journal it to. Default = None
+
+    Returns:
+        None
+    """
+    model = GameModel()
+    journal = None
+
+    if autosave:
+        # pylint: disable=import-outside-toplevel
+        from persistence.ModelJournal import ModelJournal
+        from persistence.ModelRecovery import load_model
+
+        model, generation = load_model(autosave)
+        journal = ModelJournal(autosave, model, generation)
+        model.journal = journal
+
+    api = AutomationApi(model)
+
+    async def execute(line: bytes) -> Optional[bytes]:
+        return api.handle_line(line)
+
+    server = AutomationServer(execute)
+
+    try:
+        for address in addresses:
+            host, port, path = parse_address(address)
+            await server.start(host, port, path)
+            print(f'listening on {address}', flush=True)
+
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+        if journal:
+            journal.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the headless automation server
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='World of Rectangles JSON-RPC automation server')
+    parser.add_argument('--listen', action='append', metavar='ADDRESS',
+                        help=f'HOST:PORT or unix:PATH to listen on, can be repeated. '
+                             f'Default: 127.0.0.1:{DEFAULT_AUTOMATION_PORT}')
+    parser.add_argument('--autosave', metavar='DIR', help='journal the scene to the directory and restore it on start')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.listen or [f'127.0.0.1:{DEFAULT_AUTOMATION_PORT}'], args.autosave))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Implementation of the local HTTP service that serves PNG renders of a scene without opening a window.
+
+Usage (from the src folder):
+    python -m network.RenderService (--load DIR | --connect ADDRESS) [--listen 127.0.0.1:8780]
+
+Endpoints:
+    GET /scene.png[?scale=S]                   - the whole game field
+    GET /scene.png?x=X&y=Y&w=W&h=H[&scale=S]   - the region of the game field
+"""
+import argparse
+import asyncio
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from PyQt6.QtCore import QRect
+
+from models.GameModel import GameModel
+from network.SyncClient import SyncClient
+from network.SyncProtocol import Message, parse_address
+from network.SyncSession import SyncSession
+from rendering.SceneRenderer import SceneRenderer
+
+DEFAULT_RENDER_PORT: int = 8780
+RENDER_PATH: str = '/scene.png'
+
+
+def parse_render_query(query: Dict[str, List[str]], field_rect: QRect) -> Tuple[QRect, float]:
+    """
+    Parses the viewport and the scale of the render request
+
+    Args:
+        query (Dict[str, List[str]]): parsed query string
+        field_rect (QRect): bounds of the game field, the viewport when the region is not given
+
+    Returns:
+        Tuple[QRect, float]: viewport and scale
+
+    Raises:
+        ValueError: if a parameter is not a number or only a part of the region is given
+    """
+    values = {name: query[name][-1] for name in ('x', 'y', 'w', 'h', 'scale') if name in query}
+    scale = float(values.pop('scale', 1.0))
+
+    if not values:
+        return field_rect, scale
+    if len(values) != 4:
+        raise ValueError('region needs all of x, y, w and h')
+
+    return QRect(int(values['x']), int(values['y']), int(values['w']), int(values['h'])), scale
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    The RenderRequestHandler, child of BaseHTTPRequestHandler class, that answers render requests.
+    The ETag of a render is its cache key, so clients can revalidate it without downloading the image
+    """
+    server: 'RenderService'
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Handles the GET request
+
+        Returns:
+            None
+        """
+        url = urlsplit(self.path)
+
+        if url.path != RENDER_PATH:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        renderer = self.server.renderer
+
+        try:
+            viewport, scale = parse_render_query(parse_qs(url.query), renderer.get_field_rect())
+            version, png = renderer.render_png(viewport, scale)
+        except ValueError as error:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+
+        etag = f'"{version}-{viewport.x()}-{viewport.y()}-{viewport.width()}-{viewport.height()}-{scale}"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(png)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(png)
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """
+        Keeps the request log quiet
+        """
+
+
+class RenderService(ThreadingHTTPServer):
+    """
+    The RenderService, child of ThreadingHTTPServer class, that serves renders of the scene on a local address
+
+    Args:
+        renderer (SceneRenderer): renderer of the scene
+        host (str): host to listen on. Default: '127.0.0.1'
+        port (int): port to listen on, 0 picks a free one. Default: DEFAULT_RENDER_PORT
+
+    Attributes:
+        renderer (SceneRenderer): renderer of the scene
+    """
+    daemon_threads = True
+
+    def __init__(self, renderer: SceneRenderer, host: str = '127.0.0.1', port: int = DEFAULT_RENDER_PORT):
+        super().__init__((host, port), RenderRequestHandler)
+        self.renderer = renderer
+
+
+def follow_sync_server(model: GameModel, lock: threading.Lock, address: str) -> threading.Thread:
+    """
+    Keeps the game model in sync with the sync server on a background thread
+
+    Args:
+        model (GameModel): game model to keep in sync, must be empty
+        lock (threading.Lock): lock to hold while the server changes are applied
+        address (str): address of the sync server, see parse_address
+
+    Returns:
+        threading.Thread: started background thread
+    """
+    session = SyncSession(model, lambda operation: None)
+    model.journal = session
+
+    def apply_message(message: Message) -> None:
+        with lock:
+            session.apply_message(message)
+
+    client = SyncClient(apply_message)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(client.connect(*parse_address(address)))
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(client.run(),), name='RenderSync', daemon=True)
+    thread.start()
+
+    return thread
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the render service
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='World of Rectangles render service')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--load', metavar='DIR', help='render the scene saved by --autosave to the directory')
+    source.add_argument('--connect', metavar='ADDRESS', help='render the live scene of the sync server')
+    parser.add_argument('--listen', metavar='HOST:PORT', default=f'127.0.0.1:{DEFAULT_RENDER_PORT}',
+                        help=f'address to serve on. Default: 127.0.0.1:{DEFAULT_RENDER_PORT}')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtGui import QGuiApplication
+
+    app = QGuiApplication([])  # pylint: disable=unused-variable
+    lock = threading.Lock()
+
+    if args.load:
+        from persistence.ModelRecovery import load_model  # pylint: disable=import-outside-toplevel
+        model, _ = load_model(args.load)
+    else:
+        model = GameModel()
+        follow_sync_server(model, lock, args.connect)
+
+    host, port, _ = parse_address(args.listen)
+    service = RenderService(SceneRenderer(model, lock), host, port)
+    print(f'serving on http://{host}:{service.server_address[1]}{RENDER_PATH}', flush=True)
+
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Implementation of the bridge between the Qt event loop and the asyncio sync client
+"""
+import asyncio
+import threading
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from models.GameModel import GameModel
+from network.SyncClient import SyncClient
+from network.SyncProtocol import DEFAULT_PORT, Message
+from network.SyncSession import SyncSession
+
+
+class SyncBridge(QObject):
+    """
+    The SyncBridge, child of QObject class, that runs the SyncClient on an asyncio event loop in a background
+    thread. Server messages are delivered to the GUI thread through a queued signal and applied there,
+    so the game model is only ever touched by the GUI thread
+
+    Args:
+        model (GameModel): local game model, the session is attached to it as its journal
+        host (Optional[str]): host of the server. Default = None - localhost
+        port (int): TCP port of the server. Default: DEFAULT_PORT
+        path (Optional[str]): path of the Unix socket of the server, used instead of TCP. Default = None
+
+    Attributes:
+        session (SyncSession): session that keeps the game model in sync
+        loop (asyncio.AbstractEventLoop): event loop of the client
+        client (SyncClient): connection to the server
+        thread (threading.Thread): background thread that runs the event loop
+    """
+    message_received = pyqtSignal(object)
+    updated = pyqtSignal()
+
+    def __init__(self, model: GameModel, host: Optional[str] = None, port: int = DEFAULT_PORT,
+                 path: Optional[str] = None):
+        super().__init__()
+
+        self.session = SyncSession(model, self.send)
+        model.journal = self.session
+
+        self.loop = asyncio.new_event_loop()
+        self.client = SyncClient(self.message_received.emit)
+        self.message_received.connect(self.apply_message)
+        self.loop.run_until_complete(self.client.connect(host, port, path))
+
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self.client.run(),),
+                                       name='SyncBridge', daemon=True)
+        self.thread.start()
+
+    def send(self, operation: Message) -> None:
+        """
+        Hands the operation over to the event loop thread
+
+        Args:
+            operation (Message): operation to send
+
+        Returns:
+            None
+        """
+        self.loop.call_soon_threadsafe(self.client.send, operation)
+
+    def send_drag(self) -> None:
+        """
+        Sends the position of the dragged rectangle
+
+        Returns:
+            None
+        """
+        self.session.send_drag()
+
+    def apply_message(self, message: Message) -> None:
+        """
+        Applies the server message on the GUI thread and notifies the views
+
+        Args:
+            message (Message): decoded server message
+
+        Returns:
+            None
+        """
+        self.session.apply_message(message)
+        self.updated.emit()
+
+    def close(self) -> None:
+        """
+        Closes the connection and waits for the background thread
+
+        Returns:
+            None
+        """
+        if self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.client.close)
+            self.thread.join()
+
+        self.loop.close()
@@ -0,0 +1,80 @@
+"""
+Implementation of the asyncio connection to the SyncServer
+"""
+import asyncio
+from typing import Callable, Optional
+
+from network.SyncProtocol import DEFAULT_PORT, MAX_MESSAGE_SIZE, Message, encode_message, decode_message
+
+
+class SyncClient:
+    """
+    The SyncClient that sends operations to the SyncServer and passes the received messages to the callback
+
+    Args:
+        on_message (Callable[[Message], None]): callback called with every decoded server message
+
+    Attributes:
+        on_message (Callable[[Message], None]): callback called with every decoded server message
+        reader (Optional[asyncio.StreamReader]): stream to read messages from
+        writer (Optional[asyncio.StreamWriter]): stream to send operations to
+    """
+    def __init__(self, on_message: Callable[[Message], None]):
+        self.on_message = on_message
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, host: Optional[str] = None, port: int = DEFAULT_PORT, path: Optional[str] = None) -> None:
+        """
+        Connects to the server over TCP or over the Unix socket
+
+        Args:
+            host (Optional[str]): host of the server. Default = None - localhost
+            port (int): TCP port of the server. Default: DEFAULT_PORT
+            path (Optional[str]): path of the Unix socket of the server, used instead of TCP. Default = None
+
+        Returns:
+            None
+        """
+        if path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(path, limit=MAX_MESSAGE_SIZE)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host or '127.0.0.1', port, limit=MAX_MESSAGE_SIZE)
+
+    def send(self, operation: Message) -> None:
+        """
+        Sends the operation to the server. Must be called on the thread of the event loop
+
+        Args:
+            operation (Message): operation to send
+
+        Returns:
+            None
+        """
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.write(encode_message(operation))
+
+    async def run(self) -> None:
+        """
+        Reads the server messages until the connection is closed
+
+        Returns:
+            None
+        """
+        try:
+            while line := await self.reader.readline():
+                self.on_message(decode_message(line))
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writer.close()
+
+    def close(self) -> None:
+        """
+        Closes the connection. Must be called on the thread of the event loop
+
+        Returns:
+            None
+        """
+        if self.writer is not None:
+            self.writer.close()
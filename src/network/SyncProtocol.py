@@ -0,0 +1,176 @@
+"""
+Implementation of the scene sync protocol shared by the SyncServer and the clients.
+Messages are JSON objects, one per line.
+
+Client operations, each with an increasing "seq" number:
+    {"op": "add", "seq": int, "rectangle": RectangleRecord}
+    {"op": "move", "seq": int, "id": rectangle id, "x": x coordinate, "y": y coordinate}
+    {"op": "resize", "seq": int, "id": rectangle id, "width": width, "height": height}
+    {"op": "link", "seq": int, "link": LinkRecord}
+    {"op": "unlink", "seq": int, "id": link id}
+    {"op": "label", "seq": int, "id": rectangle id, "label": str}
+
+Server messages:
+    {"type": "state", "version": int, "rectangles": [RectangleRecord], "links": [LinkRecord]}
+    {"type": "update", "version": int, "ack": int, "rectangles": [RectangleRecord], "moves": [[id, x, y]],
+     "resizes": [[id, width, height]], "labels": [[id, label]], "links": [LinkRecord], "removed_rectangles": [id],
+     "removed_links": [id]}
+
+Updates are delta-encoded: they only carry what changed since the previous update, and empty fields are left out.
+"ack" is the "seq" of the last operation of the receiving client that the update already includes.
+A RectangleRecord is [id, color, x, y, width, height, [port ids], label], the label may be left out,
+and a LinkRecord is [id, source port id, destination port id]
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from utils import Constants
+
+ADD_OPERATION: str = 'add'
+MOVE_OPERATION: str = 'move'
+RESIZE_OPERATION: str = 'resize'
+LINK_OPERATION: str = 'link'
+UNLINK_OPERATION: str = 'unlink'
+LABEL_OPERATION: str = 'label'
+
+STATE_MESSAGE: str = 'state'
+UPDATE_MESSAGE: str = 'update'
+
+DEFAULT_PORT: int = 8765
+MAX_MESSAGE_SIZE: int = 2 ** 24
+UNIX_ADDRESS_PREFIX: str = 'unix:'
+ID_PATTERN: re.Pattern = re.compile('[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+PORT_COUNT: int = 4
+
+Message = Dict[str, Any]
+
+
+def encode_message(message: Message) -> bytes:
+    """
+    Encodes the message as one line of compact JSON
+
+    Args:
+        message (Message): message to encode
+
+    Returns:
+        bytes: encoded message, with the trailing newline
+    """
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+def decode_message(line: bytes) -> Message:
+    """
+    Decodes the message encoded by encode_message
+
+    Args:
+        line (bytes): encoded message
+
+    Returns:
+        Message: decoded message
+
+    Raises:
+        ValueError: if the line is not a JSON object
+    """
+    message = json.loads(line)
+
+    if not isinstance(message, dict):
+        raise ValueError('sync message must be a JSON object')
+
+    return message
+
+def rectangle_to_record(rectangle: MoveableRectangle) -> List[Any]:
+    """
+    Converts the rectangle to its protocol record
+
+    Args:
+        rectangle (MoveableRectangle): rectangle to convert
+
+    Returns:
+        List[Any]: rectangle record
+    """
+    return [rectangle.id, rectangle.color, rectangle.x(), rectangle.y(), rectangle.width(), rectangle.height(),
+            [port.id for port in rectangle.ports], rectangle.label]
+
+def is_valid_id(value: Any) -> bool:
+    """
+    Checks if the value is an id in the UUID format
+
+    Args:
+        value (Any): value to check
+
+    Returns:
+        bool: True if the value is an id, False otherwise
+    """
+    return isinstance(value, str) and ID_PATTERN.fullmatch(value) is not None
+
+def is_valid_rectangle_record(record: List[Any]) -> bool:
+    """
+    Checks if the rectangle record can be restored as is: the id is in the UUID format, the color is one of
+    the rectangle colors, the size is not below the minimum, there are four distinct port ids,
+    each made of the rectangle id and its own id, and the label, if any, is a string
+
+    Args:
+        record (List[Any]): rectangle record
+
+    Returns:
+        bool: True if the record is valid, False otherwise
+
+    Raises:
+        ValueError, TypeError: if the record is malformed
+    """
+    rectangle_id, color, _, _, width, height, port_ids, *label = record
+
+    return (is_valid_id(rectangle_id) and color in Constants.RECTANGLE_COLORS and len(label) <= 1
+            and all(isinstance(text, str) for text in label)
+            and int(width) >= Constants.RECTANGLE_MIN_WIDTH_PX and int(height) >= Constants.RECTANGLE_MIN_HEIGHT_PX
+            and isinstance(port_ids, list) and len(port_ids) == PORT_COUNT and len(set(port_ids)) == PORT_COUNT
+            and all(isinstance(port_id, str) and port_id.startswith(f'{rectangle_id}_')
+                    and is_valid_id(port_id[len(rectangle_id) + 1:]) for port_id in port_ids))
+
+def rectangle_from_record(record: List[Any]) -> MoveableRectangle:
+    """
+    Creates the rectangle from its protocol record
+
+    Args:
+        record (List[Any]): rectangle record
+
+    Returns:
+        MoveableRectangle: new rectangle with the ids of the record
+    """
+    rectangle_id, color, x_coord, y_coord, width, height, port_ids, *label = record
+    return MoveableRectangle.restore(rectangle_id, color, int(x_coord), int(y_coord), int(width), int(height),
+                                     port_ids, str(label[0])[:Constants.LABEL_MAX_LENGTH] if label else '')
+
+def link_to_record(link: Link) -> List[str]:
+    """
+    Converts the link to its protocol record
+
+    Args:
+        link (Link): link to convert
+
+    Returns:
+        List[str]: link record
+    """
+    return [link.id, link.src_id, link.dst_id]
+
+def parse_address(address: str) -> Tuple[Optional[str], int, Optional[str]]:
+    """
+    Parses the sync address, either HOST:PORT or unix:PATH
+
+    Args:
+        address (str): address to parse
+
+    Returns:
+        Tuple[Optional[str], int, Optional[str]]: host, TCP port and Unix socket path, the path is None for
+        TCP addresses and the host is None for Unix socket addresses
+
+    Raises:
+        ValueError: if the TCP port is not a number
+    """
+    if address.startswith(UNIX_ADDRESS_PREFIX):
+        return None, DEFAULT_PORT, address[len(UNIX_ADDRESS_PREFIX):]
+
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port) if port else DEFAULT_PORT, None
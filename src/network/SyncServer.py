@@ -0,0 +1,417 @@
+"""
+Implementation of the asyncio scene sync server that holds the authoritative game model.
+
+Usage (from the src folder):
+    python -m network.SyncServer [--listen 127.0.0.1:8765] [--listen unix:/tmp/world.sock] [--autosave DIR]
+"""
+import argparse
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from components.Port import Port
+from models.GameModel import GameModel
+from network.SyncProtocol import (ADD_OPERATION, MOVE_OPERATION, RESIZE_OPERATION, LINK_OPERATION,
+                                  UNLINK_OPERATION, LABEL_OPERATION, STATE_MESSAGE, UPDATE_MESSAGE, DEFAULT_PORT,
+                                  MAX_MESSAGE_SIZE, Message, encode_message, decode_message, is_valid_rectangle_record,
+                                  rectangle_to_record, rectangle_from_record, link_to_record, parse_address)
+
+BROADCAST_INTERVAL_S: float = 1 / 30
+
+
+class ClientState:
+    """
+    The ClientState that stores the per-connection data of the SyncServer
+
+    Args:
+        writer (asyncio.StreamWriter): stream to send messages to the client
+
+    Attributes:
+        writer (asyncio.StreamWriter): stream to send messages to the client
+        last_sequence (int): sequence number of the last operation received from the client
+        acked_sequence (int): sequence number the client was last told about
+        rejected_rectangles (List[str]): ids of the rejected rectangles of the client since the last update
+        rejected_links (List[str]): ids of the rejected links of the client since the last update
+    """
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.last_sequence = 0
+        self.acked_sequence = 0
+        self.rejected_rectangles: List[str] = []
+        self.rejected_links: List[str] = []
+
+
+class SyncServer:
+    """
+    The SyncServer that applies client operations to the authoritative game model and broadcasts the changes.
+    Add, label, link and unlink operations are applied when they arrive, while moves and resizes are only stored
+    per rectangle, so a drag that sends hundreds of moves costs one collision check and one broadcast entry
+    per interval. Collisions are checked centrally by the game model, and a rejected operation is answered with
+    the authoritative state so the client can roll back its optimistic change
+
+    Args:
+        model (GameModel): authoritative game model
+        broadcast_interval (float): interval between broadcasts in seconds. Default: BROADCAST_INTERVAL_S
+
+    Attributes:
+        model (GameModel): authoritative game model
+        broadcast_interval (float): interval between broadcasts in seconds
+        clients (Dict[asyncio.StreamWriter, ClientState]): connected clients
+        rectangles (Dict[str, MoveableRectangle]): rectangles by id
+        ports (Dict[str, Port]): ports by id
+        links (Dict[str, Link]): links by id
+        pending_moves (Dict[str, Tuple[int, int]]): latest requested position by rectangle id
+        pending_resizes (Dict[str, Tuple[int, int]]): latest requested size by rectangle id
+        added_rectangles (List[str]): ids of the rectangles added since the last broadcast
+        moved_rectangles (Set[str]): ids of the rectangles to send the position of in the next broadcast
+        resized_rectangles (Set[str]): ids of the rectangles to send the size of in the next broadcast
+        relabeled_rectangles (Set[str]): ids of the rectangles to send the label of in the next broadcast
+        added_links (List[str]): ids of the links added since the last broadcast
+        removed_links (List[str]): ids of the links removed since the last broadcast
+        servers (List[asyncio.AbstractServer]): listening servers
+        broadcast_task (Optional[asyncio.Task]): task that broadcasts the changes
+    """
+    def __init__(self, model: GameModel, broadcast_interval: float = BROADCAST_INTERVAL_S):
+        self.model = model
+        self.broadcast_interval = broadcast_interval
+        self.clients: Dict[asyncio.StreamWriter, ClientState] = {}
+
+        self.rectangles: Dict[str, MoveableRectangle] = {rect.id: rect for rect in model.rectangles}
+        self.ports: Dict[str, Port] = {port.id: port for rect in model.rectangles for port in rect.ports}
+        self.links: Dict[str, Link] = {link.id: link for link in model.links}
+
+        self.pending_moves: Dict[str, Tuple[int, int]] = {}
+        self.pending_resizes: Dict[str, Tuple[int, int]] = {}
+        self.added_rectangles: List[str] = []
+        self.moved_rectangles: Set[str] = set()
+        self.resized_rectangles: Set[str] = set()
+        self.relabeled_rectangles: Set[str] = set()
+        self.added_links: List[str] = []
+        self.removed_links: List[str] = []
+
+        self.servers: List[asyncio.AbstractServer] = []
+        self.broadcast_task: Optional[asyncio.Task] = None
+
+    async def start(self, host: Optional[str] = None, port: int = DEFAULT_PORT, path: Optional[str] = None) -> None:
+        """
+        Starts listening on the TCP address or on the Unix socket
+
+        Args:
+            host (Optional[str]): host to listen on. Default = None - localhost
+            port (int): TCP port to listen on, 0 picks a free one. Default: DEFAULT_PORT
+            path (Optional[str]): path of the Unix socket to listen on instead of TCP. Default = None
+
+        Returns:
+            None
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path, limit=MAX_MESSAGE_SIZE)
+        else:
+            server = await asyncio.start_server(self.handle_client, host or '127.0.0.1', port, limit=MAX_MESSAGE_SIZE)
+
+        self.servers.append(server)
+
+        if self.broadcast_task is None:
+            self.broadcast_task = asyncio.create_task(self.broadcast_loop())
+
+    def get_tcp_port(self) -> int:
+        """
+        Gets the TCP port the server listens on, useful if it was started on port 0
+
+        Returns:
+            int: TCP port of the first TCP server
+        """
+        for server in self.servers:
+            for sock in server.sockets:
+                if isinstance(sock.getsockname(), tuple):
+                    return sock.getsockname()[1]
+
+        raise RuntimeError('sync server does not listen on TCP')
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Sends the full state to the connected client and applies its operations until it disconnects
+
+        Args:
+            reader (asyncio.StreamReader): stream to read operations from
+            writer (asyncio.StreamWriter): stream to send messages to
+
+        Returns:
+            None
+        """
+        client = ClientState(writer)
+        self.clients[writer] = client
+
+        writer.write(encode_message({
+            'type': STATE_MESSAGE,
+            'version': self.model.version,
+            'rectangles': [rectangle_to_record(rect) for rect in self.model.rectangles],
+            'links': [link_to_record(link) for link in self.model.links],
+        }))
+
+        try:
+            while line := await reader.readline():
+                try:
+                    self.apply_operation(decode_message(line), client)
+                except (ValueError, KeyError, TypeError):
+                    continue
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.clients[writer]
+            writer.close()
+
+    def apply_operation(self, operation: Message, client: ClientState) -> None:
+        """
+        Validates and applies the client operation to the game model
+
+        Args:
+            operation (Message): decoded operation
+            client (ClientState): client that sent the operation
+
+        Returns:
+            None
+
+        Raises:
+            ValueError, KeyError, TypeError: if the operation is malformed
+        """
+        client.last_sequence = max(client.last_sequence, int(operation.get('seq', 0)))
+        kind = operation['op']
+
+        if kind == MOVE_OPERATION:
+            if operation['id'] in self.rectangles:
+                self.pending_moves[operation['id']] = (int(operation['x']), int(operation['y']))
+        elif kind == RESIZE_OPERATION:
+            if operation['id'] in self.rectangles:
+                self.pending_resizes[operation['id']] = (int(operation['width']), int(operation['height']))
+        elif kind == ADD_OPERATION:
+            record = operation['rectangle']
+
+            if (not is_valid_rectangle_record(record) or record[0] in self.rectangles
+                    or any(port_id in self.model.ports_by_id for port_id in record[6])):
+                client.rejected_rectangles.append(str(record[0]))
+                return
+
+            rectangle = rectangle_from_record(record)
+
+            if self.model.has_collision(rectangle):
+                client.rejected_rectangles.append(rectangle.id)
+                return
+
+            self.model.add_rectangle(rectangle)
+            self.rectangles[rectangle.id] = rectangle
+            self.ports.update((port.id, port) for port in rectangle.ports)
+            self.added_rectangles.append(rectangle.id)
+        elif kind == LINK_OPERATION:
+            link_id, src_id, dst_id = operation['link']
+            src, dst = self.ports.get(src_id), self.ports.get(dst_id)
+
+            if (link_id in self.links or src is None or dst is None or src.parent_id == dst.parent_id
+                    or src_id in self.model.linked_port_ids or dst_id in self.model.linked_port_ids):
+                client.rejected_links.append(link_id)
+                return
+
+            self.links[link_id] = self.model.add_link(src, dst, link_id)
+            self.added_links.append(link_id)
+        elif kind == LABEL_OPERATION:
+            rectangle = self.rectangles.get(operation['id'])
+
+            if rectangle is not None and isinstance(operation['label'], str):
+                self.model.set_label(rectangle, operation['label'])
+                self.relabeled_rectangles.add(rectangle.id)
+        elif kind == UNLINK_OPERATION:
+            link = self.links.pop(operation['id'], None)
+
+            if link is not None:
+                self.model.remove_link(link)
+                self.removed_links.append(link.id)
+        else:
+            raise ValueError(f'unknown sync operation {kind}')
+
+    def apply_moves(self) -> None:
+        """
+        Applies the latest requested size and position of every resized and moved rectangle if it does not
+        collide. Containers are moved before their children, which they carry along, and rejected changes
+        are broadcast with the current size or position
+
+        Returns:
+            None
+        """
+        for rectangle_id, (width, height) in self.pending_resizes.items():
+            rectangle = self.rectangles[rectangle_id]
+
+            if (width, height) != (rectangle.width(), rectangle.height()) and \
+                    self.model.can_resize(rectangle, width, height):
+                self.model.resize_rectangle(rectangle, width, height)
+
+            self.resized_rectangles.add(rectangle_id)
+
+        for rectangle_id, (x_coord, y_coord) in sorted(self.pending_moves.items(),
+                                                       key=lambda item: self.model.get_depth(self.rectangles[item[0]])):
+            rectangle = self.rectangles[rectangle_id]
+            x_offset, y_offset = x_coord - rectangle.x(), y_coord - rectangle.y()
+
+            if (x_offset or y_offset) and not self.model.has_collision(rectangle, x_offset, y_offset):
+                self.model.move_rectangle(rectangle, x_offset, y_offset)
+
+            self.moved_rectangles.add(rectangle_id)
+
+        self.pending_resizes.clear()
+        self.pending_moves.clear()
+
+    def broadcast(self) -> None:
+        """
+        Applies the pending moves and sends the changes since the last broadcast to every client,
+        together with its rejected operations and the sequence number of its last applied operation
+
+        Returns:
+            None
+        """
+        self.apply_moves()
+
+        update: Message = {'type': UPDATE_MESSAGE, 'version': self.model.version}
+        added_rectangles = set(self.added_rectangles)
+
+        if self.added_rectangles:
+            update['rectangles'] = [rectangle_to_record(self.rectangles[rectangle_id])
+                                    for rectangle_id in self.added_rectangles]
+        if self.moved_rectangles - added_rectangles:
+            update['moves'] = [[rectangle_id, self.rectangles[rectangle_id].x(), self.rectangles[rectangle_id].y()]
+                               for rectangle_id in self.moved_rectangles - added_rectangles]
+        if self.resized_rectangles - added_rectangles:
+            update['resizes'] = [[rectangle_id, self.rectangles[rectangle_id].width(),
+                                  self.rectangles[rectangle_id].height()]
+                                 for rectangle_id in self.resized_rectangles - added_rectangles]
+        if self.relabeled_rectangles - added_rectangles:
+            update['labels'] = [[rectangle_id, self.rectangles[rectangle_id].label]
+                                for rectangle_id in self.relabeled_rectangles - added_rectangles]
+        if self.added_links:
+            update['links'] = [link_to_record(self.links[link_id])
+                               for link_id in self.added_links if link_id in self.links]
+        if self.removed_links:
+            update['removed_links'] = list(self.removed_links)
+
+        has_changes = len(update) > 2
+
+        for client in list(self.clients.values()):
+            message = update
+
+            if client.rejected_rectangles or client.rejected_links or client.acked_sequence != client.last_sequence:
+                message = dict(update, ack=client.last_sequence)
+                if client.rejected_rectangles:
+                    message['removed_rectangles'] = client.rejected_rectangles
+                if client.rejected_links:
+                    message['removed_links'] = update.get('removed_links', []) + client.rejected_links
+                client.rejected_rectangles, client.rejected_links = [], []
+                client.acked_sequence = client.last_sequence
+            elif not has_changes:
+                continue
+
+            if client.writer.transport.get_write_buffer_size() > MAX_MESSAGE_SIZE:
+                client.writer.close()
+                continue
+
+            client.writer.write(encode_message(message))
+
+        self.added_rectangles, self.added_links, self.removed_links = [], [], []
+        self.moved_rectangles, self.resized_rectangles, self.relabeled_rectangles = set(), set(), set()
+
+    async def broadcast_loop(self) -> None:
+        """
+        Broadcasts the changes every broadcast interval
+
+        Returns:
+            None
+        """
+        while True:
+            await asyncio.sleep(self.broadcast_interval)
+            self.broadcast()
+
+    async def close(self) -> None:
+        """
+        Stops listening, sends the last changes and disconnects the clients
+
+        Returns:
+            None
+        """
+        for server in self.servers:
+            server.close()
+
+        if self.broadcast_task is not None:
+            self.broadcast_task.cancel()
+            self.broadcast_task = None
+
+        self.broadcast()
+
+        for writer in list(self.clients):
+            writer.close()
+
+        for server in self.servers:
+            await server.wait_closed()
+
+        self.servers = []
+
+
+async def serve(addresses: List[str], autosave: Optional[str] = None) -> None:
+    """
+    Runs the sync server until it is cancelled
+
+    Args:
+        addresses (List[str]): addresses to listen on, see parse_address
+        autosave (Optional[str]): directory to restore the game model from and to journal it to. Default = None
+
+    Returns:
+        None
+    """
+    model = GameModel()
+    journal = None
+
+    if autosave:
+        # pylint: disable=import-outside-toplevel
+        from persistence.ModelJournal import ModelJournal
+        from persistence.ModelRecovery import load_model
+
+        model, generation = load_model(autosave)
+        journal = ModelJournal(autosave, model, generation)
+        model.journal = journal
+
+    server = SyncServer(model)
+
+    try:
+        for address in addresses:
+            host, port, path = parse_address(address)
+            await server.start(host, port, path)
+            print(f'listening on {address}', flush=True)
+
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+        if journal:
+            journal.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the sync server
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='World of Rectangles scene sync server')
+    parser.add_argument('--listen', action='append', metavar='ADDRESS',
+                        help=f'HOST:PORT or unix:PATH to listen on, can be repeated. Default: 127.0.0.1:{DEFAULT_PORT}')
+    parser.add_argument('--autosave', metavar='DIR', help='journal the scene to the directory and restore it on start')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.listen or [f'127.0.0.1:{DEFAULT_PORT}'], args.autosave))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
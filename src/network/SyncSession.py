@@ -0,0 +1,234 @@
+"""
+Implementation of the client side of the scene sync protocol
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from components.Port import Port
+from models.GameModel import GameModel
+from network.SyncProtocol import (ADD_OPERATION, MOVE_OPERATION, RESIZE_OPERATION, LINK_OPERATION,
+                                  UNLINK_OPERATION, LABEL_OPERATION, Message, rectangle_to_record,
+                                  rectangle_from_record, link_to_record)
+
+
+class SyncSession:
+    """
+    The SyncSession that keeps a local game model in sync with the SyncServer. It is attached to the model
+    as its journal, so every local mutation is sent as an operation and applied optimistically,
+    while the changes of the server are applied back through the game model mutation methods.
+    Server positions and sizes of a rectangle are ignored while it is dragged or resized locally and until
+    the server acknowledges the last local move or resize of it, so the rectangle does not jump back to older positions
+
+    Args:
+        model (GameModel): local game model
+        send (Callable[[Message], None]): callback that sends an operation to the server
+
+    Attributes:
+        model (GameModel): local game model
+        send (Callable[[Message], None]): callback that sends an operation to the server
+        is_applying (bool): True while server changes are applied, so they are not sent back
+        sequence (int): sequence number of the last sent operation
+        pending_moves (Dict[str, int]): sequence number of the last unacknowledged move or resize by rectangle id
+        dragged_position (Optional[Tuple[int, int]]): last sent position of the dragged rectangle
+        rectangles (Dict[str, MoveableRectangle]): rectangles by id
+        ports (Dict[str, Port]): ports by id
+        links (Dict[str, Link]): links by id
+    """
+    def __init__(self, model: GameModel, send: Callable[[Message], None]):
+        self.model = model
+        self.send = send
+        self.is_applying = False
+        self.sequence = 0
+        self.pending_moves: Dict[str, int] = {}
+        self.dragged_position: Optional[Tuple[int, int]] = None
+
+        self.rectangles: Dict[str, MoveableRectangle] = {rect.id: rect for rect in model.rectangles}
+        self.ports: Dict[str, Port] = {port.id: port for rect in model.rectangles for port in rect.ports}
+        self.links: Dict[str, Link] = {link.id: link for link in model.links}
+
+    def send_operation(self, operation: Message) -> None:
+        """
+        Numbers the operation and sends it to the server
+
+        Args:
+            operation (Message): operation to send
+
+        Returns:
+            None
+        """
+        self.sequence += 1
+        operation['seq'] = self.sequence
+        self.send(operation)
+
+    def send_move(self, rectangle: MoveableRectangle, x_coord: int, y_coord: int) -> None:
+        """
+        Sends the new position of the rectangle and waits for its acknowledgement
+
+        Args:
+            rectangle (MoveableRectangle): moved rectangle
+            x_coord (int): x coordinate of the new position
+            y_coord (int): y coordinate of the new position
+
+        Returns:
+            None
+        """
+        self.send_operation({'op': MOVE_OPERATION, 'id': rectangle.id, 'x': x_coord, 'y': y_coord})
+        self.pending_moves[rectangle.id] = self.sequence
+
+    def send_drag(self) -> None:
+        """
+        Sends the position of the dragged rectangle, so other clients see the drag while it happens
+
+        Returns:
+            None
+        """
+        rectangle = self.model.selected_rectangle
+
+        if rectangle is None or not self.is_dragged(rectangle) or self.model.resized_size is not None:
+            return
+
+        position = (rectangle.x() + self.model.x2, rectangle.y() + self.model.y2)
+
+        if position != self.dragged_position:
+            self.dragged_position = position
+            self.send_move(rectangle, *position)
+
+    def is_dragged(self, rectangle: MoveableRectangle) -> bool:
+        """
+        Checks if the rectangle is dragged locally
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to check
+
+        Returns:
+            bool: True if the rectangle is dragged. False otherwise
+        """
+        return self.model.selected_rectangle is rectangle and self.model.x1 > 0 and not self.model.is_dragging_link
+
+    def record_rectangle_added(self, rectangle: MoveableRectangle) -> None:
+        """
+        Registers the added rectangle and sends it unless it came from the server
+        """
+        self.rectangles[rectangle.id] = rectangle
+        self.ports.update((port.id, port) for port in rectangle.ports)
+
+        if not self.is_applying:
+            self.send_operation({'op': ADD_OPERATION, 'rectangle': rectangle_to_record(rectangle)})
+
+    def record_rectangle_moved(self, rectangle: MoveableRectangle) -> None:
+        """
+        Sends the new position of the moved rectangle unless it came from the server
+        """
+        if not self.is_applying:
+            self.dragged_position = None
+            self.send_move(rectangle, rectangle.x(), rectangle.y())
+
+    def record_rectangle_resized(self, rectangle: MoveableRectangle) -> None:
+        """
+        Sends the new size of the resized rectangle unless it came from the server
+        """
+        if not self.is_applying:
+            self.send_operation({'op': RESIZE_OPERATION, 'id': rectangle.id, 'width': rectangle.width(),
+                                 'height': rectangle.height()})
+            self.pending_moves[rectangle.id] = self.sequence
+
+    def record_rectangle_relabeled(self, rectangle: MoveableRectangle) -> None:
+        """
+        Sends the new label of the relabeled rectangle unless it came from the server
+        """
+        if not self.is_applying:
+            self.send_operation({'op': LABEL_OPERATION, 'id': rectangle.id, 'label': rectangle.label})
+
+    def record_rectangle_removed(self, rectangle: MoveableRectangle) -> None:
+        """
+        Unregisters the removed rectangle. Rectangles are only removed by the server
+        """
+        self.rectangles.pop(rectangle.id, None)
+        self.pending_moves.pop(rectangle.id, None)
+
+        for port in rectangle.ports:
+            self.ports.pop(port.id, None)
+
+    def record_link_added(self, link: Link) -> None:
+        """
+        Registers the added link and sends it unless it came from the server
+        """
+        self.links[link.id] = link
+
+        if not self.is_applying:
+            self.send_operation({'op': LINK_OPERATION, 'link': link_to_record(link)})
+
+    def record_link_removed(self, link: Link) -> None:
+        """
+        Unregisters the removed link and sends the removal unless it came from the server
+        """
+        self.links.pop(link.id, None)
+
+        if not self.is_applying:
+            self.send_operation({'op': UNLINK_OPERATION, 'id': link.id})
+
+    def apply_message(self, message: Message) -> None:
+        """
+        Applies the state or update message of the server to the local game model
+
+        Args:
+            message (Message): decoded server message
+
+        Returns:
+            None
+        """
+        ack = message.get('ack', 0)
+        self.pending_moves = {key: sequence for key, sequence in self.pending_moves.items() if sequence > ack}
+        self.is_applying = True
+
+        try:
+            for record in message.get('rectangles', []):
+                if record[0] not in self.rectangles:
+                    self.model.add_rectangle(rectangle_from_record(record))
+
+            for rectangle_id, x_coord, y_coord in message.get('moves', []):
+                rectangle = self.rectangles.get(rectangle_id)
+
+                if rectangle is None or rectangle_id in self.pending_moves or self.is_dragged(rectangle):
+                    continue
+                if (x_coord, y_coord) != (rectangle.x(), rectangle.y()):
+                    self.model.move_rectangle(rectangle, x_coord - rectangle.x(), y_coord - rectangle.y())
+
+            for rectangle_id, width, height in message.get('resizes', []):
+                rectangle = self.rectangles.get(rectangle_id)
+
+                if rectangle is None or rectangle_id in self.pending_moves or self.is_dragged(rectangle):
+                    continue
+                if (width, height) != (rectangle.width(), rectangle.height()):
+                    self.model.resize_rectangle(rectangle, width, height)
+
+            for rectangle_id, label in message.get('labels', []):
+                rectangle = self.rectangles.get(rectangle_id)
+
+                if rectangle is not None and label != rectangle.label:
+                    self.model.set_label(rectangle, label)
+
+            for link_id, src_id, dst_id in message.get('links', []):
+                if link_id not in self.links and src_id in self.ports and dst_id in self.ports:
+                    self.model.add_link(self.ports[src_id], self.ports[dst_id], link_id)
+
+            for link_id in message.get('removed_links', []):
+                link = self.links.get(link_id)
+
+                if link is not None:
+                    if self.model.selected_link is link:
+                        self.model.selected_link = None
+                    self.model.remove_link(link)
+
+            for rectangle_id in message.get('removed_rectangles', []):
+                rectangle = self.rectangles.get(rectangle_id)
+
+                if rectangle is not None:
+                    if self.model.selected_link is not None and rectangle_id in self.model.selected_link.id:
+                        self.model.selected_link = None
+                    self.model.remove_rectangle(rectangle)
+
+            self.model.recalculate_min_field_size()
+        finally:
+            self.is_applying = False
@@ -0,0 +1,134 @@
+import json
+
+from src.models.GameModel import GameModel
+from src.models.Subgraph import decode_subgraph
+from src.network.AutomationApi import (INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR,
+                                       REJECTED_ERROR, TRANSACTION_ERROR, AutomationApi)
+
+
+def request(method, params, request_id=1):
+    return {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+
+
+def call(api, payload):
+    response = api.handle_line(json.dumps(payload).encode('utf-8'))
+    return None if response is None else json.loads(response)
+
+
+def build_api():
+    model = GameModel()
+    model.field_width, model.field_height = 4000, 4000
+    return model, AutomationApi(model)
+
+
+class TestAutomationApi:
+    def test_applies_batch(self):
+        model, api = build_api()
+        added = call(api, request('add_rectangles', {'rectangles': [
+            {'x': 100, 'y': 100, 'width': 100, 'height': 50, 'label': 'first'},
+            {'x': 300, 'y': 100, 'width': 100, 'height': 50, 'color': 'magenta'},
+        ]}))['result']
+
+        assert [(rect['x'], rect['y'], rect['label']) for rect in added] == [(100, 100, 'first'), (300, 100, '')]
+        assert model.rectangles[1].color == 'magenta'
+
+        responses = call(api, [
+            request('link', {'src': added[0]['ports'][1], 'dst': added[1]['ports'][3]}, 1),
+            request('move_rectangle', {'id': added[1]['id'], 'x': 500, 'y': 200}, 2),
+            {'jsonrpc': '2.0', 'method': 'query_region', 'params': {'x': 0, 'y': 0, 'width': 10, 'height': 10}},
+            request('query_region', {'x': 450, 'y': 150, 'width': 100, 'height': 100}, 3),
+        ])
+
+        # the notification is applied but not answered
+        assert [response['id'] for response in responses] == [1, 2, 3]
+        link_id = responses[0]['result']
+        assert (responses[1]['result']['x'], responses[1]['result']['y']) == (500, 200)
+        assert [rect['id'] for rect in responses[2]['result']['rectangles']] == [added[1]['id']]
+        assert responses[2]['result']['links'] == [[link_id, added[0]['ports'][1], added[1]['ports'][3]]]
+
+        assert call(api, request('unlink', {'id': link_id}))['result'] is True
+        assert not model.links
+
+    def test_rolls_back_failed_batch(self):
+        model, api = build_api()
+        first = call(api, request('add_rectangle', {'x': 100, 'y': 100, 'width': 100, 'height': 50}))['result']
+        second = call(api, request('add_rectangle', {'x': 300, 'y': 100, 'width': 100, 'height': 50}))['result']
+        link_id = call(api, request('link', {'src': first['ports'][1], 'dst': second['ports'][3]}))['result']
+        link_ends = (model.links[0].x1(), model.links[0].y1(), model.links[0].x2(), model.links[0].y2())
+        version = model.version
+
+        responses = call(api, [
+            request('unlink', {'id': link_id}, 1),
+            request('move_rectangle', {'id': first['id'], 'x': 100, 'y': 300}, 2),
+            request('add_rectangle', {'x': 600, 'y': 100, 'width': 100, 'height': 50}, 3),
+            request('add_rectangle', {'x': 320, 'y': 120, 'width': 100, 'height': 50}, 4),
+            request('add_rectangle', {'x': 900, 'y': 100, 'width': 100, 'height': 50}, 5),
+        ])
+
+        assert [response['error']['code'] for response in responses] == [TRANSACTION_ERROR] * 3 + [
+            REJECTED_ERROR, TRANSACTION_ERROR]
+        assert model.version > version
+        assert [(rect.id, rect.x(), rect.y()) for rect in model.rectangles] == [
+            (first['id'], 100, 100), (second['id'], 300, 100)]
+        assert [link.id for link in model.links] == [link_id]
+        assert (model.links[0].x1(), model.links[0].y1(), model.links[0].x2(), model.links[0].y2()) == link_ends
+
+        # the indexes by id follow the rolled back model
+        assert call(api, request('unlink', {'id': link_id}))['result'] is True
+
+    def test_rejects_malformed_requests(self):
+        model, api = build_api()
+
+        assert json.loads(api.handle_line(b'{not json'))['error']['code'] == PARSE_ERROR
+        assert call(api, [])['error']['code'] == INVALID_REQUEST
+        assert call(api, {'id': 1, 'method': 'link'})['error']['code'] == INVALID_REQUEST
+        assert call(api, request('remove_everything', {}))['error']['code'] == METHOD_NOT_FOUND
+        assert call(api, request('add_rectangle', {'x': '1', 'y': 1, 'width': 100, 'height': 50}))['error'][
+            'code'] == INVALID_PARAMS
+        assert call(api, request('add_rectangle', {'x': 1, 'y': 1, 'width': 1, 'height': 1}))['error'][
+            'code'] == INVALID_PARAMS
+        assert call(api, request('move_rectangle', {'id': 'missing', 'x': 1, 'y': 1}))['error'][
+            'code'] == INVALID_PARAMS
+        assert call(api, request('add_rectangle', {'x': 1, 'y': 1, 'width': 100, 'height': 50, 'color': 'white'}))[
+            'error']['code'] == INVALID_PARAMS
+        assert not model.rectangles
+
+    def test_rolls_back_unexpected_failure(self):
+        model, api = build_api()
+
+        def fail(params):
+            raise RuntimeError('broken')
+
+        api.methods['query_region'] = fail
+        responses = call(api, [
+            request('add_rectangle', {'x': 100, 'y': 100, 'width': 100, 'height': 50}, 1),
+            request('query_region', {'x': 0, 'y': 0, 'width': 10, 'height': 10}, 2),
+        ])
+
+        assert [response['error']['code'] for response in responses] == [TRANSACTION_ERROR, INTERNAL_ERROR]
+        assert not model.rectangles
+
+    def test_exports_subgraph(self):
+        model, api = build_api()
+        call(api, request('add_rectangles', {'rectangles': [
+            {'x': 100, 'y': 100, 'width': 400, 'height': 300},
+            {'x': 150, 'y': 150, 'width': 100, 'height': 50, 'label': 'child'},
+            {'x': 700, 'y': 100, 'width': 100, 'height': 50},
+        ]}))
+
+        assert len(decode_subgraph(call(api, request('export', {}))['result']).rectangles) == 3
+
+        subgraph = decode_subgraph(call(api, request('export', {'ids': [model.rectangles[0].id]}))['result'])
+
+        assert [record[5] for record in subgraph.rectangles] == ['', 'child']
+
+    def test_builds_large_diagram_in_one_call(self):
+        model, api = build_api()
+        model.field_width, model.field_height = 20000, 20000
+        rectangles = [{'x': 150 * (index % 100), 'y': 100 * (index // 100), 'width': 100, 'height': 50}
+                      for index in range(10000)]
+        added = call(api, request('add_rectangles', {'rectangles': rectangles}))['result']
+        links = call(api, [request('link', {'src': first['ports'][1], 'dst': second['ports'][3]}, index)
+                           for index, (first, second) in enumerate(zip(added, added[1:])) if index % 100 != 99])
+
+        assert len(model.rectangles) == 10000 and len(model.links) == len(links) == 9900
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from src.models.GameModel import GameModel
+from src.network.AutomationApi import AutomationApi
+from src.network.AutomationServer import AutomationServer
+
+
+async def start(model, path=None):
+    api = AutomationApi(model)
+
+    async def execute(line):
+        return api.handle_line(line)
+
+    server = AutomationServer(execute)
+    await server.start(port=0, path=path)
+
+    return server
+
+
+async def exchange(reader, writer, payload):
+    writer.write(json.dumps(payload).encode('utf-8') + b'\n')
+    await writer.drain()
+
+    return json.loads(await reader.readline())
+
+
+class TestAutomationServer:
+    def test_answers_requests_over_tcp(self):
+        async def run():
+            model = GameModel()
+            server = await start(model)
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.get_tcp_port())
+
+            added = await exchange(reader, writer, [
+                {'jsonrpc': '2.0', 'id': index, 'method': 'add_rectangle',
+                 'params': {'x': 100 + 200 * index, 'y': 100, 'width': 100, 'height': 50}} for index in range(3)
+            ])
+            # a notification is not answered, the next line answers the next request
+            writer.write(b'{"jsonrpc": "2.0", "method": "export"}\n\n')
+            region = await exchange(reader, writer, {'jsonrpc': '2.0', 'id': 'q', 'method': 'query_region',
+                                                     'params': {'x': 0, 'y': 0, 'width': 350, 'height': 200}})
+
+            writer.close()
+            await server.close()
+
+            return added, region, len(model.rectangles)
+
+        added, region, count = asyncio.run(run())
+
+        assert [response['id'] for response in added] == [0, 1, 2] and count == 3
+        assert [rect['id'] for rect in region['result']['rectangles']] == [response['result']['id']
+                                                                         for response in added[:2]]
+
+    def test_answers_requests_over_unix_socket(self, tmp_path):
+        async def run():
+            path = str(tmp_path / 'automation.sock')
+            server = await start(GameModel(), path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            response = await exchange(reader, writer, {'jsonrpc': '2.0', 'id': 1, 'method': 'unlink',
+                                                       'params': {'id': 'missing'}})
+            writer.close()
+            await server.close()
+
+            return response
+
+        assert asyncio.run(run())['error']['message'] == 'unknown link missing'
@@ -0,0 +1,56 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.network.RenderService import RenderService
+from src.rendering.SceneRenderer import SceneRenderer
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def service(app):
+    render_service = RenderService(SceneRenderer(build_scene(8)), port=0)
+    thread = threading.Thread(target=render_service.serve_forever, daemon=True)
+    thread.start()
+    yield render_service
+    render_service.shutdown()
+    render_service.server_close()
+
+
+def get(service, path, headers=None):
+    request = urllib.request.Request(f'http://127.0.0.1:{service.server_address[1]}{path}', headers=headers or {})
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, b''
+
+
+class TestRenderService:
+    def test_serves_png_renders(self, service):
+        status, headers, body = get(service, '/scene.png?x=0&y=0&w=200&h=100&scale=0.5')
+
+        assert status == 200
+        assert headers['Content-Type'] == 'image/png'
+        assert QImage.fromData(body).size().width() == 100
+        assert get(service, '/scene.png?x=0&y=0&w=200&h=100&scale=0.5', {'If-None-Match': headers['ETag']})[0] == 304
+        assert service.renderer.misses == 1
+
+    def test_rejects_bad_requests(self, service):
+        assert get(service, '/scene.png?x=0&y=0')[0] == 400
+        assert get(service, '/scene.png?scale=abc')[0] == 400
+        assert get(service, '/other.png')[0] == 404
@@ -0,0 +1,238 @@
+import asyncio
+
+from src.controllers.GameController import GameController
+from src.models.GameModel import GameModel
+from src.network.SyncClient import SyncClient
+from src.network.SyncProtocol import rectangle_to_record
+from src.network.SyncServer import ClientState, SyncServer
+from src.network.SyncSession import SyncSession
+
+
+def snapshot(model):
+    return (sorted((rect.id, rect.color, rect.x(), rect.y(), tuple(port.id for port in rect.ports), rect.label)
+                   for rect in model.rectangles),
+            sorted((link.id, link.x1(), link.y1(), link.x2(), link.y2()) for link in model.links))
+
+
+class Peer:
+    def __init__(self):
+        self.model = GameModel()
+        self.controller = GameController(self.model)
+        self.messages = []
+        self.client = SyncClient(self.on_message)
+        self.session = SyncSession(self.model, self.client.send)
+        self.model.journal = self.session
+        self.task = None
+
+    def on_message(self, message):
+        self.messages.append(message)
+        self.session.apply_message(message)
+
+    async def connect(self, server, path=None):
+        if path is None:
+            await self.client.connect(port=server.get_tcp_port())
+        else:
+            await self.client.connect(path=path)
+
+        self.task = asyncio.create_task(self.client.run())
+        await settle()
+
+    def drag(self, rectangle, x_offset, y_offset, steps=1):
+        x_coord, y_coord = rectangle.center().x(), rectangle.center().y()
+        self.controller.press(x_coord, y_coord)
+
+        for step in range(1, steps + 1):
+            self.controller.move(x_coord + x_offset * step // steps, y_coord + y_offset * step // steps)
+            self.session.send_drag()
+
+        self.controller.release()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+async def tick(server):
+    await settle()
+    server.broadcast()
+    await settle()
+
+
+async def start(count, path=None):
+    server = SyncServer(GameModel(), broadcast_interval=3600)
+    await server.start(port=0, path=path)
+    peers = [Peer() for _ in range(count)]
+
+    for peer in peers:
+        await peer.connect(server, path)
+
+    return server, peers
+
+
+async def stop(server, peers):
+    for peer in peers:
+        peer.client.close()
+        await peer.task
+
+    await server.close()
+
+
+class TestSyncServer:
+    def test_clients_converge(self):
+        async def scenario():
+            server, peers = await start(3)
+            peers[0].controller.double_click(300, 300)
+            peers[1].controller.double_click(600, 300)
+            await tick(server)
+
+            rectangle = peers[2].model.rectangles[0]
+            peers[2].drag(rectangle, 40, 120, 4)
+            await tick(server)
+            await tick(server)
+
+            assert all(snapshot(peer.model) == snapshot(server.model) for peer in peers)
+            assert len(server.model.rectangles) == 2
+            assert (server.rectangles[rectangle.id].x(), server.rectangles[rectangle.id].y()) == (rectangle.x(),
+                                                                                                 rectangle.y())
+            await stop(server, peers)
+
+        asyncio.run(scenario())
+
+    def test_late_client_gets_state(self):
+        async def scenario():
+            server, peers = await start(1)
+            peers[0].controller.double_click(300, 300)
+            peers[0].controller.double_click(600, 300)
+            await tick(server)
+
+            late_peer = Peer()
+            await late_peer.connect(server)
+
+            assert late_peer.messages[0]['type'] == 'state'
+            assert snapshot(late_peer.model) == snapshot(server.model)
+            await stop(server, peers + [late_peer])
+
+        asyncio.run(scenario())
+
+    def test_coalesces_drag_moves(self):
+        async def scenario():
+            server, peers = await start(2)
+            peers[0].controller.double_click(300, 300)
+            await tick(server)
+
+            peers[0].drag(peers[0].model.rectangles[0], 200, 100, 50)
+            version = server.model.version
+            await tick(server)
+
+            updates = [message for message in peers[1].messages if message.get('moves')]
+
+            assert len(updates) == 1
+            assert len(updates[0]['moves']) == 1
+            assert server.model.version == version + 1
+            assert snapshot(peers[1].model) == snapshot(peers[0].model)
+            await stop(server, peers)
+
+        asyncio.run(scenario())
+
+    def test_rejects_colliding_rectangle(self):
+        async def scenario():
+            server, peers = await start(2)
+            peers[0].controller.double_click(300, 300)
+            peers[1].controller.double_click(320, 310)
+            await tick(server)
+
+            assert len(server.model.rectangles) == 1
+            assert all(snapshot(peer.model) == snapshot(server.model) for peer in peers)
+            await stop(server, peers)
+
+        asyncio.run(scenario())
+
+    def test_rejects_invalid_rectangles(self):
+        server = SyncServer(GameModel())
+        client = ClientState(None)
+        model = GameModel()
+        first = rectangle_to_record(model.try_add_new_rectangle(300, 300))
+        second = rectangle_to_record(model.try_add_new_rectangle(600, 300))
+        server.apply_operation({'op': 'add', 'rectangle': first}, client)
+
+        invalid = [['not-an-id'] + second[1:], second[:1] + ['white'] + second[2:], second[:4] + [10, 10, second[6]],
+                   second[:6] + [second[6][:3]], second[:6] + [second[6][:3] + second[6][:1]],
+                   second[:6] + [first[6][:1] + second[6][1:]], second[:6] + [[port_id.replace(second[0], first[0])
+                                                                              for port_id in second[6]]]]
+
+        for record in invalid:
+            server.apply_operation({'op': 'add', 'rectangle': record}, client)
+
+        assert client.rejected_rectangles == [str(record[0]) for record in invalid]
+        assert [rect.id for rect in server.model.rectangles] == [first[0]]
+        assert list(server.rectangles) == [first[0]] and len(server.ports) == 4
+
+        server.apply_operation({'op': 'add', 'rectangle': second}, client)
+
+        assert list(server.rectangles) == [first[0], second[0]]
+
+    def test_corrects_colliding_moves(self):
+        async def scenario():
+            server, peers = await start(2)
+            peers[0].controller.double_click(200, 200)
+            peers[0].controller.double_click(600, 200)
+            await tick(server)
+
+            first, second = peers[0].model.rectangles
+            peers[0].drag(first, 200, 300)
+            peers[1].drag(peers[1].session.rectangles[second.id], -200, 300)
+            await tick(server)
+            await tick(server)
+
+            positions = {(rect.x(), rect.y()) for rect in server.model.rectangles}
+
+            assert positions in ({(350, 475), (550, 175)}, {(150, 175), (350, 475)})
+            assert all(snapshot(peer.model) == snapshot(server.model) for peer in peers)
+            await stop(server, peers)
+
+        asyncio.run(scenario())
+
+    def test_syncs_labels(self):
+        async def scenario():
+            server, peers = await start(2)
+            peers[0].controller.double_click(300, 300)
+            await tick(server)
+
+            peers[1].model.set_label(peers[1].model.rectangles[0], 'shared')
+            await tick(server)
+
+            assert server.model.rectangles[0].label == 'shared'
+            assert all(snapshot(peer.model) == snapshot(server.model) for peer in peers)
+
+            late_peer = Peer()
+            await late_peer.connect(server)
+
+            assert late_peer.model.rectangles[0].label == 'shared'
+            await stop(server, peers + [late_peer])
+
+        asyncio.run(scenario())
+
+    def test_links_over_unix_socket(self, tmp_path):
+        async def scenario():
+            server, peers = await start(2, str(tmp_path / 'world.sock'))
+            peers[0].controller.double_click(300, 300)
+            peers[0].controller.double_click(600, 300)
+            src_port = peers[0].model.rectangles[0].ports[1]
+            dst_port = peers[0].model.rectangles[1].ports[3]
+            peers[0].model.add_link(src_port, dst_port)
+            await tick(server)
+
+            assert len(peers[1].model.links) == 1
+            assert snapshot(peers[1].model) == snapshot(peers[0].model)
+
+            peers[1].model.add_link(peers[1].session.ports[src_port.id],
+                                    peers[1].session.ports[peers[0].model.rectangles[1].ports[0].id])
+            peers[1].model.remove_link(peers[1].model.links[0])
+            await tick(server)
+
+            assert not server.model.links
+            assert all(not peer.model.links and not peer.model.linked_port_ids for peer in peers)
+            await stop(server, peers)
+
+        asyncio.run(scenario())
@@ -0,0 +1,261 @@
+"""
+Implementation of the binary format of the model journal and the model snapshot.
+Both files are a fixed header followed by fixed-size little-endian records, one record kind byte each.
+A snapshot is a compacted journal: one rectangle added record for every rectangle, one rectangle relabeled record
+for every labeled rectangle and one link added record for every link. Ids are stored as 16 bytes per UUID instead
+of text, labels as UTF-8 padded to the size of the longest label
+"""
+import struct
+from typing import BinaryIO, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from utils import Constants
+
+SNAPSHOT_MAGIC: bytes = b'WORS'
+JOURNAL_MAGIC: bytes = b'WORJ'
+FORMAT_VERSION: int = 1
+HEADER_FORMAT: struct.Struct = struct.Struct('<4sBQ')
+
+RECTANGLE_ADDED: bytes = b'a'
+RECTANGLE_MOVED: bytes = b'm'
+RECTANGLE_REMOVED: bytes = b'r'
+RECTANGLE_RESIZED: bytes = b's'
+RECTANGLE_RELABELED: bytes = b'n'
+LINK_ADDED: bytes = b'l'
+LINK_REMOVED: bytes = b'x'
+
+RECORD_FORMATS = {
+    RECTANGLE_ADDED: struct.Struct('<16sBiiII16s16s16s16s'),
+    RECTANGLE_MOVED: struct.Struct('<16sii'),
+    RECTANGLE_REMOVED: struct.Struct('<16s'),
+    RECTANGLE_RESIZED: struct.Struct('<16sII'),
+    # UTF-8 takes at most 4 bytes per character
+    RECTANGLE_RELABELED: struct.Struct(f'<16sH{Constants.LABEL_MAX_LENGTH * 4}s'),
+    LINK_ADDED: struct.Struct('<16s16s16s16s16s'),
+    LINK_REMOVED: struct.Struct('<16s16s16s16s16s'),
+}
+
+
+class Record(NamedTuple):
+    """
+    Single decoded journal record
+
+    Attributes:
+        kind (bytes): one of RECTANGLE_ADDED, RECTANGLE_MOVED, RECTANGLE_REMOVED, RECTANGLE_RESIZED,
+            RECTANGLE_RELABELED, LINK_ADDED or LINK_REMOVED
+        fields (tuple): unpacked fields of the record, see RECORD_FORMATS
+    """
+    kind: bytes
+    fields: tuple
+
+
+def pack_id(value: str) -> bytes:
+    """
+    Packs the id in the UUID format into 16 bytes
+
+    Args:
+        value (str): id
+
+    Returns:
+        bytes: packed id
+    """
+    return bytes.fromhex(value.replace('-', ''))
+
+def unpack_id(value: bytes) -> str:
+    """
+    Unpacks the id packed by pack_id
+
+    Args:
+        value (bytes): packed id
+
+    Returns:
+        str: id in the UUID format
+    """
+    digits = value.hex()
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
+
+def pack_port_id(value: str) -> Tuple[bytes, bytes]:
+    """
+    Packs the port id, made of the parent rectangle id and its own id, into two 16 bytes parts
+
+    Args:
+        value (str): port id
+
+    Returns:
+        Tuple[bytes, bytes]: packed parent rectangle id and packed own id
+    """
+    parent_id, own_id = value.split('_')
+    return pack_id(parent_id), pack_id(own_id)
+
+def encode_rectangle_added(rectangle: MoveableRectangle) -> bytes:
+    """
+    Encodes the record of the added rectangle together with its ports
+
+    Args:
+        rectangle (MoveableRectangle): added rectangle
+
+    Returns:
+        bytes: encoded record
+    """
+    return RECTANGLE_ADDED + RECORD_FORMATS[RECTANGLE_ADDED].pack(
+        pack_id(rectangle.id), Constants.RECTANGLE_COLORS.index(rectangle.color),
+        rectangle.x(), rectangle.y(), rectangle.width(), rectangle.height(),
+        *(pack_port_id(port.id)[1] for port in rectangle.ports)
+    )
+
+def encode_rectangle_moved(rectangle: MoveableRectangle) -> bytes:
+    """
+    Encodes the record of the moved rectangle with its new absolute position
+
+    Args:
+        rectangle (MoveableRectangle): moved rectangle
+
+    Returns:
+        bytes: encoded record
+    """
+    return RECTANGLE_MOVED + RECORD_FORMATS[RECTANGLE_MOVED].pack(pack_id(rectangle.id), rectangle.x(), rectangle.y())
+
+def encode_rectangle_removed(rectangle: MoveableRectangle) -> bytes:
+    """
+    Encodes the record of the removed rectangle
+
+    Args:
+        rectangle (MoveableRectangle): removed rectangle
+
+    Returns:
+        bytes: encoded record
+    """
+    return RECTANGLE_REMOVED + RECORD_FORMATS[RECTANGLE_REMOVED].pack(pack_id(rectangle.id))
+
+def encode_rectangle_resized(rectangle: MoveableRectangle) -> bytes:
+    """
+    Encodes the record of the resized rectangle with its new size
+
+    Args:
+        rectangle (MoveableRectangle): resized rectangle
+
+    Returns:
+        bytes: encoded record
+    """
+    return RECTANGLE_RESIZED + RECORD_FORMATS[RECTANGLE_RESIZED].pack(pack_id(rectangle.id), rectangle.width(),
+                                                                      rectangle.height())
+
+def pack_label(label: str) -> Tuple[int, bytes]:
+    """
+    Packs the label as UTF-8, cut to Constants.LABEL_MAX_LENGTH characters
+
+    Args:
+        label (str): label
+
+    Returns:
+        Tuple[int, bytes]: length of the encoded label in bytes and the encoded label
+    """
+    data = label[:Constants.LABEL_MAX_LENGTH].encode('utf-8')
+    return len(data), data
+
+def unpack_label(length: int, data: bytes) -> str:
+    """
+    Unpacks the label packed by pack_label
+
+    Args:
+        length (int): length of the encoded label in bytes
+        data (bytes): padded encoded label
+
+    Returns:
+        str: label
+    """
+    return data[:length].decode('utf-8', errors='replace')
+
+def encode_rectangle_relabeled(rectangle: MoveableRectangle) -> bytes:
+    """
+    Encodes the record of the relabeled rectangle with its new label, empty if the label was removed
+
+    Args:
+        rectangle (MoveableRectangle): relabeled rectangle
+
+    Returns:
+        bytes: encoded record
+    """
+    return RECTANGLE_RELABELED + RECORD_FORMATS[RECTANGLE_RELABELED].pack(pack_id(rectangle.id),
+                                                                          *pack_label(rectangle.label))
+
+def encode_link(kind: bytes, link: Link) -> bytes:
+    """
+    Encodes the record of the added or removed link
+
+    Args:
+        kind (bytes): LINK_ADDED or LINK_REMOVED
+        link (Link): added or removed link
+
+    Returns:
+        bytes: encoded record
+    """
+    return kind + RECORD_FORMATS[kind].pack(pack_id(link.id.rsplit(';;', 1)[1]),
+                                            *pack_port_id(link.src_id), *pack_port_id(link.dst_id))
+
+def write_header(stream: BinaryIO, magic: bytes, generation: int) -> None:
+    """
+    Writes the snapshot or journal header to the given binary stream
+
+    Args:
+        stream (BinaryIO): stream to write to
+        magic (bytes): SNAPSHOT_MAGIC or JOURNAL_MAGIC
+        generation (int): number of the snapshot the journal continues
+
+    Returns:
+        None
+    """
+    stream.write(HEADER_FORMAT.pack(magic, FORMAT_VERSION, generation))
+
+def read_header(stream: BinaryIO, magic: bytes) -> Optional[int]:
+    """
+    Reads and validates the snapshot or journal header from the given binary stream
+
+    Args:
+        stream (BinaryIO): stream to read from
+        magic (bytes): expected SNAPSHOT_MAGIC or JOURNAL_MAGIC
+
+    Returns:
+        Optional[int]: generation of the file, or None if the header is missing or invalid
+    """
+    data = stream.read(HEADER_FORMAT.size)
+
+    if len(data) < HEADER_FORMAT.size:
+        return None
+
+    file_magic, version, generation = HEADER_FORMAT.unpack(data)
+
+    if file_magic != magic or version != FORMAT_VERSION:
+        return None
+
+    return generation
+
+def read_records(stream: BinaryIO, record_formats: Optional[Dict[bytes, struct.Struct]] = None) -> Iterator[Record]:
+    """
+    Reads the records following the header until the end of the stream.
+    A torn record at the end, left by a crash in the middle of a write, and everything after an unknown
+    record kind are ignored
+
+    Args:
+        stream (BinaryIO): stream positioned after the header
+        record_formats (Optional[Dict[bytes, struct.Struct]]): formats by record kind. Default = None - RECORD_FORMATS
+
+    Returns:
+        Iterator[Record]: decoded records
+    """
+    record_formats = record_formats or RECORD_FORMATS
+
+    while True:
+        kind = stream.read(1)
+        record_format = record_formats.get(kind)
+
+        if record_format is None:
+            return
+
+        data = stream.read(record_format.size)
+
+        if len(data) < record_format.size:
+            return
+
+        yield Record(kind, record_format.unpack(data))
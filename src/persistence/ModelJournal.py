@@ -0,0 +1,268 @@
+"""
+Implementation of the append-only model journal with background autosave
+"""
+import os
+import queue
+import threading
+import time
+from typing import BinaryIO, Dict, List, Optional
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from models.GameModel import GameModel
+from persistence.JournalFormat import (JOURNAL_MAGIC, SNAPSHOT_MAGIC, RECORD_FORMATS, RECTANGLE_ADDED,
+                                       RECTANGLE_MOVED, RECTANGLE_REMOVED, RECTANGLE_RESIZED, RECTANGLE_RELABELED,
+                                       LINK_ADDED, LINK_REMOVED, encode_rectangle_added, encode_rectangle_moved,
+                                       encode_rectangle_removed, encode_rectangle_resized,
+                                       encode_rectangle_relabeled, encode_link, write_header)
+
+SNAPSHOT_FILE_NAME: str = 'world.snapshot'
+JOURNAL_FILE_NAME: str = 'world.journal'
+FLUSH_INTERVAL_S: float = 0.5
+COMPACT_THRESHOLD: int = 1024
+
+
+class ModelJournal:
+    """
+    The ModelJournal that logs game model mutations as compact records. Records are encoded on the caller
+    thread and handed to a background thread that appends them to the journal file in batches.
+    The background thread keeps the latest record of every rectangle and link, so once the journal grows
+    longer than the scene it writes them as a new snapshot and starts an empty journal without
+    touching the game model. The snapshot and the journal carry a generation number, and the journal is
+    only replayed on top of the snapshot of the same generation
+
+    Args:
+        directory (str): directory of the snapshot and journal files, created if missing
+        model (GameModel): game model the journal starts from
+        generation (int): generation of the snapshot the model was loaded from. Default: 0
+        flush_interval (float): time in seconds to collect records into one batch. Default: FLUSH_INTERVAL_S
+        compact_threshold (int): min number of journal records to compact. Default: COMPACT_THRESHOLD
+
+    Attributes:
+        directory (str): directory of the snapshot and journal files
+        generation (int): generation of the current snapshot
+        flush_interval (float): time in seconds to collect records into one batch
+        compact_threshold (int): min number of journal records to compact
+        records (queue.Queue): encoded records waiting to be written, None stops the background thread
+        rectangles (Dict[bytes, bytes]): latest rectangle added record by packed rectangle id
+        labels (Dict[bytes, bytes]): latest rectangle relabeled record of the labeled rectangles
+            by packed rectangle id
+        links (Dict[bytes, bytes]): link added records by packed link id
+        journal_records (int): number of records in the current journal
+        stream (Optional[BinaryIO]): opened journal file
+        thread (threading.Thread): background thread that writes the files
+    """
+    def __init__(self, directory: str, model: GameModel, generation: int = 0,
+                 flush_interval: float = FLUSH_INTERVAL_S, compact_threshold: int = COMPACT_THRESHOLD):
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.generation = generation
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+        self.records: queue.Queue = queue.Queue()
+
+        self.rectangles: Dict[bytes, bytes] = {}
+        self.labels: Dict[bytes, bytes] = {}
+        self.links: Dict[bytes, bytes] = {}
+
+        for rectangle in model.rectangles:
+            self.apply(encode_rectangle_added(rectangle))
+            if rectangle.label:
+                self.apply(encode_rectangle_relabeled(rectangle))
+        for link in model.links:
+            self.apply(encode_link(LINK_ADDED, link))
+
+        self.journal_records = 0
+        self.stream: Optional[BinaryIO] = None
+        self.compact()
+
+        self.thread = threading.Thread(target=self.run, name='ModelJournal', daemon=True)
+        self.thread.start()
+
+    def record_rectangle_added(self, rectangle: MoveableRectangle) -> None:
+        """
+        Records the added rectangle, together with its label if it has one
+        """
+        self.records.put(encode_rectangle_added(rectangle))
+
+        if rectangle.label:
+            self.records.put(encode_rectangle_relabeled(rectangle))
+
+    def record_rectangle_moved(self, rectangle: MoveableRectangle) -> None:
+        """
+        Records the new position of the moved rectangle
+        """
+        self.records.put(encode_rectangle_moved(rectangle))
+
+    def record_rectangle_removed(self, rectangle: MoveableRectangle) -> None:
+        """
+        Records the removed rectangle
+        """
+        self.records.put(encode_rectangle_removed(rectangle))
+
+    def record_rectangle_resized(self, rectangle: MoveableRectangle) -> None:
+        """
+        Records the new size of the resized rectangle
+        """
+        self.records.put(encode_rectangle_resized(rectangle))
+
+    def record_rectangle_relabeled(self, rectangle: MoveableRectangle) -> None:
+        """
+        Records the new label of the relabeled rectangle
+        """
+        self.records.put(encode_rectangle_relabeled(rectangle))
+
+    def record_link_added(self, link: Link) -> None:
+        """
+        Records the added link
+        """
+        self.records.put(encode_link(LINK_ADDED, link))
+
+    def record_link_removed(self, link: Link) -> None:
+        """
+        Records the removed link
+        """
+        self.records.put(encode_link(LINK_REMOVED, link))
+
+    def apply(self, record: bytes) -> None:
+        """
+        Applies the encoded record to the latest records of rectangles and links
+
+        Args:
+            record (bytes): encoded record
+
+        Returns:
+            None
+        """
+        kind, key = record[:1], record[1:17]
+
+        if kind == RECTANGLE_ADDED:
+            self.rectangles[key] = record
+            self.labels.pop(key, None)
+        elif kind == RECTANGLE_MOVED and key in self.rectangles:
+            added_format = RECORD_FORMATS[RECTANGLE_ADDED]
+            fields = list(added_format.unpack(self.rectangles[key][1:]))
+            fields[2:4] = RECORD_FORMATS[RECTANGLE_MOVED].unpack(record[1:])[1:]
+            self.rectangles[key] = RECTANGLE_ADDED + added_format.pack(*fields)
+        elif kind == RECTANGLE_RESIZED and key in self.rectangles:
+            added_format = RECORD_FORMATS[RECTANGLE_ADDED]
+            fields = list(added_format.unpack(self.rectangles[key][1:]))
+            fields[4:6] = RECORD_FORMATS[RECTANGLE_RESIZED].unpack(record[1:])[1:]
+            self.rectangles[key] = RECTANGLE_ADDED + added_format.pack(*fields)
+        elif kind == RECTANGLE_RELABELED and key in self.rectangles:
+            if RECORD_FORMATS[RECTANGLE_RELABELED].unpack(record[1:])[1]:
+                self.labels[key] = record
+            else:
+                self.labels.pop(key, None)
+        elif kind == RECTANGLE_REMOVED:
+            self.rectangles.pop(key, None)
+            self.labels.pop(key, None)
+        elif kind == LINK_ADDED:
+            self.links[key] = record
+        elif kind == LINK_REMOVED:
+            self.links.pop(key, None)
+
+    def write_batch(self, batch: List[bytes]) -> None:
+        """
+        Appends the batch of records to the journal and syncs it to the disk
+
+        Args:
+            batch (List[bytes]): encoded records
+
+        Returns:
+            None
+        """
+        for record in batch:
+            self.apply(record)
+
+        self.stream.write(b''.join(batch))
+        self.stream.flush()
+        os.fsync(self.stream.fileno())
+        self.journal_records += len(batch)
+
+    def compact(self) -> None:
+        """
+        Writes the latest records of rectangles, labels and links as a snapshot of the next generation
+        and starts an empty journal of that generation
+
+        Returns:
+            None
+        """
+        self.generation += 1
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE_NAME)
+
+        with open(snapshot_path + '.tmp', 'wb') as snapshot:
+            write_header(snapshot, SNAPSHOT_MAGIC, self.generation)
+            snapshot.write(b''.join(self.rectangles.values()))
+            snapshot.write(b''.join(self.labels.values()))
+            snapshot.write(b''.join(self.links.values()))
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+
+        os.replace(snapshot_path + '.tmp', snapshot_path)
+
+        if self.stream:
+            self.stream.close()
+
+        self.stream = open(os.path.join(self.directory, JOURNAL_FILE_NAME), 'wb')  # pylint: disable=consider-using-with
+        write_header(self.stream, JOURNAL_MAGIC, self.generation)
+        self.stream.flush()
+        self.journal_records = 0
+
+    def run(self) -> None:
+        """
+        Collects records into batches, writes them and compacts the journal once it is longer than the scene.
+        Runs on the background thread until None is received
+
+        Returns:
+            None
+        """
+        is_running = True
+
+        while is_running:
+            batch = [self.records.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.records.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            if batch[-1] is None:
+                is_running = False
+                batch.pop()
+
+            if batch:
+                self.write_batch(batch)
+
+            if self.journal_records >= max(self.compact_threshold, len(self.rectangles) + len(self.links)):
+                self.compact()
+
+            for _ in range(len(batch) + (0 if is_running else 1)):
+                self.records.task_done()
+
+    def flush(self) -> None:
+        """
+        Waits until all recorded mutations are written to the disk
+
+        Returns:
+            None
+        """
+        self.records.join()
+
+    def close(self) -> None:
+        """
+        Writes the remaining records, compacts the journal and stops the background thread
+
+        Returns:
+            None
+        """
+        if not self.thread.is_alive():
+            return
+
+        self.records.put(None)
+        self.thread.join()
+        self.compact()
+        self.stream.close()
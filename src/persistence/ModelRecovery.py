@@ -0,0 +1,145 @@
+"""
+Implementation of the game model recovery from the latest snapshot and the journal tail
+"""
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from components.Port import Port
+from models.GameModel import GameModel
+from persistence.JournalFormat import (JOURNAL_MAGIC, SNAPSHOT_MAGIC, RECTANGLE_ADDED, RECTANGLE_MOVED,
+                                       RECTANGLE_REMOVED, RECTANGLE_RESIZED, RECTANGLE_RELABELED, LINK_ADDED,
+                                       LINK_REMOVED, Record, read_header, read_records, unpack_id, unpack_label)
+from persistence.ModelJournal import JOURNAL_FILE_NAME, SNAPSHOT_FILE_NAME
+from utils import Constants
+
+
+class ModelRecovery:
+    """
+    The ModelRecovery that rebuilds a game model by applying snapshot and journal records through
+    the game model mutation methods. Records that do not match the model, e.g. the ones of a journal
+    that was written after the snapshot it follows was already replaced, are skipped
+
+    Args:
+        model (GameModel): game model to apply records to
+
+    Attributes:
+        model (GameModel): game model to apply records to
+        rectangles (Dict[str, MoveableRectangle]): rectangles by id
+        ports (Dict[str, Port]): ports by id
+        links (Dict[str, Link]): links by id
+    """
+    def __init__(self, model: GameModel):
+        self.model = model
+        self.rectangles: Dict[str, MoveableRectangle] = {rect.id: rect for rect in model.rectangles}
+        self.ports: Dict[str, Port] = {port.id: port for rect in model.rectangles for port in rect.ports}
+        self.links: Dict[str, Link] = {link.id: link for link in model.links}
+
+    def apply(self, record: Record) -> None:
+        """
+        Applies the record to the game model
+
+        Args:
+            record (Record): decoded record
+
+        Returns:
+            None
+        """
+        if record.kind == RECTANGLE_ADDED:
+            rectangle_id, color_index, x_coord, y_coord, width, height, *port_ids = record.fields
+            rectangle_id = unpack_id(rectangle_id)
+
+            if rectangle_id in self.rectangles:
+                return
+
+            rectangle = MoveableRectangle.restore(
+                rectangle_id, Constants.RECTANGLE_COLORS[color_index], x_coord, y_coord, width, height,
+                [rectangle_id + '_' + unpack_id(port_id) for port_id in port_ids]
+            )
+
+            self.rectangles[rectangle_id] = rectangle
+            self.ports.update((port.id, port) for port in rectangle.ports)
+            self.model.add_rectangle(rectangle)
+        elif record.kind == RECTANGLE_MOVED:
+            rectangle_id, x_coord, y_coord = record.fields
+            rectangle = self.rectangles.get(unpack_id(rectangle_id))
+
+            if rectangle is not None:
+                self.model.move_rectangle(rectangle, x_coord - rectangle.x(), y_coord - rectangle.y())
+        elif record.kind == RECTANGLE_RESIZED:
+            rectangle_id, width, height = record.fields
+            rectangle = self.rectangles.get(unpack_id(rectangle_id))
+
+            if rectangle is not None:
+                self.model.resize_rectangle(rectangle, width, height)
+        elif record.kind == RECTANGLE_RELABELED:
+            rectangle_id, length, label = record.fields
+            rectangle = self.rectangles.get(unpack_id(rectangle_id))
+
+            if rectangle is not None:
+                self.model.set_label(rectangle, unpack_label(length, label))
+        elif record.kind == RECTANGLE_REMOVED:
+            rectangle = self.rectangles.pop(unpack_id(record.fields[0]), None)
+
+            if rectangle is not None:
+                for link_id in [link.id for link in self.model.links if link.src_id.startswith(rectangle.id)
+                                or link.dst_id.startswith(rectangle.id)]:
+                    self.links.pop(link_id)
+                self.model.remove_rectangle(rectangle)
+        else:
+            link_id, src_parent_id, src_id, dst_parent_id, dst_id = (unpack_id(field) for field in record.fields)
+            src_id, dst_id = src_parent_id + '_' + src_id, dst_parent_id + '_' + dst_id
+            link_id = src_id + ';;' + dst_id + ';;' + link_id
+
+            if record.kind == LINK_ADDED and link_id not in self.links and {src_id, dst_id} <= self.ports.keys():
+                self.links[link_id] = self.model.add_link(self.ports[src_id], self.ports[dst_id], link_id)
+            elif record.kind == LINK_REMOVED and link_id in self.links:
+                self.model.remove_link(self.links.pop(link_id))
+
+    def apply_all(self, records: Iterable[Record]) -> None:
+        """
+        Applies the records to the game model in order
+
+        Args:
+            records (Iterable[Record]): decoded records
+
+        Returns:
+            None
+        """
+        for record in records:
+            self.apply(record)
+
+
+def load_model(directory: str) -> Tuple[GameModel, int]:
+    """
+    Rebuilds the game model from the latest snapshot and the journal tail of the same generation
+
+    Args:
+        directory (str): directory of the snapshot and journal files
+
+    Returns:
+        Tuple[GameModel, int]: rebuilt game model, empty if there is nothing to recover,
+        and generation of the loaded snapshot, 0 if there is none
+    """
+    model = GameModel()
+    recovery = ModelRecovery(model)
+    generation: Optional[int] = None
+
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE_NAME)
+    journal_path = os.path.join(directory, JOURNAL_FILE_NAME)
+
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, 'rb') as snapshot:
+            generation = read_header(snapshot, SNAPSHOT_MAGIC)
+            if generation is not None:
+                recovery.apply_all(read_records(snapshot))
+
+    if generation is not None and os.path.exists(journal_path):
+        with open(journal_path, 'rb') as journal:
+            if read_header(journal, JOURNAL_MAGIC) == generation:
+                recovery.apply_all(read_records(journal))
+
+    model.recalculate_min_field_size()
+
+    return model, generation or 0
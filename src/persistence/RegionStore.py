@@ -0,0 +1,409 @@
+"""
+Implementation of the region-sharded world storage: the world is split into square regions,
+and every region is stored in its own file of journal format records. Rectangles are stored in the region of their
+top left corner, and a small index file keeps a summary of every region, so the regions whose rectangles reach
+out of them and an overview of the whole world are known without reading the regions
+"""
+import os
+import re
+import struct
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from persistence.JournalFormat import (RECORD_FORMATS, RECTANGLE_ADDED, RECTANGLE_RELABELED, pack_id, pack_label,
+                                       pack_port_id, unpack_id, unpack_label, read_header, read_records,
+                                       write_header)
+from utils import Constants
+
+REGION_MAGIC: bytes = b'WORR'
+REGION_INDEX_MAGIC: bytes = b'WORI'
+REGION_SIZE_PX: int = 512
+REGION_LINK: bytes = b'k'
+REGION_SUMMARY: bytes = b'u'
+
+REGION_RECORD_FORMATS = {
+    RECTANGLE_ADDED: RECORD_FORMATS[RECTANGLE_ADDED],
+    RECTANGLE_RELABELED: RECORD_FORMATS[RECTANGLE_RELABELED],
+    REGION_LINK: struct.Struct('<16s16s16s16s16siiiiiiii'),
+}
+
+REGION_INDEX_FORMATS = {
+    REGION_SUMMARY: struct.Struct('<iiiiiiB'),
+}
+
+RegionKey = Tuple[int, int]
+Bounds = Tuple[int, int, int, int]
+
+
+class RectangleRecord(NamedTuple):
+    """
+    Stored rectangle in the world coordinates
+
+    Attributes:
+        id (str): id of the rectangle
+        color (str): color name of the rectangle
+        x (int): x coordinate of the top left corner
+        y (int): y coordinate of the top left corner
+        width (int): width of the rectangle
+        height (int): height of the rectangle
+        port_ids (Tuple[str, ...]): ids of the ports
+        label (str): text shown in the rectangle
+    """
+    id: str
+    color: str
+    x: int
+    y: int
+    width: int
+    height: int
+    port_ids: Tuple[str, ...]
+    label: str = ''
+
+
+class LinkRecord(NamedTuple):
+    """
+    Stored link in the world coordinates. A link between rectangles of different regions is stored in both,
+    so it is loaded with either of them
+
+    Attributes:
+        id (str): id of the link
+        src_id (str): id of the source port
+        dst_id (str): id of the destination port
+        x1 (int): x coordinate of the source end
+        y1 (int): y coordinate of the source end
+        x2 (int): x coordinate of the destination end
+        y2 (int): y coordinate of the destination end
+        src_region (RegionKey): region of the source rectangle
+        dst_region (RegionKey): region of the destination rectangle
+    """
+    id: str
+    src_id: str
+    dst_id: str
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    src_region: RegionKey
+    dst_region: RegionKey
+
+
+class RegionSummary(NamedTuple):
+    """
+    Summary of the rectangles of a region, enough to show the region in an overview without reading it
+
+    Attributes:
+        left (int): left side of the bounds of the rectangles in the world coordinates
+        top (int): top side of the bounds of the rectangles in the world coordinates
+        right (int): right side of the bounds of the rectangles in the world coordinates
+        bottom (int): bottom side of the bounds of the rectangles in the world coordinates
+        color (str): color name of the largest rectangle
+    """
+    left: int
+    top: int
+    right: int
+    bottom: int
+    color: str
+
+
+class RegionData:
+    """
+    The RegionData that holds the decoded records of one region
+
+    Attributes:
+        rectangles (Dict[str, RectangleRecord]): rectangles by id
+        links (Dict[str, LinkRecord]): links by id
+        is_dirty (bool): True if the records changed since they were loaded or saved
+    """
+    def __init__(self):
+        self.rectangles: Dict[str, RectangleRecord] = {}
+        self.links: Dict[str, LinkRecord] = {}
+        self.is_dirty = False
+
+    def size(self) -> int:
+        """
+        Gets the number of records of the region, used as its memory cost
+
+        Returns:
+            int: number of records
+        """
+        return len(self.rectangles) + len(self.links)
+
+    def get_summary(self) -> Optional[RegionSummary]:
+        """
+        Gets the summary of the rectangles of the region
+
+        Returns:
+            Optional[RegionSummary]: summary of the rectangles, None if there are no rectangles
+        """
+        if not self.rectangles:
+            return None
+
+        rectangles = self.rectangles.values()
+
+        return RegionSummary(min(rect.x for rect in rectangles), min(rect.y for rect in rectangles),
+                             max(rect.x + rect.width for rect in rectangles),
+                             max(rect.y + rect.height for rect in rectangles),
+                             max(rectangles, key=lambda rect: rect.width * rect.height).color)
+
+
+class RegionStore:
+    """
+    The RegionStore that reads and writes the region files of one world directory.
+    The region size is a part of the file names, so worlds of different region sizes do not mix
+
+    Args:
+        directory (str): directory of the region files, created if missing
+        region_size (int): side of the square region in pixels. Default: REGION_SIZE_PX
+
+    Attributes:
+        directory (str): directory of the region files
+        region_size (int): side of the square region in pixels
+        summaries (Dict[RegionKey, RegionSummary]): summaries of the saved regions with rectangles by region key
+        reaches (Dict[RegionKey, Tuple[int, int]]): right and bottom sides reached by the rectangles of the saved
+            regions whose rectangles reach out of them, by region key
+        bounds (Optional[Bounds]): bounds of the rectangles of the saved regions, None if unknown
+        is_index_dirty (bool): True if the summaries changed since the index was written
+    """
+    def __init__(self, directory: str, region_size: int = REGION_SIZE_PX):
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.region_size = region_size
+        self.summaries: Dict[RegionKey, RegionSummary] = {}
+        self.reaches: Dict[RegionKey, Tuple[int, int]] = {}
+        self.bounds: Optional[Bounds] = None
+        self.is_index_dirty = False
+
+        if os.path.exists(self.get_index_path()):
+            self.load_index()
+        else:
+            # worlds saved before the index was added are summarized once
+            pattern = re.compile(f'region_{region_size}_(-?[0-9]+)_(-?[0-9]+)\\.bin')
+
+            for name in os.listdir(directory):
+                match = pattern.fullmatch(name)
+
+                if match:
+                    key = int(match.group(1)), int(match.group(2))
+                    self.set_summary(key, self.load(key).get_summary())
+
+            self.save_index()
+
+    def get_region_key(self, x_coord: int, y_coord: int) -> RegionKey:
+        """
+        Gets the key of the region that contains the point
+
+        Args:
+            x_coord (int): x coordinate in the world
+            y_coord (int): y coordinate in the world
+
+        Returns:
+            RegionKey: column and row of the region
+        """
+        return x_coord // self.region_size, y_coord // self.region_size
+
+    def get_path(self, key: RegionKey) -> str:
+        """
+        Gets the path of the region file
+
+        Args:
+            key (RegionKey): key of the region
+
+        Returns:
+            str: path of the region file
+        """
+        return os.path.join(self.directory, f'region_{self.region_size}_{key[0]}_{key[1]}.bin')
+
+    def get_index_path(self) -> str:
+        """
+        Gets the path of the index file of the region summaries
+
+        Returns:
+            str: path of the index file
+        """
+        return os.path.join(self.directory, f'regions_{self.region_size}.index')
+
+    def is_reaching_out(self, key: RegionKey, summary: Optional[RegionSummary]) -> bool:
+        """
+        Checks if the rectangles of the region reach out of it to the right or to the bottom
+
+        Args:
+            key (RegionKey): key of the region
+            summary (Optional[RegionSummary]): summary of the rectangles of the region
+
+        Returns:
+            bool: True if the rectangles reach out of the region. False otherwise
+        """
+        return summary is not None and (summary.right > (key[0] + 1) * self.region_size or
+                                        summary.bottom > (key[1] + 1) * self.region_size)
+
+    def set_summary(self, key: RegionKey, summary: Optional[RegionSummary]) -> None:
+        """
+        Updates the summary of the region and the regions that reach out of them
+
+        Args:
+            key (RegionKey): key of the region
+            summary (Optional[RegionSummary]): summary of the rectangles of the region, None if there are none
+
+        Returns:
+            None
+        """
+        if self.summaries.get(key) == summary:
+            return
+
+        if summary is None:
+            del self.summaries[key]
+        else:
+            self.summaries[key] = summary
+
+        if self.is_reaching_out(key, summary):
+            self.reaches[key] = summary.right, summary.bottom
+        else:
+            self.reaches.pop(key, None)
+
+        self.bounds = None
+        self.is_index_dirty = True
+
+    def get_bounds(self) -> Optional[Bounds]:
+        """
+        Gets the bounds of the rectangles of the saved regions
+
+        Returns:
+            Optional[Bounds]: left, top, right and bottom sides in the world coordinates, None if there are
+            no rectangles
+        """
+        if self.bounds is None and self.summaries:
+            summaries = self.summaries.values()
+            self.bounds = (min(summary.left for summary in summaries), min(summary.top for summary in summaries),
+                           max(summary.right for summary in summaries), max(summary.bottom for summary in summaries))
+
+        return self.bounds
+
+    def load_index(self) -> None:
+        """
+        Reads the region summaries from the index file
+
+        Returns:
+            None
+        """
+        with open(self.get_index_path(), 'rb') as stream:
+            if read_header(stream, REGION_INDEX_MAGIC) is None:
+                return
+
+            for record in read_records(stream, REGION_INDEX_FORMATS):
+                column, row, left, top, right, bottom, color_index = record.fields
+                self.set_summary((column, row), RegionSummary(left, top, right, bottom,
+                                                              Constants.RECTANGLE_COLORS[color_index]))
+
+        self.is_index_dirty = False
+
+    def save_index(self) -> None:
+        """
+        Writes the region summaries to a temporary file and replaces the index file with it,
+        if they changed since the last write
+
+        Returns:
+            None
+        """
+        if not self.is_index_dirty and os.path.exists(self.get_index_path()):
+            return
+
+        summary_format = REGION_INDEX_FORMATS[REGION_SUMMARY]
+
+        with open(self.get_index_path() + '.tmp', 'wb') as stream:
+            write_header(stream, REGION_INDEX_MAGIC, 0)
+
+            for key, summary in self.summaries.items():
+                stream.write(REGION_SUMMARY + summary_format.pack(
+                    *key, *summary[:4], Constants.RECTANGLE_COLORS.index(summary.color)))
+
+        os.replace(self.get_index_path() + '.tmp', self.get_index_path())
+        self.is_index_dirty = False
+
+    def load(self, key: RegionKey) -> RegionData:
+        """
+        Reads the records of the region
+
+        Args:
+            key (RegionKey): key of the region
+
+        Returns:
+            RegionData: records of the region, empty if the region was never saved
+        """
+        data = RegionData()
+
+        if not os.path.exists(self.get_path(key)):
+            return data
+
+        with open(self.get_path(key), 'rb') as stream:
+            if read_header(stream, REGION_MAGIC) is None:
+                return data
+
+            for record in read_records(stream, REGION_RECORD_FORMATS):
+                if record.kind == RECTANGLE_ADDED:
+                    rectangle_id, color_index, x_coord, y_coord, width, height, *port_ids = record.fields
+                    rectangle_id = unpack_id(rectangle_id)
+                    data.rectangles[rectangle_id] = RectangleRecord(
+                        rectangle_id, Constants.RECTANGLE_COLORS[color_index], x_coord, y_coord, width, height,
+                        tuple(rectangle_id + '_' + unpack_id(port_id) for port_id in port_ids)
+                    )
+                elif record.kind == RECTANGLE_RELABELED:
+                    rectangle_id, length, label = record.fields
+                    rectangle_id = unpack_id(rectangle_id)
+
+                    if rectangle_id in data.rectangles:
+                        data.rectangles[rectangle_id] = data.rectangles[rectangle_id]._replace(
+                            label=unpack_label(length, label))
+                else:
+                    link_id, src_parent_id, src_id, dst_parent_id, dst_id, *coords = record.fields
+                    src_id = unpack_id(src_parent_id) + '_' + unpack_id(src_id)
+                    dst_id = unpack_id(dst_parent_id) + '_' + unpack_id(dst_id)
+                    link_id = src_id + ';;' + dst_id + ';;' + unpack_id(link_id)
+                    data.links[link_id] = LinkRecord(link_id, src_id, dst_id, *coords[:4],
+                                                     (coords[4], coords[5]), (coords[6], coords[7]))
+
+        return data
+
+    def save(self, key: RegionKey, data: RegionData) -> None:
+        """
+        Writes the records of the region to a temporary file and replaces the region file with it,
+        and updates its summary, which is written by save_index. The file of an empty region is removed
+
+        Args:
+            key (RegionKey): key of the region
+            data (RegionData): records of the region
+
+        Returns:
+            None
+        """
+        path = self.get_path(key)
+        data.is_dirty = False
+        self.set_summary(key, data.get_summary())
+
+        if not data.size():
+            if os.path.exists(path):
+                os.remove(path)
+            return
+
+        rectangle_format, link_format = REGION_RECORD_FORMATS[RECTANGLE_ADDED], REGION_RECORD_FORMATS[REGION_LINK]
+        label_format = REGION_RECORD_FORMATS[RECTANGLE_RELABELED]
+
+        with open(path + '.tmp', 'wb') as stream:
+            write_header(stream, REGION_MAGIC, 0)
+
+            for rectangle in data.rectangles.values():
+                stream.write(RECTANGLE_ADDED + rectangle_format.pack(
+                    pack_id(rectangle.id), Constants.RECTANGLE_COLORS.index(rectangle.color),
+                    rectangle.x, rectangle.y, rectangle.width, rectangle.height,
+                    *(pack_port_id(port_id)[1] for port_id in rectangle.port_ids)
+                ))
+
+                if rectangle.label:
+                    stream.write(RECTANGLE_RELABELED + label_format.pack(pack_id(rectangle.id),
+                                                                         *pack_label(rectangle.label)))
+
+            for link in data.links.values():
+                stream.write(REGION_LINK + link_format.pack(
+                    pack_id(link.id.rsplit(';;', 1)[1]), *pack_port_id(link.src_id), *pack_port_id(link.dst_id),
+                    link.x1, link.y1, link.x2, link.y2, *link.src_region, *link.dst_region
+                ))
+
+        os.replace(path + '.tmp', path)
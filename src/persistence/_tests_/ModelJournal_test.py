@@ -0,0 +1,105 @@
+import os
+
+from src.controllers.GameController import GameController
+from src.models.GameModel import GameModel
+from src.persistence.ModelJournal import ModelJournal, JOURNAL_FILE_NAME, SNAPSHOT_FILE_NAME
+from src.persistence.ModelRecovery import load_model
+
+
+def snapshot(model):
+    return ([(rect.id, rect.color, rect.x(), rect.y(), rect.width(), rect.height(), [port.id for port in rect.ports],
+              rect.label) for rect in model.rectangles],
+            [(link.id, link.x1(), link.y1(), link.x2(), link.y2()) for link in model.links])
+
+
+def play_session(directory, compact_threshold=1024):
+    model = GameModel()
+    model.journal = ModelJournal(str(directory), model, flush_interval=0.01, compact_threshold=compact_threshold)
+    controller = GameController(model)
+
+    controller.double_click(300, 300)
+    controller.double_click(600, 300)
+    controller.double_click(300, 500)
+    src_port = model.rectangles[0].ports[1]
+    dst_port = model.rectangles[1].ports[3]
+
+    controller.press(300, 300)
+    controller.release()
+    controller.press(src_port.x(), src_port.y())
+    controller.move(dst_port.x(), dst_port.y())
+    controller.release()
+    controller.press(600, 300)
+    controller.move(640, 330)
+    controller.release()
+    model.add_link(model.rectangles[2].ports[0], model.rectangles[0].ports[2])
+    model.remove_link(model.links[1])
+    controller.press(300, 500)
+    controller.release()
+    controller.press(349, 524)
+    controller.move(369, 544)
+    controller.release()
+    model.set_label(model.rectangles[0], 'first \u00fc')
+    model.set_label(model.rectangles[1], 'second')
+    model.set_label(model.rectangles[1], '')
+
+    return model
+
+
+class TestModelJournal:
+    def test_recovers_after_close(self, tmp_path):
+        model = play_session(tmp_path)
+        model.journal.close()
+
+        recovered_model, generation = load_model(str(tmp_path))
+
+        assert snapshot(recovered_model) == snapshot(model)
+        assert generation == 2
+        assert os.path.getsize(tmp_path / JOURNAL_FILE_NAME) == 13
+
+    def test_recovers_journal_tail_after_crash(self, tmp_path):
+        model = play_session(tmp_path)
+        model.journal.flush()
+
+        with open(tmp_path / JOURNAL_FILE_NAME, 'ab') as journal:
+            journal.write(b'm\x01\x02')
+
+        recovered_model, generation = load_model(str(tmp_path))
+
+        assert snapshot(recovered_model) == snapshot(model)
+        assert generation == 1
+        assert len(recovered_model.links) == 1
+
+    def test_compacts_journal(self, tmp_path):
+        model = play_session(tmp_path, compact_threshold=1)
+        model.journal.flush()
+        controller = GameController(model)
+
+        for offset in range(10):
+            controller.press(300, 500 + offset)
+            controller.move(300, 501 + offset)
+            controller.release()
+
+        model.journal.flush()
+        recovered_model, generation = load_model(str(tmp_path))
+
+        assert snapshot(recovered_model) == snapshot(model)
+        assert generation > 2
+        assert os.path.getsize(tmp_path / JOURNAL_FILE_NAME) < os.path.getsize(tmp_path / SNAPSHOT_FILE_NAME)
+
+    def test_recovered_session_continues(self, tmp_path):
+        play_session(tmp_path).journal.close()
+
+        model, generation = load_model(str(tmp_path))
+        model.journal = ModelJournal(str(tmp_path), model, generation, flush_interval=0.01)
+        GameController(model).double_click(800, 600)
+        model.journal.flush()
+
+        recovered_model, _ = load_model(str(tmp_path))
+
+        assert snapshot(recovered_model) == snapshot(model)
+        assert len(recovered_model.rectangles) == 4
+
+    def test_loads_empty_directory(self, tmp_path):
+        model, generation = load_model(str(tmp_path))
+
+        assert not model.rectangles and generation == 0
@@ -0,0 +1,128 @@
+"""
+Implementation of the input event recorder
+"""
+import time
+from typing import BinaryIO
+
+from recording.InputTrace import (TraceHeader, TraceEvent, write_header, write_event, PRESS_EVENT, MOVE_EVENT,
+                                  RELEASE_EVENT, DOUBLE_CLICK_EVENT, RESIZE_EVENT, SNAPPING_EVENT,
+                                  COMPACTION_EVENT, PUSH_EVENT, PASTE_EVENT, CURVED_LINKS_EVENT,
+                                  LABEL_EVENT)
+
+
+class InputRecorder:
+    """
+    The InputRecorder that appends input events to a trace file
+
+    Args:
+        path (str): path of the trace file to create
+        seed (int): seed of the color and id random source the session was started with
+        field_width (int): width of the game field when recording starts
+        field_height (int): height of the game field when recording starts
+
+    Attributes:
+        path (str): path of the trace file
+        stream (BinaryIO): opened trace file
+        start_time (float): monotonic time when recording started
+    """
+    def __init__(self, path: str, seed: int, field_width: int, field_height: int):
+        self.path = path
+        self.stream: BinaryIO = open(path, 'wb')  # pylint: disable=consider-using-with
+        self.start_time = time.monotonic()
+
+        write_header(self.stream, TraceHeader(seed, field_width, field_height))
+
+    def record(self, kind: bytes, a: int = 0, b: int = 0, text: str = '') -> None:
+        """
+        Appends one event to the trace
+
+        Args:
+            kind (bytes): one of the InputTrace *_EVENT constants
+            a (int): x coordinate of the mouse, or new width for resize events. Default: 0
+            b (int): y coordinate of the mouse, or new height for resize events. Default: 0
+            text (str): text of the text events. Default: ''
+
+        Returns:
+            None
+        """
+        if self.stream.closed:
+            return
+
+        time_ms = int((time.monotonic() - self.start_time) * 1000)
+        write_event(self.stream, TraceEvent(kind, time_ms, a, b, text))
+
+    def record_press(self, x_coord: int, y_coord: int) -> None:
+        """
+        Records the mouse press event
+        """
+        self.record(PRESS_EVENT, x_coord, y_coord)
+
+    def record_move(self, x_coord: int, y_coord: int) -> None:
+        """
+        Records the mouse move event
+        """
+        self.record(MOVE_EVENT, x_coord, y_coord)
+
+    def record_release(self, x_coord: int, y_coord: int) -> None:
+        """
+        Records the mouse release event
+        """
+        self.record(RELEASE_EVENT, x_coord, y_coord)
+
+    def record_double_click(self, x_coord: int, y_coord: int) -> None:
+        """
+        Records the mouse double click event
+        """
+        self.record(DOUBLE_CLICK_EVENT, x_coord, y_coord)
+
+    def record_resize(self, width: int, height: int) -> None:
+        """
+        Records the window resize event
+        """
+        self.record(RESIZE_EVENT, width, height)
+
+    def record_snapping(self, is_grid_snap_enabled: bool, is_guide_snap_enabled: bool) -> None:
+        """
+        Records the snapping mode change
+        """
+        self.record(SNAPPING_EVENT, int(is_grid_snap_enabled), int(is_guide_snap_enabled))
+
+    def record_compaction(self, is_enabled: bool) -> None:
+        """
+        Records the compaction mode change
+        """
+        self.record(COMPACTION_EVENT, int(is_enabled), 0)
+
+    def record_push(self, is_enabled: bool) -> None:
+        """
+        Records the push mode change
+        """
+        self.record(PUSH_EVENT, int(is_enabled), 0)
+
+    def record_curved_links(self, is_enabled: bool) -> None:
+        """
+        Records the curved links mode change
+        """
+        self.record(CURVED_LINKS_EVENT, int(is_enabled), 0)
+
+    def record_paste(self, text: str, x_coord: int, y_coord: int) -> None:
+        """
+        Records the paste of the encoded subgraph centered at the position
+        """
+        self.record(PASTE_EVENT, x_coord, y_coord, text)
+
+    def record_label(self, label: str) -> None:
+        """
+        Records the label change of the selected rectangle
+        """
+        self.record(LABEL_EVENT, 0, 0, label)
+
+    def close(self) -> None:
+        """
+        Flushes and closes the trace file
+
+        Returns:
+            None
+        """
+        if not self.stream.closed:
+            self.stream.close()
@@ -0,0 +1,170 @@
+"""
+Implementation of the input trace file format shared by the InputRecorder and the ReplayDriver.
+A trace is a fixed header followed by fixed-size little-endian event records, the records of text events
+are followed by the length-prefixed UTF-8 text
+"""
+import struct
+from typing import BinaryIO, FrozenSet, Iterator, NamedTuple
+
+TRACE_MAGIC: bytes = b'WORT'
+TRACE_VERSION: int = 2
+HEADER_FORMAT: struct.Struct = struct.Struct('<4sBqII')
+EVENT_FORMAT: struct.Struct = struct.Struct('<cIii')
+TEXT_LENGTH_FORMAT: struct.Struct = struct.Struct('<I')
+
+PRESS_EVENT: bytes = b'p'
+MOVE_EVENT: bytes = b'm'
+RELEASE_EVENT: bytes = b'r'
+DOUBLE_CLICK_EVENT: bytes = b'd'
+RESIZE_EVENT: bytes = b's'
+SNAPPING_EVENT: bytes = b'g'
+COMPACTION_EVENT: bytes = b'k'
+PUSH_EVENT: bytes = b'u'
+PASTE_EVENT: bytes = b'v'
+CURVED_LINKS_EVENT: bytes = b'c'
+LABEL_EVENT: bytes = b'l'
+
+TEXT_EVENTS: FrozenSet[bytes] = frozenset({PASTE_EVENT, LABEL_EVENT})
+
+EVENT_NAMES = {
+    PRESS_EVENT: 'press',
+    MOVE_EVENT: 'move',
+    RELEASE_EVENT: 'release',
+    DOUBLE_CLICK_EVENT: 'double_click',
+    RESIZE_EVENT: 'resize',
+    SNAPPING_EVENT: 'snapping',
+    COMPACTION_EVENT: 'compaction',
+    PUSH_EVENT: 'push',
+    PASTE_EVENT: 'paste',
+    CURVED_LINKS_EVENT: 'curved_links',
+    LABEL_EVENT: 'label',
+}
+
+
+class TraceHeader(NamedTuple):
+    """
+    Header of the input trace
+
+    Attributes:
+        seed (int): seed of the color and id random source
+        field_width (int): width of the game field when recording started
+        field_height (int): height of the game field when recording started
+    """
+    seed: int
+    field_width: int
+    field_height: int
+
+
+class TraceEvent(NamedTuple):
+    """
+    Single recorded input event
+
+    Attributes:
+        kind (bytes): one of the *_EVENT constants
+        time_ms (int): milliseconds since the recording started
+        a (int): x coordinate of the mouse, new width for resize events, grid snap flag for snapping events
+            compaction flag for compaction events, push flag for push events
+            or curved links flag for curved links events
+        b (int): y coordinate of the mouse, new height for resize events or guide snap flag for snapping events
+        text (str): encoded subgraph for paste events, new label of the selected rectangle for label events,
+            empty for the other events. Default: ''
+    """
+    kind: bytes
+    time_ms: int
+    a: int
+    b: int
+    text: str = ''
+
+
+def write_event(stream: BinaryIO, event: TraceEvent) -> None:
+    """
+    Writes the event record to the given binary stream, followed by its text for the text events
+
+    Args:
+        stream (BinaryIO): binary stream to write to
+        event (TraceEvent): event to write
+
+    Returns:
+        None
+    """
+    record = EVENT_FORMAT.pack(event.kind, event.time_ms, event.a, event.b)
+
+    if event.kind in TEXT_EVENTS:
+        text = event.text.encode()
+        record += TEXT_LENGTH_FORMAT.pack(len(text)) + text
+
+    stream.write(record)
+
+def write_header(stream: BinaryIO, header: TraceHeader) -> None:
+    """
+    Writes the trace header to the given binary stream
+
+    Args:
+        stream (BinaryIO): binary stream to write to
+        header (TraceHeader): header to write
+
+    Returns:
+        None
+    """
+    stream.write(HEADER_FORMAT.pack(TRACE_MAGIC, TRACE_VERSION, *header))
+
+def read_header(stream: BinaryIO) -> TraceHeader:
+    """
+    Reads the trace header from the given binary stream
+
+    Args:
+        stream (BinaryIO): binary stream positioned at the start of the trace
+
+    Returns:
+        TraceHeader: header of the trace
+
+    Raises:
+        ValueError: if the stream does not start with a supported trace header
+    """
+    data = stream.read(HEADER_FORMAT.size)
+
+    if len(data) != HEADER_FORMAT.size:
+        raise ValueError('Trace header is truncated')
+
+    magic, version, *fields = HEADER_FORMAT.unpack(data)
+
+    # version 1 traces have no text events and are read the same way
+    if magic != TRACE_MAGIC or not 1 <= version <= TRACE_VERSION:
+        raise ValueError('Not a supported input trace')
+
+    return TraceHeader(*fields)
+
+def read_events(stream: BinaryIO) -> Iterator[TraceEvent]:
+    """
+    Reads the event records following the header together with the text of the text events.
+    A truncated last record is ignored, so traces of crashed sessions can still be replayed
+
+    Args:
+        stream (BinaryIO): binary stream positioned after the header
+
+    Returns:
+        Iterator[TraceEvent]: recorded events in order
+    """
+    while True:
+        data = stream.read(EVENT_FORMAT.size)
+
+        if len(data) != EVENT_FORMAT.size:
+            return
+
+        event = TraceEvent(*EVENT_FORMAT.unpack(data))
+
+        if event.kind in TEXT_EVENTS:
+            data = stream.read(TEXT_LENGTH_FORMAT.size)
+
+            if len(data) != TEXT_LENGTH_FORMAT.size:
+                return
+
+            length, = TEXT_LENGTH_FORMAT.unpack(data)
+            data = stream.read(length)
+
+            if len(data) != length:
+                return
+
+            event = event._replace(text=data.decode())
+
+        yield event
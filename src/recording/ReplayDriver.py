@@ -0,0 +1,244 @@
+"""
+Replay driver that feeds a recorded input trace back through the game handlers as fast as possible
+and reports per-event latency.
+
+Usage (from the src folder):
+    python -m recording.ReplayDriver trace.wort [--headless] [--no-paint]
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from controllers.GameController import GameController
+from models.GameModel import GameModel
+from recording.InputTrace import (TraceHeader, TraceEvent, read_header, read_events, EVENT_NAMES, PRESS_EVENT,
+                                  MOVE_EVENT, RELEASE_EVENT, DOUBLE_CLICK_EVENT, RESIZE_EVENT, SNAPPING_EVENT,
+                                  COMPACTION_EVENT, PUSH_EVENT, PASTE_EVENT, CURVED_LINKS_EVENT,
+                                  LABEL_EVENT)
+from utils import RandomUtils
+
+Latencies = Dict[bytes, List[float]]
+
+
+def load_trace(path: str) -> Tuple[TraceHeader, List[TraceEvent]]:
+    """
+    Loads the whole trace into memory, so file reads are not part of the measured latency
+
+    Args:
+        path (str): path of the trace file
+
+    Returns:
+        Tuple[TraceHeader, List[TraceEvent]]: trace header and recorded events
+    """
+    with open(path, 'rb') as stream:
+        header = read_header(stream)
+        return header, list(read_events(stream))
+
+def create_model(header: TraceHeader) -> GameModel:
+    """
+    Seeds the random source and creates the game model the trace was recorded with
+
+    Args:
+        header (TraceHeader): trace header
+
+    Returns:
+        GameModel: new game model
+    """
+    RandomUtils.seed(header.seed)
+
+    model = GameModel()
+    model.field_width = header.field_width
+    model.field_height = header.field_height
+
+    return model
+
+def measure(events: Iterable[TraceEvent], handle: Callable[[TraceEvent], None]) -> Latencies:
+    """
+    Runs every event through the given handler and measures its latency
+
+    Args:
+        events (Iterable[TraceEvent]): events to replay
+        handle (Callable[[TraceEvent], None]): function that applies one event
+
+    Returns:
+        Latencies: latencies in seconds grouped by event kind
+    """
+    latencies: Latencies = {kind: [] for kind in EVENT_NAMES}
+
+    for event in events:
+        start = time.perf_counter()
+        handle(event)
+        latencies[event.kind].append(time.perf_counter() - start)
+
+    return latencies
+
+def replay_headless(header: TraceHeader, events: Iterable[TraceEvent]) -> Tuple[GameModel, Latencies]:
+    """
+    Replays the trace through the GameController only, without Qt
+
+    Args:
+        header (TraceHeader): trace header
+        events (Iterable[TraceEvent]): recorded events
+
+    Returns:
+        Tuple[GameModel, Latencies]: resulting game model and latencies grouped by event kind
+    """
+    model = create_model(header)
+    controller = GameController(model)
+
+    handlers = {
+        PRESS_EVENT: lambda event: controller.press(event.a, event.b),
+        MOVE_EVENT: lambda event: controller.move(event.a, event.b),
+        RELEASE_EVENT: lambda event: controller.release(),
+        DOUBLE_CLICK_EVENT: lambda event: controller.double_click(event.a, event.b),
+        RESIZE_EVENT: lambda event: controller.resize(event.a, event.b),
+        SNAPPING_EVENT: lambda event: controller.set_snapping(bool(event.a), bool(event.b)),
+        COMPACTION_EVENT: lambda event: controller.set_compaction(bool(event.a)),
+        PUSH_EVENT: lambda event: controller.set_push(bool(event.a)),
+        PASTE_EVENT: lambda event: controller.paste(event.text, event.a, event.b),
+        CURVED_LINKS_EVENT: lambda event: controller.set_curved_links(bool(event.a)),
+        LABEL_EVENT: lambda event: controller.set_label(event.text),
+    }
+
+    return model, measure(events, lambda event: handlers[event.kind](event))
+
+def replay_on_widget(header: TraceHeader, events: Iterable[TraceEvent],
+                     paint: bool = True) -> Tuple[GameModel, Latencies]:
+    """
+    Replays the trace through the GameWidget event handlers on the offscreen Qt platform
+
+    Args:
+        header (TraceHeader): trace header
+        events (Iterable[TraceEvent]): recorded events
+        paint (bool): flag to re-paint the widget synchronously after each event. Default: True
+
+    Returns:
+        Tuple[GameModel, Latencies]: resulting game model and latencies grouped by event kind
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtCore import QEvent, QPointF, Qt
+    from PyQt6.QtGui import QMouseEvent
+    from PyQt6.QtWidgets import QApplication
+
+    from widgets.GameWidget import GameWidget
+
+    app = QApplication.instance() or QApplication([])
+    model = create_model(header)
+    widget = GameWidget(model)
+    widget.show()
+    app.processEvents()
+
+    event_types = {
+        PRESS_EVENT: (QEvent.Type.MouseButtonPress, widget.mousePressEvent),
+        MOVE_EVENT: (QEvent.Type.MouseMove, widget.mouseMoveEvent),
+        RELEASE_EVENT: (QEvent.Type.MouseButtonRelease, widget.mouseReleaseEvent),
+        DOUBLE_CLICK_EVENT: (QEvent.Type.MouseButtonDblClick, widget.mouseDoubleClickEvent),
+    }
+
+    def handle(event: TraceEvent) -> None:
+        if event.kind == RESIZE_EVENT:
+            widget.resize(event.a, event.b)
+        elif event.kind == SNAPPING_EVENT:
+            widget.set_snapping(bool(event.a), bool(event.b))
+        elif event.kind == COMPACTION_EVENT:
+            widget.set_compaction(bool(event.a))
+        elif event.kind == PUSH_EVENT:
+            widget.set_push(bool(event.a))
+        elif event.kind == CURVED_LINKS_EVENT:
+            widget.set_curved_links(bool(event.a))
+        elif event.kind == LABEL_EVENT:
+            widget.set_label(event.text)
+        elif event.kind == PASTE_EVENT:
+            widget.paste(event.text, event.a, event.b)
+        else:
+            event_type, handler = event_types[event.kind]
+            position = QPointF(event.a, event.b)
+            handler(QMouseEvent(event_type, position, position, Qt.MouseButton.LeftButton,
+                                Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier))
+
+        if paint:
+            widget.repaint()
+
+    latencies = measure(events, handle)
+    widget.close()
+
+    return model, latencies
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Gets the nearest-rank percentile of the sorted values
+
+    Args:
+        ordered (List[float]): non-empty sorted values
+        fraction (float): percentile as a fraction in range [0, 1]
+
+    Returns:
+        float: percentile value
+    """
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def format_report(latencies: Latencies) -> str:
+    """
+    Formats the latency statistics as a table in microseconds
+
+    Args:
+        latencies (Latencies): latencies in seconds grouped by event kind
+
+    Returns:
+        str: report table
+    """
+    lines = [f'{"event":<14}{"count":>8}{"mean":>10}{"p50":>10}{"p95":>10}{"p99":>10}{"max":>10}']
+    total_count = 0
+    total_time = 0.0
+
+    for kind, values in latencies.items():
+        if not values:
+            continue
+
+        ordered = sorted(values)
+        total_count += len(ordered)
+        total_time += sum(ordered)
+
+        lines.append(f'{EVENT_NAMES[kind]:<14}{len(ordered):>8}{statistics.fmean(ordered) * 1e6:>10.1f}'
+                     f'{percentile(ordered, 0.5) * 1e6:>10.1f}{percentile(ordered, 0.95) * 1e6:>10.1f}'
+                     f'{percentile(ordered, 0.99) * 1e6:>10.1f}{ordered[-1] * 1e6:>10.1f}')
+
+    if total_count:
+        lines.append(f'{total_count} events in {total_time * 1e3:.1f} ms '
+                     f'({total_count / max(total_time, 1e-9):.0f} events/s)')
+
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the replay driver
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='Replay a recorded input trace and report per-event latency')
+    parser.add_argument('trace', help='path of the recorded trace')
+    parser.add_argument('--headless', action='store_true', help='replay through GameController without Qt')
+    parser.add_argument('--no-paint', action='store_true', help='do not re-paint the widget after each event')
+    args = parser.parse_args(argv)
+
+    header, events = load_trace(args.trace)
+
+    if args.headless:
+        model, latencies = replay_headless(header, events)
+    else:
+        model, latencies = replay_on_widget(header, events, not args.no_paint)
+
+    print(format_report(latencies))
+    print(f'{len(model.rectangles)} rectangles, {len(model.links)} links')
+
+
+if __name__ == '__main__':
+    main()
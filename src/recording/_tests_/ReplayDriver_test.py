@@ -0,0 +1,137 @@
+from src.controllers.GameController import GameController
+from src.models.GameModel import GameModel
+from src.recording.InputRecorder import InputRecorder
+from src.recording.InputTrace import (CURVED_LINKS_EVENT, LABEL_EVENT, PASTE_EVENT, PRESS_EVENT, MOVE_EVENT,
+                                      RESIZE_EVENT, SNAPPING_EVENT)
+from src.recording import ReplayDriver
+
+
+def record_session(path):
+    recorder = InputRecorder(str(path), 42, 1024, 768)
+    recorder.record_resize(900, 700)
+    recorder.record_double_click(300, 300)
+    recorder.record_double_click(600, 300)
+    recorder.record_press(300, 300)
+    recorder.record_release(300, 300)
+    recorder.record_press(345, 295)
+    recorder.record_move(450, 310)
+    recorder.record_move(545, 295)
+    recorder.record_release(545, 295)
+    recorder.record_snapping(True, True)
+    recorder.record_press(600, 300)
+    recorder.record_move(620, 340)
+    recorder.record_release(620, 340)
+    recorder.close()
+
+
+def copy_linked_pair():
+    controller = GameController(GameModel())
+    controller.double_click(300, 300)
+    controller.double_click(450, 300)
+    controller.model.add_link(controller.model.rectangles[0].ports[1], controller.model.rectangles[1].ports[3])
+    controller.model.selected_rectangle_ids = {rect.id for rect in controller.model.rectangles}
+
+    return controller.copy()
+
+
+def record_paste_session(path, text):
+    recorder = InputRecorder(str(path), 7, 1024, 768)
+    recorder.record_double_click(150, 150)
+    recorder.record_paste(text, 500, 500)
+    recorder.record_double_click(150, 400)
+    recorder.record_press(500, 500)
+    recorder.record_release(500, 500)
+    recorder.close()
+
+
+def snapshot(model):
+    return ([(rect.id, rect.color, rect.x(), rect.y(), rect.label) for rect in model.rectangles],
+            [(link.id, link.x1(), link.y1(), link.x2(), link.y2()) for link in model.links],
+            (model.field_width, model.field_height))
+
+
+class TestReplayDriver:
+    def test_trace_round_trip(self, tmp_path):
+        path = tmp_path / 'session.wort'
+        record_session(path)
+
+        header, events = ReplayDriver.load_trace(str(path))
+
+        assert header == (42, 1024, 768)
+        assert len(events) == 13
+        assert (events[0].kind, events[0].a, events[0].b) == (RESIZE_EVENT, 900, 700)
+        assert (events[5].kind, events[5].a, events[5].b) == (PRESS_EVENT, 345, 295)
+        assert events[6].kind == MOVE_EVENT
+        assert (events[9].kind, events[9].a, events[9].b) == (SNAPPING_EVENT, 1, 1)
+
+    def test_headless_replay_is_deterministic(self, tmp_path):
+        path = tmp_path / 'session.wort'
+        record_session(path)
+        header, events = ReplayDriver.load_trace(str(path))
+
+        first_model, latencies = ReplayDriver.replay_headless(header, events)
+        second_model, _ = ReplayDriver.replay_headless(header, events)
+
+        assert snapshot(first_model) == snapshot(second_model)
+        assert len(first_model.rectangles) == 2
+        assert len(first_model.links) == 1
+        assert first_model.rectangles[1].x() % 25 == 0 and first_model.rectangles[1].y() % 25 == 0
+        assert sum(len(values) for values in latencies.values()) == len(events)
+        assert 'events/s' in ReplayDriver.format_report(latencies)
+
+    def test_widget_replay_matches_headless_replay(self, tmp_path):
+        path = tmp_path / 'session.wort'
+        record_session(path)
+        header, events = ReplayDriver.load_trace(str(path))
+
+        headless_model, _ = ReplayDriver.replay_headless(header, events)
+        widget_model, _ = ReplayDriver.replay_on_widget(header, events)
+
+        assert snapshot(widget_model) == snapshot(headless_model)
+
+    def test_replays_paste(self, tmp_path):
+        path = tmp_path / 'session.wort'
+        text = copy_linked_pair()
+        record_paste_session(path, text)
+        header, events = ReplayDriver.load_trace(str(path))
+
+        assert (events[1].kind, events[1].a, events[1].b, events[1].text) == (PASTE_EVENT, 500, 500, text)
+
+        headless_model, _ = ReplayDriver.replay_headless(header, events)
+        widget_model, _ = ReplayDriver.replay_on_widget(header, events)
+
+        assert len(headless_model.rectangles) == 4 and len(headless_model.links) == 1
+        assert snapshot(widget_model) == snapshot(headless_model)
+
+    def test_replays_curved_links_toggle(self, tmp_path):
+        path = tmp_path / 'session.wort'
+        recorder = InputRecorder(str(path), 42, 1024, 768)
+        recorder.record_double_click(300, 300)
+        recorder.record_curved_links(True)
+        recorder.close()
+        header, events = ReplayDriver.load_trace(str(path))
+
+        assert (events[1].kind, events[1].a) == (CURVED_LINKS_EVENT, 1)
+
+        headless_model, _ = ReplayDriver.replay_headless(header, events)
+        widget_model, _ = ReplayDriver.replay_on_widget(header, events)
+
+        assert headless_model.is_curved_links_enabled and widget_model.is_curved_links_enabled
+
+    def test_replays_labels(self, tmp_path):
+        path = tmp_path / 'session.wort'
+        recorder = InputRecorder(str(path), 42, 1024, 768)
+        recorder.record_double_click(300, 300)
+        recorder.record_press(300, 300)
+        recorder.record_release(300, 300)
+        recorder.record_label('première')
+        recorder.close()
+        header, events = ReplayDriver.load_trace(str(path))
+
+        assert (events[3].kind, events[3].text) == (LABEL_EVENT, 'première')
+
+        headless_model, _ = ReplayDriver.replay_headless(header, events)
+        widget_model, _ = ReplayDriver.replay_on_widget(header, events)
+
+        assert [rect.label for rect in headless_model.rectangles] == ['première']
+        assert snapshot(widget_model) == snapshot(headless_model)
@@ -0,0 +1,139 @@
+"""
+Implementation of the cache of the laid out rectangle labels
+"""
+from collections import OrderedDict
+from typing import Tuple
+
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QFont, QFontMetrics, QPainter, QStaticText
+
+from utils import Constants, PainterUtils
+
+LabelKey = Tuple[str, str, int]
+
+
+class LabelCache:
+    """
+    The LabelCache that keeps the labels elided to the width of their rectangles as prepared QStaticText objects,
+    so the glyphs of a label are laid out once and not on every paint. The layouts are keyed by the text, the font
+    and the width, so moving a rectangle reuses its layout and only resizing or relabeling it lays the text out again
+
+    Args:
+        size (int): maximum number of cached layouts. Default = Constants.LABEL_CACHE_SIZE
+
+    Attributes:
+        size (int): maximum number of cached layouts
+        font (QFont): font of the labels
+        font_key (str): key of the font in the cache keys
+        metrics (QFontMetrics): metrics of the font to elide the labels with
+        layouts (OrderedDict[LabelKey, QStaticText]): laid out labels, least recently used first
+        hits (int): number of the layouts found in the cache
+        misses (int): number of the laid out labels
+    """
+    def __init__(self, size: int = Constants.LABEL_CACHE_SIZE):
+        self.size = size
+        self.font = QFont()
+        self.font.setPixelSize(Constants.LABEL_FONT_PX)
+        self.font_key = self.font.key()
+        self.metrics = QFontMetrics(self.font)
+        self.layouts: 'OrderedDict[LabelKey, QStaticText]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def elide(self, text: str, width: int) -> str:
+        """
+        Cuts the label with an ellipsis so it fits the rectangle together with the padding
+
+        Args:
+            text (str): label
+            width (int): width of the rectangle
+
+        Returns:
+            str: elided label, empty if not even the ellipsis fits
+        """
+        return self.metrics.elidedText(text, Qt.TextElideMode.ElideRight, width - 2 * Constants.LABEL_PADDING_PX)
+
+    def is_fitting(self, height: int) -> bool:
+        """
+        Checks if a line of the label fits the rectangle of the given height together with the padding
+
+        Args:
+            height (int): height of the rectangle
+
+        Returns:
+            bool: True if the label fits. False otherwise
+        """
+        return height >= self.metrics.height() + 2 * Constants.LABEL_PADDING_PX
+
+    def get_layout(self, text: str, width: int) -> QStaticText:
+        """
+        Gets the laid out label for the rectangle of the given width, lays it out on a cache miss
+
+        Args:
+            text (str): label
+            width (int): width of the rectangle
+
+        Returns:
+            QStaticText: prepared elided label
+        """
+        key = (text, self.font_key, width)
+        layout = self.layouts.get(key)
+
+        if layout is not None:
+            self.hits += 1
+            self.layouts.move_to_end(key)
+            return layout
+
+        self.misses += 1
+        layout = QStaticText(self.elide(text, width))
+        layout.setTextFormat(Qt.TextFormat.PlainText)
+        layout.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        layout.prepare(font=self.font)
+        self.layouts[key] = layout
+
+        if len(self.layouts) > self.size:
+            self.layouts.popitem(last=False)
+
+        return layout
+
+    @staticmethod
+    def is_legible(qp: QPainter) -> bool:
+        """
+        Checks if the labels are large enough to read at the scale of the painter
+
+        Args:
+            qp (QPainter): QPainter instance
+
+        Returns:
+            bool: True if the scaled font is at least Constants.LABEL_MIN_LEGIBLE_PX high. False otherwise
+        """
+        return Constants.LABEL_FONT_PX * qp.transform().m11() >= Constants.LABEL_MIN_LEGIBLE_PX
+
+    def draw(self, qp: QPainter, x_coord: float, y_coord: float, width: int, height: int, text: str) -> None:
+        """
+        Draws the label centered at the top of the rectangle, labels that are empty, do not fit the rectangle
+        or are too small to read are skipped
+
+        Args:
+            qp (QPainter): QPainter instance
+            x_coord (float): x coordinate of the top left corner of the rectangle
+            y_coord (float): y coordinate of the top left corner of the rectangle
+            width (int): width of the rectangle
+            height (int): height of the rectangle
+            text (str): label
+
+        Returns:
+            None
+        """
+        if not text or not self.is_fitting(height) or not self.is_legible(qp):
+            return
+
+        layout = self.get_layout(text, width)
+        text_width = layout.size().width()
+
+        if text_width <= 0:
+            return
+
+        qp.setFont(self.font)
+        qp.setPen(PainterUtils.get_color(Constants.LABEL_COLOR))
+        qp.drawStaticText(QPointF(x_coord + (width - text_width) / 2, y_coord + Constants.LABEL_PADDING_PX), layout)
@@ -0,0 +1,239 @@
+"""
+Implementation of the cache of link paths and their hit-test outlines
+"""
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QPainterPath, QPainterPathStroker
+
+from components.Link import Link
+from components.MoveableRectangle import PORT_NORMALS
+from models.ChangeBus import LINK_REMOVED, ChangeEvent
+from models.GameModel import GameModel
+from utils import Constants
+
+PathKey = Tuple[int, int, int, int, bool]
+Normal = Tuple[float, float]
+
+
+class LinkPath(NamedTuple):
+    """
+    Cached geometry of one link
+
+    Attributes:
+        key (PathKey): ends of the link and the curve flag the geometry was built for
+        path (QPainterPath): path to draw the link with
+        outline (QPainterPath): stroked outline of the path to hit-test the link with
+        bounds (QRectF): bounding rectangle of the outline
+    """
+    key: PathKey
+    path: QPainterPath
+    outline: QPainterPath
+    bounds: QRectF
+
+
+class LinkPathCache:
+    """
+    The LinkPathCache that keeps the QPainterPath of every link together with its stroked outline.
+    The geometry is keyed by the ends of the link, so it is rebuilt only when one of its ports moves,
+    and drawing or hit-testing a curved link costs a dictionary lookup like a straight one.
+    Curved links are cubic Bezier curves that leave and enter their ports along the outward normal
+    of the rectangle side the port is on
+
+    Args:
+        model (GameModel): game model the links belong to
+
+    Attributes:
+        model (GameModel): game model the links belong to
+        paths (Dict[str, LinkPath]): cached geometry by link id
+        port_normals (Dict[str, Normal]): outward normals of the ports by port id
+        normals_version (int): version of the game model the port normals were collected at
+        stroker (QPainterPathStroker): stroker of the hit-test outlines
+        builds (int): number of built paths
+    """
+    def __init__(self, model: GameModel):
+        self.model = model
+        self.paths: Dict[str, LinkPath] = {}
+        self.port_normals: Dict[str, Normal] = {}
+        self.normals_version = -1
+        self.builds = 0
+
+        self.stroker = QPainterPathStroker()
+        self.stroker.setWidth(Constants.LINK_WIDTH_PX * 2)
+        self.stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+
+        model.changes.subscribe(self.handle_changes, {LINK_REMOVED})
+
+    def handle_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Drops the geometry of the removed links
+
+        Args:
+            events (List[ChangeEvent]): link removal events
+
+        Returns:
+            None
+        """
+        for event in events:
+            self.paths.pop(event.item.id, None)
+
+    def get_port_normal(self, port_id: str, x_offset: float, y_offset: float) -> Normal:
+        """
+        Gets the outward normal of the port. The normals are collected again only when a port is missing
+        and the game model has changed since, a port of a rectangle that is not in the game model
+        points to the other end of the link
+
+        Args:
+            port_id (str): id of the port
+            x_offset (float): x offset from the port to the other end of the link
+            y_offset (float): y offset from the port to the other end of the link
+
+        Returns:
+            Normal: unit vector
+        """
+        if port_id not in self.port_normals and self.normals_version != self.model.version:
+            self.port_normals = {port.id: normal for rect in self.model.rectangles
+                                 for port, normal in zip(rect.ports, PORT_NORMALS)}
+            self.normals_version = self.model.version
+
+        if port_id in self.port_normals:
+            return self.port_normals[port_id]
+
+        length = math.hypot(x_offset, y_offset) or 1.0
+
+        return x_offset / length, y_offset / length
+
+    def get_control_points(self, link: Link, x1: float, y1: float, x2: float,
+                           y2: float) -> Tuple[float, float, float, float]:
+        """
+        Gets the control points of the curved link, they leave and enter the ports along their outward normals
+
+        Args:
+            link (Link): link to get the control points of
+            x1 (float): x coordinate of the source end
+            y1 (float): y coordinate of the source end
+            x2 (float): x coordinate of the destination end
+            y2 (float): y coordinate of the destination end
+
+        Returns:
+            Tuple[float, float, float, float]: x and y coordinates of the source and of the destination control point
+        """
+        src_x, src_y = self.get_port_normal(link.src_id, x2 - x1, y2 - y1)
+        dst_x, dst_y = self.get_port_normal(link.dst_id, x1 - x2, y1 - y2)
+        reach = max(Constants.LINK_CURVE_REACH_PX, math.hypot(x2 - x1, y2 - y1) / 3)
+
+        return x1 + src_x * reach, y1 + src_y * reach, x2 + dst_x * reach, y2 + dst_y * reach
+
+    def build(self, link: Link, key: PathKey) -> LinkPath:
+        """
+        Builds the path of the link between the given ends and strokes its outline
+
+        Args:
+            link (Link): link to build the path of
+            key (PathKey): ends of the link and the curve flag
+
+        Returns:
+            LinkPath: built geometry
+        """
+        x1, y1, x2, y2, is_curved = key
+        path = QPainterPath(QPointF(x1, y1))
+
+        if is_curved:
+            src_x, src_y, dst_x, dst_y = self.get_control_points(link, x1, y1, x2, y2)
+            path.cubicTo(QPointF(src_x, src_y), QPointF(dst_x, dst_y), QPointF(x2, y2))
+        else:
+            path.lineTo(QPointF(x2, y2))
+
+        outline = self.stroker.createStroke(path)
+        self.builds += 1
+
+        return LinkPath(key, path, outline, outline.boundingRect())
+
+    def get_path(self, link: Link, x_offset: int = 0, y_offset: int = 0,
+                 dst_x_offset: Optional[int] = None, dst_y_offset: Optional[int] = None) -> LinkPath:
+        """
+        Gets the geometry of the link with its ends moved by the given offsets, builds it if an end has moved
+
+        Args:
+            link (Link): link to get the geometry of
+            x_offset (int): x offset of the source end. Default: 0
+            y_offset (int): y offset of the source end. Default: 0
+            dst_x_offset (Optional[int]): x offset of the destination end. Default = None - x_offset
+            dst_y_offset (Optional[int]): y offset of the destination end. Default = None - y_offset
+
+        Returns:
+            LinkPath: cached geometry
+        """
+        x1, y1, x2, y2 = link.get_ends()
+        key = (x1 + x_offset, y1 + y_offset,
+               x2 + (x_offset if dst_x_offset is None else dst_x_offset),
+               y2 + (y_offset if dst_y_offset is None else dst_y_offset),
+               self.model.is_curved_links_enabled)
+        link_path = self.paths.get(link.id)
+
+        if link_path is None or link_path.key != key:
+            link_path = self.paths[link.id] = self.build(link, key)
+
+        return link_path
+
+    def contains(self, link: Link, x_coord: int, y_coord: int) -> bool:
+        """
+        Checks if the point is on the outline of the link
+
+        Args:
+            link (Link): link to check
+            x_coord (int): x coordinate of the point
+            y_coord (int): y coordinate of the point
+
+        Returns:
+            bool: True if the point is on the link. False otherwise
+        """
+        link_path = self.get_path(link)
+        point = QPointF(x_coord, y_coord)
+
+        return link_path.bounds.contains(point) and link_path.outline.contains(point)
+
+    def intersects(self, link: Link, left: int, top: int, right: int, bottom: int) -> bool:
+        """
+        Checks if the outline of the link touches the rectangle
+
+        Args:
+            link (Link): link to check
+            left (int): left side of the rectangle
+            top (int): top side of the rectangle
+            right (int): right side of the rectangle, inclusive
+            bottom (int): bottom side of the rectangle, inclusive
+
+        Returns:
+            bool: True if the link touches the rectangle. False otherwise
+        """
+        link_path = self.get_path(link)
+        rect = QRectF(left, top, right - left + 1, bottom - top + 1)
+
+        return link_path.bounds.intersects(rect) and link_path.outline.intersects(rect)
+
+    def get_center(self, link: Link) -> Tuple[float, float]:
+        """
+        Gets the middle point of the link as it is drawn
+
+        Args:
+            link (Link): link to get the middle point of
+
+        Returns:
+            Tuple[float, float]: x and y coordinates of the middle point
+        """
+        point = self.get_path(link).path.pointAtPercent(0.5)
+
+        return point.x(), point.y()
+
+    def prune(self) -> None:
+        """
+        Drops the geometry of the links that are not in the game model anymore
+
+        Returns:
+            None
+        """
+        if len(self.paths) > len(self.model.links):
+            link_ids = {link.id for link in self.model.links}
+            self.paths = {link_id: link_path for link_id, link_path in self.paths.items() if link_id in link_ids}
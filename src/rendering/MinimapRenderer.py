@@ -0,0 +1,221 @@
+"""
+Implementation of the renderer of the downscaled overview of the whole scene
+"""
+from math import ceil, floor
+from typing import Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QImage, QPainter
+
+from models.ChangeBus import (FIELD_RESIZED, RECTANGLE_ADDED, RECTANGLE_MOVED, RECTANGLE_REMOVED, RECTANGLE_RESIZED,
+                              SCENE_TRANSLATED, ChangeEvent)
+from models.GameModel import GameModel
+from persistence.RegionStore import RegionSummary
+from utils import Constants, PainterUtils
+
+if TYPE_CHECKING:
+    from models.ShardedWorld import ShardedWorld
+
+MINIMAP_CHANGE_KINDS: FrozenSet[str] = frozenset({
+    RECTANGLE_ADDED, RECTANGLE_MOVED, RECTANGLE_RESIZED, RECTANGLE_REMOVED, FIELD_RESIZED, SCENE_TRANSLATED,
+})
+
+PixelBounds = Tuple[int, int, int, int]
+
+
+class MinimapRenderer:
+    """
+    The MinimapRenderer that keeps a low-resolution image of the whole scene: the game field and every rectangle
+    around it, filled with its color. The image is rebuilt only when the extent of the scene changes,
+    otherwise only the pixels under the rectangles reported moved, resized, added or removed are re-painted,
+    from a query of the bounding volume hierarchies, so dragging in the game field costs a few small fills.
+    With a sharded world the scene is the whole world: the regions that are not loaded are filled from
+    their summaries under the rectangles of the game model
+
+    Args:
+        model (GameModel): GameModel object with game data
+        width (int): max width of the image
+        height (int): max height of the image
+        world (Optional[ShardedWorld]): sharded world shown in the game model. Default: None
+
+    Attributes:
+        model (GameModel): GameModel object to render
+        width (int): max width of the image
+        height (int): max height of the image
+        world (Optional[ShardedWorld]): sharded world shown in the game model
+        summaries (List[RegionSummary]): summaries of the regions of the world that are not loaded,
+            taken when the image was rebuilt
+        image (QImage): downscaled image of the scene
+        extent (Tuple[int, int, int, int]): left, top, right and bottom sides of the scene shown in the image
+        scale (float): scale of the image
+        painted (Dict[int, PixelBounds]): pixel bounds of every painted rectangle by its identity
+        dirty (List[PixelBounds]): pixel bounds to re-paint
+        is_valid (bool): flag if the image only needs the dirty pixels re-painted
+        repainted_pixels (int): number of pixels re-painted by the last update, to measure its cost
+    """
+    def __init__(self, model: GameModel, width: int, height: int, world: Optional['ShardedWorld'] = None):
+        self.model = model
+        self.width = width
+        self.height = height
+        self.world = world
+        self.summaries: List[RegionSummary] = []
+
+        self.image = QImage()
+        self.extent: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self.scale = 1.0
+        self.painted: Dict[int, PixelBounds] = {}
+        self.dirty: List[PixelBounds] = []
+        self.is_valid = False
+        self.repainted_pixels = 0
+
+    def get_scene_extent(self) -> Tuple[int, int, int, int]:
+        """
+        Gets the bounds of the game field together with the rectangles outside of it
+        and the rectangles of the world
+
+        Returns:
+            Tuple[int, int, int, int]: left, top, right and bottom sides of the scene
+        """
+        extent = self.model.get_scene_extent()
+        bounds = self.world.get_world_bounds() if self.world is not None else None
+
+        if bounds is None:
+            return extent
+
+        return (min(extent[0], bounds[0]), min(extent[1], bounds[1]),
+                max(extent[2], bounds[2]), max(extent[3], bounds[3]))
+
+    def to_pixels(self, left: int, top: int, right: int, bottom: int) -> PixelBounds:
+        """
+        Gets the pixels of the image covered by the scene bounds
+
+        Args:
+            left (int): left side of the bounds
+            top (int): top side of the bounds
+            right (int): right side of the bounds
+            bottom (int): bottom side of the bounds
+
+        Returns:
+            PixelBounds: left, top, right and bottom sides of the covered pixels
+        """
+        return (floor((left - self.extent[0]) * self.scale), floor((top - self.extent[1]) * self.scale),
+                ceil((right - self.extent[0]) * self.scale), ceil((bottom - self.extent[1]) * self.scale))
+
+    def to_scene(self, x_coord: int, y_coord: int) -> Tuple[int, int]:
+        """
+        Gets the point of the scene shown at the pixel of the image
+
+        Args:
+            x_coord (int): x coordinate of the pixel
+            y_coord (int): y coordinate of the pixel
+
+        Returns:
+            Tuple[int, int]: x and y coordinates of the point of the scene
+        """
+        return (round(x_coord / self.scale) + self.extent[0], round(y_coord / self.scale) + self.extent[1])
+
+    def handle_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Marks the pixels under the old and the new bounds of the changed rectangles dirty,
+        a change of the field or the whole scene invalidates the image
+
+        Args:
+            events (List[ChangeEvent]): coalesced change events, see MINIMAP_CHANGE_KINDS
+
+        Returns:
+            None
+        """
+        for event in events:
+            if event.kind in (FIELD_RESIZED, SCENE_TRANSLATED):
+                self.is_valid = False
+            elif event.kind in MINIMAP_CHANGE_KINDS:
+                painted = self.painted.pop(id(event.item), None)
+
+                if painted is not None:
+                    self.dirty.append(painted)
+
+                if event.kind != RECTANGLE_REMOVED:
+                    self.dirty.append(self.to_pixels(*self.model.get_tree_bounds(event.item)))
+
+    def get_image(self) -> QImage:
+        """
+        Brings the image up to date: rebuilds it if the extent of the scene changed, or re-paints the dirty pixels
+
+        Returns:
+            QImage: downscaled image of the scene
+        """
+        self.repainted_pixels = 0
+
+        if not self.is_valid or self.get_scene_extent() != self.extent:
+            self.rebuild()
+        elif self.dirty:
+            qp = QPainter()
+            qp.begin(self.image)
+
+            for left, top, right, bottom in self.dirty:
+                clip = QRect(left, top, right - left, bottom - top).intersected(self.image.rect())
+
+                if not clip.isEmpty():
+                    self.paint_region(qp, clip)
+
+            qp.end()
+
+        self.dirty.clear()
+
+        return self.image
+
+    def rebuild(self) -> None:
+        """
+        Re-paints the whole image for the current extent of the scene
+
+        Returns:
+            None
+        """
+        self.extent = self.get_scene_extent()
+        left, top, right, bottom = self.extent
+        self.scale = min(self.width / max(right - left, 1), self.height / max(bottom - top, 1))
+        self.image = QImage(max(ceil((right - left) * self.scale), 1), max(ceil((bottom - top) * self.scale), 1),
+                            QImage.Format.Format_RGB32)
+        self.painted.clear()
+        # the regions that are not loaded change only when the view moves, which invalidates the image
+        self.summaries = list(self.world.get_region_summaries().values()) if self.world is not None else []
+
+        qp = QPainter()
+        qp.begin(self.image)
+        self.paint_region(qp, self.image.rect())
+        qp.end()
+
+        self.is_valid = True
+
+    def paint_region(self, qp: QPainter, clip: QRect) -> None:
+        """
+        Clears the pixels of the region and fills the summaries of the regions of the world that are not loaded
+        and the rectangles over them, containers before their children
+
+        Args:
+            qp (QPainter): painter of the image
+            clip (QRect): pixels to re-paint
+
+        Returns:
+            None
+        """
+        qp.setClipRect(clip)
+        qp.fillRect(clip, PainterUtils.get_color(Constants.SCREEN_COLOR))
+
+        # a rectangle rounded out to the pixels of the region may lie a pixel outside of it in the scene
+        left, top = self.to_scene(clip.left() - 1, clip.top() - 1)
+        right, bottom = self.to_scene(clip.right() + 2, clip.bottom() + 2)
+
+        for summary in self.summaries:
+            if summary.left < right and summary.right > left and summary.top < bottom and summary.bottom > top:
+                bounds = self.to_pixels(*summary[:4])
+                qp.fillRect(QRect(bounds[0], bounds[1], bounds[2] - bounds[0], bounds[3] - bounds[1]),
+                            PainterUtils.get_color(summary.color))
+
+        for rectangle in self.model.find_rectangles(left, top, right, bottom):
+            bounds = self.to_pixels(*self.model.get_tree_bounds(rectangle))
+            self.painted[id(rectangle)] = bounds
+            qp.fillRect(QRect(bounds[0], bounds[1], bounds[2] - bounds[0], bounds[3] - bounds[1]),
+                        PainterUtils.get_color(rectangle.color))
+
+        self.repainted_pixels += clip.width() * clip.height()
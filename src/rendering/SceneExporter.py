@@ -0,0 +1,431 @@
+"""
+Implementation of the streaming export of whole scenes to PNG and SVG files, for scenes too large
+to be painted into one image.
+
+Usage (from the src folder):
+    python -m rendering.SceneExporter DIR OUTPUT.png|OUTPUT.svg [--scale 0.5] [--workers N]
+"""
+import argparse
+import multiprocessing
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Deque, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from PyQt6.QtGui import QImage
+
+from models.GameModel import GameModel
+from rendering.LabelCache import LabelCache
+from rendering.LinkPathCache import LinkPathCache
+from rendering.SceneRenderer import MAX_RENDER_SCALE, SceneRenderer
+from utils import Constants, PainterUtils
+
+EXPORT_BAND_PIXELS: int = 4096 * 256
+BANDS_PER_WORKER: int = 2
+PNG_CHUNK_SIZE: int = 1 << 20
+PNG_SIGNATURE: bytes = b'\x89PNG\r\n\x1a\n'
+EXPORT_MARGIN_PX: int = Constants.LINK_WIDTH_PX
+
+Band = Tuple[int, int]
+
+worker_app: Optional[object] = None
+worker_renderer: Optional[SceneRenderer] = None
+
+
+def get_export_extent(model: GameModel) -> Tuple[int, int, int, int]:
+    """
+    Gets the bounds of the exported scene, the game field together with the rectangles outside of it.
+    The restored game model always has the default field size, so the field alone may cut the scene off
+
+    Args:
+        model (GameModel): game model to export
+
+    Returns:
+        Tuple[int, int, int, int]: left, top, right and bottom sides of the scene
+    """
+    return model.get_scene_extent(EXPORT_MARGIN_PX)
+
+
+def get_image_size(model: GameModel, scale: float) -> Tuple[int, int]:
+    """
+    Gets the size of the exported image of the whole scene
+
+    Args:
+        model (GameModel): game model to export
+        scale (float): scale of the image
+
+    Returns:
+        Tuple[int, int]: width and height of the image in pixels
+
+    Raises:
+        ValueError: if the scale is out of range
+    """
+    if not 0 < scale <= MAX_RENDER_SCALE:
+        raise ValueError(f'scale must be in (0, {MAX_RENDER_SCALE}]')
+
+    left, top, right, bottom = get_export_extent(model)
+
+    return max(1, round((right - left) * scale)), max(1, round((bottom - top) * scale))
+
+
+def get_bands(width: int, height: int, band_pixels: int = EXPORT_BAND_PIXELS) -> List[Band]:
+    """
+    Splits the image into full width bands of at most band_pixels pixels, at least one row each
+
+    Args:
+        width (int): width of the image in pixels
+        height (int): height of the image in pixels
+        band_pixels (int): max number of pixels of a band. Default: EXPORT_BAND_PIXELS
+
+    Returns:
+        List[Band]: first row and number of rows of every band, top to bottom
+    """
+    rows = max(1, band_pixels // width)
+
+    return [(top, min(rows, height - top)) for top in range(0, height, rows)]
+
+
+def get_rgba_rows(image: QImage) -> bytes:
+    """
+    Gets the pixels of the image as not premultiplied RGBA rows, the layout of a PNG image of color type 6
+
+    Args:
+        image (QImage): painted image
+
+    Returns:
+        bytes: rows of the image, top to bottom
+    """
+    image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+
+    return bytes(bits)
+
+
+def render_band(renderer: SceneRenderer, band: Band, width: int, scale: float, origin: Tuple[int, int]) -> bytes:
+    """
+    Paints one band of the image
+
+    Args:
+        renderer (SceneRenderer): renderer of the game model
+        band (Band): first row and number of rows of the band
+        width (int): width of the image in pixels
+        scale (float): scale of the image
+        origin (Tuple[int, int]): point of the scene at the top left corner of the image
+
+    Returns:
+        bytes: RGBA rows of the band
+    """
+    with renderer.lock:
+        image = renderer.render_band(band[0], width, band[1], scale, origin)
+
+    return get_rgba_rows(image)
+
+
+def init_worker(directory: str) -> None:
+    """
+    Prepares the worker process, which restores the saved scene once and paints the bands it is given
+
+    Args:
+        directory (str): directory of the saved scene
+
+    Returns:
+        None
+    """
+    global worker_app, worker_renderer  # pylint: disable=global-statement
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtGui import QGuiApplication
+    from persistence.ModelRecovery import load_model
+
+    worker_app = QGuiApplication([])
+    worker_renderer = SceneRenderer(load_model(directory)[0])
+
+
+def render_worker_band(band: Band, width: int, scale: float, origin: Tuple[int, int]) -> bytes:
+    """
+    Paints one band of the image in the worker process
+
+    Args:
+        band (Band): first row and number of rows of the band
+        width (int): width of the image in pixels
+        scale (float): scale of the image
+        origin (Tuple[int, int]): point of the scene at the top left corner of the image
+
+    Returns:
+        bytes: RGBA rows of the band
+    """
+    return render_band(worker_renderer, band, width, scale, origin)
+
+
+def iter_bands(model: GameModel, width: int, height: int, scale: float,
+               origin: Tuple[int, int]) -> Iterator[bytes]:
+    """
+    Paints the bands of the image one by one in this process
+
+    Args:
+        model (GameModel): game model to export
+        width (int): width of the image in pixels
+        height (int): height of the image in pixels
+        scale (float): scale of the image
+        origin (Tuple[int, int]): point of the scene at the top left corner of the image
+
+    Returns:
+        Iterator[bytes]: RGBA rows of the bands, top to bottom
+    """
+    renderer = SceneRenderer(model)
+
+    for band in get_bands(width, height):
+        yield render_band(renderer, band, width, scale, origin)
+
+
+def iter_worker_bands(directory: str, width: int, height: int, scale: float, origin: Tuple[int, int],
+                      workers: int) -> Iterator[bytes]:
+    """
+    Paints the bands of the image in worker processes. Only a few bands per worker are in flight at a time,
+    so the memory stays bounded however large the image is. The workers are spawned and not forked,
+    as a forked copy of a running Qt application is not safe to use
+
+    Args:
+        directory (str): directory of the saved scene
+        width (int): width of the image in pixels
+        height (int): height of the image in pixels
+        scale (float): scale of the image
+        origin (Tuple[int, int]): point of the scene at the top left corner of the image
+        workers (int): number of worker processes
+
+    Returns:
+        Iterator[bytes]: RGBA rows of the bands, top to bottom
+    """
+    bands = iter(get_bands(width, height))
+    pending: 'Deque[Future[bytes]]' = deque()
+
+    with ProcessPoolExecutor(workers, multiprocessing.get_context('spawn'), init_worker, (directory,)) as executor:
+        for band in bands:
+            pending.append(executor.submit(render_worker_band, band, width, scale, origin))
+
+            if len(pending) >= workers * BANDS_PER_WORKER:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_png_chunk(output: BinaryIO, kind: bytes, data: bytes) -> None:
+    """
+    Writes one chunk of the PNG file
+
+    Args:
+        output (BinaryIO): file to write to
+        kind (bytes): type of the chunk
+        data (bytes): payload of the chunk
+
+    Returns:
+        None
+    """
+    output.write(struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+
+def write_png(output: BinaryIO, width: int, height: int, bands: Iterable[bytes]) -> None:
+    """
+    Writes the PNG file of 8 bit RGBA pixels band by band, the compressed rows are flushed in IDAT chunks
+    as they come, so neither the image nor its compressed data is ever held in memory whole
+
+    Args:
+        output (BinaryIO): file to write to
+        width (int): width of the image in pixels
+        height (int): height of the image in pixels
+        bands (Iterable[bytes]): RGBA rows of the bands, top to bottom
+
+    Returns:
+        None
+    """
+    output.write(PNG_SIGNATURE)
+    write_png_chunk(output, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+
+    compressor = zlib.compressobj()
+    row_size = width * 4
+    data = bytearray()
+
+    for rows in bands:
+        for start in range(0, len(rows), row_size):
+            data += compressor.compress(b'\x00' + rows[start:start + row_size])
+
+        while len(data) >= PNG_CHUNK_SIZE:
+            write_png_chunk(output, b'IDAT', bytes(data[:PNG_CHUNK_SIZE]))
+            del data[:PNG_CHUNK_SIZE]
+
+    data += compressor.flush()
+    write_png_chunk(output, b'IDAT', bytes(data))
+    write_png_chunk(output, b'IEND', b'')
+
+
+def export_png(path: str, model: GameModel, scale: float = 1.0, directory: Optional[str] = None,
+               workers: int = 0) -> None:
+    """
+    Exports the whole scene to the PNG file, painted band by band like ScenePainter.draw_game_objects paints it
+
+    Args:
+        path (str): path of the PNG file
+        model (GameModel): game model to export
+        scale (float): scale of the image. Default: 1.0
+        directory (Optional[str]): directory the game model was restored from, the worker processes restore it
+            from there as well. Default = None - the bands are painted in this process
+        workers (int): number of worker processes, 0 paints the bands in this process. Default: 0
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: if the scale is out of range
+    """
+    width, height = get_image_size(model, scale)
+    origin = get_export_extent(model)[:2]
+
+    if directory is not None and workers > 0:
+        bands = iter_worker_bands(directory, width, height, scale, origin, workers)
+    else:
+        bands = iter_bands(model, width, height, scale, origin)
+
+    with open(path, 'wb') as output:
+        write_png(output, width, height, bands)
+
+
+def get_svg_color(name: str) -> str:
+    """
+    Gets the SVG color of the Qt color name
+
+    Args:
+        name (str): Qt color name
+
+    Returns:
+        str: #rrggbb color
+    """
+    return PainterUtils.get_color(name).name()
+
+
+def iter_svg(model: GameModel, scale: float = 1.0) -> Iterator[str]:
+    """
+    Generates the SVG document of the whole scene straight from the game model, element by element,
+    with the styles of ScenePainter.draw_game_objects. Outlines are shifted by half a pixel, so the cosmetic
+    one pixel pens of Qt cover the same pixels
+
+    Args:
+        model (GameModel): game model to export
+        scale (float): scale of the document size, the coordinates stay in field pixels. Default: 1.0
+
+    Returns:
+        Iterator[str]: parts of the document
+
+    Raises:
+        ValueError: if the scale is out of range
+    """
+    width, height = get_image_size(model, scale)
+    left, top, right, bottom = get_export_extent(model)
+    labels = LabelCache()
+    link_paths = LinkPathCache(model)
+    label_color = get_svg_color(Constants.LABEL_COLOR)
+    label_ascent = labels.metrics.ascent()
+
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+           f'viewBox="{left} {top} {right - left} {bottom - top}">\n')
+    yield (f'<rect x="0.5" y="0.5" width="{model.field_width}" height="{model.field_height}" '
+           f'fill="{get_svg_color(Constants.SCREEN_COLOR)}" stroke="{get_svg_color(Constants.BLACK_COLOR)}"/>\n')
+
+    for rect in model.rectangles:
+        is_selected = rect == model.selected_rectangle or rect.id in model.selected_rectangle_ids
+        stroke = Constants.SELECTED_RECTANGLE_BORDER_COLOR if is_selected else rect.color
+        yield (f'<rect x="{rect.x() + 0.5}" y="{rect.y() + 0.5}" width="{rect.width()}" height="{rect.height()}" '
+               f'fill="{get_svg_color(rect.color)}" stroke="{get_svg_color(stroke)}"/>\n')
+
+        if rect.label and labels.is_fitting(rect.height()):
+            text = labels.elide(rect.label, rect.width())
+
+            if text:
+                yield (f'<text x="{rect.x() + rect.width() / 2}" '
+                       f'y="{rect.y() + Constants.LABEL_PADDING_PX + label_ascent}" text-anchor="middle" '
+                       f'font-size="{Constants.LABEL_FONT_PX}" fill="{label_color}" '
+                       f'font-family={quoteattr(labels.font.family())}>{escape(text)}</text>\n')
+
+    for link in model.links:
+        is_selected = model.selected_link == link or link.id in model.selected_link_ids
+        color = Constants.SELECTED_ELEMENT_COLOR if is_selected else Constants.LINK_COLOR
+        x1, y1, x2, y2 = link.get_ends()
+
+        if model.is_curved_links_enabled:
+            src_x, src_y, dst_x, dst_y = link_paths.get_control_points(link, x1, y1, x2, y2)
+            curve = f'C {src_x:g} {src_y:g} {dst_x:g} {dst_y:g} {x2} {y2}'
+        else:
+            curve = f'L {x2} {y2}'
+
+        yield (f'<path d="M {x1} {y1} {curve}" fill="none" stroke="{get_svg_color(color)}" '
+               f'stroke-width="{Constants.LINK_WIDTH_PX}" stroke-linecap="round"/>\n')
+
+    yield '</svg>\n'
+
+
+def export_svg(path: str, model: GameModel, scale: float = 1.0) -> None:
+    """
+    Exports the whole scene to the SVG file, written as it is generated
+
+    Args:
+        path (str): path of the SVG file
+        model (GameModel): game model to export
+        scale (float): scale of the document size. Default: 1.0
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: if the scale is out of range
+    """
+    with open(path, 'w', encoding='utf-8') as output:
+        output.writelines(iter_svg(model, scale))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the scene exporter
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description='World of Rectangles scene exporter')
+    parser.add_argument('directory', metavar='DIR', help='directory of the scene saved by --autosave')
+    parser.add_argument('output', metavar='OUTPUT', help='path of the .png or .svg file to write')
+    parser.add_argument('--scale', type=float, default=1.0, help='scale of the image. Default: 1.0')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of processes that paint the PNG bands, 0 paints them in this process. '
+                             'Default: the number of CPUs')
+    args = parser.parse_args(argv)
+
+    if not args.output.lower().endswith(('.png', '.svg')):
+        parser.error('OUTPUT must be a .png or .svg file')
+    if not os.path.isdir(args.directory):
+        parser.error(f'{args.directory} is not a directory')
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtGui import QGuiApplication
+    from persistence.ModelRecovery import load_model
+
+    app = QGuiApplication([])  # pylint: disable=unused-variable
+    model, _ = load_model(args.directory)
+
+    try:
+        if args.output.lower().endswith('.svg'):
+            export_svg(args.output, model, args.scale)
+        else:
+            export_png(args.output, model, args.scale, args.directory, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+
+
+if __name__ == '__main__':
+    main()
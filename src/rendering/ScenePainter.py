@@ -0,0 +1,232 @@
+"""
+Implementation of the painter of the game scene shared by the widget and the headless renderers
+"""
+from typing import Optional
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QPainter
+
+from components.MoveableRectangle import MoveableRectangle
+from models.GameModel import GameModel
+from rendering.LabelCache import LabelCache
+from rendering.LinkPathCache import LinkPathCache
+from utils import Constants, PainterUtils
+
+
+class ScenePainter:
+    """
+    The ScenePainter that draws the game model with a QPainter on any paint device, so the window
+    and the offscreen renderers paint the scene with the same code and need no widget
+
+    Args:
+        model (GameModel): GameModel object with game data
+
+    Attributes:
+        model (GameModel): GameModel object to draw
+        link_paths (LinkPathCache): cache of the link paths
+        labels (LabelCache): cache of the laid out rectangle labels
+    """
+    def __init__(self, model: GameModel):
+        self.model = model
+        self.link_paths = LinkPathCache(model)
+        self.labels = LabelCache()
+
+    def draw_game_field(self, qp: QPainter) -> None:
+        """
+        Draws the game field with correct styles
+
+        Args:
+            qp (QPainter): QPainter instance
+
+        Returns:
+            None
+        """
+        PainterUtils.enable_game_field_painter_style(qp)
+        qp.drawRect(0, 0, self.model.field_width, self.model.field_height)
+
+    def draw_links(self, qp: QPainter) -> None:
+        """
+        Draws the link objects with correct styles from the cached link paths
+
+        Args:
+            qp (QPainter): QPainter instance
+
+        Returns:
+            None
+        """
+        if self.model.is_dragging_link:
+            PainterUtils.enable_link_painter_style(qp)
+            qp.drawLine(
+                self.model.x1,
+                self.model.y1,
+                self.model.x1 + self.model.x2,
+                self.model.y1 + self.model.y2
+            )
+
+        dragged_port_ids = {port.id for rect in self.model.get_dragged_rectangles() for port in rect.ports}
+
+        for link in self.model.links:
+            src_offset_x = 0
+            src_offset_y = 0
+            dst_offset_x = 0
+            dst_offset_y = 0
+
+            if link.src_id in dragged_port_ids:
+                src_offset_x = self.model.x2
+                src_offset_y = self.model.y2
+            if link.dst_id in dragged_port_ids:
+                dst_offset_x = self.model.x2
+                dst_offset_y = self.model.y2
+
+            PainterUtils.enable_link_painter_style(qp, self.model.selected_link == link
+                                                   or link.id in self.model.selected_link_ids)
+            qp.drawPath(self.link_paths.get_path(link, src_offset_x, src_offset_y, dst_offset_x, dst_offset_y).path)
+
+        self.link_paths.prune()
+
+        if self.model.selected_link is not None:
+            if self.model.is_curved_links_enabled:
+                center_x, center_y = self.link_paths.get_center(self.model.selected_link)
+            else:
+                center_x, center_y = self.model.selected_link.center().x(), self.model.selected_link.center().y()
+
+            PainterUtils.enable_button_painter_style(qp, Constants.DELETE_COLOR)
+            qp.drawEllipse(
+                int(center_x - Constants.CIRCLE_RADIUS_PX / 2),
+                int(center_y - Constants.CIRCLE_RADIUS_PX / 2),
+                Constants.CIRCLE_RADIUS_PX,
+                Constants.CIRCLE_RADIUS_PX
+            )
+
+    def draw_ports(self, qp: QPainter, rectangle: MoveableRectangle) -> None:
+        """
+        Draws the ports of the given moveable rectangle with correct styles
+
+        Args:
+            qp (QPainter): QPainter instance
+            rectangle (MoveableRectangle): moveable rectangle object to draw ports for
+
+        Returns:
+            None
+        """
+        for port in rectangle.ports:
+            if port.id in self.model.linked_port_ids:
+                continue
+
+            is_selected = port == self.model.selected_port
+            is_hovered = port == self.model.hovered_port and self.model.selected_port != self.model.hovered_port
+            is_unavailable = (
+                    port == self.model.hovered_port
+                    and self.model.selected_port != self.model.hovered_port
+                    and self.model.hovered_port in self.model.selected_rectangle.ports
+            )
+
+            port_x = port.x() if self.model.is_dragging_link else port.x() + self.model.x2
+            port_y = port.y() if self.model.is_dragging_link else port.y() + self.model.y2
+
+            PainterUtils.enable_port_painter_style(qp, port.color, is_selected, is_hovered, is_unavailable)
+            qp.drawEllipse(port_x, port_y, port.radius, port.radius)
+
+    def draw_rectangles(self, qp: QPainter, bounds: Optional[QRect] = None) -> None:
+        """
+        Draws the rectangle objects with correct styles, the selected rectangle is dragged together with
+        its descendants and shows its resize handle
+
+        Args:
+            qp (QPainter): QPainter instance
+            bounds (Optional[QRect]): bounds to skip the not dragged rectangles and their ports outside of.
+                Default = None
+
+        Returns:
+            None
+        """
+        if bounds is not None:
+            margin = Constants.CIRCLE_RADIUS_PX + 1
+            left, top = bounds.left() - margin, bounds.top() - margin
+            right, bottom = bounds.right() + margin, bounds.bottom() + margin
+
+        dragged_ids = {id(rect) for rect in self.model.get_dragged_rectangles()}
+
+        for rect in self.model.rectangles:
+            if bounds is not None and (rect.x() > right or rect.y() > bottom or rect.x() + rect.width() < left
+                                       or rect.y() + rect.height() < top) and id(rect) not in dragged_ids \
+                    and rect != self.model.selected_rectangle:
+                continue
+
+            if id(rect) in dragged_ids or rect == self.model.selected_rectangle:
+                rect_x = rect.x() if self.model.is_dragging_link else rect.x() + self.model.x2
+                rect_y = rect.y() if self.model.is_dragging_link else rect.y() + self.model.y2
+
+                PainterUtils.enable_rectangle_painter_style(qp, rect.color, rect == self.model.selected_rectangle)
+                qp.drawRect(rect_x, rect_y, rect.width(), rect.height())
+                self.labels.draw(qp, rect_x, rect_y, rect.width(), rect.height(), rect.label)
+
+                if rect == self.model.selected_rectangle:
+                    PainterUtils.enable_button_painter_style(qp, Constants.SELECTED_ELEMENT_COLOR)
+                    qp.drawRect(rect_x + rect.width() - Constants.RESIZE_HANDLE_PX,
+                                rect_y + rect.height() - Constants.RESIZE_HANDLE_PX,
+                                Constants.RESIZE_HANDLE_PX, Constants.RESIZE_HANDLE_PX)
+
+                if rect == self.model.selected_rectangle or self.model.selected_port is not None:
+                    self.draw_ports(qp, rect)
+            else:
+                PainterUtils.enable_rectangle_painter_style(qp, rect.color, rect == self.model.selected_rectangle
+                                                            or rect.id in self.model.selected_rectangle_ids)
+                qp.drawRect(rect.x(), rect.y(), rect.width(), rect.height())
+                self.labels.draw(qp, rect.x(), rect.y(), rect.width(), rect.height(), rect.label)
+
+                if self.model.selected_port is not None:
+                    self.draw_ports(qp, rect)
+
+    def draw_guides(self, qp: QPainter) -> None:
+        """
+        Draws the alignment guides of the dragged rectangle across the game field
+
+        Args:
+            qp (QPainter): QPainter instance
+
+        Returns:
+            None
+        """
+        if not self.model.vertical_guides and not self.model.horizontal_guides:
+            return
+
+        PainterUtils.enable_guide_painter_style(qp)
+
+        for x_coord in self.model.vertical_guides:
+            qp.drawLine(x_coord, 0, x_coord, self.model.field_height)
+        for y_coord in self.model.horizontal_guides:
+            qp.drawLine(0, y_coord, self.model.field_width, y_coord)
+
+    def draw_selection_box(self, qp: QPainter) -> None:
+        """
+        Draws the rubber-band selection box while it is dragged
+
+        Args:
+            qp (QPainter): QPainter instance
+
+        Returns:
+            None
+        """
+        if self.model.selection_box is None:
+            return
+
+        left, top, right, bottom = self.model.selection_box
+        PainterUtils.enable_selection_box_painter_style(qp)
+        qp.drawRect(left, top, right - left, bottom - top)
+
+    def draw_game_objects(self, qp: QPainter) -> None:
+        """
+        Handles drawing of all game objects
+
+        Args:
+            qp (QPainter): QPainter instance
+
+        Returns:
+            None
+        """
+        self.draw_game_field(qp)
+        self.draw_rectangles(qp)
+        self.draw_links(qp)
+        self.draw_guides(qp)
+        self.draw_selection_box(qp)
@@ -0,0 +1,179 @@
+"""
+Implementation of the headless scene renderer that rasterizes the game model into PNG images
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PyQt6.QtCore import QBuffer, QIODevice, QRect, Qt
+from PyQt6.QtGui import QImage, QPainter
+
+from models.GameModel import GameModel
+from rendering.ScenePainter import ScenePainter
+
+RENDER_CACHE_SIZE: int = 64
+MAX_RENDER_SCALE: float = 8.0
+MAX_RENDER_PIXELS: int = 4096 * 4096
+
+RenderKey = Tuple[int, int, int, int, int, float]
+
+
+class SceneRenderer:
+    """
+    The SceneRenderer that paints the game model into a QImage with the ScenePainter the GameWidget uses,
+    so it needs neither a window nor the GUI thread. Encoded PNG images are kept in an LRU cache keyed
+    by the model version and the viewport, so repeated requests of an unchanged scene are not re-rasterized
+
+    Args:
+        model (GameModel): game model to render
+        lock (Optional[threading.Lock]): lock held by every writer of the game model. Default = None - a new lock
+        cache_size (int): max number of cached images. Default: RENDER_CACHE_SIZE
+
+    Attributes:
+        model (GameModel): game model to render
+        lock (threading.Lock): lock held while the game model is read
+        cache_size (int): max number of cached images
+        cache (OrderedDict[RenderKey, bytes]): encoded images, least recently used first
+        cache_lock (threading.Lock): lock of the cache
+        hits (int): number of renders served from the cache
+        misses (int): number of rasterized renders
+        painter (ScenePainter): painter of the scene with its own link path and label caches
+    """
+    def __init__(self, model: GameModel, lock: Optional[threading.Lock] = None, cache_size: int = RENDER_CACHE_SIZE):
+        self.model = model
+        self.lock = lock or threading.Lock()
+        self.cache_size = cache_size
+        self.cache: 'OrderedDict[RenderKey, bytes]' = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.painter = ScenePainter(model)
+
+    def get_field_rect(self) -> QRect:
+        """
+        Gets the bounds of the whole game field
+
+        Returns:
+            QRect: bounds of the game field
+        """
+        return QRect(0, 0, self.model.field_width, self.model.field_height)
+
+    def flush_changes(self) -> None:
+        """
+        Delivers the queued change events of the game model to the caches before painting, if nothing else
+        schedules their delivery, e.g. in the render service. The caller must hold the lock
+
+        Returns:
+            None
+        """
+        if self.model.changes.schedule is None:
+            self.model.changes.flush()
+
+    def render_image(self, viewport: QRect, scale: float = 1.0) -> QImage:
+        """
+        Paints the viewport of the game model at the given scale. The caller must hold the lock
+
+        Args:
+            viewport (QRect): region of the game field to paint
+            scale (float): scale of the image. Default: 1.0
+
+        Returns:
+            QImage: painted image, transparent outside of the game field
+
+        Raises:
+            ValueError: if the viewport is empty or the image would be too large
+        """
+        if viewport.isEmpty() or not 0 < scale <= MAX_RENDER_SCALE:
+            raise ValueError(f'viewport must not be empty and scale must be in (0, {MAX_RENDER_SCALE}]')
+
+        width, height = max(1, round(viewport.width() * scale)), max(1, round(viewport.height() * scale))
+
+        if width * height > MAX_RENDER_PIXELS:
+            raise ValueError(f'render of {width}x{height} pixels is too large')
+
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+
+        self.flush_changes()
+
+        qp = QPainter()
+        qp.begin(image)
+        qp.scale(scale, scale)
+        qp.translate(-viewport.x(), -viewport.y())
+        self.painter.draw_game_objects(qp)
+        qp.end()
+
+        return image
+
+    def render_band(self, top: int, width: int, height: int, scale: float = 1.0,
+                    origin: Tuple[int, int] = (0, 0)) -> QImage:
+        """
+        Paints the band of the image of the whole scene at the given scale, the band is aligned to the pixels
+        of the image, so the bands of an image painted one by one join without seams. The caller must hold the lock
+
+        Args:
+            top (int): first pixel row of the band
+            width (int): width of the band in pixels
+            height (int): number of the pixel rows of the band
+            scale (float): scale of the image. Default: 1.0
+            origin (Tuple[int, int]): point of the scene at the top left corner of the image. Default: (0, 0)
+
+        Returns:
+            QImage: painted band, transparent outside of the game field
+        """
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+
+        self.flush_changes()
+
+        qp = QPainter()
+        qp.begin(image)
+        qp.translate(0, -top)
+        qp.scale(scale, scale)
+        qp.translate(-origin[0], -origin[1])
+        self.painter.draw_game_objects(qp)
+        qp.end()
+
+        return image
+
+    def render_png(self, viewport: Optional[QRect] = None, scale: float = 1.0) -> Tuple[int, bytes]:
+        """
+        Gets the PNG image of the viewport of the current scene, from the cache if the scene has not changed
+
+        Args:
+            viewport (Optional[QRect]): region of the game field to render. Default = None - the whole field
+            scale (float): scale of the image. Default: 1.0
+
+        Returns:
+            Tuple[int, bytes]: version of the rendered scene and encoded PNG image
+
+        Raises:
+            ValueError: if the viewport is empty or the image would be too large
+        """
+        with self.lock:
+            viewport = viewport or self.get_field_rect()
+            key = (self.model.version, viewport.x(), viewport.y(), viewport.width(), viewport.height(), scale)
+
+            with self.cache_lock:
+                png = self.cache.get(key)
+
+                if png is not None:
+                    self.cache.move_to_end(key)
+                    self.hits += 1
+                    return key[0], png
+
+            image = self.render_image(viewport, scale)
+
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, 'PNG')
+        png = bytes(buffer.data())
+
+        with self.cache_lock:
+            self.misses += 1
+            self.cache[key] = png
+
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return key[0], png
@@ -0,0 +1,288 @@
+"""
+Implementation of the tiled renderer that rasterizes the static part of the game field in parallel
+"""
+from typing import Dict, List, Set, Tuple
+
+from PyQt6 import sip
+from PyQt6.QtCore import QRect, QRectF, QRunnable, QThread, QThreadPool, Qt
+from PyQt6.QtGui import QFont, QImage, QPainter, QRegion
+
+from components.MoveableRectangle import MoveableRectangle
+from models.GameModel import GameModel
+from rendering.LabelCache import LabelCache
+from utils import Constants, PainterUtils
+
+TILE_SIZE_PX: int = 256
+
+TileKey = Tuple[int, int]
+RectangleEntry = Tuple[int, int, int, int, str, bool, str]
+
+
+class TileJob(QRunnable):
+    """
+    The TileJob, child of QRunnable class, that paints the field and the rectangle entries overlapping one tile
+    into the shared backing image. Every job paints through its own QImage over the same pixel buffer,
+    clipped to its tile, so jobs never write the same pixels and may run off the GUI thread
+
+    Args:
+        tile (QRect): bounds of the tile in the field coordinates
+        buffer (sip.voidptr): pixel buffer of the backing image
+        image_size (Tuple[int, int, int]): width, height and bytes per line of the backing image
+        device_pixel_ratio (float): device pixel ratio of the backing image
+        field_size (Tuple[int, int]): width and height of the game field
+        entries (List[RectangleEntry]): rectangle entries overlapping the tile, in paint order
+        font (QFont): font of the labels
+    """
+    def __init__(self, tile: QRect, buffer: sip.voidptr, image_size: Tuple[int, int, int],
+                 device_pixel_ratio: float, field_size: Tuple[int, int], entries: List[RectangleEntry], font: QFont):
+        super().__init__()
+
+        self.tile = tile
+        self.buffer = buffer
+        self.image_size = image_size
+        self.device_pixel_ratio = device_pixel_ratio
+        self.field_size = field_size
+        self.entries = entries
+        self.font = font
+
+    def run(self) -> None:
+        """
+        Paints the tile
+
+        Returns:
+            None
+        """
+        image = QImage(self.buffer, *self.image_size, QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(self.device_pixel_ratio)
+
+        qp = QPainter()
+        qp.begin(image)
+        qp.setClipRect(self.tile)
+
+        PainterUtils.enable_game_field_painter_style(qp)
+        qp.drawRect(0, 0, *self.field_size)
+
+        qp.setFont(self.font)
+
+        for x_coord, y_coord, width, height, color, is_selected, label in self.entries:
+            PainterUtils.enable_rectangle_painter_style(qp, color, is_selected)
+            qp.drawRect(x_coord, y_coord, width, height)
+
+            if label:
+                qp.setPen(PainterUtils.get_color(Constants.LABEL_COLOR))
+                qp.drawText(QRectF(x_coord, y_coord + Constants.LABEL_PADDING_PX, width, height),
+                            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, label)
+
+        qp.end()
+
+
+class TiledRenderer:
+    """
+    The TiledRenderer that splits the game field into fixed-size tiles and caches the static layer:
+    the field and the rectangles that are not selected, with the ones selected by the selection box outlined.
+    Dirty tiles are rendered in parallel on a thread pool into one backing image, and a tile is invalidated
+    only if a rectangle overlapping it changed.
+    The widget paints the selected rectangle and the ports over the backing image clipped to
+    get_dynamic_region(), and the links on top of everything, so the paint order stays the same
+
+    Args:
+        model (GameModel): GameModel object with game data
+        tile_size (int): size of the tile side. Default: TILE_SIZE_PX
+
+    Attributes:
+        model (GameModel): GameModel object to render
+        tile_size (int): size of the tile side
+        thread_pool (QThreadPool): thread pool that renders tiles
+        image (QImage): backing image with the static layer
+        valid_tiles (Set[TileKey]): tiles of the backing image that are up to date
+        display_list (Dict[str, RectangleEntry]): static rectangle entries by rectangle id, in paint order
+        tile_entries (Dict[TileKey, List[RectangleEntry]]): static entries overlapping each tile, in paint order
+        display_key (tuple): model version, selections and field size the display list was built for
+        labels (LabelCache): cache that elides the labels on the GUI thread, the jobs only draw them
+    """
+    def __init__(self, model: GameModel, tile_size: int = TILE_SIZE_PX):
+        self.model = model
+        self.tile_size = tile_size
+
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(QThread.idealThreadCount())
+
+        self.image = QImage()
+        self.valid_tiles: Set[TileKey] = set()
+        self.display_list: Dict[str, RectangleEntry] = {}
+        self.tile_entries: Dict[TileKey, List[RectangleEntry]] = {}
+        self.display_key: tuple = ()
+        self.labels = LabelCache()
+
+    def is_selected_rectangle(self, rectangle: MoveableRectangle) -> bool:
+        """
+        Checks if the rectangle is painted as selected or dragged with the selected one,
+        with the same equality the GameWidget uses
+
+        Args:
+            rectangle (MoveableRectangle): rectangle to check
+
+        Returns:
+            (bool): True if rectangle is selected or a descendant of the selected one. False otherwise
+        """
+        selected = self.model.selected_rectangle
+        return selected is not None and (rectangle is selected or rectangle == selected
+                                         or self.model.is_descendant(rectangle, selected))
+
+    def get_tile_keys(self, left: int, top: int, right: int, bottom: int) -> List[TileKey]:
+        """
+        Gets the keys of the tiles overlapping the given bounds
+
+        Args:
+            left (int): left bound
+            top (int): top bound
+            right (int): right bound, exclusive
+            bottom (int): bottom bound, exclusive
+
+        Returns:
+            List[TileKey]: keys of the overlapping tiles
+        """
+        return [(column, row)
+                for column in range(max(0, left) // self.tile_size, max(0, right - 1) // self.tile_size + 1)
+                for row in range(max(0, top) // self.tile_size, max(0, bottom - 1) // self.tile_size + 1)]
+
+    def get_entry_tile_keys(self, entry: RectangleEntry) -> List[TileKey]:
+        """
+        Gets the keys of the tiles overlapping the pixels painted for the entry, including the pen
+
+        Args:
+            entry (RectangleEntry): rectangle entry
+
+        Returns:
+            List[TileKey]: keys of the overlapping tiles
+        """
+        x_coord, y_coord, width, height = entry[:4]
+        return self.get_tile_keys(x_coord - 1, y_coord - 1, x_coord + width + 2, y_coord + height + 2)
+
+    def update_display_list(self, device_pixel_ratio: float) -> None:
+        """
+        Rebuilds the static display list if the model or the selection changed since the last paint and
+        invalidates the tiles overlapping the changed entries
+
+        Args:
+            device_pixel_ratio (float): device pixel ratio of the target widget
+
+        Returns:
+            None
+        """
+        model = self.model
+        display_key = (model.version, id(model.selected_rectangle), model.selection_version, model.field_width,
+                       model.field_height, device_pixel_ratio)
+
+        if display_key == self.display_key:
+            return
+
+        display_list: Dict[str, RectangleEntry] = {
+            rectangle.id: (rectangle.x(), rectangle.y(), rectangle.width(), rectangle.height(), rectangle.color,
+                           rectangle.id in model.selected_rectangle_ids,
+                           self.labels.get_layout(rectangle.label, rectangle.width()).text()
+                           if rectangle.label and self.labels.is_fitting(rectangle.height()) else '')
+            for rectangle in model.rectangles if not self.is_selected_rectangle(rectangle)
+        }
+
+        if self.display_key[3:] != display_key[3:]:
+            self.image = QImage(int(model.field_width * device_pixel_ratio),
+                                int(model.field_height * device_pixel_ratio),
+                                QImage.Format.Format_ARGB32_Premultiplied)
+            self.image.setDevicePixelRatio(device_pixel_ratio)
+            self.valid_tiles.clear()
+        else:
+            for rectangle_id in self.display_list.keys() | display_list.keys():
+                old_entry, new_entry = self.display_list.get(rectangle_id), display_list.get(rectangle_id)
+                if old_entry == new_entry:
+                    continue
+                for entry in (old_entry, new_entry):
+                    if entry is not None:
+                        self.valid_tiles.difference_update(self.get_entry_tile_keys(entry))
+
+        self.tile_entries = {}
+        for entry in display_list.values():
+            for key in self.get_entry_tile_keys(entry):
+                self.tile_entries.setdefault(key, []).append(entry)
+
+        self.display_list = display_list
+        self.display_key = display_key
+
+    def render_tiles(self, keys: List[TileKey]) -> None:
+        """
+        Renders the given tiles in parallel and waits until all of them are done
+
+        Args:
+            keys (List[TileKey]): keys of the tiles to render
+
+        Returns:
+            None
+        """
+        field_size = (self.model.field_width, self.model.field_height)
+        image_size = (self.image.width(), self.image.height(), self.image.bytesPerLine())
+        buffer = self.image.bits()
+
+        for key in keys:
+            tile = QRect(key[0] * self.tile_size, key[1] * self.tile_size, self.tile_size, self.tile_size)
+            self.thread_pool.start(TileJob(tile, buffer, image_size, self.image.devicePixelRatio(), field_size,
+                                           self.tile_entries.get(key, []), self.labels.font))
+
+        self.thread_pool.waitForDone()
+        self.valid_tiles.update(keys)
+
+    def paint(self, qp: QPainter, rect: QRect, device_pixel_ratio: float = 1.0) -> None:
+        """
+        Paints the static layer inside the given rectangle, rendering the dirty tiles first
+
+        Args:
+            qp (QPainter): QPainter instance
+            rect (QRect): rectangle to paint
+            device_pixel_ratio (float): device pixel ratio of the target widget. Default: 1.0
+
+        Returns:
+            None
+        """
+        self.update_display_list(device_pixel_ratio)
+
+        rect = rect.intersected(QRect(0, 0, self.model.field_width, self.model.field_height))
+        if rect.isEmpty():
+            return
+
+        keys = self.get_tile_keys(rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1)
+        dirty = [key for key in keys if key not in self.valid_tiles]
+
+        if dirty:
+            self.render_tiles(dirty)
+
+        source = QRectF(rect.x() * device_pixel_ratio, rect.y() * device_pixel_ratio,
+                        rect.width() * device_pixel_ratio, rect.height() * device_pixel_ratio)
+        qp.drawImage(QRectF(rect), self.image, source)
+
+    def get_dynamic_region(self) -> QRegion:
+        """
+        Gets the region covered by the rectangles and ports that are not part of the tiles:
+        the selected rectangle with its ports and, while a port is selected, every rectangle with its ports
+
+        Returns:
+            QRegion: region to paint over the static layer
+        """
+        model = self.model
+        margin = Constants.CIRCLE_RADIUS_PX + 1
+        region = QRegion()
+
+        def add_rectangle(rectangle: MoveableRectangle, x_offset: int, y_offset: int) -> None:
+            nonlocal region
+            region = region.united(QRect(rectangle.x() + x_offset - margin, rectangle.y() + y_offset - margin,
+                                         rectangle.width() + 2 * margin + 1, rectangle.height() + 2 * margin + 1))
+
+        if model.selected_rectangle is not None:
+            if model.is_dragging_link:
+                add_rectangle(model.selected_rectangle, 0, 0)
+            else:
+                add_rectangle(model.selected_rectangle, model.x2, model.y2)
+
+        if model.selected_port is not None:
+            for rectangle in model.rectangles:
+                add_rectangle(rectangle, 0, 0)
+
+        return region
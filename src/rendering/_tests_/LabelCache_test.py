@@ -0,0 +1,60 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from src.rendering.LabelCache import LabelCache
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def draw_label(labels, scale, width=120, height=40, text='label'):
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.white)
+    qp = QPainter()
+    qp.begin(image)
+    qp.scale(scale, scale)
+    labels.draw(qp, 0, 0, width, height, text)
+    qp.end()
+
+    return any(image.pixelColor(x, y) != Qt.GlobalColor.white for x in range(width) for y in range(height))
+
+
+class TestLabelCache:
+    def test_elides_labels_to_width(self, app):
+        labels = LabelCache()
+        text = 'a rather long label that does not fit'
+        layout = labels.get_layout(text, 60)
+
+        assert layout.text() != text and layout.text().endswith('…')
+        assert layout.size().width() <= 60 - 8
+        assert labels.get_layout('short', 200).text() == 'short'
+
+    def test_reuses_layouts(self, app):
+        labels = LabelCache(size=2)
+        first = labels.get_layout('first', 100)
+
+        assert labels.get_layout('first', 100) is first
+        assert (labels.hits, labels.misses) == (1, 1)
+
+        # another width lays the label out again, the least recently used layout is dropped
+        labels.get_layout('first', 50)
+        labels.get_layout('second', 100)
+
+        assert labels.get_layout('first', 100) is not first
+        assert (labels.hits, labels.misses) == (1, 4)
+
+    def test_skips_illegible_labels(self, app):
+        labels = LabelCache()
+
+        assert draw_label(labels, 1)
+        assert not draw_label(labels, 0.25)
+        assert not draw_label(labels, 1, height=10)
+        assert not draw_label(labels, 1, text='')
@@ -0,0 +1,84 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtGui import QPainterPath
+from PyQt6.QtWidgets import QApplication
+
+from src.components.MoveableRectangle import MoveableRectangle
+from src.models.GameModel import GameModel
+from src.rendering.LinkPathCache import LinkPathCache
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def build_linked_model():
+    model = GameModel()
+    model.add_rectangle(MoveableRectangle(200, 200, 100, 50))
+    model.add_rectangle(MoveableRectangle(500, 400, 100, 50))
+    link = model.add_link(model.rectangles[0].ports[2], model.rectangles[1].ports[0])
+
+    return model, link
+
+
+class TestLinkPathCache:
+    def test_rebuilds_only_moved_links(self, app):
+        model, link = build_linked_model()
+        other = MoveableRectangle(800, 200, 100, 50)
+        model.add_rectangle(other)
+        other_link = model.add_link(model.rectangles[0].ports[1], other.ports[3])
+        cache = LinkPathCache(model)
+
+        for _ in range(3):
+            cache.get_path(link)
+            cache.get_path(other_link)
+
+        assert cache.builds == 2
+
+        model.move_rectangle(other, 0, 25)
+        path = cache.get_path(link)
+        other_path = cache.get_path(other_link)
+
+        assert cache.builds == 3
+        assert other_path.key[:4] == (other_link.x1(), other_link.y1(), other_link.x2(), other_link.y2())
+        assert cache.get_path(link) is path
+
+        model.is_curved_links_enabled = True
+        cache.get_path(link)
+
+        assert cache.builds == 4
+
+        model.remove_link(other_link)
+        cache.prune()
+
+        assert set(cache.paths) == {link.id}
+
+    def test_curves_follow_port_normals(self, app):
+        model, link = build_linked_model()
+        model.is_curved_links_enabled = True
+        path = LinkPathCache(model).get_path(link).path
+
+        assert path.elementCount() == 4
+        assert path.elementAt(1).type == QPainterPath.ElementType.CurveToElement
+        # leaves the bottom port downwards and enters the top port from above
+        assert path.elementAt(1).x == link.x1() and path.elementAt(1).y > link.y1()
+        assert path.elementAt(2).x == link.x2() and path.elementAt(2).y < link.y2()
+
+    def test_model_hit_tests_curved_links(self, app):
+        model, link = build_linked_model()
+        model.link_paths = LinkPathCache(model)
+        on_chord = (link.x1() + 20, link.y1() + 10)
+        below_src_port = (link.x1(), link.y1() + 15)
+
+        assert model.find_selected_link(*on_chord) is link
+        assert model.find_selected_link(*below_src_port) is None
+
+        model.is_curved_links_enabled = True
+
+        assert model.find_selected_link(*on_chord) is None
+        assert model.find_selected_link(*below_src_port) is link
+        assert model.find_selected_link(*map(int, model.get_link_center(link))) is link
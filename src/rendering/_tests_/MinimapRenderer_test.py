@@ -0,0 +1,102 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import random
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.components.MoveableRectangle import MoveableRectangle
+from src.models.GameModel import GameModel
+from src.models.ShardedWorld import ShardedWorld
+from src.persistence.RegionStore import RegionStore
+from src.rendering.MinimapRenderer import MINIMAP_CHANGE_KINDS, MinimapRenderer
+from src.utils import PainterUtils
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def render_fresh(model):
+    return MinimapRenderer(model, 200, 150).get_image()
+
+
+class TestMinimapRenderer:
+    def test_repaints_only_changed_pixels(self, app):
+        model = build_scene(144, 4000, 3000)
+        renderer = MinimapRenderer(model, 200, 150)
+        model.changes.subscribe(renderer.handle_changes, MINIMAP_CHANGE_KINDS)
+        renderer.get_image()
+
+        assert renderer.repainted_pixels == renderer.image.width() * renderer.image.height()
+
+        generator = random.Random(3)
+
+        for _ in range(20):
+            rectangle = generator.choice(model.rectangles)
+            x_offset, y_offset = generator.randrange(-60, 60), generator.randrange(-60, 60)
+
+            if not model.has_collision(rectangle, x_offset, y_offset):
+                model.move_rectangle(rectangle, x_offset, y_offset)
+
+            model.changes.flush()
+            image = renderer.get_image()
+
+            assert renderer.repainted_pixels < 200
+            assert image == render_fresh(model)
+
+        model.remove_rectangle(model.rectangles[0])
+        model.add_rectangle(MoveableRectangle(2000, 1500, 300, 200))
+        model.add_rectangle(MoveableRectangle(2000, 1500, 100, 50))
+        model.changes.flush()
+
+        assert renderer.get_image() == render_fresh(model)
+        assert renderer.repainted_pixels < 400
+
+    def test_rebuilds_when_scene_grows(self, app):
+        model = build_scene(16)
+        renderer = MinimapRenderer(model, 200, 150)
+        model.changes.subscribe(renderer.handle_changes, MINIMAP_CHANGE_KINDS)
+        renderer.get_image()
+        model.translate(-500, 0)
+        model.changes.flush()
+
+        assert renderer.get_image() == render_fresh(model)
+        assert renderer.extent[0] == min(rectangle.x() for rectangle in model.rectangles) < 0
+        # a pixel of the minimap covers several points of the scene
+        assert all(abs(coord) <= 1 / renderer.scale for coord in renderer.to_scene(*renderer.to_pixels(0, 0, 1, 1)[:2]))
+
+    def test_shows_regions_of_world_that_are_not_loaded(self, app, tmp_path):
+        model = GameModel()
+        model.field_width, model.field_height = 600, 400
+        world = ShardedWorld(model, RegionStore(str(tmp_path), 256))
+        world.move_view(3000, 2000)
+        far = model.try_add_new_rectangle(300, 200)
+        far_center = far.center().x() + world.origin_x, far.center().y() + world.origin_y
+        world.move_view(-3000, -2000)
+        world.close()
+
+        model = GameModel()
+        model.field_width, model.field_height = 600, 400
+        world = ShardedWorld(model, RegionStore(str(tmp_path), 256))
+        renderer = MinimapRenderer(model, 200, 150, world)
+        model.changes.subscribe(renderer.handle_changes, MINIMAP_CHANGE_KINDS)
+        image = renderer.get_image()
+
+        assert not model.rectangles
+        assert renderer.extent[2] > far_center[0] and renderer.extent[3] > far_center[1]
+        pixel = renderer.to_pixels(*far_center, *far_center)[:2]
+        assert image.pixelColor(*pixel) == PainterUtils.get_color(far.color)
+
+        world.move_view(*renderer.to_scene(*pixel))
+        model.changes.flush()
+
+        assert [rect.id for rect in model.rectangles] == [far.id]
+        center = model.rectangles[0].center()
+        pixel = renderer.to_pixels(center.x(), center.y(), center.x(), center.y())[:2]
+        assert renderer.get_image().pixelColor(*pixel) == PainterUtils.get_color(far.color)
+        world.close()
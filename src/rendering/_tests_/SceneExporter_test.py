@@ -0,0 +1,101 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.models.GameModel import GameModel
+from src.persistence.ModelJournal import ModelJournal
+from src.persistence.ModelRecovery import load_model
+from src.rendering import SceneExporter
+from src.rendering.SceneRenderer import SceneRenderer
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def to_argb(image):
+    return image.convertToFormat(QImage.Format.Format_ARGB32)
+
+
+class TestSceneExporter:
+    def test_splits_image_into_bands(self):
+        assert SceneExporter.get_bands(100, 250, 10000) == [(0, 100), (100, 100), (200, 50)]
+        assert SceneExporter.get_bands(20000, 3, 10000) == [(0, 1), (1, 1), (2, 1)]
+
+    def test_png_matches_scene_renderer(self, app, tmp_path, monkeypatch):
+        model = build_scene(24)
+        model.is_curved_links_enabled = True
+        path = str(tmp_path / 'scene.png')
+        monkeypatch.setattr(SceneExporter, 'EXPORT_BAND_PIXELS', model.field_width * 37)
+        SceneExporter.export_png(path, model)
+
+        expected = SceneRenderer(model).render_image(SceneRenderer(model).get_field_rect())
+
+        assert to_argb(QImage(path)) == to_argb(expected)
+
+    def test_png_is_painted_by_workers(self, app, tmp_path):
+        model = GameModel()
+        journal = ModelJournal(str(tmp_path), model, flush_interval=0.01)
+        model.journal = journal
+        model.try_add_new_rectangle(300, 300)
+        model.try_add_new_rectangle(600, 300)
+        model.add_link(model.rectangles[0].ports[1], model.rectangles[1].ports[3])
+        journal.close()
+
+        path = str(tmp_path / 'scene.png')
+        SceneExporter.export_png(path, model, 0.5, str(tmp_path), workers=2)
+        image = QImage(path)
+
+        assert (image.width(), image.height()) == SceneExporter.get_image_size(model, 0.5)
+        assert to_argb(image) == to_argb(SceneRenderer(model).render_image(SceneRenderer(model).get_field_rect(), 0.5))
+
+    def test_covers_rectangles_outside_of_field(self, app, tmp_path):
+        model = GameModel()
+        model.field_width, model.field_height = 8000, 6000
+        journal = ModelJournal(str(tmp_path), model, flush_interval=0.01)
+        model.journal = journal
+        model.try_add_new_rectangle(300, 300)
+        far = model.try_add_new_rectangle(5950, 4975)
+        journal.close()
+
+        loaded, _ = load_model(str(tmp_path))
+        path = str(tmp_path / 'scene.png')
+        SceneExporter.export_png(path, loaded, 0.5)
+        image = QImage(path)
+
+        assert (loaded.field_width, loaded.field_height) == (GameModel().field_width, GameModel().field_height)
+        assert image.width() > far.right() * 0.5 and image.height() > far.bottom() * 0.5
+        assert image.pixelColor(round(far.center().x() * 0.5), round(far.center().y() * 0.5)).alpha() == 255
+
+        SceneExporter.export_svg(str(tmp_path / 'scene.svg'), loaded)
+
+        with open(tmp_path / 'scene.svg', encoding='utf-8') as svg:
+            text = svg.read()
+
+        left, top, right, bottom = SceneExporter.get_export_extent(loaded)
+        assert right > far.right() and bottom > far.bottom()
+        assert f'viewBox="{left} {top} {right - left} {bottom - top}"' in text
+
+    def test_svg_follows_model(self, app, tmp_path):
+        model = build_scene(4)
+        model.rectangles[0].label = 'first & <best>'
+        path = str(tmp_path / 'scene.svg')
+        SceneExporter.export_svg(path, model, 2.0)
+
+        with open(path, encoding='utf-8') as svg:
+            text = svg.read()
+
+        assert text.startswith(f'<svg xmlns="http://www.w3.org/2000/svg" width="{model.field_width * 2}"')
+        assert text.count('<rect ') == len(model.rectangles) + 1
+        assert text.count('<path ') == len(model.links)
+        assert 'first &amp; &lt;best&gt;' in text
+        assert text.endswith('</svg>\n')
+
+        with pytest.raises(ValueError):
+            SceneExporter.export_svg(path, model, 0)
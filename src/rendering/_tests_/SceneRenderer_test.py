@@ -0,0 +1,93 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.rendering.SceneRenderer import SceneRenderer
+from src.widgets.GameWidget import GameWidget
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def to_rgb(image):
+    return image.convertToFormat(QImage.Format.Format_RGB32)
+
+
+def count_different_pixels(image, other_image):
+    return sum(image.pixel(x, y) != other_image.pixel(x, y)
+               for x in range(image.width()) for y in range(image.height()))
+
+
+class TestSceneRenderer:
+    def test_matches_game_widget(self, app):
+        model = build_scene(24)
+        view = GameWidget(model)
+        view.resize(model.field_width, model.field_height)
+        view.show()
+        app.processEvents()
+
+        widget_image = to_rgb(view.grab().toImage())
+        view.close()
+
+        assert to_rgb(SceneRenderer(model).render_image(QRect(0, 0, model.field_width, model.field_height))) == \
+            widget_image
+
+    def test_renders_scaled_region(self, app):
+        model = build_scene(24)
+        renderer = SceneRenderer(model)
+        full_image = to_rgb(renderer.render_image(renderer.get_field_rect()))
+        region_image = renderer.render_image(QRect(100, 50, 300, 200), 0.5)
+
+        assert (region_image.width(), region_image.height()) == (150, 100)
+        # wide link lines are rasterized slightly differently once translated, rectangles are not
+        assert count_different_pixels(to_rgb(renderer.render_image(QRect(100, 50, 300, 200))),
+                                      full_image.copy(100, 50, 300, 200)) <= 4
+
+        with pytest.raises(ValueError):
+            renderer.render_image(QRect(0, 0, 0, 10))
+        with pytest.raises(ValueError):
+            renderer.render_image(renderer.get_field_rect(), 100)
+
+    def test_caches_by_version_and_viewport(self, app):
+        model = build_scene(8)
+        renderer = SceneRenderer(model, cache_size=2)
+
+        version, png = renderer.render_png()
+        assert renderer.render_png() == (version, png)
+        assert (renderer.hits, renderer.misses) == (1, 1)
+
+        renderer.render_png(QRect(0, 0, 100, 100))
+        renderer.render_png(QRect(0, 0, 100, 100), 2.0)
+        renderer.render_png()
+        assert (renderer.hits, renderer.misses) == (1, 4)
+
+        model.move_rectangle(model.rectangles[0], 5, 5)
+        new_version, new_png = renderer.render_png()
+        assert new_version == version + 1
+        assert new_png != png
+        assert (renderer.hits, renderer.misses) == (1, 5)
+        assert len(renderer.cache) == 2
+
+    def test_delivers_changes_without_event_loop(self, app):
+        model = build_scene(8)
+        model.is_curved_links_enabled = True
+        renderer = SceneRenderer(model)
+        renderer.render_png()
+        removed = model.links[0]
+
+        assert removed.id in renderer.painter.link_paths.paths
+
+        for link in list(model.links):
+            model.remove_link(link)
+        renderer.render_png()
+
+        assert not model.changes.pending
+        assert not renderer.painter.link_paths.paths
@@ -0,0 +1,110 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.models.GameModel import GameModel
+from src.rendering.TiledRenderer import TiledRenderer
+from src.widgets.GameWidget import GameWidget
+# components draw colors from the top-level utils package, not from src.utils
+from utils import RandomUtils
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def grab(view):
+    return view.grab().toImage().convertToFormat(QImage.Format.Format_RGB32)
+
+
+def play_session(app, tiled):
+    RandomUtils.seed(5)
+    view = GameWidget(GameModel(), tiled=tiled)
+    view.show()
+    frames = []
+
+    def click(action, x_coord, y_coord):
+        getattr(QTest, action)(view, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier,
+                               QPoint(x_coord, y_coord))
+        app.processEvents()
+        frames.append(grab(view))
+
+    def move(x_coord, y_coord):
+        QTest.mouseMove(view, QPoint(x_coord, y_coord))
+        app.processEvents()
+        frames.append(grab(view))
+
+    click('mouseDClick', 300, 300)
+    click('mouseDClick', 600, 300)
+    click('mouseDClick', 450, 500)
+    click('mouseClick', 300, 300)
+    click('mousePress', 345, 295)
+    move(450, 300)
+    move(545, 295)
+    click('mouseRelease', 545, 295)
+    click('mousePress', 600, 300)
+    move(620, 350)
+    move(700, 420)
+    click('mouseRelease', 700, 420)
+    link_center = view.model.links[0].center()
+    click('mouseClick', link_center.x(), link_center.y())
+    click('mouseClick', link_center.x(), link_center.y())
+    view.resize(900, 650)
+    app.processEvents()
+    frames.append(grab(view))
+    view.close()
+
+    return view.model, frames
+
+
+class TestTiledRenderer:
+    def test_matches_game_widget(self, app):
+        model, frames = play_session(app, False)
+        tiled_model, tiled_frames = play_session(app, True)
+
+        assert len(tiled_model.rectangles) == len(model.rectangles) == 3
+        assert len(tiled_frames) == len(frames)
+
+        for frame, tiled_frame in zip(frames, tiled_frames):
+            assert frame == tiled_frame
+
+    def test_invalidates_only_changed_tiles(self, app):
+        model = build_scene(16)
+        renderer = TiledRenderer(model, 128)
+        image = QImage(model.field_width, model.field_height, QImage.Format.Format_ARGB32_Premultiplied)
+
+        qp = QPainter(image)
+        renderer.paint(qp, image.rect())
+        qp.end()
+        assert len(renderer.valid_tiles) == 8 * 6
+
+        model.selected_rectangle = model.rectangles[0]
+        renderer.update_display_list(1.0)
+        invalid_tiles = {(column, row) for column in range(8) for row in range(6)} - renderer.valid_tiles
+
+        assert invalid_tiles and all(column <= 1 and row <= 1 for column, row in invalid_tiles)
+        assert renderer.get_dynamic_region().boundingRect().contains(model.rectangles[0].x(), model.rectangles[0].y())
+
+    def test_matches_game_widget_on_generated_scene(self, app):
+        frames = []
+
+        for tiled in (False, True):
+            view = GameWidget(build_scene(64), tiled=tiled)
+            view.show()
+            dragged = view.model.rectangles[20]
+            center = QPoint(dragged.center().x(), dragged.center().y())
+            QTest.mousePress(view, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier, center)
+            QTest.mouseMove(view, center + QPoint(7, 5))
+            app.processEvents()
+            frames.append(grab(view))
+            view.close()
+
+        assert frames[0] == frames[1]
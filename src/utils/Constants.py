@@ -1,34 +1,54 @@
 """
-Configuration constants used in application
+Configuration constants used in application.
+Colors are stored as Qt color names, so the module can be imported without Qt
 """
 from typing import List
 
-from PyQt6.QtGui import QColor
-
 START_COORDINATES: List[int] = [200, 200]
 SCREEN_SIZE_MAX_PX: List[int] = [1024, 768]
 SCREEN_SIZE_MIN_PX: List[int] = [200, 200]
 
 RECTANGLE_COLORS: List[str] = ['cyan', 'darkCyan', 'darkRed', 'magenta',
                                'darkMagenta', 'darkGreen', 'yellow', 'darkBlue', 'gray']
-BLACK_COLOR: QColor = QColor('black')
-WHITE_COLOR: QColor = QColor('white')
-GREEN_COLOR: QColor = QColor('green')
-RED_COLOR: QColor = QColor('red')
-BLUE_COLOR: QColor = QColor('blue')
+BLACK_COLOR: str = 'black'
+WHITE_COLOR: str = 'white'
+GREEN_COLOR: str = 'green'
+RED_COLOR: str = 'red'
+BLUE_COLOR: str = 'blue'
+ORANGE_COLOR: str = 'orange'
 
-SCREEN_COLOR: QColor = QColor(BLACK_COLOR)
-BORDER_COLOR: QColor = QColor(BLACK_COLOR)
-LINK_COLOR: QColor = QColor(WHITE_COLOR)
-PORT_COLOR: QColor = QColor(WHITE_COLOR)
-SELECTED_RECTANGLE_BORDER_COLOR: QColor = QColor(WHITE_COLOR)
-SELECTED_ELEMENT_COLOR: QColor = QColor(BLUE_COLOR)
-AVAILABLE_COLOR: QColor = QColor(GREEN_COLOR)
-UNAVAILABLE_COLOR: QColor = QColor(RED_COLOR)
-DELETE_COLOR: QColor = QColor(RED_COLOR)
+SCREEN_COLOR: str = BLACK_COLOR
+BORDER_COLOR: str = BLACK_COLOR
+LINK_COLOR: str = WHITE_COLOR
+PORT_COLOR: str = WHITE_COLOR
+SELECTED_RECTANGLE_BORDER_COLOR: str = WHITE_COLOR
+SELECTED_ELEMENT_COLOR: str = BLUE_COLOR
+AVAILABLE_COLOR: str = GREEN_COLOR
+UNAVAILABLE_COLOR: str = RED_COLOR
+DELETE_COLOR: str = RED_COLOR
+GUIDE_COLOR: str = ORANGE_COLOR
+SELECTION_BOX_COLOR: str = SELECTED_ELEMENT_COLOR
+LABEL_COLOR: str = BLACK_COLOR
 
 RECTANGLE_WIDTH_PX: int = 100
 RECTANGLE_HEIGHT_PX: int = int(RECTANGLE_WIDTH_PX / 2)
+RECTANGLE_MIN_WIDTH_PX: int = 40
+RECTANGLE_MIN_HEIGHT_PX: int = 20
+RESIZE_HANDLE_PX: int = 10
 CIRCLE_RADIUS_PX: int = 10
 CIRCLE_RADIUS_SQUARED_PX: int = CIRCLE_RADIUS_PX ** 2
 LINK_WIDTH_PX: int = 4
+LINK_CURVE_REACH_PX: int = 40
+GRID_SIZE_PX: int = 25
+SNAP_TOLERANCE_PX: int = 6
+PAN_STEP_PX: int = 128
+PROFILER_INTERVAL_MS: int = 2
+STALL_THRESHOLD_MS: int = 500
+PROFILE_ENV_VAR: str = 'WOR_PROFILE'
+STALL_ENV_VAR: str = 'WOR_STALL_MS'
+MINIMAP_SIZE_PX: List[int] = [200, 150]
+LABEL_FONT_PX: int = 12
+LABEL_PADDING_PX: int = 4
+LABEL_MIN_LEGIBLE_PX: int = 7
+LABEL_MAX_LENGTH: int = 256
+LABEL_CACHE_SIZE: int = 1024
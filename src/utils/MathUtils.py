@@ -1,12 +1,14 @@
 """
 Utility functions related to general calculations
 """
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple, TYPE_CHECKING
 from functools import lru_cache
 
-from components.MoveableRectangle import MoveableRectangle
 from utils import Constants
 
+if TYPE_CHECKING:
+    from components.MoveableRectangle import MoveableRectangle
+
 
 @lru_cache(maxsize=128)
 def has_border_collision(left: int, right: int, top: int, bottom: int,
@@ -67,8 +69,30 @@ def has_rectangle_overlap(left_1: int, right_1: int, top_1: int, bottom_1: int,
 
     return not no_overlap
 
-def has_collision(moveable_rectangle: Optional[MoveableRectangle],
-                  rectangles: List[Optional[MoveableRectangle]],
+def is_rectangle_inside(left_1: int, right_1: int, top_1: int, bottom_1: int,
+                        left_2: int, right_2: int, top_2: int, bottom_2: int) -> bool:
+    """
+    Checks if the first rectangle lies inside the second one, which makes the second one its container.
+    Rectangles with equal bounds are not nested
+
+    Args:
+        left_1 (int): left side of the inner rectangle
+        right_1 (int): right side of the inner rectangle
+        top_1 (int): top side of the inner rectangle
+        bottom_1 (int): bottom side of the inner rectangle
+        left_2 (int): left side of the outer rectangle
+        right_2 (int): right side of the outer rectangle
+        top_2 (int): top side of the outer rectangle
+        bottom_2 (int): bottom side of the outer rectangle
+
+    Returns:
+        (bool): True if the first rectangle is inside the second one. False otherwise
+    """
+    return (left_2 <= left_1 and right_1 <= right_2 and top_2 <= top_1 and bottom_1 <= bottom_2
+            and (left_1, right_1, top_1, bottom_1) != (left_2, right_2, top_2, bottom_2))
+
+def has_collision(moveable_rectangle: Optional['MoveableRectangle'],
+                  rectangles: List[Optional['MoveableRectangle']],
                   screen_width: int, screen_height: int,
                   x_offset: int=0, y_offset: int=0) -> bool:
     """
@@ -119,3 +143,74 @@ def is_point_in_circle(x_center: int, y_center: int, x_coord: int, y_coord: int)
     """
     return ((x_coord - x_center) ** 2 + (y_coord - y_center) ** 2
             <= Constants.CIRCLE_RADIUS_SQUARED_PX)
+
+def is_point_in_polygon(polygon: Sequence[Tuple[int, int]], x_coord: int, y_coord: int) -> bool:
+    """
+    Checks if point with given coordinates is inside the given polygon using the winding fill rule.
+    Mirrors QPolygon.containsPoint(..., Qt.FillRule.WindingFill), including its handling of edges
+
+    Args:
+        polygon (Sequence[Tuple[int, int]]): polygon vertices as (x, y) pairs, implicitly closed
+        x_coord (int): x coordinate of the point
+        y_coord (int): y coordinate of the point
+
+    Returns:
+        (bool): True if point is inside the polygon, False otherwise
+    """
+    if not polygon:
+        return False
+
+    winding_number = 0
+    vertices_count = len(polygon)
+
+    for i in range(vertices_count):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % vertices_count]
+
+        if y1 == y2:
+            continue
+
+        direction = 1
+        if y2 < y1:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+            direction = -1
+
+        if y1 <= y_coord < y2 and x1 + (x2 - x1) / (y2 - y1) * (y_coord - y1) <= x_coord:
+            winding_number += direction
+
+    return winding_number != 0
+
+def has_segment_overlap(x1: float, y1: float, x2: float, y2: float,
+                        left: int, right: int, top: int, bottom: int) -> bool:
+    """
+    Checks if the segment touches the rectangle, clipping the segment to the rectangle sides (Liang-Barsky).
+    The rectangle includes its sides
+
+    Args:
+        x1 (float): x coordinate of the segment start
+        y1 (float): y coordinate of the segment start
+        x2 (float): x coordinate of the segment end
+        y2 (float): y coordinate of the segment end
+        left (int): left side of the rectangle
+        right (int): right side of the rectangle
+        top (int): top side of the rectangle
+        bottom (int): bottom side of the rectangle
+
+    Returns:
+        (bool): True if some point of the segment lies in the rectangle. False otherwise
+    """
+    start, end = 0.0, 1.0
+
+    for delta, distance in ((x1 - x2, x1 - left), (x2 - x1, right - x1), (y1 - y2, y1 - top), (y2 - y1, bottom - y1)):
+        if delta == 0:
+            if distance < 0:
+                return False
+        elif delta < 0:
+            start = max(start, distance / delta)
+        else:
+            end = min(end, distance / delta)
+
+        if start > end:
+            return False
+
+    return True
@@ -1,12 +1,83 @@
 """
-Utility functions to set various QPainter styles
+Utility functions to set various QPainter styles.
+Model colors are plain color names and are converted to QColor and QPen objects only here,
+lazily on first paint, and then cached
 """
+from functools import lru_cache
+
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPainter, QColor, QPen
 
 from utils import Constants
 
 
+@lru_cache(maxsize=None)
+def get_color(name: str) -> QColor:
+    """
+    Gets the cached QColor object for the given color name. The returned object must not be modified
+
+    Args:
+        name (str): Qt color name
+
+    Returns:
+        QColor: color object
+    """
+    return QColor(name)
+
+@lru_cache(maxsize=None)
+def get_pen(name: str) -> QPen:
+    """
+    Gets the cached default QPen object for the given color name. The returned object must not be modified
+
+    Args:
+        name (str): Qt color name
+
+    Returns:
+        QPen: pen object
+    """
+    return QPen(get_color(name))
+
+@lru_cache(maxsize=None)
+def get_link_pen(is_selected: bool) -> QPen:
+    """
+    Gets the cached QPen object used to draw links. The returned object must not be modified
+
+    Args:
+        is_selected (bool): flag to check if link is selected
+
+    Returns:
+        QPen: pen object
+    """
+    pen = QPen()
+    pen.setWidth(Constants.LINK_WIDTH_PX)
+    pen.setColor(get_color(Constants.SELECTED_ELEMENT_COLOR if is_selected else Constants.LINK_COLOR))
+    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+    return pen
+
+@lru_cache(maxsize=None)
+def get_guide_pen() -> QPen:
+    """
+    Gets the cached QPen object used to draw alignment guides. The returned object must not be modified
+
+    Returns:
+        QPen: pen object
+    """
+    pen = QPen(get_color(Constants.GUIDE_COLOR))
+    pen.setStyle(Qt.PenStyle.DashLine)
+    return pen
+
+@lru_cache(maxsize=None)
+def get_selection_box_pen() -> QPen:
+    """
+    Gets the cached QPen object used to draw the selection box. The returned object must not be modified
+
+    Returns:
+        QPen: pen object
+    """
+    pen = QPen(get_color(Constants.SELECTION_BOX_COLOR))
+    pen.setStyle(Qt.PenStyle.DashLine)
+    return pen
+
 def enable_game_field_painter_style(qp: QPainter) -> None:
     """
     Sets correct style for drawing game field
@@ -17,31 +88,31 @@ def enable_game_field_painter_style(qp: QPainter) -> None:
     Returns:
         None
     """
-    qp.setBrush(Constants.SCREEN_COLOR)
+    qp.setBrush(get_color(Constants.SCREEN_COLOR))
 
-def enable_rectangle_painter_style(qp: QPainter, color: QColor, is_selected: bool=False) -> None:
+def enable_rectangle_painter_style(qp: QPainter, color: str, is_selected: bool=False) -> None:
     """
     Sets correct style for drawing moveable rectangles
 
     Args:
         qp (QPainter): QPainter instance
-        color (QColor): color of the rectangle
+        color (str): color name of the rectangle
         is_selected (bool): flag to check if rectangle is selected
 
     Returns:
         None
     """
-    qp.setBrush(color)
-    qp.setPen(Constants.SELECTED_RECTANGLE_BORDER_COLOR if is_selected else color)
+    qp.setBrush(get_color(color))
+    qp.setPen(get_color(Constants.SELECTED_RECTANGLE_BORDER_COLOR if is_selected else color))
 
-def enable_port_painter_style(qp: QPainter, color: QColor, is_selected: bool=False,
+def enable_port_painter_style(qp: QPainter, color: str, is_selected: bool=False,
                               is_hovered: bool=False, is_unavailable: bool=False) -> None:
     """
     Sets correct style for drawing ports
 
     Args:
         qp (QPainter): QPainter instance
-        color (QColor): color of the rectangle
+        color (str): color name of the port
         is_selected (bool): flag to check if rectangle is selected
         is_hovered (bool): flag to check if port is hovered
         is_unavailable (bool): flag to check if port is unavailable
@@ -58,8 +129,8 @@ def enable_port_painter_style(qp: QPainter, color: QColor, is_selected: bool=Fal
     if is_unavailable:
         brush_color = Constants.UNAVAILABLE_COLOR
 
-    qp.setBrush(brush_color)
-    qp.setPen(Constants.SELECTED_ELEMENT_COLOR)
+    qp.setBrush(get_color(brush_color))
+    qp.setPen(get_color(Constants.SELECTED_ELEMENT_COLOR))
 
 def enable_link_painter_style(qp: QPainter, is_selected: bool=False) -> None:
     """
@@ -72,22 +143,44 @@ def enable_link_painter_style(qp: QPainter, is_selected: bool=False) -> None:
     Returns:
         None
     """
-    pen = QPen()
-    pen.setWidth(Constants.LINK_WIDTH_PX)
-    pen.setColor(Constants.SELECTED_ELEMENT_COLOR if is_selected else Constants.LINK_COLOR)
-    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-    qp.setPen(pen)
+    qp.setPen(get_link_pen(is_selected))
+    qp.setBrush(Qt.BrushStyle.NoBrush)
 
-def enable_button_painter_style(qp: QPainter, color: QColor) -> None:
+def enable_button_painter_style(qp: QPainter, color: str) -> None:
     """
     Sets correct style for drawing buttons
 
     Args:
         qp (QPainter): QPainter instance
-        color (QColor): color of the button
+        color (str): color name of the button
+
+    Returns:
+        None
+    """
+    qp.setPen(get_color(color))
+    qp.setBrush(get_color(color))
+
+def enable_guide_painter_style(qp: QPainter) -> None:
+    """
+    Sets correct style for drawing alignment guides
+
+    Args:
+        qp (QPainter): QPainter instance
+
+    Returns:
+        None
+    """
+    qp.setPen(get_guide_pen())
+
+def enable_selection_box_painter_style(qp: QPainter) -> None:
+    """
+    Sets correct style for drawing the selection box
+
+    Args:
+        qp (QPainter): QPainter instance
 
     Returns:
         None
     """
-    qp.setPen(color)
-    qp.setBrush(color)
+    qp.setPen(get_selection_box_pen())
+    qp.setBrush(Qt.BrushStyle.NoBrush)
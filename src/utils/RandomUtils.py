@@ -0,0 +1,49 @@
+"""
+Utility functions to draw colors and ids from a single seedable random source,
+so recorded sessions can be replayed deterministically
+"""
+import random
+from typing import Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+_random = random.Random()
+
+
+def seed(value: Optional[int]) -> None:
+    """
+    Re-seeds the random source used for colors and ids
+
+    Args:
+        value (Optional[int]): seed value. None seeds from system entropy
+
+    Returns:
+        None
+    """
+    _random.seed(value)
+
+def choice(sequence: Sequence[T]) -> T:
+    """
+    Chooses a random element from the given non-empty sequence
+
+    Args:
+        sequence (Sequence[T]): sequence to choose from
+
+    Returns:
+        T: chosen element
+    """
+    return _random.choice(sequence)
+
+def new_id() -> str:
+    """
+    Generates a new random id in the UUID4 format. Formatted by hand, as importing uuid is slow
+
+    Returns:
+        str: new id
+    """
+    value = _random.getrandbits(128)
+    value = (value & ~(0xc000 << 48)) | (0x8000 << 48)
+    value = (value & ~(0xf000 << 64)) | (4 << 76)
+    digits = f'{value:032x}'
+
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
@@ -92,3 +92,11 @@ class TestMathUtils:
         assert MathUtils.has_collision(rectangle1, rectangles, screen_width, screen_height) is False
         assert MathUtils.has_collision(rectangle2, rectangles, screen_width, screen_height) is True
         assert MathUtils.has_collision(rectangle1, rectangles, screen_width, screen_height, x_offset, y_offset) is True
+
+    def test_has_segment_overlap(self):
+        assert MathUtils.has_segment_overlap(0, 0, 100, 100, 40, 60, 40, 60) is True
+        assert MathUtils.has_segment_overlap(0, 0, 100, 0, 40, 60, 0, 10) is True
+        assert MathUtils.has_segment_overlap(0, 100, 100, 0, 0, 30, 0, 30) is False
+        assert MathUtils.has_segment_overlap(0, 0, 30, 30, 30, 40, 30, 40) is True
+        assert MathUtils.has_segment_overlap(50, 50, 50, 50, 40, 60, 40, 60) is True
+        assert MathUtils.has_segment_overlap(50, 0, 50, 30, 40, 60, 40, 60) is False
@@ -0,0 +1,327 @@
+"""
+Implementation of the scene integrity validator and repair tool.
+
+Usage (from the src folder):
+    python -m validation.SceneValidator DIR [--repair] [--workers N]
+"""
+import argparse
+import json
+import os
+import sys
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from components.MoveableRectangle import MoveableRectangle
+from models.GameModel import GameModel
+from utils import Constants
+from utils.MathUtils import has_border_collision, has_rectangle_overlap, is_rectangle_inside
+
+PARALLEL_THRESHOLD: int = 4096
+CHUNKS_PER_WORKER: int = 4
+
+BoundsEntry = Tuple[int, int, int, int, int]
+
+
+class ValidationReport(NamedTuple):
+    """
+    Result of the scene validation, every list is empty for a valid scene
+
+    Attributes:
+        duplicate_rectangle_ids (List[str]): ids shared by several rectangles
+        out_of_bounds (List[str]): ids of the rectangles outside of the game field
+        overlaps (List[Tuple[str, str]]): id pairs of the overlapping rectangles that are not nested,
+            in the model order
+        broken_links (List[str]): ids of the links with a missing port, with both ends on one rectangle,
+            with a duplicate id or with a port that is already linked
+        duplicate_linked_ports (List[str]): port ids listed more than once in linked_port_ids
+        stale_linked_ports (List[str]): port ids listed in linked_port_ids without a link or linked but not listed
+    """
+    duplicate_rectangle_ids: List[str]
+    out_of_bounds: List[str]
+    overlaps: List[Tuple[str, str]]
+    broken_links: List[str]
+    duplicate_linked_ports: List[str]
+    stale_linked_ports: List[str]
+
+    def is_valid(self) -> bool:
+        """
+        Checks if no problem was found
+
+        Returns:
+            bool: True if the scene is valid. False otherwise
+        """
+        return not any(self)
+
+
+def is_overlapping(left_1: int, right_1: int, top_1: int, bottom_1: int,
+                   left_2: int, right_2: int, top_2: int, bottom_2: int) -> bool:
+    """
+    Checks if the rectangles overlap without one of them being nested in the other
+
+    Args:
+        left_1 (int): left side of the first rectangle
+        right_1 (int): right side of the first rectangle
+        top_1 (int): top side of the first rectangle
+        bottom_1 (int): bottom side of the first rectangle
+        left_2 (int): left side of the second rectangle
+        right_2 (int): right side of the second rectangle
+        top_2 (int): top side of the second rectangle
+        bottom_2 (int): bottom side of the second rectangle
+
+    Returns:
+        bool: True if the rectangles overlap. False otherwise
+    """
+    first, second = (left_1, right_1, top_1, bottom_1), (left_2, right_2, top_2, bottom_2)
+
+    return has_rectangle_overlap(*first, *second) and not is_rectangle_inside(*first, *second) \
+        and not is_rectangle_inside(*second, *first)
+
+def find_overlaps_in_chunk(entries: List[BoundsEntry], count: int) -> List[Tuple[int, int]]:
+    """
+    Sweeps the entries sorted by the left side and finds the overlaps of the first count entries
+    with the entries after them. A rectangle inside another one is nested, not overlapping.
+    Runs in the worker processes
+
+    Args:
+        entries (List[BoundsEntry]): bounds entries sorted by the left side
+        count (int): number of the first entries to find the overlaps of
+
+    Returns:
+        List[Tuple[int, int]]: index pairs of the overlapping rectangles
+    """
+    overlaps = []
+
+    for i in range(count):
+        left, right, top, bottom, index = entries[i]
+
+        for j in range(i + 1, len(entries)):
+            other_left, _, other_top, other_bottom, other_index = entries[j]
+
+            if other_left >= right:
+                break
+            if other_top < bottom and top < other_bottom and \
+                    not is_rectangle_inside(*entries[j][:4], left, right, top, bottom) and \
+                    not is_rectangle_inside(left, right, top, bottom, *entries[j][:4]):
+                overlaps.append((index, other_index))
+
+    return overlaps
+
+def find_overlaps(rectangles: List[MoveableRectangle], workers: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Finds the overlapping rectangles with sort and sweep along the x axis. Large scenes are split into chunks
+    of consecutive entries, and every chunk is sent to a worker process together with the entries its
+    rectangles can reach
+
+    Args:
+        rectangles (List[MoveableRectangle]): rectangles to check
+        workers (Optional[int]): number of worker processes, 0 sweeps in the current process.
+            Default = None - the number of CPUs for scenes of PARALLEL_THRESHOLD rectangles or more
+
+    Returns:
+        List[Tuple[str, str]]: id pairs of the overlapping rectangles, in the model order
+    """
+    entries = sorted((*rect.get_bound_coordinates(), index) for index, rect in enumerate(rectangles))
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(entries) >= PARALLEL_THRESHOLD else 0
+
+    if workers <= 1 or len(entries) < 2:
+        pairs = find_overlaps_in_chunk(entries, len(entries))
+    else:
+        lefts = [entry[0] for entry in entries]
+        chunk_size = -(-len(entries) // (workers * CHUNKS_PER_WORKER))
+        chunks = []
+
+        for start in range(0, len(entries), chunk_size):
+            end = min(start + chunk_size, len(entries))
+            reach = bisect_left(lefts, max(entry[1] for entry in entries[start:end]), end)
+            chunks.append((entries[start:reach], end - start))
+
+        with ProcessPoolExecutor(workers) as executor:
+            pairs = [pair for chunk_pairs in executor.map(find_overlaps_in_chunk, *zip(*chunks))
+                     for pair in chunk_pairs]
+
+    return [(rectangles[first].id, rectangles[second].id)
+            for first, second in sorted((min(pair), max(pair)) for pair in pairs)]
+
+def validate(model: GameModel, workers: Optional[int] = None) -> ValidationReport:
+    """
+    Checks the game model for duplicate ids, rectangles outside of the field, overlapping rectangles,
+    broken links and inconsistent linked port ids
+
+    Args:
+        model (GameModel): game model to check
+        workers (Optional[int]): number of worker processes of the overlap check, see find_overlaps
+
+    Returns:
+        ValidationReport: found problems
+    """
+    rectangle_ids = Counter(rect.id for rect in model.rectangles)
+    port_parents: Dict[str, str] = {port.id: rect.id for rect in model.rectangles for port in rect.ports}
+
+    broken_links = []
+    link_ids: Set[str] = set()
+    linked_ports: Set[str] = set()
+
+    for link in model.links:
+        if (link.id in link_ids or link.src_id not in port_parents or link.dst_id not in port_parents
+                or port_parents[link.src_id] == port_parents[link.dst_id]
+                or link.src_id in linked_ports or link.dst_id in linked_ports):
+            broken_links.append(link.id)
+        else:
+            linked_ports.update((link.src_id, link.dst_id))
+
+        link_ids.add(link.id)
+
+    listed_ports = Counter(model.linked_port_ids)
+    all_linked_ports = {port_id for link in model.links for port_id in (link.src_id, link.dst_id)}
+
+    return ValidationReport(
+        duplicate_rectangle_ids=[rectangle_id for rectangle_id, count in rectangle_ids.items() if count > 1],
+        out_of_bounds=[rect.id for rect in model.rectangles
+                       if has_border_collision(*rect.get_bound_coordinates(), model.field_width, model.field_height)],
+        overlaps=find_overlaps(model.rectangles, workers),
+        broken_links=broken_links,
+        duplicate_linked_ports=[port_id for port_id, count in listed_ports.items() if count > 1],
+        stale_linked_ports=sorted(listed_ports.keys() ^ all_linked_ports),
+    )
+
+def find_free_offset(rectangle: MoveableRectangle, placed: List[MoveableRectangle],
+                     field_width: int, field_height: int) -> Optional[Tuple[int, int]]:
+    """
+    Finds the nearest offset that moves the rectangle into the field without overlapping the placed rectangles,
+    nesting in them or around them is allowed. The rectangle is first clamped into the field, then pushed
+    just outside of every rectangle it overlaps, and at last searched for on the grid
+
+    Args:
+        rectangle (MoveableRectangle): rectangle to place
+        placed (List[MoveableRectangle]): rectangles that stay where they are
+        field_width (int): width of the game field
+        field_height (int): height of the game field
+
+    Returns:
+        Optional[Tuple[int, int]]: offset to move the rectangle by, or None if there is no space left
+    """
+    left, right, top, bottom = rectangle.get_bound_coordinates()
+    width, height = right - left, bottom - top
+    x_coord = min(max(left, 0), field_width - width)
+    y_coord = min(max(top, 0), field_height - height)
+    candidates = [(x_coord, y_coord)]
+
+    for other in placed:
+        other_left, other_right, other_top, other_bottom = other.get_bound_coordinates()
+
+        if other_left < x_coord + width and x_coord < other_right and other_top < y_coord + height \
+                and y_coord < other_bottom:
+            candidates += [(other_left - width, y_coord), (other_right, y_coord),
+                           (x_coord, other_top - height), (x_coord, other_bottom)]
+
+    candidates.sort(key=lambda point: abs(point[0] - left) + abs(point[1] - top))
+    candidates += sorted(((grid_x, grid_y)
+                          for grid_x in range(0, field_width - width + 1, Constants.GRID_SIZE_PX)
+                          for grid_y in range(0, field_height - height + 1, Constants.GRID_SIZE_PX)),
+                         key=lambda point: abs(point[0] - left) + abs(point[1] - top))
+
+    for candidate_x, candidate_y in candidates:
+        x_offset, y_offset = candidate_x - left, candidate_y - top
+
+        # only the placed rectangles count, model.has_collision would also hit the misplaced ones not moved yet
+        if not has_border_collision(left, right, top, bottom, field_width, field_height, x_offset, y_offset) and \
+                not any(is_overlapping(left + x_offset, right + x_offset, top + y_offset, bottom + y_offset,
+                                       *other.get_bound_coordinates()) for other in placed):
+            return x_offset, y_offset
+
+    return None
+
+def repair(model: GameModel, workers: Optional[int] = None) -> ValidationReport:
+    """
+    Repairs the game model through its mutation methods, so an attached journal records the repair:
+    drops the rectangles with a duplicate id, keeping the first one with its links, and the broken links,
+    rebuilds linked_port_ids and nudges the rectangles outside of the field or overlapping other rectangles
+    to the nearest free space
+
+    Args:
+        model (GameModel): game model to repair
+        workers (Optional[int]): number of worker processes of the overlap check, see find_overlaps
+
+    Returns:
+        ValidationReport: problems left after the repair, e.g. rectangles there is no space for
+    """
+    report = validate(model, workers)
+    originals: Dict[str, MoveableRectangle] = {}
+
+    for rectangle in list(model.rectangles):
+        original = originals.setdefault(rectangle.id, rectangle)
+
+        if original is not rectangle:
+            own_port_ids = {port.id for port in rectangle.ports} - {port.id for port in original.ports}
+
+            for link in [link for link in model.links if link.src_id in own_port_ids or link.dst_id in own_port_ids]:
+                model.remove_link(link)
+            model.remove_duplicate_rectangle(rectangle, original)
+
+    model.linked_port_ids = [port_id for link in model.links for port_id in (link.src_id, link.dst_id)]
+
+    for link in [link for link in model.links if link.id in set(report.broken_links)]:
+        if model.selected_link is link:
+            model.selected_link = None
+        model.remove_link(link)
+
+    misplaced = set(report.out_of_bounds)
+
+    for first_id, second_id in report.overlaps:
+        if first_id not in misplaced:
+            misplaced.add(second_id)
+
+    placed = [rect for rect in model.rectangles if rect.id not in misplaced]
+
+    for rectangle in [rect for rect in model.rectangles if rect.id in misplaced]:
+        offset = find_free_offset(rectangle, placed, model.field_width, model.field_height)
+
+        if offset is not None:
+            if offset != (0, 0):
+                model.move_rectangle(rectangle, *offset)
+            placed.append(rectangle)
+
+    model.recalculate_min_field_size()
+
+    return validate(model, workers)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the validator, prints the report of the scene saved by --autosave as JSON
+
+    Args:
+        argv (Optional[List[str]]): command line arguments. Default: sys.argv
+
+    Returns:
+        int: 0 if the scene is valid, 1 otherwise
+    """
+    parser = argparse.ArgumentParser(description='World of Rectangles scene validator')
+    parser.add_argument('directory', help='directory of the scene saved by --autosave')
+    parser.add_argument('--repair', action='store_true', help='repair the scene and save it back')
+    parser.add_argument('--workers', type=int, help='number of processes of the overlap check')
+    args = parser.parse_args(argv)
+
+    # pylint: disable=import-outside-toplevel
+    from persistence.ModelJournal import ModelJournal
+    from persistence.ModelRecovery import load_model
+
+    model, generation = load_model(args.directory)
+    report = validate(model, args.workers)
+
+    if args.repair and not report.is_valid():
+        model.journal = ModelJournal(args.directory, model, generation)
+        report = repair(model, args.workers)
+        model.journal.close()
+
+    print(json.dumps(report._asdict(), indent=2))
+
+    return 0 if report.is_valid() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
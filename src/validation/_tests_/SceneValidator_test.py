@@ -0,0 +1,107 @@
+import random
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.components.MoveableRectangle import MoveableRectangle
+from src.models.GameModel import GameModel
+from src.persistence.ModelJournal import ModelJournal
+from src.persistence.ModelRecovery import load_model
+from src.validation.SceneValidator import find_overlaps, is_overlapping, repair, validate
+
+
+def build_broken_scene():
+    model = GameModel()
+    first = model.try_add_new_rectangle(200, 200)
+    second = model.try_add_new_rectangle(500, 200)
+    third = model.try_add_new_rectangle(200, 500)
+    model.add_rectangle(MoveableRectangle(230, 220, 100, 50))
+    model.add_rectangle(MoveableRectangle(1000, 700, 100, 50))
+
+    model.add_link(first.ports[1], second.ports[3])
+    model.add_link(first.ports[0], first.ports[2])
+    model.add_link(second.ports[0], third.ports[2])
+    model.rectangles.remove(third)
+    model.linked_port_ids.append(first.ports[1].id)
+
+    return model
+
+
+class TestSceneValidator:
+    def test_accepts_valid_scene(self):
+        model = build_scene(32)
+
+        assert validate(model).is_valid()
+        assert validate(GameModel(model)).is_valid()
+
+    def test_reports_problems(self):
+        model = build_broken_scene()
+        report = validate(model)
+
+        assert not report.duplicate_rectangle_ids
+        assert report.out_of_bounds == [model.rectangles[3].id]
+        assert report.overlaps == [(model.rectangles[0].id, model.rectangles[2].id)]
+        assert report.broken_links == [model.links[1].id, model.links[2].id]
+        assert report.duplicate_linked_ports == [model.rectangles[0].ports[1].id]
+        assert not report.stale_linked_ports
+        assert not report.is_valid()
+
+    def test_accepts_nested_rectangles(self):
+        model = GameModel()
+        container = MoveableRectangle(400, 400, 300, 200)
+        model.add_rectangle(container)
+        model.try_add_new_rectangle(330, 350)
+        model.try_add_new_rectangle(470, 450)
+
+        assert validate(model).is_valid()
+
+        model.add_rectangle(MoveableRectangle(580, 400, 100, 50))
+
+        assert validate(model).overlaps == [(container.id, model.rectangles[3].id)]
+
+    def test_parallel_sweep_matches_brute_force(self):
+        generator = random.Random(7)
+        rectangles = [MoveableRectangle(generator.randrange(0, 3000), generator.randrange(0, 3000),
+                                        generator.randrange(10, 120), generator.randrange(10, 120))
+                      for _ in range(1500)]
+        expected = [(first.id, second.id)
+                    for i, first in enumerate(rectangles) for second in rectangles[i + 1:]
+                    if is_overlapping(*first.get_bound_coordinates(), *second.get_bound_coordinates())]
+
+        assert expected
+        assert find_overlaps(rectangles, 0) == expected
+        assert find_overlaps(rectangles, 3) == expected
+
+    def test_repairs_scene(self):
+        model = build_broken_scene()
+        valid_link = model.links[0]
+        report = repair(model)
+
+        assert report.is_valid()
+        assert model.links == [valid_link]
+        assert sorted(model.linked_port_ids) == sorted([valid_link.src_id, valid_link.dst_id])
+
+        for rect in model.rectangles:
+            laid_out = MoveableRectangle(rect.x() + rect.width() / 2, rect.y() + rect.height() / 2,
+                                         rect.width(), rect.height())
+            assert [(port.x(), port.y()) for port in rect.ports] == [(port.x(), port.y()) for port in laid_out.ports]
+
+    def test_repairs_duplicate_rectangle(self, tmp_path):
+        model = GameModel()
+        model.journal = ModelJournal(str(tmp_path), model, flush_interval=0.01)
+        first = model.try_add_new_rectangle(200, 200)
+        second = model.try_add_new_rectangle(500, 200)
+        link = model.add_link(first.ports[1], second.ports[3])
+        duplicate = MoveableRectangle.restore(first.id, first.color, first.x(), first.y(), first.width(),
+                                              first.height(), [port.id for port in first.ports])
+        model.add_rectangle(duplicate)
+
+        assert validate(model).duplicate_rectangle_ids == [first.id]
+        assert repair(model).is_valid()
+        assert [id(rect) for rect in model.rectangles] == [id(first), id(second)]
+        assert model.links == [link] and link.src is first.ports[1]
+        assert model.ports_by_id[first.ports[1].id] is first.ports[1]
+
+        model.journal.close()
+        restored, _ = load_model(str(tmp_path))
+
+        assert [rect.id for rect in restored.rectangles] == [first.id, second.id]
+        assert [restored_link.id for restored_link in restored.links] == [link.id]
@@ -0,0 +1,163 @@
+"""
+Implementation of the QGraphicsView based game view
+"""
+from typing import Optional, TYPE_CHECKING
+
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtGui import QMouseEvent, QPainter, QResizeEvent
+from PyQt6.QtWidgets import QFrame, QGraphicsView
+
+from controllers.GameController import GameController
+from models.GameModel import GameModel
+from utils import Constants
+from widgets.GameScene import GameScene
+
+if TYPE_CHECKING:
+    from recording.InputRecorder import InputRecorder
+
+
+class GameGraphicsView(QGraphicsView):
+    """
+    The GameGraphicsView, child of QGraphicsView class, alternative to the GameWidget that shows the game
+    through a GameScene. Input is forwarded to the same GameController, so the game rules are shared,
+    and only the items affected by a change are re-painted
+
+    Args:
+        model (GameModel): GameModel object with game data
+        recorder (Optional[InputRecorder]): recorder to log input events to. Default = None
+
+    Attributes:
+        model (GameModel): GameModel object to hold game data
+        controller (GameController): GameController object that handles user input
+        game_scene (GameScene): scene that mirrors the game model
+        recorder (Optional[InputRecorder]): recorder to log input events to
+    """
+
+    def __init__(self, model: GameModel, recorder: Optional['InputRecorder'] = None):
+        self.game_scene = GameScene(model)
+        super().__init__(self.game_scene)
+
+        self.model = model
+        self.controller = GameController(model)
+        self.recorder = recorder
+        model.changes.schedule = lambda flush: QTimer.singleShot(0, flush)
+        self.init_ui()
+
+    def init_ui(self):
+        """
+        Initializes the game view object
+
+        Returns:
+            None
+        """
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+
+        self.setGeometry(self.model.window_x, self.model.window_y, self.model.field_width, self.model.field_height)
+        self.setMaximumSize(*Constants.SCREEN_SIZE_MAX_PX)
+        self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+        self.setMouseTracking(True)
+        self.viewport().setMouseTracking(True)
+        self.setWindowTitle('World of Rectangles')
+
+    def mouseMoveEvent(self, event: Optional[QMouseEvent]) -> None:
+        """
+        Handles the mouse movement logic
+
+        Args:
+            event (QMouseEvent): event data
+
+        Returns:
+            None
+        """
+        if not event:
+            return
+
+        if self.recorder:
+            self.recorder.record_move(event.pos().x(), event.pos().y())
+
+        if self.controller.move(event.pos().x(), event.pos().y()):
+            self.game_scene.sync()
+
+    def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
+        """
+        Handles the mouse press logic
+
+        Args:
+            event (QMouseEvent): event data
+
+        Returns:
+            None
+        """
+        if event is None:
+            return
+
+        if self.recorder:
+            self.recorder.record_press(event.pos().x(), event.pos().y())
+
+        if self.controller.press(event.pos().x(), event.pos().y()):
+            self.game_scene.sync()
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        """
+        Handles the mouse double click logic
+
+        Args:
+            event (QMouseEvent): event data
+
+        Returns:
+            None
+        """
+        if not event:
+            return
+
+        if self.recorder:
+            self.recorder.record_double_click(event.pos().x(), event.pos().y())
+
+        if self.controller.double_click(event.pos().x(), event.pos().y()):
+            self.game_scene.sync()
+
+    def mouseReleaseEvent(self, event: Optional[QMouseEvent]) -> None:
+        """
+        Handles the mouse release logic
+
+        Args:
+            event (QMouseEvent): event data
+
+        Returns:
+            None
+        """
+        if not event:
+            return
+
+        if self.recorder:
+            self.recorder.record_release(event.pos().x(), event.pos().y())
+
+        if self.controller.release():
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+            self.game_scene.sync()
+
+    def resizeEvent(self, event: Optional[QResizeEvent]) -> None:
+        """
+        Handles the window resize logic
+
+        Args:
+            event (QResizeEvent): event data
+
+        Returns:
+            None
+        """
+        super().resizeEvent(event)
+
+        if self.recorder:
+            self.recorder.record_resize(self.width(), self.height())
+
+        if self.controller.resize(self.width(), self.height()):
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+
+        self.game_scene.sync()
@@ -0,0 +1,487 @@
+"""
+Implementation of the QGraphicsScene mirror of the game model
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import QLineF
+from PyQt6.QtGui import QPainter
+from PyQt6.QtWidgets import (QGraphicsScene, QGraphicsItem, QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsLineItem,
+                             QStyleOptionGraphicsItem, QWidget)
+
+from components.Link import Link
+from components.MoveableRectangle import MoveableRectangle
+from components.Port import Port
+from models.ChangeBus import LINK_MOVED, RECTANGLE_MOVED, RECTANGLE_RELABELED, RECTANGLE_RESIZED, ChangeEvent
+from models.GameModel import GameModel
+from rendering.LabelCache import LabelCache
+from utils import Constants
+from utils.PainterUtils import get_color, get_pen, get_link_pen, get_selection_box_pen
+
+FIELD_Z: float = -1
+RECTANGLE_Z_STEP: float = 1 / 1024
+LINK_Z: float = 1
+BUTTON_Z: float = 2
+
+
+class PortItem(QGraphicsEllipseItem):
+    """
+    The PortItem, child of QGraphicsEllipseItem class, that draws a Port. It is a child item of the
+    RectangleItem, so it moves together with its rectangle without being updated
+
+    Args:
+        port (Port): port to draw
+        parent (RectangleItem): item of the parent rectangle
+
+    Attributes:
+        port (Port): port to draw
+    """
+    def __init__(self, port: Port, parent: 'RectangleItem'):
+        super().__init__(0, 0, port.radius, port.radius, parent)
+
+        self.port = port
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.setPen(get_pen(Constants.SELECTED_ELEMENT_COLOR))
+        self.setVisible(False)
+
+    def refresh(self, is_visible: bool, brush_color: str) -> None:
+        """
+        Updates the item from the port. Unchanged values do not trigger a repaint
+
+        Args:
+            is_visible (bool): flag to check if the port is drawn
+            brush_color (str): color name of the port
+
+        Returns:
+            None
+        """
+        parent_rectangle = self.parentItem().rectangle
+        self.setPos(self.port.x() - parent_rectangle.x(), self.port.y() - parent_rectangle.y())
+        self.setBrush(get_color(brush_color))
+        self.setVisible(is_visible)
+
+
+class RectangleItem(QGraphicsRectItem):
+    """
+    The RectangleItem, child of QGraphicsRectItem class, that draws a MoveableRectangle with its ports
+    and the resize handle shown while it is selected
+
+    Args:
+        rectangle (MoveableRectangle): rectangle to draw
+        labels (LabelCache): cache of the laid out labels shared by the items of the scene
+
+    Attributes:
+        rectangle (MoveableRectangle): rectangle to draw
+        labels (LabelCache): cache of the laid out labels shared by the items of the scene
+        label (str): label the item was painted with
+        handle_item (QGraphicsRectItem): item of the resize handle in the bottom right corner
+        port_items (List[PortItem]): items of the rectangle ports
+    """
+    def __init__(self, rectangle: MoveableRectangle, labels: LabelCache):
+        super().__init__(0, 0, rectangle.width(), rectangle.height())
+
+        self.rectangle = rectangle
+        self.labels = labels
+        self.label = rectangle.label
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.setBrush(get_color(rectangle.color))
+
+        self.handle_item = QGraphicsRectItem(0, 0, Constants.RESIZE_HANDLE_PX, Constants.RESIZE_HANDLE_PX, self)
+        self.handle_item.setPen(get_pen(Constants.SELECTED_ELEMENT_COLOR))
+        self.handle_item.setBrush(get_color(Constants.SELECTED_ELEMENT_COLOR))
+        self.handle_item.setVisible(False)
+
+        self.port_items: List[PortItem] = [PortItem(port, self) for port in rectangle.ports]
+
+    def refresh(self, x_offset: int, y_offset: int, is_selected: bool, depth: int,
+                is_box_selected: bool = False) -> None:
+        """
+        Updates the item from the rectangle. Unchanged values do not trigger a repaint
+
+        Args:
+            x_offset (int): x offset of the dragged rectangle
+            y_offset (int): y offset of the dragged rectangle
+            is_selected (bool): flag to check if rectangle is selected
+            depth (int): number of the containers of the rectangle, deeper rectangles are drawn on top
+            is_box_selected (bool): flag to check if rectangle is selected with the selection box. Default: False
+
+        Returns:
+            None
+        """
+        self.setPos(self.rectangle.x() + x_offset, self.rectangle.y() + y_offset)
+        self.setRect(0, 0, self.rectangle.width(), self.rectangle.height())
+        self.setZValue(depth * RECTANGLE_Z_STEP)
+        self.setPen(get_pen(Constants.SELECTED_RECTANGLE_BORDER_COLOR if is_selected or is_box_selected
+                            else self.rectangle.color))
+        self.handle_item.setPos(self.rectangle.width() - Constants.RESIZE_HANDLE_PX,
+                                self.rectangle.height() - Constants.RESIZE_HANDLE_PX)
+        self.handle_item.setVisible(is_selected)
+
+        if self.label != self.rectangle.label:
+            self.label = self.rectangle.label
+            self.update()
+
+    def paint(self, painter: Optional[QPainter], option: Optional[QStyleOptionGraphicsItem],
+              widget: Optional[QWidget] = None) -> None:
+        """
+        Paints the rectangle and its label, the label is skipped when the view is zoomed out too far to read it
+
+        Args:
+            painter (QPainter): QPainter instance
+            option (QStyleOptionGraphicsItem): style options of the item
+            widget (Optional[QWidget]): widget the item is painted on. Default = None
+
+        Returns:
+            None
+        """
+        super().paint(painter, option, widget)
+
+        if painter:
+            self.labels.draw(painter, 0, 0, self.rectangle.width(), self.rectangle.height(), self.label)
+
+
+class LinkItem(QGraphicsLineItem):
+    """
+    The LinkItem, child of QGraphicsLineItem class, that draws a Link. Links are not cached,
+    as their bounding boxes are large and change whenever one of the ends moves
+
+    Args:
+        link (Link): link to draw
+
+    Attributes:
+        link (Link): link to draw
+    """
+    def __init__(self, link: Link):
+        super().__init__()
+
+        self.link = link
+        self.setZValue(LINK_Z)
+
+    def refresh(self, src_offset: Tuple[int, int], dst_offset: Tuple[int, int], is_selected: bool) -> None:
+        """
+        Updates the item from the link. Unchanged values do not trigger a repaint
+
+        Args:
+            src_offset (Tuple[int, int]): (x, y) offset of the source end
+            dst_offset (Tuple[int, int]): (x, y) offset of the destination end
+            is_selected (bool): flag to check if link is selected
+
+        Returns:
+            None
+        """
+        self.setLine(QLineF(self.link.x1() + src_offset[0], self.link.y1() + src_offset[1],
+                            self.link.x2() + dst_offset[0], self.link.y2() + dst_offset[1]))
+        self.setPen(get_link_pen(is_selected))
+
+
+class GameScene(QGraphicsScene):
+    """
+    The GameScene, child of QGraphicsScene class, that mirrors the GameModel into graphics items.
+    Items are indexed with a BSP tree and sync() only touches the items affected by the last change,
+    so the view re-paints only the regions of the moved items
+
+    Args:
+        model (GameModel): GameModel object with game data
+
+    Attributes:
+        model (GameModel): GameModel object to mirror
+        field_item (QGraphicsRectItem): item of the game field
+        rectangle_items (Dict[str, RectangleItem]): rectangle items by rectangle id
+        link_items (Dict[str, LinkItem]): link items by link id
+        port_parents (Dict[str, str]): rectangle ids by port id
+        rectangle_links (Dict[str, Set[str]]): ids of the links attached to the rectangle by rectangle id
+        drag_link_item (QGraphicsLineItem): item of the link being dragged
+        delete_button_item (QGraphicsEllipseItem): item of the delete button of the selected link
+        selection_box_item (QGraphicsRectItem): item of the rubber-band selection box
+        shown_state (tuple): selected rectangle id, selected port, hovered port and selected link at the last sync
+        shown_selection (Tuple[Set[str], Set[str]]): ids of the rectangles and links selected with the selection box
+            at the last sync
+        changed_ids (Set[str]): ids of the rectangles and links the game model reported moved since the last sync
+        labels (LabelCache): cache of the laid out rectangle labels
+    """
+    def __init__(self, model: GameModel):
+        super().__init__()
+
+        self.model = model
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+
+        self.field_item = QGraphicsRectItem()
+        self.field_item.setZValue(FIELD_Z)
+        self.field_item.setBrush(get_color(Constants.SCREEN_COLOR))
+        self.field_item.setPen(get_pen(Constants.BORDER_COLOR))
+        self.addItem(self.field_item)
+
+        self.rectangle_items: Dict[str, RectangleItem] = {}
+        self.link_items: Dict[str, LinkItem] = {}
+        self.port_parents: Dict[str, str] = {}
+        self.rectangle_links: Dict[str, Set[str]] = {}
+
+        self.drag_link_item = QGraphicsLineItem()
+        self.drag_link_item.setZValue(LINK_Z)
+        self.drag_link_item.setPen(get_link_pen(False))
+        self.drag_link_item.setVisible(False)
+        self.addItem(self.drag_link_item)
+
+        self.delete_button_item = QGraphicsEllipseItem(0, 0, Constants.CIRCLE_RADIUS_PX, Constants.CIRCLE_RADIUS_PX)
+        self.delete_button_item.setZValue(BUTTON_Z)
+        self.delete_button_item.setBrush(get_color(Constants.DELETE_COLOR))
+        self.delete_button_item.setPen(get_pen(Constants.DELETE_COLOR))
+        self.delete_button_item.setVisible(False)
+        self.addItem(self.delete_button_item)
+
+        self.selection_box_item = QGraphicsRectItem()
+        self.selection_box_item.setZValue(BUTTON_Z)
+        self.selection_box_item.setPen(get_selection_box_pen())
+        self.selection_box_item.setVisible(False)
+        self.addItem(self.selection_box_item)
+
+        self.shown_state: tuple = (None, None, None, None)
+        self.shown_selection: Tuple[Set[str], Set[str]] = (set(), set())
+        self.changed_ids: Set[str] = set()
+        self.labels = LabelCache()
+        self.sync(True)
+
+        model.changes.subscribe(self.handle_changes,
+                                {RECTANGLE_MOVED, RECTANGLE_RESIZED, RECTANGLE_RELABELED, LINK_MOVED})
+
+    def handle_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Refreshes the items of the rectangles and links that were moved or relabeled,
+        e.g. by another client of a shared scene
+
+        Args:
+            events (List[ChangeEvent]): move, resize and relabel events
+
+        Returns:
+            None
+        """
+        self.changed_ids.update(event.item.id for event in events)
+        self.sync()
+
+    def find_rectangle_id(self, rectangle: Optional[MoveableRectangle]) -> Optional[str]:
+        """
+        Finds the id of the mirrored rectangle equal to the given one
+
+        Args:
+            rectangle (Optional[MoveableRectangle]): rectangle to find
+
+        Returns:
+            Optional[str]: id of the mirrored rectangle. None if there is no such rectangle
+        """
+        if rectangle is None:
+            return None
+
+        if rectangle.id in self.rectangle_items:
+            return rectangle.id
+
+        return next((item_id for item_id, item in self.rectangle_items.items() if item.rectangle == rectangle), None)
+
+    def sync_rectangles(self) -> Set[str]:
+        """
+        Adds and removes rectangle items to match the model
+
+        Returns:
+            Set[str]: ids of the added rectangles
+        """
+        added = set()
+
+        if len(self.model.rectangles) == len(self.rectangle_items) and all(
+                rectangle.id in self.rectangle_items for rectangle in self.model.rectangles[-1:]):
+            return added
+
+        model_ids = {rectangle.id for rectangle in self.model.rectangles}
+
+        for rectangle_id in [item_id for item_id in self.rectangle_items if item_id not in model_ids]:
+            item = self.rectangle_items.pop(rectangle_id)
+            for port_item in item.port_items:
+                self.port_parents.pop(port_item.port.id, None)
+            self.rectangle_links.pop(rectangle_id, None)
+            self.removeItem(item)
+
+        for rectangle in self.model.rectangles:
+            if rectangle.id in self.rectangle_items:
+                continue
+
+            item = RectangleItem(rectangle, self.labels)
+            self.addItem(item)
+            self.rectangle_items[rectangle.id] = item
+            self.rectangle_links.setdefault(rectangle.id, set())
+            for port in rectangle.ports:
+                self.port_parents[port.id] = rectangle.id
+            added.add(rectangle.id)
+
+        return added
+
+    def sync_links(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Adds and removes link items to match the model
+
+        Returns:
+            Tuple[Set[str], Set[str]]: ids of the added links and ids of the rectangles whose ports were linked
+            or released
+        """
+        added = set()
+        touched_rectangles = set()
+
+        if len(self.model.links) == len(self.link_items) and all(
+                link.id in self.link_items for link in self.model.links[-1:]):
+            return added, touched_rectangles
+
+        model_ids = {link.id for link in self.model.links}
+
+        for link_id in [item_id for item_id in self.link_items if item_id not in model_ids]:
+            item = self.link_items.pop(link_id)
+            for port_id in (item.link.src_id, item.link.dst_id):
+                if port_id in self.port_parents:
+                    self.rectangle_links[self.port_parents[port_id]].discard(link_id)
+                    touched_rectangles.add(self.port_parents[port_id])
+            self.removeItem(item)
+
+        for link in self.model.links:
+            if link.id in self.link_items:
+                continue
+
+            item = LinkItem(link)
+            self.addItem(item)
+            self.link_items[link.id] = item
+            for port_id in (link.src_id, link.dst_id):
+                if port_id in self.port_parents:
+                    self.rectangle_links[self.port_parents[port_id]].add(link.id)
+                    touched_rectangles.add(self.port_parents[port_id])
+            added.add(link.id)
+
+        return added, touched_rectangles
+
+    def refresh_rectangle(self, rectangle_id: str, selected_id: Optional[str], dragged_ids: Set[str],
+                          linked_port_ids: Set[str]) -> None:
+        """
+        Updates the rectangle item and its port items from the model interaction state
+
+        Args:
+            rectangle_id (str): id of the rectangle to refresh
+            selected_id (Optional[str]): id of the selected rectangle
+            dragged_ids (Set[str]): ids of the selected rectangle and its descendants while it is dragged
+            linked_port_ids (Set[str]): ids of the linked ports
+
+        Returns:
+            None
+        """
+        model = self.model
+        item = self.rectangle_items[rectangle_id]
+        is_selected = rectangle_id == selected_id
+        is_dragged = rectangle_id in dragged_ids
+
+        item.refresh(model.x2 if is_dragged else 0, model.y2 if is_dragged else 0, is_selected,
+                     model.get_depth(item.rectangle), rectangle_id in model.selected_rectangle_ids)
+
+        ports_visible = is_selected or model.selected_port is not None
+        selected_ports = model.selected_rectangle.ports if model.selected_rectangle else []
+
+        for port_item in item.port_items:
+            port = port_item.port
+            is_hovered = port == model.hovered_port and model.selected_port != model.hovered_port
+            brush_color = port.color
+
+            if port == model.selected_port:
+                brush_color = Constants.SELECTED_ELEMENT_COLOR
+            if is_hovered:
+                brush_color = Constants.AVAILABLE_COLOR
+            if is_hovered and model.hovered_port in selected_ports:
+                brush_color = Constants.UNAVAILABLE_COLOR
+
+            port_item.refresh(ports_visible and port.id not in linked_port_ids, brush_color)
+
+    def refresh_link(self, link_id: str, selected_rectangle_ports: Set[str]) -> None:
+        """
+        Updates the link item from the model interaction state
+
+        Args:
+            link_id (str): id of the link to refresh
+            selected_rectangle_ports (Set[str]): ids of the dragged rectangle ports
+
+        Returns:
+            None
+        """
+        model = self.model
+        item = self.link_items[link_id]
+        offset = (model.x2, model.y2)
+
+        item.refresh(offset if item.link.src_id in selected_rectangle_ports else (0, 0),
+                     offset if item.link.dst_id in selected_rectangle_ports else (0, 0),
+                     model.selected_link == item.link or link_id in model.selected_link_ids)
+
+    def sync(self, full: bool = False) -> None:
+        """
+        Updates the scene items after the model was changed
+
+        Args:
+            full (bool): flag to refresh every item instead of the affected ones. Default = False
+
+        Returns:
+            None
+        """
+        model = self.model
+
+        if (self.sceneRect().width(), self.sceneRect().height()) != (model.field_width, model.field_height):
+            self.setSceneRect(0, 0, model.field_width, model.field_height)
+            self.field_item.setRect(0, 0, model.field_width, model.field_height)
+
+        dirty_rectangles = self.sync_rectangles()
+        dirty_links, linked_rectangles = self.sync_links()
+        dirty_rectangles.update(linked_rectangles)
+
+        selected_id = self.find_rectangle_id(model.selected_rectangle)
+        dragged = model.get_dragged_rectangles()
+        dragged_ids = {rectangle.id for rectangle in dragged} | ({selected_id} if selected_id and dragged else set())
+        shown_selected_id, shown_selected_port, shown_hovered_port, shown_selected_link = self.shown_state
+
+        if full or (model.selected_port is None) != (shown_selected_port is None):
+            dirty_rectangles = set(self.rectangle_items)
+        else:
+            dirty_rectangles.update(item_id for item_id in (selected_id, shown_selected_id) if item_id)
+            dirty_rectangles.update(rectangle.id for rectangle in dragged if rectangle.id in self.rectangle_items)
+            for port in (model.hovered_port, shown_hovered_port, model.selected_port, shown_selected_port):
+                if port is not None and port.parent_id in self.rectangle_items:
+                    dirty_rectangles.add(port.parent_id)
+            dirty_rectangles.update(rectangle_id for rectangle_id in
+                                    model.selected_rectangle_ids ^ self.shown_selection[0]
+                                    if rectangle_id in self.rectangle_items)
+            dirty_rectangles.update(item_id for item_id in self.changed_ids if item_id in self.rectangle_items)
+
+        if full:
+            dirty_links = set(self.link_items)
+        else:
+            for rectangle_id in dirty_rectangles:
+                dirty_links.update(self.rectangle_links.get(rectangle_id, ()))
+            for link in (model.selected_link, shown_selected_link):
+                if link is not None and link.id in self.link_items:
+                    dirty_links.add(link.id)
+            dirty_links.update(link_id for link_id in model.selected_link_ids ^ self.shown_selection[1]
+                               if link_id in self.link_items)
+            dirty_links.update(item_id for item_id in self.changed_ids if item_id in self.link_items)
+
+        linked_port_ids = set(model.linked_port_ids)
+        for rectangle_id in dirty_rectangles:
+            self.refresh_rectangle(rectangle_id, selected_id, dragged_ids, linked_port_ids)
+
+        selected_rectangle_ports = {port.id for rectangle in dragged for port in rectangle.ports}
+        for link_id in dirty_links:
+            self.refresh_link(link_id, selected_rectangle_ports)
+
+        self.drag_link_item.setVisible(model.is_dragging_link)
+        if model.is_dragging_link:
+            self.drag_link_item.setLine(QLineF(model.x1, model.y1, model.x1 + model.x2, model.y1 + model.y2))
+
+        self.delete_button_item.setVisible(model.selected_link is not None)
+        if model.selected_link is not None:
+            center = model.selected_link.center()
+            self.delete_button_item.setPos(int(center.x() - Constants.CIRCLE_RADIUS_PX / 2),
+                                           int(center.y() - Constants.CIRCLE_RADIUS_PX / 2))
+
+        self.selection_box_item.setVisible(model.selection_box is not None)
+        if model.selection_box is not None:
+            left, top, right, bottom = model.selection_box
+            self.selection_box_item.setRect(left, top, right - left, bottom - top)
+
+        self.shown_state = (selected_id, model.selected_port, model.hovered_port, model.selected_link)
+        self.shown_selection = (model.selected_rectangle_ids, model.selected_link_ids)
+        self.changed_ids.clear()
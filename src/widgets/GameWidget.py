@@ -1,33 +1,81 @@
 """
 Implementation of the main game widget
 """
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
-from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QMouseEvent, QResizeEvent
+from PyQt6.QtWidgets import QApplication, QInputDialog, QWidget
+from PyQt6.QtCore import QEvent, QMimeData, QTimer, Qt
+from PyQt6.QtGui import QCursor, QKeySequence, QPainter, QKeyEvent, QMouseEvent, QResizeEvent
 
-from components.Link import Link
-from components.MoveableRectangle import MoveableRectangle
+from controllers.GameController import GameController
+from models.ChangeBus import ChangeEvent
 from models.GameModel import GameModel
-from utils import Constants, PainterUtils
-from utils.MathUtils import has_collision, is_point_in_circle
+from models.Subgraph import SUBGRAPH_MIME_TYPE
+from rendering.ScenePainter import ScenePainter
+from utils import Constants
+
+if TYPE_CHECKING:
+    from diagnostics.SamplingProfiler import SamplingProfiler
+    from models.ShardedWorld import ShardedWorld
+    from network.SyncBridge import SyncBridge
+    from recording.InputRecorder import InputRecorder
+    from rendering.TiledRenderer import TiledRenderer
+
+PAN_OFFSETS: Dict[Qt.Key, Tuple[int, int]] = {
+    Qt.Key.Key_Left: (-Constants.PAN_STEP_PX, 0),
+    Qt.Key.Key_Right: (Constants.PAN_STEP_PX, 0),
+    Qt.Key.Key_Up: (0, -Constants.PAN_STEP_PX),
+    Qt.Key.Key_Down: (0, Constants.PAN_STEP_PX),
+}
 
 
 class GameWidget(QWidget):
     """
-    The GameWidget, child of QWidget class, that implements the main game logic
+    The GameWidget, child of QWidget class, that paints the game and forwards Qt input events
+    to the GameController, which implements the main game logic
 
     Args:
         model (GameModel): GameModel object with game data
+        recorder (Optional[InputRecorder]): recorder to log input events to. Default = None
+        tiled (bool): paint the static objects from tiles rendered in parallel. Default = False
+        sync (Optional[SyncBridge]): connection to the scene sync server. Default = None
+        world (Optional[ShardedWorld]): sharded world the game field is a view of. Default = None
 
     Attributes:
         model (GameModel): GameModel object to hold game data
+        controller (GameController): GameController object that handles user input
+        recorder (Optional[InputRecorder]): recorder to log input events to
+        tiled_renderer (Optional[TiledRenderer]): renderer of the cached static tiles, None if tiling is off
+        sync (Optional[SyncBridge]): connection to the scene sync server
+        world (Optional[ShardedWorld]): sharded world the game field is a view of
+        painter (ScenePainter): painter of the scene, its link path cache is also used by the game model
+            to hit-test curved links
+        profiler (Optional[SamplingProfiler]): profiler of the event handlers, None until the first capture
     """
 
-    def __init__(self, model: GameModel):
+    def __init__(self, model: GameModel, recorder: Optional['InputRecorder'] = None, tiled: bool = False,
+                 sync: Optional['SyncBridge'] = None, world: Optional['ShardedWorld'] = None):
         super().__init__()
 
         self.model = model
+        self.controller = GameController(model)
+        self.recorder = recorder
+        self.tiled_renderer: Optional['TiledRenderer'] = None
+        self.sync = sync
+        self.world = world
+        self.painter = ScenePainter(model)
+        self.profiler: Optional['SamplingProfiler'] = None
+        model.link_paths = self.painter.link_paths
+        model.changes.schedule = lambda flush: QTimer.singleShot(0, flush)
+        model.changes.subscribe(self.handle_model_changes)
+
+        if sync:
+            sync.updated.connect(self.handle_sync_update)
+
+        if tiled:
+            from rendering.TiledRenderer import TiledRenderer  # pylint: disable=import-outside-toplevel
+            self.tiled_renderer = TiledRenderer(model)
+
         self.init_ui()
 
     def init_ui(self):
@@ -41,8 +89,49 @@ class GameWidget(QWidget):
         self.setMaximumSize(*Constants.SCREEN_SIZE_MAX_PX)
         self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
         self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.setWindowTitle('World of Rectangles')
 
+    def event(self, event: Optional[QEvent]) -> bool:
+        """
+        Dispatches the event to its handler, inside of the measured section of the profiler while it captures
+
+        Args:
+            event (QEvent): event data
+
+        Returns:
+            (bool): True if the event was recognized. False otherwise
+        """
+        if self.profiler is None or not self.profiler.is_capturing:
+            return super().event(event)
+
+        with self.profiler.measure():
+            return super().event(event)
+
+    def toggle_profiling(self) -> Optional[str]:
+        """
+        Starts the capture of the event handler profile, or stops it and writes the collapsed stacks,
+        see get_profile_path
+
+        Returns:
+            (Optional[str]): path the profile was written to, None if the capture was started
+        """
+        # pylint: disable=import-outside-toplevel
+        from diagnostics.SamplingProfiler import SamplingProfiler, get_profile_path
+
+        if self.profiler is None:
+            self.profiler = SamplingProfiler()
+
+        if not self.profiler.is_capturing:
+            self.profiler.start()
+            return None
+
+        self.profiler.stop()
+        path = get_profile_path()
+        self.profiler.write(path)
+
+        return path
+
     def mouseMoveEvent(self, event: Optional[QMouseEvent]) -> None:
         """
         Handles the mouse movement logic
@@ -56,359 +145,349 @@ class GameWidget(QWidget):
         if not event:
             return
 
-        if self.model.x1 > 0:
-            new_x2 = event.pos().x() - self.model.x1
-            new_y2 = event.pos().y() - self.model.y1
-
-            if self.model.is_dragging_link:
-                self.model.hovered_port = (
-                    self.model.find_selected_port(event.pos().x(), event.pos().y(), True))
-
-                self.model.x2 = new_x2
-                self.model.y2 = new_y2
-            else:
-                if not has_collision(self.model.selected_rectangle, self.model.rectangles,
-                                     self.model.field_width, self.model.field_height, new_x2, new_y2):
-                    self.model.x2 = new_x2
-                    self.model.y2 = new_y2
+        if self.recorder:
+            self.recorder.record_move(event.pos().x(), event.pos().y())
 
+        if self.controller.move(event.pos().x(), event.pos().y()):
+            if self.sync:
+                self.sync.send_drag()
             self.update()
 
-    def handle_delete_link_button_pressed(self) -> bool:
+    def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
         """
-        Handles the case when user pressed delete link button
+        Handles the mouse press logic
+
+        Args:
+            event (QMouseEvent): event data
 
         Returns:
-            (bool): True if delete button was pressed and press event is handled. False otherwise
-        """
-        if (self.model.selected_link and is_point_in_circle(
-                self.model.selected_link.center().x(),
-                self.model.selected_link.center().y(),
-                self.model.x1,
-                self.model.y1)
-        ):
-            self.model.links.remove(self.model.selected_link)
-            self.model.linked_port_ids.remove(self.model.selected_link.src_id)
-            self.model.linked_port_ids.remove(self.model.selected_link.dst_id)
-            self.model.selected_link = None
-            self.update()
-            return True
+            None
+        """
+        if event is None:
+            return
+
+        if self.recorder:
+            self.recorder.record_press(event.pos().x(), event.pos().y())
 
-        return False
+        if self.controller.press(event.pos().x(), event.pos().y()):
+            self.update()
 
-    def handle_link_pressed(self) -> bool:
+    def mouseDoubleClickEvent(self, event) -> None:
         """
-        Handles the case when user pressed link object
+        Handles the mouse double click logic
+
+        Args:
+            event (QMouseEvent): event data
 
         Returns:
-            (bool): True if link was pressed and press event is handled. False otherwise
+            None
         """
-        self.model.selected_link = self.model.find_selected_link(self.model.x1, self.model.y1)
+        if not event:
+            return
 
-        if self.model.selected_link is not None:
-            self.model.selected_port = None
-            self.model.selected_rectangle = None
-            self.model.is_dragging_link = False
+        if self.recorder:
+            self.recorder.record_double_click(event.pos().x(), event.pos().y())
 
+        if self.controller.double_click(event.pos().x(), event.pos().y()):
             self.update()
-            return True
 
-        return False
-
-    def handle_port_pressed(self) -> bool:
+    def mouseReleaseEvent(self, event: Optional[QMouseEvent]) -> None:
         """
-        Handles the case when user pressed port object
+        Handles the mouse release logic
+
+        Args:
+            event (QMouseEvent): event data
 
         Returns:
-            (bool): True if port was pressed and press event is handled. False otherwise
+            None
         """
-        self.model.selected_port = self.model.find_selected_port(self.model.x1, self.model.y1)
+        if not event:
+            return
 
-        if (self.model.selected_port is not None
-                and self.model.selected_port.id not in self.model.linked_port_ids):
-            self.update()
-            self.model.is_dragging_link = True
-            return True
+        if self.recorder:
+            self.recorder.record_release(event.pos().x(), event.pos().y())
 
-        self.model.selected_port = None
-        return False
+        if self.controller.release():
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+            self.update()
 
-    def handle_moveable_rectangle_pressed(self) -> bool:
+    def keyPressEvent(self, event: Optional[QKeyEvent]) -> None:
         """
-        Handles the case when user pressed moveable rectangle object
+        Handles the key press logic: the copy and paste shortcuts copy the selection to the clipboard and paste it
+        at the cursor, G toggles snapping to the grid, A toggles snapping to alignment guides, C toggles curved links,
+        K toggles the compaction of the rectangles when the window shrinks, P toggles pushing the rectangles in the way
+        of the dragged one, F2 edits the label of the selected rectangle, F9 starts and stops the profiler,
+        arrows move the view over the sharded world
+
+        Args:
+            event (QKeyEvent): event data
 
         Returns:
-            (bool): True if moveable rectangle was pressed and press event is handled. False otherwise
+            None
         """
-        self.model.selected_rectangle = self.model.find_selected_rectangle(self.model.x1, self.model.y1)
+        if not event:
+            return
 
-        if self.model.selected_rectangle is not None:
+        if event.matches(QKeySequence.StandardKey.Copy):
+            self.copy_selection()
+        elif event.matches(QKeySequence.StandardKey.Paste):
+            self.paste_selection()
+        elif event.key() == Qt.Key.Key_G:
+            self.set_snapping(not self.model.is_grid_snap_enabled, self.model.is_guide_snap_enabled)
+        elif event.key() == Qt.Key.Key_A:
+            self.set_snapping(self.model.is_grid_snap_enabled, not self.model.is_guide_snap_enabled)
+        elif event.key() == Qt.Key.Key_C:
+            self.set_curved_links(not self.model.is_curved_links_enabled)
+        elif event.key() == Qt.Key.Key_K:
+            self.set_compaction(not self.model.is_compaction_enabled)
+        elif event.key() == Qt.Key.Key_P:
+            self.set_push(not self.model.is_push_enabled)
+        elif event.key() == Qt.Key.Key_F2:
+            self.edit_label()
+        elif event.key() == Qt.Key.Key_F9:
+            path = self.toggle_profiling()
+            self.window().setWindowTitle('World of Rectangles' + (f' - profile written to {path}' if path else
+                                                                  ' - profiling'))
+        elif self.world and event.key() in PAN_OFFSETS and self.model.x1 <= 0:
+            self.world.move_view(*PAN_OFFSETS[event.key()])
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
             self.update()
-            return True
+        else:
+            super().keyPressEvent(event)
 
-        return False
-
-    def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
+    def jump_to(self, x_coord: int, y_coord: int) -> bool:
         """
-        Handles the mouse press logic
+        Moves the view over the sharded world so the point is in the center of the game field
 
         Args:
-            event (QMouseEvent): event data
+            x_coord (int): x coordinate of the point in the game field coordinates
+            y_coord (int): y coordinate of the point in the game field coordinates
+
+        Returns:
+            (bool): True if the view moved. False if the game field is not a view of a sharded world
+        """
+        if not self.world or self.model.x1 > 0:
+            return False
+
+        self.world.move_view(x_coord - self.model.field_width // 2, y_coord - self.model.field_height // 2)
+        self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+        self.update()
+
+        return True
+
+    def copy_selection(self) -> None:
+        """
+        Copies the selected rectangles with the links between them to the clipboard
 
         Returns:
             None
         """
-        if event is None:
-            return
+        text = self.controller.copy()
 
-        self.model.x1 = event.pos().x()
-        self.model.y1 = event.pos().y()
+        if text is not None:
+            mime_data = QMimeData()
+            mime_data.setData(SUBGRAPH_MIME_TYPE, text.encode())
+            QApplication.clipboard().setMimeData(mime_data)
 
-        if self.handle_delete_link_button_pressed():
-            return
+    def paste_selection(self) -> None:
+        """
+        Pastes the copied rectangles from the clipboard centered at the cursor
 
-        if self.handle_link_pressed():
-            return
+        Returns:
+            None
+        """
+        mime_data = QApplication.clipboard().mimeData()
 
-        if self.handle_port_pressed():
+        if mime_data is None or not mime_data.hasFormat(SUBGRAPH_MIME_TYPE):
             return
 
-        self.handle_moveable_rectangle_pressed()
+        position = self.mapFromGlobal(QCursor.pos())
+        self.paste(bytes(mime_data.data(SUBGRAPH_MIME_TYPE)).decode(), position.x(), position.y())
 
-    def mouseDoubleClickEvent(self, event) -> None:
+    def paste(self, text: str, x_coord: int, y_coord: int) -> None:
         """
-        Handles the mouse double click logic
+        Pastes the encoded subgraph centered at the given position
 
         Args:
-            event (QMouseEvent): event data
+            text (str): encoded subgraph
+            x_coord (int): x coordinate of the center of the pasted subgraph
+            y_coord (int): y coordinate of the center of the pasted subgraph
 
         Returns:
             None
         """
-        if not event:
-            return
+        if self.recorder:
+            self.recorder.record_paste(text, x_coord, y_coord)
 
-        self.model.x1 = event.pos().x()
-        self.model.y1 = event.pos().y()
-
-        selected_link = self.model.find_selected_link(self.model.x1, self.model.y1)
-        selected_port = self.model.find_selected_port(self.model.x1, self.model.y1)
+        if self.controller.paste(text, x_coord, y_coord):
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+            self.update()
 
-        if selected_link is not None or selected_port is not None:
-            return
+    def set_snapping(self, is_grid_snap_enabled: bool, is_guide_snap_enabled: bool) -> None:
+        """
+        Enables or disables snapping of the dragged rectangle
 
-        selected_rectangle = self.model.find_selected_rectangle(self.model.x1, self.model.y1)
+        Args:
+            is_grid_snap_enabled (bool): flag to snap the dragged rectangle to the grid
+            is_guide_snap_enabled (bool): flag to snap the dragged rectangle to the edges of other rectangles
 
-        if selected_rectangle is None:
-            new_rectangle = self.model.try_add_new_rectangle(self.model.x1, self.model.y1)
-            self.model.x1 = self.model.y1 = 0
+        Returns:
+            None
+        """
+        if self.recorder:
+            self.recorder.record_snapping(is_grid_snap_enabled, is_guide_snap_enabled)
 
-            if new_rectangle:
-                self.model.selected_rectangle = new_rectangle
-                self.update()
+        if self.controller.set_snapping(is_grid_snap_enabled, is_guide_snap_enabled):
+            self.update()
 
-    def mouseReleaseEvent(self, event: Optional[QMouseEvent]) -> None:
+    def set_curved_links(self, is_enabled: bool) -> None:
         """
-        Handles the mouse release logic
+        Switches the links between straight lines and curves
 
         Args:
-            event (QMouseEvent): event data
+            is_enabled (bool): flag to draw and hit-test the links as curves
 
         Returns:
             None
         """
-        if not event:
-            return
+        if self.recorder:
+            self.recorder.record_curved_links(is_enabled)
 
-        if self.model.selected_rectangle and not self.model.is_dragging_link:
-            self.model.selected_rectangle.setRect(
-                self.model.selected_rectangle.x() + self.model.x2,
-                self.model.selected_rectangle.y() + self.model.y2,
-                self.model.selected_rectangle.width(),
-                self.model.selected_rectangle.height()
-            )
-
-            self.model.selected_rectangle.update_ports_offset(self.model.x2, self.model.y2)
-            self.model.update_links_offset(self.model.x2, self.model.y2)
-
-        if (self.model.selected_port is not None
-                and self.model.hovered_port is not None
-                and self.model.hovered_port not in self.model.selected_rectangle.ports
-        ):
-            self.model.links.append(
-                Link.from_ports(
-                    self.model.selected_port,
-                    self.model.hovered_port,
-                    Constants.LINK_WIDTH_PX,
-                    Constants.LINK_COLOR)
-            )
-            self.model.linked_port_ids.append(self.model.selected_port.id)
-            self.model.linked_port_ids.append(self.model.hovered_port.id)
-
-        self.model.x1 = self.model.x2 = self.model.y1 = self.model.y2 = 0
-        self.model.is_dragging_link = False
-        self.model.hovered_port = None
-        self.setMinimumSize(*self.model.recalculate_min_field_size())
-        self.update()
+        if self.controller.set_curved_links(is_enabled):
+            self.update()
 
-    def resizeEvent(self, event: Optional[QResizeEvent]) -> None:
+    def set_push(self, is_enabled: bool) -> None:
         """
-        Handles the window resize logic
+        Enables or disables pushing the rectangles in the way of the dragged rectangle
 
         Args:
-            event (QResizeEvent): event data
+            is_enabled (bool): flag to push the rectangles instead of stopping the dragged rectangle
 
         Returns:
             None
         """
-        self.model.field_width = self.width()
-        self.model.field_height = self.height()
+        if self.recorder:
+            self.recorder.record_push(is_enabled)
 
-    def paintEvent(self, event) -> None:
+        if self.controller.set_push(is_enabled):
+            self.update()
+
+    def edit_label(self) -> None:
         """
-        Handles the window re-paint logic
+        Asks for the new label of the selected rectangle
 
         Returns:
             None
         """
-        qp = QPainter()
-        qp.begin(self)
-        self.draw_game_objects(qp)
-        qp.end()
+        if self.model.selected_rectangle is None:
+            return
 
-    def draw_game_field(self, qp: QPainter) -> None:
+        label, is_accepted = QInputDialog.getText(self, 'Label', 'Label of the rectangle:',
+                                                  text=self.model.selected_rectangle.label)
+
+        if is_accepted:
+            self.set_label(label)
+
+    def set_label(self, label: str) -> None:
         """
-        Draws the game field with correct styles
+        Sets the text shown in the selected rectangle
 
         Args:
-            qp (QPainter): QPainter instance
+            label (str): new text, empty to remove the label
 
         Returns:
             None
         """
-        PainterUtils.enable_game_field_painter_style(qp)
-        qp.drawRect(0, 0, self.model.field_width, self.model.field_height)
+        if self.recorder:
+            self.recorder.record_label(label)
+
+        if self.controller.set_label(label):
+            self.update()
 
-    def draw_links(self, qp: QPainter) -> None:
+    def set_compaction(self, is_enabled: bool) -> None:
         """
-        Draws the link objects with correct styles
+        Enables or disables the compaction of the rectangles when the window shrinks
 
         Args:
-            qp (QPainter): QPainter instance
+            is_enabled (bool): flag to push the rectangles left and up instead of blocking the shrinking
 
         Returns:
             None
         """
-        if self.model.is_dragging_link:
-            PainterUtils.enable_link_painter_style(qp)
-            qp.drawLine(
-                self.model.x1,
-                self.model.y1,
-                self.model.x1 + self.model.x2,
-                self.model.y1 + self.model.y2
-            )
-
-        for link in self.model.links:
-            src_offset_x = 0
-            src_offset_y = 0
-            dst_offset_x = 0
-            dst_offset_y = 0
-
-            if self.model.selected_rectangle and not self.model.is_dragging_link:
-                src_port = next((x for x in self.model.selected_rectangle.ports if x.id == link.src_id), None)
-                dst_port = next((x for x in self.model.selected_rectangle.ports if x.id == link.dst_id), None)
-
-                if src_port:
-                    src_offset_x = self.model.x2
-                    src_offset_y = self.model.y2
-                if dst_port:
-                    dst_offset_x = self.model.x2
-                    dst_offset_y = self.model.y2
-
-            PainterUtils.enable_link_painter_style(qp, self.model.selected_link == link)
-            qp.drawLine(
-                link.x1() + src_offset_x,
-                link.y1() + src_offset_y,
-                link.x2() + dst_offset_x,
-                link.y2() + dst_offset_y
-            )
-
-        if self.model.selected_link is not None:
-            center_x, center_y = self.model.selected_link.center().x(), self.model.selected_link.center().y()
-
-            PainterUtils.enable_button_painter_style(qp, Constants.DELETE_COLOR)
-            qp.drawEllipse(
-                int(center_x - Constants.CIRCLE_RADIUS_PX / 2),
-                int(center_y - Constants.CIRCLE_RADIUS_PX / 2),
-                Constants.CIRCLE_RADIUS_PX,
-                Constants.CIRCLE_RADIUS_PX
-            )
-
-    def draw_ports(self, qp: QPainter, rectangle: MoveableRectangle) -> None:
-        """
-        Draws the ports of the given moveable rectangle with correct styles
+        if self.recorder:
+            self.recorder.record_compaction(is_enabled)
+
+        if self.controller.set_compaction(is_enabled):
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+
+    def handle_model_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Re-paints the game field once per event loop tick after the game model was changed by anything,
+        not only by the input handled here
 
         Args:
-            qp (QPainter): QPainter instance
-            rectangle (MoveableRectangle): moveable rectangle object to draw ports for
+            events (List[ChangeEvent]): coalesced change events
 
         Returns:
             None
         """
-        for port in rectangle.ports:
-            if port.id in self.model.linked_port_ids:
-                continue
-
-            is_selected = port == self.model.selected_port
-            is_hovered = port == self.model.hovered_port and self.model.selected_port != self.model.hovered_port
-            is_unavailable = (
-                    port == self.model.hovered_port
-                    and self.model.selected_port != self.model.hovered_port
-                    and self.model.hovered_port in self.model.selected_rectangle.ports
-            )
+        self.update()
 
-            port_x = port.x() if self.model.is_dragging_link else port.x() + self.model.x2
-            port_y = port.y() if self.model.is_dragging_link else port.y() + self.model.y2
+    def handle_sync_update(self) -> None:
+        """
+        Re-paints the game field after the changes of other clients were applied
 
-            PainterUtils.enable_port_painter_style(qp, port.color, is_selected, is_hovered, is_unavailable)
-            qp.drawEllipse(port_x, port_y, port.radius, port.radius)
+        Returns:
+            None
+        """
+        self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
+        self.update()
 
-    def draw_rectangles(self, qp: QPainter) -> None:
+    def resizeEvent(self, event: Optional[QResizeEvent]) -> None:
         """
-        Draws the rectangle objects with correct styles
+        Handles the window resize logic
 
         Args:
-            qp (QPainter): QPainter instance
+            event (QResizeEvent): event data
 
         Returns:
             None
         """
-        for rect in self.model.rectangles:
-            if rect == self.model.selected_rectangle:
-                rect_x = rect.x() if self.model.is_dragging_link else rect.x() + self.model.x2
-                rect_y = rect.y() if self.model.is_dragging_link else rect.y() + self.model.y2
-
-                PainterUtils.enable_rectangle_painter_style(qp, rect.color, rect == self.model.selected_rectangle)
-                qp.drawRect(rect_x, rect_y, rect.width(), rect.height())
+        if self.recorder:
+            self.recorder.record_resize(self.width(), self.height())
 
-                self.draw_ports(qp, rect)
-            else:
-                PainterUtils.enable_rectangle_painter_style(qp, rect.color, rect == self.model.selected_rectangle)
-                qp.drawRect(rect.x(), rect.y(), rect.width(), rect.height())
+        if self.controller.resize(self.width(), self.height()):
+            self.setMinimumSize(self.model.min_field_width, self.model.min_field_height)
 
-                if self.model.selected_port is not None:
-                    self.draw_ports(qp, rect)
+        if self.world:
+            self.world.update_view()
 
-    def draw_game_objects(self, qp: QPainter) -> None:
+    def paintEvent(self, event) -> None:
         """
-        Handles drawing of all game objects
-
-        Args:
-            qp (QPainter): QPainter instance
+        Handles the window re-paint logic. With tiling on, the field and the rectangles come from the cached tiles,
+        only the region of the selected rectangle and the visible ports is re-painted over them,
+        and the links are painted on top as usual
 
         Returns:
             None
         """
-        self.draw_game_field(qp)
-        self.draw_rectangles(qp)
-        self.draw_links(qp)
+        qp = QPainter()
+        qp.begin(self)
+
+        if self.tiled_renderer is None:
+            self.painter.draw_game_objects(qp)
+        else:
+            self.tiled_renderer.paint(qp, event.rect(), self.devicePixelRatioF())
+            region = self.tiled_renderer.get_dynamic_region().intersected(event.region())
+
+            if not region.isEmpty():
+                qp.setClipRegion(region)
+                self.painter.draw_game_field(qp)
+                self.painter.draw_rectangles(qp, region.boundingRect())
+                qp.setClipping(False)
+
+            self.painter.draw_links(qp)
+            self.painter.draw_guides(qp)
+            self.painter.draw_selection_box(qp)
+
+        qp.end()
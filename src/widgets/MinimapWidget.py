@@ -0,0 +1,90 @@
+"""
+Implementation of the minimap widget
+"""
+from typing import Callable, List, Optional, TYPE_CHECKING
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QMouseEvent, QPainter
+from PyQt6.QtWidgets import QWidget
+
+from models.ChangeBus import ChangeEvent
+from models.GameModel import GameModel
+from rendering.MinimapRenderer import MINIMAP_CHANGE_KINDS, MinimapRenderer
+from utils import Constants, PainterUtils
+
+if TYPE_CHECKING:
+    from models.ShardedWorld import ShardedWorld
+
+
+class MinimapWidget(QWidget):
+    """
+    The MinimapWidget, child of QWidget class, that shows the whole scene downscaled with the game field outlined,
+    and jumps to the point of the scene clicked in it
+
+    Args:
+        model (GameModel): GameModel object with game data
+        jump (Optional[Callable[[int, int], bool]]): function that centers the game field at the point of the scene,
+            returns True if the view moved. Default = None - clicks are ignored
+        world (Optional[ShardedWorld]): sharded world shown in the game model, to show all of it. Default = None
+
+    Attributes:
+        model (GameModel): GameModel object to show
+        jump (Optional[Callable[[int, int], bool]]): function that centers the game field at the point of the scene
+        renderer (MinimapRenderer): renderer of the cached image of the scene
+    """
+    def __init__(self, model: GameModel, jump: Optional[Callable[[int, int], bool]] = None,
+                 world: Optional['ShardedWorld'] = None):
+        super().__init__()
+
+        self.model = model
+        self.jump = jump
+        self.renderer = MinimapRenderer(model, *Constants.MINIMAP_SIZE_PX, world)
+        model.changes.subscribe(self.handle_model_changes, MINIMAP_CHANGE_KINDS)
+
+        self.setFixedSize(*Constants.MINIMAP_SIZE_PX)
+
+    def handle_model_changes(self, events: List[ChangeEvent]) -> None:
+        """
+        Marks the changed parts of the image dirty and schedules the re-paint
+
+        Args:
+            events (List[ChangeEvent]): coalesced change events
+
+        Returns:
+            None
+        """
+        self.renderer.handle_changes(events)
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        """
+        Paints the image of the scene and the outline of the game field over it
+
+        Returns:
+            None
+        """
+        image = self.renderer.get_image()
+        left, top, right, bottom = self.renderer.to_pixels(0, 0, self.model.field_width, self.model.field_height)
+
+        qp = QPainter()
+        qp.begin(self)
+        qp.fillRect(self.rect(), PainterUtils.get_color(Constants.BORDER_COLOR))
+        qp.drawImage(0, 0, image)
+        qp.setPen(PainterUtils.get_pen(Constants.SELECTED_ELEMENT_COLOR))
+        qp.drawRect(QRect(left, top, max(right - left - 1, 1), max(bottom - top - 1, 1)))
+        qp.end()
+
+    def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
+        """
+        Centers the game field at the clicked point of the scene
+
+        Args:
+            event (QMouseEvent): event data
+
+        Returns:
+            None
+        """
+        if event is None or self.jump is None:
+            return
+
+        self.jump(*self.renderer.to_scene(event.pos().x(), event.pos().y()))
@@ -0,0 +1,92 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtGui import QImage
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication
+
+from src.benchmarks.RenderBenchmark import build_scene
+from src.models.GameModel import GameModel
+from src.widgets.GameGraphicsView import GameGraphicsView
+from src.widgets.GameWidget import GameWidget
+# components draw colors from the top-level utils package, not from src.utils
+from utils import RandomUtils
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def grab(view):
+    return view.grab().toImage().convertToFormat(QImage.Format.Format_RGB32)
+
+
+def play_session(app, view_class):
+    RandomUtils.seed(3)
+    view = view_class(GameModel())
+    view.show()
+    target = view.viewport() if isinstance(view, GameGraphicsView) else view
+    frames = []
+
+    def click(action, x_coord, y_coord):
+        getattr(QTest, action)(target, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier,
+                               QPoint(x_coord, y_coord))
+        app.processEvents()
+        frames.append(grab(view))
+
+    click('mouseDClick', 300, 300)
+    click('mouseDClick', 600, 300)
+    click('mouseClick', 300, 300)
+    click('mousePress', 345, 295)
+    QTest.mouseMove(target, QPoint(545, 295))
+    click('mouseRelease', 545, 295)
+    click('mousePress', 600, 300)
+    QTest.mouseMove(target, QPoint(620, 350))
+    app.processEvents()
+    frames.append(grab(view))
+    click('mouseRelease', 620, 350)
+    link_center = view.model.links[0].center()
+    click('mouseClick', link_center.x() - 30, link_center.y() - 3)
+    click('mouseClick', link_center.x(), link_center.y())
+    view.close()
+
+    return view.model, frames
+
+
+class TestGameGraphicsView:
+    def test_matches_game_widget(self, app):
+        widget_model, widget_frames = play_session(app, GameWidget)
+        scene_model, scene_frames = play_session(app, GameGraphicsView)
+
+        assert len(scene_model.rectangles) == len(widget_model.rectangles) == 2
+        assert [(rect.x(), rect.y()) for rect in scene_model.rectangles] == \
+               [(rect.x(), rect.y()) for rect in widget_model.rectangles]
+
+        for widget_frame, scene_frame in zip(widget_frames, scene_frames):
+            assert widget_frame == scene_frame
+
+    def test_mirrors_generated_scene(self, app):
+        model = build_scene(16)
+        view = GameGraphicsView(model)
+
+        assert set(view.game_scene.rectangle_items) == {rect.id for rect in model.rectangles}
+        assert set(view.game_scene.link_items) == {link.id for link in model.links}
+        assert view.game_scene.itemIndexMethod() == view.game_scene.ItemIndexMethod.BspTreeIndex
+
+    def test_follows_changes_made_outside_of_view(self, app):
+        model = build_scene(16)
+        view = GameGraphicsView(model)
+        rectangle = model.rectangles[0]
+        item = view.game_scene.rectangle_items[rectangle.id]
+        link_item = view.game_scene.link_items[model.links[0].id]
+
+        model.move_rectangle(rectangle, 0, 3)
+        app.processEvents()
+
+        assert item.sceneBoundingRect().center().y() == rectangle.y() + rectangle.height() / 2
+        assert link_item.line().y1() + link_item.pos().y() == model.links[0].y1()
+        view.close()